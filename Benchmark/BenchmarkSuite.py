@@ -0,0 +1,180 @@
+import json
+import time
+import platform
+import datetime
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'source')))
+from LatencyStats import LatencyStats
+
+"""
+Module for the BenchmarkSuite class.
+This class measures the latency of code paths, saves the results as a baseline
+and compares new results with it to detect performance regressions.
+"""
+
+class BenchmarkSuite:
+    """
+    Collection of benchmark results.
+
+    Each result has the latency statistics of LatencyStats.summary() in microseconds
+    (count, mean, min, p50, p99, max), the throughput in calls per second,
+    the clock of the measure ("wall" or "simulated") and optionally other counters
+    (e.g. I2C transactions per call).
+    A result regresses when one of its gated metrics is more than threshold
+    above the baseline, e.g. 0.5 for 50 %.
+
+    The speed of the machine is measured with a fixed pure Python workload (calibrate).
+    Wall time medians are scaled by the ratio of the two calibrations before being compared,
+    so a baseline stays usable when the CPU is faster or slower than when it was saved.
+
+    Attributes:
+        threshold (float): Allowed relative increase of a gated metric.
+        gatedMetrics (tuple): Metrics compared with the baseline, lower is better.
+    """
+    GATED_METRICS = ("p50", "transactionsPerCall")
+
+    def __init__(self, threshold: float = 0.5, gatedMetrics: tuple = GATED_METRICS):
+        if threshold < 0:
+            raise ValueError("Threshold must not be negative.")
+        self.__threshold = threshold
+        self.__gatedMetrics = tuple(gatedMetrics)
+        self.__results = {}
+        self.__reference = None
+
+    @property
+    def threshold(self):
+        return self.__threshold
+
+    @property
+    def results(self):
+        return dict(self.__results)
+
+    @property
+    def reference(self):
+        """Median time of the calibration workload in microseconds."""
+        return self.__reference
+
+    def calibrate(self, iterations: int = 2000) -> float:
+        """
+        Measures the speed of the machine with a fixed pure Python workload.
+        """
+        def workload():
+            total = 0
+            for i in range(200):
+                total += i * i
+            return total
+
+        self.__reference = self.measure("calibration", workload, iterations)["p50"]
+        del self.__results["calibration"]
+        return self.__reference
+
+    def measure(self, name: str, function, iterations: int = 1000, warmup: int = 10, prepare=None, repeat: int = 3) -> dict:
+        """
+        Calls function iterations times and records the wall time of each call.
+        prepare, if given, is called before each call and is not timed.
+        The measure is repeated and the round with the lowest median is kept,
+        the other rounds being slowed down by the rest of the system.
+        """
+        for _ in range(warmup):
+            if prepare is not None:
+                prepare()
+            function()
+        best = None
+        for _ in range(repeat):
+            stats = LatencyStats(iterations)
+            for _ in range(iterations):
+                if prepare is not None:
+                    prepare()
+                start = time.perf_counter_ns()
+                function()
+                stats.record(time.perf_counter_ns() - start)
+            if best is None or stats.percentile(50) < best.percentile(50):
+                best = stats
+        return self.record(name, best)
+
+    def record(self, name: str, stats: LatencyStats, clock: str = "wall", **counters) -> dict:
+        """
+        Stores the statistics of a benchmark, with extra counters.
+        """
+        result = stats.summary()
+        result["throughput"] = round(1e9 / stats.mean, 1) if stats.mean else None
+        result["clock"] = clock
+        result.update(counters)
+        self.__results[name] = result
+        return result
+
+    def addCounters(self, name: str, **counters) -> None:
+        self.__results[name].update(counters)
+
+    def save(self, path: str) -> None:
+        """
+        Writes the results in a baseline file.
+        """
+        with open(path, "w") as file:
+            json.dump({
+                "date": datetime.datetime.now().isoformat(timespec="seconds"),
+                "machine": platform.platform(),
+                "python": platform.python_version(),
+                "reference": self.__reference,
+                "results": self.__results
+            }, file, indent=4)
+
+    @staticmethod
+    def load(path: str) -> dict:
+        """
+        Reads a baseline file, a dict with the "results" and the calibration "reference".
+        """
+        with open(path, "r") as file:
+            return json.load(file)
+
+    def scale(self, baseline: dict) -> float:
+        """
+        Returns the factor converting the wall times of this machine into the ones of the baseline machine.
+        """
+        reference = baseline.get("reference")
+        if not reference or not self.__reference:
+            return 1.0
+        return reference / self.__reference
+
+    def compare(self, baseline: dict) -> list:
+        """
+        Returns the regressions as (benchmark, metric, baseline value, current value) tuples,
+        the current wall times being scaled to the baseline machine.
+        Benchmarks missing from one of the two sides are ignored.
+        """
+        regressions = []
+        scale = self.scale(baseline)
+        results = baseline.get("results", {})
+        for name, result in self.__results.items():
+            reference = results.get(name)
+            if reference is None:
+                continue
+            for metric in self.__gatedMetrics:
+                before, after = reference.get(metric), result.get(metric)
+                if before is None or after is None:
+                    continue
+                if metric == "p50" and result.get("clock") == "wall":
+                    after = round(after * scale, 1)
+                if after > before * (1 + self.__threshold) and after > before:
+                    regressions.append((name, metric, before, after))
+        return regressions
+
+    def report(self, baseline: dict = None) -> str:
+        """
+        Returns a table of the results, with the change of p50 against the baseline.
+        """
+        scale = self.scale(baseline) if baseline else 1.0
+        results = baseline.get("results", {}) if baseline else {}
+        lines = [f"{'benchmark':32} {'p50 us':>10} {'p99 us':>10} {'max us':>10} {'calls/s':>12} {'vs base':>8}"]
+        for name, result in self.__results.items():
+            change = ""
+            reference = results.get(name)
+            if reference and reference.get("p50"):
+                factor = scale if result.get("clock") == "wall" else 1.0
+                change = f"{(result['p50'] * factor / reference['p50'] - 1) * 100:+.0f}%"
+            lines.append(
+                f"{name:32} {result['p50']:>10} {result['p99']:>10} {result['max']:>10} "
+                f"{result['throughput'] or 0:>12} {change:>8}"
+            )
+        return "\n".join(lines)
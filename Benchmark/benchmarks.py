@@ -0,0 +1,237 @@
+import argparse
+import logging
+import os
+import subprocess
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'source')))
+from BenchmarkSuite import BenchmarkSuite
+from LatencyStats import LatencyStats
+from sim.Simulation import Simulation
+from Hardware import busio, board
+
+"""
+Benchmarks of the sensing and control hot paths of the LamboCar, run on the simulated hardware in virtual time.
+
+Usage (from the Benchmark directory):
+    python benchmarks.py              compare with baseline.json, exit code 1 on regression
+    python benchmarks.py --save       run and write baseline.json
+    python benchmarks.py --threshold 0.5 --baseline other.json
+
+The wall time of each call is measured, the echoes and the car take no real time.
+The cold start of main.py and reset.py is the import time of the module in a new interpreter.
+The wall times are compared with the baseline after scaling by the speed of the machine.
+The lap detection latency is measured in simulated time, from the edge of the
+line sensor to the lap counted by LamboCar.
+"""
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+def newCar():
+    """
+    Installs a new simulation and returns it with a LamboCar and its I2C bus.
+    """
+    from LamboCar import LamboCar
+    simulation = Simulation.virtual().install()
+    bus = busio.I2C(board.SCL, board.SDA)
+    return simulation, bus, LamboCar(bus)
+
+def stepSensors(sensorManager):
+    scheduler = sensorManager.firingScheduler
+    for _ in scheduler.slots:
+        scheduler.step()
+
+def benchDistance(suite: BenchmarkSuite, iterations: int) -> None:
+    simulation, _, lambo = newCar()
+    sensorManager = lambo.sensorManager
+    sensorManager.startSampling(background=False)
+    stepSensors(sensorManager)
+    suite.measure("getDistance.sampled", sensorManager.getDistance, iterations)
+
+    scheduler = sensorManager.firingScheduler
+    suite.measure("ultrasonic.fireSlot", scheduler.step, iterations // 5)
+    sensorManager.stopSampling()
+
+def benchStayMid(suite: BenchmarkSuite, iterations: int) -> None:
+    simulation, _, lambo = newCar()
+    sensorManager = lambo.sensorManager
+    sensorManager.startSampling(background=False)
+    period = 1.0 / lambo.controlFrequency
+
+    def prepare():
+        simulation.clock.advance(period)
+        stepSensors(sensorManager)
+
+    suite.measure("stayMid.tick", lambo.stayMid, iterations, prepare=prepare)
+    lambo.stopCar()
+    sensorManager.stopSampling()
+
+def benchMotorCommands(suite: BenchmarkSuite, iterations: int) -> None:
+    simulation, bus, lambo = newCar()
+    motorManager = lambo.motorManager
+
+    def measureCommand(name, method, values):
+        index = [0]
+
+        def call():
+            method(values[index[0] % len(values)])
+            index[0] += 1
+
+        suite.measure(name, call, iterations, warmup=0)
+        before = bus.stats()["transactions"]
+        for _ in range(iterations):
+            call()
+        transactions = bus.stats()["transactions"] - before
+        suite.addCounters(name, transactionsPerCall=round(transactions / iterations, 3))
+
+    measureCommand("setSpeed.changing", motorManager.setSpeed, [40, 41])
+    measureCommand("setSpeed.unchanged", motorManager.setSpeed, [41])
+    measureCommand("setAngle.sweep", motorManager.setAngle, list(range(-100, 101, 5)))
+    measureCommand("setAngle.unchanged", motorManager.setAngle, [0])
+    lambo.stopCar()
+
+def benchColour(suite: BenchmarkSuite, iterations: int) -> None:
+    """
+    Colour predicates of one tick (isGreen and isRed), each tick reads a new colour frame.
+    """
+    simulation, bus, lambo = newCar()
+    sensorManager = lambo.sensorManager
+    period = 1.0 / lambo.controlFrequency
+
+    def tick():
+        sensorManager.isGreen()
+        sensorManager.isRed()
+
+    def prepare():
+        simulation.clock.advance(period)
+
+    suite.measure("colour.tick", tick, iterations, prepare=prepare)
+    before = bus.stats()["transactions"]
+    for _ in range(iterations):
+        prepare()
+        tick()
+    transactions = bus.stats()["transactions"] - before
+    suite.addCounters("colour.tick", transactionsPerCall=round(transactions / iterations, 3))
+
+def benchTelemetry(suite: BenchmarkSuite, iterations: int) -> None:
+    import tempfile
+    from TelemetryRecorder import TelemetryRecorder
+    from data.DistanceData import DistanceData
+    from data.RGBData import RGBData
+    distance = DistanceData(120.5, 35.2, 34.8)
+    rgb = RGBData(3, 92, 4)
+    with tempfile.TemporaryDirectory() as directory:
+        with TelemetryRecorder(os.path.join(directory, "telemetry.bin"), capacity=4096) as recorder:
+            timestamp = [0]
+
+            def record():
+                timestamp[0] += 10_000_000
+                recorder.record(timestamp[0], distance, False, rgb, 850.0, 40.0, -12.5)
+
+            suite.measure("telemetry.record", record, iterations)
+
+def benchLapDetection(suite: BenchmarkSuite, laps: int) -> None:
+    """
+    Drives laps on the simulated track and measures the delay between a line edge and the lap count.
+    """
+    from ControlLoop import ControlLoop
+    simulation, _, lambo = newCar()
+    world = simulation.world
+    clock = simulation.clock
+    sensorManager = lambo.sensorManager
+    lastEdge = [None]
+    lineCallback = world.lineCallback
+
+    def onLineChange(onLine):
+        lastEdge[0] = clock.nowNs()
+        lineCallback(onLine)
+
+    world.lineCallback = onLineChange
+    stats = LatencyStats(max(1, laps * 2))
+    previousTour = [lambo.tour]
+
+    def tick():
+        stepSensors(sensorManager)
+        lambo.stayMid()
+        lambo.LineCount()
+        if lambo.tour != previousTour[0]:
+            previousTour[0] = lambo.tour
+            if lastEdge[0] is not None:
+                stats.record(clock.nowNs() - lastEdge[0])
+        return world.laps < laps and world.elapsed < laps * 60
+
+    sensorManager.startSampling(background=False)
+    try:
+        ControlLoop(lambo.controlFrequency, clock).run(tick)
+    finally:
+        lambo.stopCar()
+        sensorManager.stopSampling()
+    suite.record("lapDetection.latency", stats, clock="simulated", laps=world.laps, collisions=world.collisions)
+
+SOURCE_DIRECTORY = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'source'))
+
+def importTimeNs(module: str) -> int:
+    """
+    Imports module in a new interpreter and returns its cumulative import time (python -X importtime).
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SOURCE_DIRECTORY, capture_output=True, text=True, check=True
+    )
+    for line in reversed(result.stderr.splitlines()):
+        fields = [field.strip() for field in line.split("|")]
+        if len(fields) == 3 and fields[2] == module:
+            return int(fields[1]) * 1000
+    raise RuntimeError(f"No import time reported for {module}")
+
+def benchColdStart(suite: BenchmarkSuite, runs: int) -> None:
+    """
+    Import time of the entry points: no driver or heavy module must be loaded before the prompt.
+    """
+    for module in ("main", "reset"):
+        stats = LatencyStats(runs)
+        for _ in range(runs):
+            stats.record(importTimeNs(module))
+        suite.record(f"coldStart.{module}", stats)
+
+def runAll(suite: BenchmarkSuite, iterations: int = 2000, laps: int = 3) -> BenchmarkSuite:
+    suite.calibrate()
+    benchDistance(suite, iterations)
+    benchStayMid(suite, iterations)
+    benchMotorCommands(suite, iterations)
+    benchColour(suite, iterations)
+    benchTelemetry(suite, iterations)
+    benchLapDetection(suite, laps)
+    benchColdStart(suite, 10)
+    return suite
+
+def main():
+    parser = argparse.ArgumentParser(description="LamboCar hot path benchmarks on simulated hardware.")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline file to compare with or to write.")
+    parser.add_argument("--save", action="store_true", help="Write the results as the new baseline.")
+    parser.add_argument("--threshold", type=float, default=0.5, help="Allowed relative regression (0.5 = 50 %%).")
+    parser.add_argument("--iterations", type=int, default=2000, help="Calls per benchmark.")
+    parser.add_argument("--laps", type=int, default=3, help="Laps driven by the lap detection benchmark.")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    suite = runAll(BenchmarkSuite(args.threshold), args.iterations, args.laps)
+
+    baseline = None
+    if not args.save and os.path.exists(args.baseline):
+        baseline = BenchmarkSuite.load(args.baseline)
+    print(suite.report(baseline))
+
+    if args.save:
+        suite.save(args.baseline)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    if baseline is None:
+        print(f"No baseline in {args.baseline}, run with --save first.")
+        return 0
+
+    regressions = suite.compare(baseline)
+    for name, metric, before, after in regressions:
+        print(f"REGRESSION {name}.{metric}: {before} -> {after}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -39,6 +39,15 @@ class TestMotorManager(unittest.TestCase):
         self.motorManager.setSpeed(10)
         self.assertTrue(mock.called_with(True))
 
+    @patch('DCMotor.DCMotor.setDirection')
+    def testSetSpeed_skips_unchanged_writes(self, mock):
+        self.motorManager.setSpeed(30)
+        self.motorManager.setSpeed(30)
+        stats = self.motorManager.actuator.stats()
+        self.assertEqual(mock.call_count, 2)
+        self.assertEqual(stats["transactions"], 1)
+        self.assertEqual(stats["skippedWrites"], 2)
+
     @patch('MotorManager.MotorManager.convert_steering_to_duty', return_value=6990)
     @patch('MotorManager.MotorManager.pwmDriver')
     def testSetAngle(self, mock, mock2):
@@ -2,6 +2,7 @@ import unittest
 from unittest.mock import MagicMock, patch
 
 from SensorManager import SensorManager
+from data.RGBData import RGBData
 import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'source')))
@@ -18,6 +19,9 @@ class TestSensorManager(unittest.TestCase):
         self.sensor_manager._SensorManager__distSensorLeft = MagicMock()
         self.sensor_manager._SensorManager__distSensorRight = MagicMock()
 
+    def setRGB(self, red, green, blue):
+        self.sensor_manager._SensorManager__rgbSensor.readFrame.return_value = MagicMock(rgb=RGBData(red, green, blue))
+
     def test_detectLine_true(self):
         self.sensor_manager._SensorManager__isOnLine = False
         self.sensor_manager._SensorManager__lineSensor.readValue.return_value = True
@@ -35,21 +39,60 @@ class TestSensorManager(unittest.TestCase):
             self.sensor_manager._SensorManager__distSensorLeft,
             self.sensor_manager._SensorManager__distSensorRight
         ]:
-            sensor.readValue.side_effect = [10, 12, 11, 13, 10]  # Moyenne = 11.2
+            sensor.readValue.side_effect = [10, 12, 11, 13, 10]  # Mediane = 11
+
+        for _ in range(5):
+            distances = self.sensor_manager.getDistance()
+        self.assertEqual((distances.front, distances.left, distances.right), (11, 11, 11))
+        self.assertEqual(distances.confidence, (1.0, 1.0, 1.0))
+
+    def test_getDistance_one_reading_per_call(self):
+        """
+        Each call reads every sensor once and already gives an estimate.
+        """
+        for sensor in [
+            self.sensor_manager._SensorManager__distSensorFront,
+            self.sensor_manager._SensorManager__distSensorLeft,
+            self.sensor_manager._SensorManager__distSensorRight
+        ]:
+            sensor.readValue.return_value = 40
 
         distances = self.sensor_manager.getDistance()
-        self.assertEqual(distances, (11.2, 11.2, 11.2))
+        self.assertEqual(distances.front, 40)
+        self.assertEqual(distances.confidence, (0.2, 0.2, 0.2))
+        self.sensor_manager._SensorManager__distSensorFront.readValue.assert_called_once()
 
     def test_getDistance_with_invalids(self):
         # One sensor returns only None
         self.sensor_manager._SensorManager__distSensorFront.readValue.side_effect = [None] * 5
         self.sensor_manager._SensorManager__distSensorLeft.readValue.side_effect = [20, 21, 19, 20, 21]
-        self.sensor_manager._SensorManager__distSensorRight.readValue.side_effect = [30, None, 30, 29, 31]
+        self.sensor_manager._SensorManager__distSensorRight.readValue.side_effect = [30, 31, None, 90, 29]
+
+        for _ in range(5):
+            distances = self.sensor_manager.getDistance()
+        self.assertEqual(distances.front, None)
+        self.assertEqual(distances.left, 20)
+        self.assertEqual(distances.right, 30)
+        self.assertEqual(distances.confidence[0], 0.0)
+        self.assertEqual(distances.confidence[2], 0.6)
+
+    def test_getDistance_sampling(self):
+        for sensor, value in [
+            (self.sensor_manager._SensorManager__distSensorFront, 50),
+            (self.sensor_manager._SensorManager__distSensorLeft, 20),
+            (self.sensor_manager._SensorManager__distSensorRight, 30)
+        ]:
+            sensor.readValue.return_value = value
 
-        distances = self.sensor_manager.getDistance()
-        self.assertEqual(distances[0], None)
-        self.assertEqual(distances[1], 20.2)
-        self.assertEqual(distances[2], 30.0)
+        self.sensor_manager.startSampling(rateHz=100, readyTimeout=1.0)
+        try:
+            self.assertTrue(self.sensor_manager.sampling)
+            distances = self.sensor_manager.getDistance()
+        finally:
+            self.sensor_manager.stopSampling()
+
+        self.assertEqual((distances.front, distances.left, distances.right), (50.0, 20.0, 30.0))
+        self.assertFalse(self.sensor_manager.sampling)
 
     def test_getCurrent_valid(self):
         self.sensor_manager._SensorManager__inaSensor.readValue.return_value = {'Current': 420}
@@ -60,28 +103,44 @@ class TestSensorManager(unittest.TestCase):
         self.assertIsNone(self.sensor_manager.getCurrent())
 
     def test_isRed_true(self):
-        self.sensor_manager._SensorManager__rgbSensor.readValue.return_value = (180, 100, 50)
+        self.setRGB(180, 100, 50)
         self.assertTrue(self.sensor_manager.isRed())
 
     def test_isRed_false_low_r(self):
-        self.sensor_manager._SensorManager__rgbSensor.readValue.return_value = (120, 110, 50)
+        self.setRGB(120, 110, 50)
         self.assertFalse(self.sensor_manager.isRed())
 
     def test_isRed_false_low_delta(self):
-        self.sensor_manager._SensorManager__rgbSensor.readValue.return_value = (155, 140, 50)
+        self.setRGB(155, 140, 50)
         self.assertFalse(self.sensor_manager.isRed())
 
     def test_isGreen_true(self):
-        self.sensor_manager._SensorManager__rgbSensor.readValue.return_value = (80, 170, 60)
+        self.setRGB(80, 170, 60)
         self.assertTrue(self.sensor_manager.isGreen())
 
     def test_isGreen_false_low_g(self):
-        self.sensor_manager._SensorManager__rgbSensor.readValue.return_value = (60, 100, 60)
-        self.assertFalse(self.sensor_manager.isGreen())
+        self.setRGB(60, 100, 60)
+        self.assertFalse(self.sensor_manager.isGreen(greenMinimum=150, G_R_DeltaMinimum=50))
 
     def test_isGreen_false_low_delta(self):
-        self.sensor_manager._SensorManager__rgbSensor.readValue.return_value = (140, 170, 60)
-        self.assertFalse(self.sensor_manager.isGreen())
+        self.setRGB(140, 170, 60)
+        self.assertFalse(self.sensor_manager.isGreen(greenMinimum=150, G_R_DeltaMinimum=50))
+
+    def test_colour_frame_is_shared(self):
+        """
+        isRed and isGreen evaluated in the same tick read the colour sensor once.
+        """
+        self.setRGB(80, 170, 60)
+        self.assertFalse(self.sensor_manager.isRed())
+        self.assertTrue(self.sensor_manager.isGreen())
+        self.sensor_manager._SensorManager__rgbSensor.readFrame.assert_called_once()
+        self.assertEqual(self.sensor_manager.lastRGB.green, 170)
+
+    def test_colour_frame_expires(self):
+        self.setRGB(80, 170, 60)
+        self.sensor_manager.isGreen()
+        self.sensor_manager.readColourFrame(maxAge=-1)
+        self.assertEqual(self.sensor_manager.colourReads, 2)
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,137 @@
+import unittest
+from unittest.mock import MagicMock
+import threading
+import time
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'source')))
+from multiprocessing import shared_memory
+import Hardware
+from sim.Simulation import Simulation
+from SharedSampleBuffer import SharedSampleBuffer
+from AcquisitionProcess import AcquisitionProcess
+from AdaptiveSamplingPolicy import AdaptiveSamplingPolicy
+from ReplayMotorManager import ReplayMotorManager
+
+
+class TestSharedSampleBuffer(unittest.TestCase):
+
+    def setUp(self):
+        self.buffer = SharedSampleBuffer()
+
+    def tearDown(self):
+        self.buffer.close()
+        self.buffer.unlink()
+
+    def test_sample_round_trip(self):
+        self.assertIsNone(self.buffer.readSample())
+        self.buffer.writeSample(
+            1234, [(30.5, 1000, 0.8), (None, None, 0.0), (12.0, 1100, 1.0)],
+            True, 999, 3, {"Front": 25.0, "Left": 12.5}
+        )
+        sample = SharedSampleBuffer(self.buffer.name).readSample()
+        self.assertEqual(sample.timestampNs, 1234)
+        self.assertEqual((sample.distance.front, sample.distance.left, sample.distance.right), (30.5, None, 12.0))
+        self.assertEqual(sample.distance.confidence, (0.8, 0.0, 1.0))
+        self.assertTrue(sample.onLine)
+        self.assertEqual((sample.lineEdges, sample.lastEdgeNs), (3, 999))
+        self.assertEqual(sample.rates, {"Front": 25.0, "Left": 12.5, "Right": 0.0})
+        self.assertEqual(sample.sequence, 1)
+
+    def test_commands_drive_a_policy(self):
+        self.assertEqual(self.buffer.readCommands(), (0.0, 0.0))
+        self.buffer.writeCommands(80, -40)
+        policy = AdaptiveSamplingPolicy(ReplayMotorManager()).rebind(self.buffer)
+        self.assertEqual((policy.motorManager.speed, policy.motorManager.angle), (80, -40))
+
+    def test_reads_are_never_torn(self):
+        """
+        A reader in another thread always sees the three distances of the same sample.
+        """
+        stop = threading.Event()
+
+        def writer():
+            value = 2.0
+            while not stop.is_set():
+                self.buffer.writeSample(int(value), [(value, 0, 1.0)] * 3, False, None, 0, {})
+                value += 1
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        try:
+            for _ in range(20000):
+                sample = self.buffer.readSample()
+                if sample is not None:
+                    distance = sample.distance
+                    self.assertEqual(distance.front, distance.left)
+                    self.assertEqual(distance.front, distance.right)
+                    self.assertEqual(sample.timestampNs, int(distance.front))
+        finally:
+            stop.set()
+            thread.join()
+
+
+class TestAcquisitionProcess(unittest.TestCase):
+
+    def setUp(self):
+        from SensorManager import SensorManager
+        self.simulation = Simulation.scaled(1).install()
+        bus = Hardware.busio.I2C(Hardware.board.SCL, Hardware.board.SDA)
+        self.sensorManager = SensorManager(bus)
+
+    def tearDown(self):
+        self.sensorManager.stopSampling()
+        Hardware.useBackend(None)
+
+    def test_distances_from_the_child_process(self):
+        self.sensorManager.startSampling(process=True, readyTimeout=2.0)
+        acquisition = self.sensorManager.acquisition
+        self.assertNotEqual(acquisition.pid, os.getpid())
+        time.sleep(0.3)
+        shared = self.sensorManager.getDistance()
+        self.assertFalse(self.sensorManager.detectLine())
+        self.assertGreater(self.sensorManager.firingRates()["Front"], 0)
+        name = acquisition.buffer.name
+        self.sensorManager.stopSampling()
+
+        self.assertFalse(acquisition.running)
+        with self.assertRaises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+        # the car does not move: the child process measured the distances of the world,
+        # plus the echo delay and the jitter of the echo timing in real time
+        world = self.simulation.world
+        for side in ("Front", "Left", "Right"):
+            expected = world.ultrasonicDistance(side)
+            self.assertAlmostEqual(getattr(shared, side.lower()), expected, delta=3 + 0.02 * expected)
+
+    def test_adaptive_policy_in_the_child(self):
+        motors = ReplayMotorManager()
+        motors.setSpeed(100)
+        policy = AdaptiveSamplingPolicy(motors)
+        self.sensorManager.startSampling(process=True, policy=policy, readyTimeout=2.0)
+        time.sleep(0.5)
+        self.sensorManager.getDistance()
+        time.sleep(0.5)
+        rates = self.sensorManager.firingRates()
+        self.assertGreater(rates["Front"], rates["Left"])
+
+    def test_crash_is_raised_in_the_control_process(self):
+        lineSensor = MagicMock()
+        lineSensor.readValue.side_effect = OSError("line sensor unplugged")
+        acquisition = AcquisitionProcess(
+            [MagicMock(readValue=MagicMock(return_value=50.0)) for _ in range(3)],
+            lineSensor
+        )
+        with self.assertRaises(RuntimeError) as context:
+            acquisition.start(readyTimeout=2.0)
+            deadline = time.time() + 2
+            while time.time() < deadline:
+                acquisition.read()
+                time.sleep(0.01)
+        self.assertIn("line sensor unplugged", str(context.exception))
+        self.assertNotEqual(acquisition.exitcode, 0)
+        acquisition.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+import time
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'source')))
+from AdaptiveSamplingPolicy import AdaptiveSamplingPolicy
+from FiringScheduler import FiringScheduler
+from DistanceSampler import DistanceSampler
+from ReplayMotorManager import ReplayMotorManager
+from ReplaySensor import ReplaySensor
+
+
+class TestAdaptiveSamplingPolicy(unittest.TestCase):
+
+    def setUp(self):
+        self.motorManager = ReplayMotorManager()
+        self.policy = AdaptiveSamplingPolicy(self.motorManager, budgetHz=45, frontRange=(10, 30), sideRange=(5, 15))
+        self.sensors = {name: ReplaySensor(name, 50.0) for name in ["Front", "Left", "Right"]}
+        self.samplers = {name: DistanceSampler(sensor) for name, sensor in self.sensors.items()}
+
+    def test_front_rate_goes_up_with_speed(self):
+        slow = self.policy.targetRates(0, 0)
+        fast = self.policy.targetRates(75, 0)
+        self.assertEqual(slow, {"Front": 10, "Left": 5, "Right": 5})
+        self.assertEqual(fast["Front"], 25)
+        self.assertEqual(fast["Left"], 5)
+
+    def test_side_rates_go_up_in_curves(self):
+        rates = self.policy.targetRates(0, -50)
+        self.assertEqual(rates["Left"], 10)
+        self.assertEqual(rates["Right"], 10)
+
+    def test_rates_fit_in_the_budget(self):
+        rates = self.policy.targetRates(100, 100)
+        self.assertAlmostEqual(sum(rates.values()), 45)
+        self.assertGreater(rates["Front"], rates["Left"])
+
+    def test_plan_follows_the_rates(self):
+        plan = self.policy.buildPlan({"Front": 30, "Left": 5, "Right": 5})
+        self.assertEqual(len(plan), 8)
+        self.assertEqual(plan.count("Front"), 6)
+        self.assertEqual(plan.count("Left"), 1)
+        self.assertEqual(plan.count("Right"), 1)
+        # the side slots are spread over the round
+        self.assertGreaterEqual(abs(plan.index("Left") - plan.index("Right")), 3)
+
+    def test_plan_keeps_every_sensor(self):
+        plan = self.policy.buildPlan({"Front": 1000, "Left": 1, "Right": 1})
+        self.assertIn("Left", plan)
+        self.assertIn("Right", plan)
+
+    def test_scheduler_follows_the_commands(self):
+        scheduler = FiringScheduler(self.samplers, policy=self.policy)
+        self.motorManager.setSpeed(0)
+        scheduler.step()
+        self.assertEqual(scheduler.slots.count("Front"), 4)
+        self.assertAlmostEqual(scheduler.slotPeriod, 1 / 20)
+
+        self.motorManager.setSpeed(100)
+        for _ in scheduler.slots:
+            scheduler.step()
+        self.assertEqual(scheduler.slots.count("Front"), 6)
+        self.assertAlmostEqual(scheduler.slotPeriod, 1 / 40)
+        self.assertEqual(self.policy.replans, 2)
+
+    def test_stats_report_achieved_rates_within_budget(self):
+        self.policy = AdaptiveSamplingPolicy(self.motorManager, budgetHz=100, frontRange=(60, 120), sideRange=(20, 40))
+        scheduler = FiringScheduler(self.samplers, guardTime=0.0, policy=self.policy)
+        self.motorManager.setSpeed(75)
+        scheduler.start()
+        time.sleep(0.5)
+        scheduler.stop()
+
+        stats = self.policy.stats()
+        self.assertEqual(stats["budgetHz"], 100)
+        self.assertEqual(set(stats["achieved"]), {"Front", "Left", "Right"})
+        self.assertLessEqual(stats["totalHz"], 110)
+        self.assertGreater(stats["achieved"]["Front"], stats["achieved"]["Left"])
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            AdaptiveSamplingPolicy(self.motorManager, budgetHz=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
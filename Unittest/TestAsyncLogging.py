@@ -0,0 +1,145 @@
+import unittest
+import logging
+import time
+import sys
+import os
+import glob
+import tempfile
+import multiprocessing
+from logging.handlers import QueueListener
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'source')))
+from RateLimitFilter import RateLimitFilter
+from AsyncLogHandler import AsyncLogHandler
+import logs_config
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def makeRecord(message, name="DistanceSensor", level=logging.ERROR):
+    return logging.LogRecord(name, level, __file__, 0, message, None, None)
+
+
+class TestRateLimitFilter(unittest.TestCase):
+
+    def test_burst_then_suppress(self):
+        rateLimit = RateLimitFilter(burst=3, interval=60)
+        results = [rateLimit.filter(makeRecord(f"Distance out of range: {650 + i}.5 cm")) for i in range(10)]
+        self.assertEqual(results, [True] * 3 + [False] * 7)
+        self.assertEqual(rateLimit.suppressed, 7)
+
+    def test_keys_are_independent(self):
+        rateLimit = RateLimitFilter(burst=1, interval=60)
+        self.assertTrue(rateLimit.filter(makeRecord("[Front] Error : timeout")))
+        self.assertTrue(rateLimit.filter(makeRecord("Lap counted!", name="LamboCar", level=logging.INFO)))
+        self.assertFalse(rateLimit.filter(makeRecord("[Front] Error : timeout")))
+
+    def test_suppressed_count_is_reported(self):
+        rateLimit = RateLimitFilter(burst=1, interval=0.01)
+        rateLimit.filter(makeRecord("Echo line is still busy."))
+        rateLimit.filter(makeRecord("Echo line is still busy."))
+        rateLimit.filter(makeRecord("Echo line is still busy."))
+        time.sleep(0.02)
+        record = makeRecord("Echo line is still busy.")
+        self.assertTrue(rateLimit.filter(record))
+        self.assertIn("2 similar messages suppressed", record.getMessage())
+
+    def test_bounded_keys(self):
+        rateLimit = RateLimitFilter(burst=1, interval=60, maxKeys=2)
+        for key in ("a", "b", "c"):
+            record = makeRecord("message")
+            record.rateKey = key
+            rateLimit.filter(record)
+        record = makeRecord("message")
+        record.rateKey = "a"
+        self.assertTrue(rateLimit.filter(record))
+
+
+class TestAsyncLogHandler(unittest.TestCase):
+
+    def setUp(self):
+        self.logger = logging.getLogger("TestAsyncLogHandler")
+        self.logger.propagate = False
+        self.logger.setLevel(logging.INFO)
+
+    def tearDown(self):
+        for handler in list(self.logger.handlers):
+            self.logger.removeHandler(handler)
+
+    def test_records_are_written_by_the_listener(self):
+        handler = AsyncLogHandler(100)
+        target = ListHandler()
+        listener = QueueListener(handler.queue, target)
+        listener.start()
+        self.logger.addHandler(handler)
+        try:
+            for i in range(10):
+                self.logger.info("tick %d", i)
+            self.assertTrue(handler.drain(1.0))
+        finally:
+            listener.stop()
+        self.assertEqual(target.messages, [f"tick {i}" for i in range(10)])
+
+    def test_full_queue_drops_without_blocking(self):
+        handler = AsyncLogHandler(5)
+        self.logger.addHandler(handler)
+        start = time.perf_counter()
+        for i in range(100):
+            self.logger.error("sensor error %d", i)
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(handler.dropped, 95)
+        self.assertEqual(handler.queue.qsize(), 5)
+
+    def test_drops_are_reported(self):
+        handler = AsyncLogHandler(2)
+        self.logger.addHandler(handler)
+        for i in range(5):
+            self.logger.error("sensor error %d", i)
+        handler.queue.get_nowait()
+        handler.queue.get_nowait()
+        self.logger.error("back")
+        messages = [handler.queue.get_nowait().getMessage() for _ in range(2)]
+        self.assertEqual(messages, ["3 log records dropped, the log queue was full", "back"])
+
+
+def logFromChild():
+    logs_config.restart_logging()
+    logging.getLogger("child").warning("from the child")
+    logs_config.shutdown_logging()
+
+
+class TestForkedLogging(unittest.TestCase):
+
+    def setUp(self):
+        self.root = logging.getLogger()
+        self.handlers, self.level = list(self.root.handlers), self.root.level
+        self.root.handlers = []
+        self.cwd = os.getcwd()
+        self.directory = tempfile.TemporaryDirectory()
+        os.chdir(self.directory.name)
+
+    def tearDown(self):
+        logs_config.shutdown_logging()
+        self.root.handlers, self.root.level = self.handlers, self.level
+        os.chdir(self.cwd)
+        self.directory.cleanup()
+
+    def test_forked_child_writes_its_records(self):
+        logs_config.setup_logging()
+        child = multiprocessing.get_context("fork").Process(target=logFromChild)
+        child.start()
+        child.join(5)
+        self.assertEqual(child.exitcode, 0)
+        logs_config.shutdown_logging()
+        with open(glob.glob(os.path.join("logs", "*.log"))[0]) as file:
+            self.assertIn("WARNING - from the child", file.read())
+
+
+if __name__ == '__main__':
+    unittest.main()
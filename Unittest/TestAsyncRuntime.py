@@ -0,0 +1,102 @@
+import unittest
+import asyncio
+import threading
+import time
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'source')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'source', 'sim')))
+import Hardware
+from Simulation import Simulation
+from AsyncRuntime import AsyncRuntime
+
+
+class TestAsyncRuntime(unittest.TestCase):
+
+    def setUp(self):
+        from LamboCar import LamboCar
+        self.simulation = Simulation.scaled(4).install()
+        bus = Hardware.busio.I2C(Hardware.board.SCL, Hardware.board.SDA)
+        self.lambo = LamboCar(bus)
+
+    def tearDown(self):
+        Hardware.useBackend(None)
+
+    def test_virtual_clock_rejected(self):
+        from LamboCar import LamboCar
+        from VirtualClock import VirtualClock
+        lambo = LamboCar(Hardware.busio.I2C(Hardware.board.SCL, Hardware.board.SDA), clock=VirtualClock())
+        with self.assertRaises(ValueError):
+            AsyncRuntime(lambo)
+
+    def test_drives_for_a_duration(self):
+        stats = asyncio.run(AsyncRuntime(self.lambo).run(duration=2))
+        world = self.simulation.world
+        self.assertGreater(stats["ticks"], 80)
+        self.assertLessEqual(stats["ticks"], 101)
+        self.assertGreater(world.distance, 50)
+        self.assertEqual(world.collisions, 0)
+        self.assertFalse(self.lambo.sensorManager.sampling)
+        self.assertEqual(self.lambo.motorManager.speed, 0)
+
+    def test_stop_from_another_thread_within_one_tick(self):
+        runtime = AsyncRuntime(self.lambo)
+        stopped = []
+
+        def stop():
+            stopped.append(time.perf_counter())
+            runtime.stop()
+
+        timer = threading.Timer(0.2, stop)
+        timer.start()
+        asyncio.run(runtime.run())
+        elapsed = time.perf_counter() - stopped[0]
+        # one tick is 20 ms of clock time, 5 ms of real time at scale 4, plus the end of an echo
+        self.assertLess(elapsed, 0.05)
+        self.assertFalse(runtime.running)
+
+    def test_commands(self):
+        async def commands():
+            await asyncio.sleep(0.1)
+            yield "pause"
+            await asyncio.sleep(0.1)
+            yield "unknown"
+            yield "maneuver startCar"
+            await asyncio.sleep(0.1)
+            yield "stop"
+
+        runtime = AsyncRuntime(self.lambo, commands())
+        asyncio.run(runtime.run(duration=10))
+        self.assertEqual(runtime.handledCommands, ["pause", "maneuver startCar", "stop"])
+        self.assertTrue(runtime.paused)
+        self.assertEqual(self.lambo.maneuverRunner.maneuver.name, "startCar")
+
+    def test_end_of_command_input_does_not_end_the_run(self):
+        async def commands():
+            return
+            yield
+
+        stats = asyncio.run(AsyncRuntime(self.lambo, commands()).run(duration=1))
+        self.assertGreater(stats["ticks"], 40)
+        self.assertGreater(self.simulation.world.distance, 0)
+
+    def test_command_input_error_ends_the_run(self):
+        async def commands():
+            yield "pause"
+            raise OSError("input closed")
+
+        with self.assertRaises(OSError):
+            asyncio.run(AsyncRuntime(self.lambo, commands()).run(duration=10))
+        self.assertFalse(self.lambo.sensorManager.sampling)
+
+    def test_task_error_stops_the_car(self):
+        def broken():
+            raise RuntimeError("sensor failure")
+        self.lambo.controlTick = broken
+        with self.assertRaises(RuntimeError):
+            asyncio.run(AsyncRuntime(self.lambo).run(duration=1))
+        self.assertFalse(self.lambo.sensorManager.sampling)
+
+
+if __name__ == '__main__':
+    unittest.main()
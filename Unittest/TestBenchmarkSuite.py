@@ -0,0 +1,77 @@
+import unittest
+import tempfile
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'source')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'Benchmark')))
+from BenchmarkSuite import BenchmarkSuite
+from LatencyStats import LatencyStats
+
+
+def statsOf(values):
+    stats = LatencyStats()
+    for value in values:
+        stats.record(value)
+    return stats
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+
+    def setUp(self):
+        self.suite = BenchmarkSuite(threshold=0.5)
+
+    def baseline(self, p50, reference=None, **counters):
+        result = {"p50": p50, "clock": "wall"}
+        result.update(counters)
+        return {"reference": reference, "results": {"path": result}}
+
+    def test_measure_records_latency(self):
+        calls = []
+        result = self.suite.measure("path", lambda: calls.append(1), iterations=100, warmup=5, repeat=2)
+        self.assertEqual(len(calls), 205)
+        self.assertEqual(result["count"], 100)
+        self.assertEqual(result["clock"], "wall")
+        self.assertIn("path", self.suite.results)
+
+    def test_no_regression_within_threshold(self):
+        self.suite.record("path", statsOf([14_000] * 10))
+        self.assertEqual(self.suite.compare(self.baseline(10.0)), [])
+
+    def test_regression_beyond_threshold(self):
+        self.suite.record("path", statsOf([16_000] * 10))
+        self.assertEqual(self.suite.compare(self.baseline(10.0)), [("path", "p50", 10.0, 16.0)])
+
+    def test_counter_regression(self):
+        self.suite.record("path", statsOf([10_000]), transactionsPerCall=1.0)
+        self.assertEqual(
+            self.suite.compare(self.baseline(10.0, transactionsPerCall=0.5)),
+            [("path", "transactionsPerCall", 0.5, 1.0)]
+        )
+
+    def test_wall_times_are_scaled_by_the_calibration(self):
+        """
+        Twice slower on a machine twice slower is not a regression.
+        """
+        self.suite.calibrate(iterations=200)
+        reference = self.suite.reference / 2
+        self.suite.record("path", statsOf([20_000] * 10))
+        self.assertEqual(self.suite.compare(self.baseline(10.0, reference)), [])
+
+    def test_simulated_times_are_not_scaled(self):
+        self.suite.calibrate(iterations=200)
+        self.suite.record("path", statsOf([20_000] * 10), clock="simulated")
+        baseline = self.baseline(10.0, self.suite.reference / 2)
+        self.assertEqual(self.suite.compare(baseline), [("path", "p50", 10.0, 20.0)])
+
+    def test_save_and_load(self):
+        self.suite.record("path", statsOf([10_000, 12_000]))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "baseline.json")
+            self.suite.save(path)
+            baseline = BenchmarkSuite.load(path)
+        self.assertEqual(baseline["results"]["path"]["max"], 12.0)
+        self.assertEqual(self.suite.compare(baseline), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+import tempfile
+import json
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'source')))
+from Calibration import Calibration
+from ServoMotor import ServoMotor
+
+
+class TestCalibration(unittest.TestCase):
+
+    def setUp(self):
+        self.calibration = Calibration([[-100, 1.0], [0, 1.5], [100, 2.0]], frequency=50)
+
+    def test_steering_points(self):
+        """
+        At 50 Hz the period is 20 ms: 1.5 ms is 7.5% of 65535.
+        """
+        self.assertEqual(self.calibration.steeringToDuty(0), int(1.5 / 20 * 65535))
+        self.assertEqual(self.calibration.steeringToDuty(-100), int(1.0 / 20 * 65535))
+        self.assertEqual(self.calibration.steeringToDuty(100), int(2.0 / 20 * 65535))
+
+    def test_steering_interpolation(self):
+        self.assertEqual(self.calibration.steeringToDuty(50), int(1.75 / 20 * 65535))
+
+    def test_steering_is_clamped(self):
+        self.assertEqual(self.calibration.steeringToDuty(150), self.calibration.steeringToDuty(100))
+        self.assertEqual(self.calibration.steeringToDuty(-150), self.calibration.steeringToDuty(-100))
+
+    def test_non_linear_steering(self):
+        calibration = Calibration([[-100, 1.0], [0, 1.2], [100, 2.0]])
+        self.assertEqual(calibration.steeringToDuty(-50), int(1.1 / 20 * 65535))
+        self.assertEqual(calibration.steeringToDuty(50), int(1.6 / 20 * 65535))
+
+    def test_throttle_dead_band(self):
+        calibration = Calibration([[-100, 1.0], [100, 2.0]], [[0, 0], [1, 20], [100, 100]])
+        self.assertEqual(calibration.speedToDuty(0), 0)
+        self.assertEqual(calibration.speedToDuty(1), int(0.2 * 65535))
+        self.assertEqual(calibration.speedToDuty(-100), 65535)
+
+    def test_batch_conversion(self):
+        self.assertEqual(
+            self.calibration.steeringToDuties([-100, 0, 100]),
+            [self.calibration.steeringToDuty(value) for value in [-100, 0, 100]]
+        )
+        self.assertEqual(self.calibration.speedsToDuties([0, 50]), [0, int(0.5 * 65535)])
+
+    def test_from_servo_matches_servo_geometry(self):
+        """
+        The default calibration gives the same duty cycles as the former pulse width computation.
+        """
+        servo = ServoMotor(0, 50)
+        calibration = Calibration.fromServo(servo)
+        period = 1000.0 / servo.frequency
+        for steering in [-100, -37.5, 0, 12.3, 100]:
+            angle = servo.centerAngle + steering / 100.0 * servo.rangeDegrees
+            fraction = servo.minPulse / period + (servo.maxPulse - servo.minPulse) / period * (angle / 180.0)
+            self.assertAlmostEqual(calibration.steeringToDuty(steering), int(fraction * 65535), delta=1)
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "calibration.json")
+            self.calibration.save(path)
+            loaded = Calibration.load(path)
+
+        self.assertEqual(loaded.steeringPoints, self.calibration.steeringPoints)
+        self.assertEqual(loaded.steeringToDuty(33), self.calibration.steeringToDuty(33))
+
+    def test_load_invalid_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "calibration.json")
+            with open(path, "w") as file:
+                json.dump({"throttle": [[0, 0], [100, 100]]}, file)
+            with self.assertRaises(ValueError):
+                Calibration.load(path)
+
+    def test_invalid_points(self):
+        with self.assertRaises(ValueError):
+            Calibration([[0, 1.5]])
+        with self.assertRaises(ValueError):
+            Calibration([[0, 1.5], [0, 1.6]])
+
+    def test_default_calibration_file(self):
+        path = os.path.join(os.path.dirname(__file__), '..', 'source', 'config', 'calibration.json')
+        calibration = Calibration.load(path)
+        self.assertEqual(calibration.steeringToDuty(0), Calibration.fromServo(ServoMotor(0, 50)).steeringToDuty(0))
+
+
+if __name__ == "__main__":
+    unittest.main()
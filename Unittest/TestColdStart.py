@@ -0,0 +1,49 @@
+import unittest
+import json
+import subprocess
+import sys
+import os
+
+SOURCE = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'source'))
+
+# modules that must not be loaded before a mode is chosen
+HEAVY_MODULES = (
+    "RPi", "board", "busio", "adafruit_pca9685", "adafruit_tcs34725", "adafruit_ina219",
+    "adafruit_bus_device", "sim", "asyncio", "multiprocessing", "concurrent"
+)
+
+
+def importInNewInterpreter(*modules):
+    """
+    Imports modules in a new interpreter, returns the loaded top-level modules and the handlers of the root logger.
+    """
+    code = (
+        "import sys, json, logging\n"
+        f"for name in {list(modules)!r}:\n"
+        "    __import__(name)\n"
+        "print(json.dumps({'modules': sorted({m.split('.')[0] for m in sys.modules}),"
+        " 'handlers': len(logging.getLogger().handlers)}))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=SOURCE, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+class TestColdStart(unittest.TestCase):
+
+    def assertLight(self, *modules):
+        loaded = importInNewInterpreter(*modules)
+        self.assertEqual([name for name in HEAVY_MODULES if name in loaded["modules"]], [])
+        self.assertEqual(loaded["handlers"], 0)
+
+    def test_main_prompt_loads_no_driver(self):
+        self.assertLight("main")
+
+    def test_reset_loads_no_driver(self):
+        self.assertLight("reset")
+
+    def test_lambocar_import_has_no_side_effect(self):
+        self.assertLight("LamboCar", "SensorManager", "Profiler")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'source')))
+from ControlLoop import ControlLoop
+from VirtualClock import VirtualClock
+from SystemClock import SystemClock
+
+
+class TestControlLoop(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = VirtualClock()
+        self.loop = ControlLoop(50, self.clock)
+
+    def test_ticks_on_absolute_deadlines(self):
+        """
+        With a tick taking 5 ms at 50 Hz, every tick starts exactly on its 20 ms deadline.
+        """
+        starts = []
+
+        def tick():
+            starts.append(self.clock.nowNs())
+            self.clock.advance(0.005)
+
+        self.loop.run(tick, maxTicks=5)
+
+        self.assertEqual(starts, [0, 20_000_000, 40_000_000, 60_000_000, 80_000_000])
+        self.assertEqual(self.loop.ticks, 5)
+        self.assertEqual(self.loop.overruns, 0)
+        self.assertEqual(self.loop.latency.max, 5_000_000)
+
+    def test_overrun_skips_missed_deadlines(self):
+        """
+        A tick of 45 ms misses two deadlines, the next tick starts on the 60 ms deadline.
+        """
+        starts = []
+        durations = iter([0.045, 0.001, 0.001])
+
+        def tick():
+            starts.append(self.clock.nowNs())
+            self.clock.advance(next(durations))
+
+        self.loop.run(tick, maxTicks=3)
+
+        self.assertEqual(starts, [0, 60_000_000, 80_000_000])
+        self.assertEqual(self.loop.overruns, 1)
+        self.assertEqual(self.loop.missedTicks, 2)
+
+    def test_tick_returning_false_stops_the_loop(self):
+        calls = []
+
+        def tick():
+            calls.append(1)
+            return len(calls) < 3
+
+        self.loop.run(tick)
+
+        self.assertEqual(len(calls), 3)
+        self.assertFalse(self.loop.running)
+
+    def test_stop(self):
+        def tick():
+            self.loop.stop()
+
+        self.loop.run(tick, maxTicks=10)
+        self.assertEqual(self.loop.ticks, 1)
+
+    def test_stats(self):
+        self.loop.run(lambda: self.clock.advance(0.002), maxTicks=4)
+        stats = self.loop.stats()
+
+        self.assertEqual(stats["ticks"], 4)
+        self.assertEqual(stats["overruns"], 0)
+        self.assertEqual(stats["latency"]["p50"], 2000.0)
+        self.assertEqual(stats["jitter"]["max"], 0.0)
+
+    def test_real_time_rate(self):
+        clock = SystemClock()
+        loop = ControlLoop(200, clock)
+        start = clock.nowNs()
+
+        loop.run(lambda: None, maxTicks=20)
+
+        elapsed = (clock.nowNs() - start) / 1e9
+        self.assertGreaterEqual(elapsed, 19 / 200)
+        self.assertLess(elapsed, 0.5)
+
+    def test_invalid_frequency(self):
+        with self.assertRaises(ValueError):
+            ControlLoop(0)
+
+
+if __name__ == "__main__":
+    unittest.main()
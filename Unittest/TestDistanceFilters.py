@@ -0,0 +1,117 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'source')))
+from MedianFilter import MedianFilter
+from AlphaBetaFilter import AlphaBetaFilter
+
+
+class TestMedianFilter(unittest.TestCase):
+
+    def setUp(self):
+        self.filter = MedianFilter(windowSize=5)
+
+    def test_estimate_after_first_reading(self):
+        self.assertEqual(self.filter.update(42), (42, 0.2))
+
+    def test_median_of_window(self):
+        for value in [10, 12, 11, 13, 10]:
+            estimate, confidence = self.filter.update(value)
+        self.assertEqual(estimate, 11)
+        self.assertEqual(confidence, 1.0)
+
+    def test_outlier_is_rejected(self):
+        """
+        A single bad echo does not move the estimate and lowers the confidence.
+        """
+        for value in [50, 51, 50, 49, 50]:
+            self.filter.update(value)
+        estimate, confidence = self.filter.update(300)
+        self.assertEqual(estimate, 50)
+        self.assertEqual(confidence, 0.8)
+        self.assertEqual(self.filter.rejected, 1)
+
+    def test_window_restarts_after_repeated_rejections(self):
+        """
+        When the obstacle really moved, the estimate follows after maxRejections readings.
+        """
+        for value in [50, 51, 50, 49, 50]:
+            self.filter.update(value)
+        for _ in range(3):
+            estimate, confidence = self.filter.update(120)
+        self.assertEqual(estimate, 120)
+        self.assertEqual(confidence, 0.2)
+
+    def test_missing_readings(self):
+        for value in [30, None, None, None, None]:
+            estimate, confidence = self.filter.update(value)
+        self.assertEqual(estimate, 30)
+        self.assertEqual(confidence, 0.2)
+        self.assertEqual(self.filter.update(None), (None, 0.0))
+
+    def test_even_count_gives_mean_of_middle_values(self):
+        self.filter.update(20)
+        self.assertEqual(self.filter.update(30), (25, 0.4))
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            MedianFilter(windowSize=0)
+
+
+class TestAlphaBetaFilter(unittest.TestCase):
+
+    def setUp(self):
+        self.filter = AlphaBetaFilter(alpha=0.5, beta=0.1, gate=30, period=0.05)
+
+    def test_first_reading_starts_the_track(self):
+        self.assertEqual(self.filter.update(None), (None, 0.0))
+        self.assertEqual(self.filter.update(80), (80, 0.5))
+
+    def test_constant_distance(self):
+        for _ in range(20):
+            estimate, confidence = self.filter.update(80)
+        self.assertEqual(estimate, 80)
+        self.assertGreater(confidence, 0.99)
+
+    def test_tracks_approaching_obstacle(self):
+        """
+        An obstacle approaching at 100 cm/s is tracked without the lag of an average.
+        """
+        for i in range(40):
+            estimate, _ = self.filter.update(200 - 5 * i, i * 50_000_000)
+        self.assertAlmostEqual(estimate, 5, delta=1)
+        self.assertAlmostEqual(self.filter.velocity, -100, delta=5)
+
+    def test_outlier_is_rejected(self):
+        for _ in range(10):
+            self.filter.update(80)
+        confidence = self.filter.confidence
+        estimate, newConfidence = self.filter.update(400)
+        self.assertEqual(estimate, 80)
+        self.assertLess(newConfidence, confidence)
+        self.assertEqual(self.filter.rejected, 1)
+
+    def test_track_restarts_after_repeated_rejections(self):
+        for _ in range(10):
+            self.filter.update(80)
+        for _ in range(3):
+            estimate, confidence = self.filter.update(200)
+        self.assertEqual(estimate, 200)
+        self.assertEqual(confidence, 0.5)
+
+    def test_track_is_lost_without_echo(self):
+        self.filter.update(80)
+        for _ in range(3):
+            estimate, confidence = self.filter.update(None)
+        self.assertIsNone(estimate)
+        self.assertEqual(confidence, 0.0)
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            AlphaBetaFilter(alpha=0)
+        with self.assertRaises(ValueError):
+            AlphaBetaFilter(gate=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'source')))
+from DistanceSampler import DistanceSampler
+from MedianFilter import MedianFilter
+
+
+class TestDistanceSampler(unittest.TestCase):
+
+    def setUp(self):
+        self.sensor = MagicMock()
+        self.sampler = DistanceSampler(self.sensor, rateHz=200, windowSize=5)
+
+    def tearDown(self):
+        self.sampler.stop()
+
+    def test_latest_is_none_before_first_sample(self):
+        self.assertIsNone(self.sampler.latest)
+
+    def test_average_of_window(self):
+        """
+        Same result as the former 5 readings average of getDistance.
+        """
+        for value in [10, 12, 11, 13, 10]:
+            self.sampler.addSample(value)
+        self.assertEqual(self.sampler.latest, 11.2)
+
+    def test_invalid_readings_are_ignored(self):
+        for value in [30, None, 30, 29, 31]:
+            self.sampler.addSample(value)
+        self.assertEqual(self.sampler.latest, 30.0)
+
+    def test_all_invalid_gives_none(self):
+        for _ in range(5):
+            self.sampler.addSample(None)
+        self.assertIsNone(self.sampler.latest)
+
+    def test_ring_buffer_evicts_oldest(self):
+        """
+        Only the last windowSize readings are averaged.
+        """
+        for value in [100, 100, 100, 100, 100, 20, 20, 20, 20, 20]:
+            self.sampler.addSample(value)
+        self.assertEqual(self.sampler.latest, 20.0)
+        self.assertEqual(self.sampler.samples, 10)
+
+    def test_snapshot_too_old(self):
+        self.sampler.addSample(42)
+        self.assertEqual(self.sampler.snapshot(maxAge=10)[0], 42.0)
+        self.assertIsNone(self.sampler.snapshot(maxAge=-1)[0])
+
+    def test_filter_gives_estimate_and_confidence(self):
+        sampler = DistanceSampler(self.sensor, windowSize=5, filter=MedianFilter(5))
+        for value in [40, 41, 300, 40]:
+            sampler.addSample(value)
+        self.assertEqual(sampler.latest, 40)
+        self.assertEqual(sampler.confidence, 0.6)
+        value, timestamp, confidence = sampler.estimate(maxAge=-1)
+        self.assertIsNone(value)
+        self.assertEqual(confidence, 0.0)
+
+    def test_background_sampling(self):
+        self.sensor.readValue.return_value = 55.0
+        self.sampler.start()
+        self.assertTrue(self.sampler.waitReady(1.0))
+        self.assertTrue(self.sampler.running)
+        self.assertEqual(self.sampler.latest, 55.0)
+
+        self.sampler.stop()
+        self.assertFalse(self.sampler.running)
+
+    def test_sensor_exception_stores_none(self):
+        self.sensor.readValue.side_effect = OSError("sensor error")
+        self.assertIsNone(self.sampler.sampleOnce())
+        self.assertIsNone(self.sampler.latest)
+
+    def test_invalid_rate(self):
+        with self.assertRaises(ValueError):
+            DistanceSampler(self.sensor, rateHz=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
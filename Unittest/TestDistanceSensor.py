@@ -1,6 +1,8 @@
 import unittest
 from unittest.mock import patch
 from DistanceSensor import DistanceSensor
+from FakeGPIO import FakeGPIO
+from VirtualClock import VirtualClock
 import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'source')))
@@ -128,5 +130,67 @@ class TestDistanceSensor(unittest.TestCase):
         self.assertIsNotNone(distance)
 
 
+class TestDistanceSensorEdgeCapture(unittest.TestCase):
+
+    def setUp(self):
+        self.gpio = FakeGPIO()
+        self.sensor = DistanceSensor(6, 5, "Front", edgeCapture=True, gpio=self.gpio)
+
+    def tearDown(self):
+        self.sensor.close()
+
+    def test_readValue_edge_capture(self):
+        """
+        The fake GPIO answers with an echo matching an obstacle at 50 cm,
+        the edges are timestamped by the callbacks without polling the echo pin.
+        The echo is timed on a virtual clock, so the measure does not depend on the thread scheduling.
+        """
+        clock = VirtualClock()
+        gpio = FakeGPIO(clock=clock, threadedEcho=False)
+        sensor = DistanceSensor(6, 5, "Front", edgeCapture=True, gpio=gpio, clock=clock)
+        gpio.attachEcho(6, 5, 50.0)
+
+        distance = sensor.readValue()
+        sensor.close()
+        self.assertAlmostEqual(distance, 50.0, delta=0.01)
+
+    def test_readValue_edge_capture_threaded_echo(self):
+        """
+        Same measure with the echo emitted by a thread like the real sensor.
+        A pause of the echo thread can only delay the falling edge, so only the lower bound is checked.
+        """
+        self.gpio.attachEcho(6, 5, 50.0)
+
+        distance = self.sensor.readValue()
+        self.assertIsNotNone(distance)
+        self.assertGreaterEqual(distance, 48)
+
+    def test_readValue_edge_capture_no_echo(self):
+        """
+        Without echo the measure times out and None is returned.
+        """
+        self.gpio.attachEcho(6, 5, None)
+
+        self.assertIsNone(self.sensor.readValue())
+
+    def test_readValue_edge_capture_out_of_range(self):
+        self.gpio.attachEcho(6, 5, 450.0)
+
+        self.assertIsNone(self.sensor.readValue())
+
+    def test_readValue_polling_fallback(self):
+        """
+        The polling path works with the same fake backend.
+        The busy-wait holds the GIL, so the measure can only be late (longer).
+        """
+        gpio = FakeGPIO()
+        gpio.attachEcho(16, 25, 80.0)
+        sensor = DistanceSensor(16, 25, "Front", gpio=gpio)
+
+        distance = sensor.readValue()
+        self.assertIsNotNone(distance)
+        self.assertGreaterEqual(distance, 78)
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,92 @@
+import unittest
+import threading
+import time
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'source')))
+from FiringScheduler import FiringScheduler
+from DistanceSampler import DistanceSampler
+
+
+class EchoSensor:
+    """
+    Sensor whose echo lasts a fixed time, records when each of its measures was in flight.
+    """
+    def __init__(self, name, log, lock, duration=0.002):
+        self.name = name
+        self.log = log
+        self.lock = lock
+        self.duration = duration
+
+    def readValue(self):
+        start = time.perf_counter()
+        time.sleep(self.duration)
+        with self.lock:
+            self.log.append((self.name, start, time.perf_counter()))
+        return 42.0
+
+
+class TestFiringScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.log = []
+        lock = threading.Lock()
+        self.samplers = {
+            name: DistanceSampler(EchoSensor(name, self.log, lock))
+            for name in ["Front", "Left", "Right"]
+        }
+
+    def test_round_robin_order(self):
+        scheduler = FiringScheduler(self.samplers, "roundRobin")
+        fired = [scheduler.step() for _ in range(6)]
+        self.assertEqual(fired, ["Front", "Left", "Right", "Front", "Left", "Right"])
+
+    def test_front_priority_order(self):
+        scheduler = FiringScheduler(self.samplers, "frontPriority")
+        self.assertEqual(scheduler.slots, ["Front", "Left", "Front", "Right"])
+
+    def test_custom_slots(self):
+        scheduler = FiringScheduler(self.samplers, ["Front", "Front", "Left"])
+        fired = [scheduler.step() for _ in range(3)]
+        self.assertEqual(fired, ["Front", "Front", "Left"])
+
+    def test_invalid_slots(self):
+        with self.assertRaises(ValueError):
+            FiringScheduler(self.samplers, ["Front", "Back"])
+
+    def test_no_overlapping_echoes(self):
+        """
+        Measures never overlap and are separated by at least the guard time.
+        """
+        scheduler = FiringScheduler(self.samplers, "roundRobin", guardTime=0.003)
+        scheduler.start()
+        time.sleep(0.1)
+        scheduler.stop()
+
+        self.assertGreater(len(self.log), 6)
+        for previous, current in zip(self.log, self.log[1:]):
+            self.assertGreaterEqual(current[1] - previous[2], 0.003 * 0.9)
+
+    def test_samplers_receive_readings(self):
+        scheduler = FiringScheduler(self.samplers)
+        for _ in range(3):
+            scheduler.step()
+        for sampler in self.samplers.values():
+            self.assertEqual(sampler.latest, 42.0)
+
+    def test_effective_rates(self):
+        """
+        With frontPriority, Front is fired twice as often as Left and Right.
+        """
+        scheduler = FiringScheduler(self.samplers, "frontPriority", guardTime=0.001)
+        scheduler.start()
+        time.sleep(0.2)
+        scheduler.stop()
+
+        rates = scheduler.effectiveRates()
+        self.assertGreater(rates["Left"], 0)
+        self.assertAlmostEqual(rates["Front"] / rates["Left"], 2.0, delta=0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
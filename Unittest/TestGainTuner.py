@@ -0,0 +1,96 @@
+import unittest
+import csv
+import json
+import os
+import sys
+import tempfile
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'source')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'source', 'sim')))
+import Hardware
+from Simulation import Simulation
+from Track import Track
+from GainTuner import GainTuner, evaluate
+from data.ControllerGains import ControllerGains
+
+
+class TestControllerGains(unittest.TestCase):
+
+    def test_defaults_are_the_former_constants(self):
+        gains = ControllerGains()
+        self.assertEqual(gains.toDict(), {
+            "kp": 10, "minFront": 20, "maxFront": 100, "minSpeed": 40, "maxSpeed": 41, "turnSlowdown": 0.5
+        })
+        self.assertEqual(ControllerGains.fromDict({"kp": 10}), gains)
+
+    def test_invalid_gains(self):
+        for values in ({"minFront": 100, "maxFront": 100}, {"minSpeed": 50, "maxSpeed": 45}, {"turnSlowdown": 1.5}):
+            with self.assertRaises(ValueError):
+                ControllerGains(**values)
+
+
+class TestGainTuner(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        Hardware.useBackend(None)
+        self.directory.cleanup()
+
+    def test_combinations_skip_invalid_gains(self):
+        tuner = GainTuner({"kp": [8, 10], "minSpeed": [40, 60], "maxSpeed": [41, 70]})
+        combinations = tuner.combinations()
+        self.assertEqual(len(combinations), 6)
+        self.assertTrue(all(gains.maxSpeed >= gains.minSpeed for gains in combinations))
+        with self.assertRaises(ValueError):
+            GainTuner({"ki": [1]})
+
+    def test_score_penalises_missing_laps_and_collisions(self):
+        tuner = GainTuner({}, laps=2, seconds=30)
+        clean = {"lapTime": 12.0, "laps": 2, "clearance": 30.0, "oscillation": 20.0, "collisions": 0}
+        self.assertEqual(tuner.score(clean), 13.0)
+        self.assertGreater(tuner.score(dict(clean, laps=1)), tuner.score(clean))
+        self.assertGreater(tuner.score(dict(clean, collisions=1)), tuner.score(clean))
+        self.assertGreater(tuner.score(dict(clean, clearance=5.0)), tuner.score(clean))
+        self.assertEqual(tuner.score(dict(clean, lapTime=None, laps=0)), 30 + 2 * 60 + 1.0)
+
+    def test_evaluate_drives_the_default_gains(self):
+        metrics = evaluate(ControllerGains().toDict(), [Track.stadium()], 1, 40)
+        self.assertEqual(metrics["laps"], 1)
+        self.assertEqual(metrics["collisions"], 0)
+        self.assertGreater(metrics["clearance"], 0)
+        self.assertGreater(metrics["oscillation"], 0)
+        # the same gains give the same lap as a plain drive of the car
+        sim = Simulation.virtual().install()
+        from LamboCar import LamboCar
+        lambo = LamboCar(Hardware.busio.I2C(Hardware.board.SCL, Hardware.board.SDA), clock=sim.clock)
+        sim.drive(lambo, 40, maxTours=1)
+        self.assertAlmostEqual(metrics["lapTime"], lambo.lapCounter.lapTimes[0] / 1e9, places=3)
+
+    def test_run_ranks_and_saves(self):
+        tuner = GainTuner({"kp": [10], "minSpeed": [40, 60], "maxSpeed": [70]}, laps=1, seconds=40, workers=2)
+        results = tuner.run()
+        self.assertEqual([result["rank"] for result in results], [1, 2])
+        self.assertLessEqual(results[0]["score"], results[1]["score"])
+        # the faster minimum speed laps sooner
+        self.assertEqual(results[0]["minSpeed"], 60)
+        path = os.path.join(self.directory.name, "gains.csv")
+        tuner.save(path)
+        with open(path, newline="") as file:
+            rows = list(csv.DictReader(file))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(float(rows[0]["score"]), results[0]["score"])
+        self.assertEqual(rows[1]["minSpeed"], "40")
+
+    def test_load_track(self):
+        stadium = Track.stadium()
+        path = os.path.join(self.directory.name, "track.json")
+        with open(path, "w") as file:
+            json.dump({"centerline": [list(point) for point in stadium.centerline], "width": stadium.width}, file)
+        track = Track.load(path)
+        self.assertEqual(track.width, stadium.width)
+        self.assertAlmostEqual(track.length, stadium.length)
+
+
+if __name__ == '__main__':
+    unittest.main()
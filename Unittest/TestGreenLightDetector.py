@@ -0,0 +1,82 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'source')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'source', 'sim')))
+import Hardware
+from Simulation import Simulation
+from SensorManager import SensorManager
+from GreenLightDetector import GreenLightDetector
+
+
+class TestGreenLightDetector(unittest.TestCase):
+
+    def setUp(self):
+        self.simulation = Simulation.virtual().install()
+        self.bus = Hardware.busio.I2C(Hardware.board.SCL, Hardware.board.SDA)
+        self.sensorManager = SensorManager(self.bus)
+        self.detector = GreenLightDetector(self.sensorManager, clock=self.simulation.clock)
+        self.world = self.simulation.world
+        self.world.setLight("red")
+
+    def tearDown(self):
+        Hardware.useBackend(None)
+
+    def test_sensor_set_to_fastest_mode(self):
+        self.world.setLight("green", 0.1)
+        self.detector.waitForGreen(1.0)
+        rgbSensor = self.sensorManager.rgbSensor
+        self.assertEqual(rgbSensor.integrationTime, 2.4)
+        self.assertEqual(rgbSensor.gain, 60)
+
+    def test_green_detected_within_two_frames(self):
+        """
+        With the 2.4 ms integration, the green light is confirmed less than 5 ms after it is switched on.
+        """
+        self.world.setLight("green", 1.0)
+        greenNs = self.detector.waitForGreen(5.0)
+        self.assertIsNotNone(greenNs)
+        self.assertGreaterEqual(greenNs, 1_000_000_000)
+        self.assertLess(greenNs, 1_002_500_000)
+        self.assertLess(self.simulation.clock.nowNs(), 1_005_000_000)
+        self.assertGreater(self.detector.frames, 400)
+
+    def test_flicker_is_ignored(self):
+        """
+        A single green frame does not start the car.
+        """
+        self.world.setLight("green", 0.5)
+        self.world.setLight("red", 0.5024)
+        self.world.setLight("green", 1.0)
+        greenNs = self.detector.waitForGreen(5.0)
+        self.assertGreaterEqual(greenNs, 1_000_000_000)
+        self.assertEqual(self.detector.flickers, 1)
+
+    def test_timeout(self):
+        self.assertIsNone(self.detector.waitForGreen(0.1))
+
+    def test_reaction_time(self):
+        from LamboCar import LamboCar
+        lambo = LamboCar(self.bus, clock=self.simulation.clock, sensorManager=self.sensorManager)
+        detector = lambo.greenLightDetector
+        self.world.setLight("green", 0.2)
+        lambo.motorManager.arm()
+        greenNs = detector.waitForGreen(1.0)
+        transactions = self.bus.stats()["transactions"]
+        lambo.motorManager.setSpeed(40)
+        self.assertEqual(self.bus.stats()["transactions"] - transactions, 1)
+
+        self.simulation.clock.advance(0.0001)
+        reaction = detector.recordReaction(greenNs)
+        self.assertEqual(reaction, round((self.simulation.clock.nowNs() - greenNs) / 1000, 1))
+        self.assertEqual(detector.reactionTimes.count, 1)
+        self.assertEqual(detector.lastReactionUs, reaction)
+        lambo.stopCar()
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            GreenLightDetector(self.sensorManager, confirmFrames=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,200 @@
+import unittest
+from unittest.mock import MagicMock
+import threading
+import time
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'source')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'source', 'sim')))
+import Hardware
+from Simulation import Simulation
+from I2CArbiter import I2CArbiter
+
+
+class TestI2CArbiter(unittest.TestCase):
+
+    def setUp(self):
+        self.bus = MagicMock()
+        self.arbiter = I2CArbiter(self.bus)
+        self.actuator = self.arbiter.client("PCA9685", I2CArbiter.ACTUATOR)
+        self.colour = self.arbiter.client("TCS34725", I2CArbiter.COLOUR)
+        self.power = self.arbiter.client("INA219", I2CArbiter.POWER)
+
+    def waitFor(self, condition, timeout=2.0):
+        deadline = time.time() + timeout
+        while not condition() and time.time() < deadline:
+            time.sleep(0.001)
+        self.assertTrue(condition())
+
+    def test_clients_are_counted_per_device(self):
+        self.assertIs(self.arbiter.client("PCA9685", I2CArbiter.ACTUATOR), self.actuator)
+        self.assertIs(I2CArbiter.clientOf(self.bus, "PCA9685", 0), self.bus)
+        self.assertTrue(self.colour.try_lock())
+        self.colour.writeto_then_readfrom(0x29, bytes([0xB4]), bytearray(8))
+        self.colour.unlock()
+        self.power.readfrom_into(0x40, bytearray(2))
+        stats = self.arbiter.stats()
+        self.assertEqual(stats["TCS34725"]["transactions"], 1)
+        self.assertEqual(stats["TCS34725"]["bytes"], 9)
+        self.assertEqual(stats["INA219"]["bytes"], 2)
+        self.assertEqual(stats["TCS34725"]["waits"]["count"], 1)
+        self.bus.writeto_then_readfrom.assert_called_once()
+        self.assertEqual(self.colour.scan, self.bus.scan)
+
+    def test_waiting_clients_get_the_bus_by_priority(self):
+        order = []
+
+        def use(client):
+            client.try_lock()
+            order.append(client.name)
+            client.unlock()
+
+        self.power.try_lock()
+        threads = []
+        for client in (self.power, self.colour, self.actuator):
+            thread = threading.Thread(target=use, args=(client,))
+            thread.start()
+            threads.append(thread)
+            self.waitFor(lambda: self.arbiter.waiting == len(threads))
+        self.power.unlock()
+        for thread in threads:
+            thread.join(2)
+        self.assertEqual(order, ["PCA9685", "TCS34725", "INA219"])
+        waits = self.arbiter.stats()["INA219"]["waits"]
+        # the first lock took the free bus, the second one waited
+        self.assertEqual(waits["count"], 2)
+        self.assertEqual(waits["p50"], 0)
+        self.assertGreater(waits["max"], 0)
+
+    def test_lock_is_reentrant_for_the_owner(self):
+        self.colour.try_lock()
+        self.assertTrue(self.power.try_lock())
+        self.power.unlock()
+        self.colour.unlock()
+        thread = threading.Thread(target=lambda: (self.actuator.try_lock(), self.actuator.unlock()))
+        thread.start()
+        thread.join(2)
+        self.assertFalse(thread.is_alive())
+
+    def test_release_by_another_thread(self):
+        with self.assertRaises(RuntimeError):
+            self.colour.unlock()
+
+    def test_posted_writes_are_batched_and_coalesced(self):
+        writes = []
+        self.assertTrue(self.actuator.post("speed", lambda: writes.append("speed 10")))
+
+        self.colour.try_lock()
+        results = []
+
+        def post():
+            results.append(self.actuator.post("speed", lambda: writes.append("speed 20")))
+            results.append(self.actuator.post("steering", lambda: writes.append("steering 50")))
+            results.append(self.actuator.post("speed", lambda: writes.append("speed 30")))
+
+        thread = threading.Thread(target=post)
+        thread.start()
+        thread.join(2)
+        self.assertEqual(results, [False, False, False])
+        self.assertEqual(writes, ["speed 10"])
+        self.colour.unlock()
+
+        self.assertEqual(writes, ["speed 10", "speed 30", "steering 50"])
+        stats = self.arbiter.stats()["PCA9685"]
+        self.assertEqual((stats["posted"], stats["coalesced"]), (3, 1))
+
+    def test_posted_writes_go_before_waiting_clients(self):
+        order = []
+        self.colour.try_lock()
+        waiter = threading.Thread(target=lambda: (self.power.try_lock(), order.append("power"), self.power.unlock()))
+        waiter.start()
+        self.waitFor(lambda: self.arbiter.waiting == 1)
+        poster = threading.Thread(target=self.actuator.post, args=("speed", lambda: order.append("speed")))
+        poster.start()
+        poster.join(2)
+        self.colour.unlock()
+        waiter.join(2)
+        self.assertEqual(order, ["speed", "power"])
+
+    def test_contention_keeps_the_bus_exclusive(self):
+        """
+        Locks and posted writes of three threads racing for the bus, with short thread switches.
+        """
+        inside = []
+        overlaps = []
+        writes = []
+
+        def transaction(label):
+            inside.append(label)
+            time.sleep(0)
+            if len(inside) > 1:
+                overlaps.append(list(inside))
+            inside.remove(label)
+
+        def work(client, index):
+            for i in range(2000):
+                if i % 2:
+                    client.try_lock()
+                    transaction(client.name)
+                    client.unlock()
+                else:
+                    client.post((index, i), lambda i=i: (transaction("post"), writes.append((index, i))))
+
+        threads = [
+            threading.Thread(target=work, args=(client, index))
+            for index, client in enumerate((self.actuator, self.colour, self.power))
+        ]
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-5)
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(10)
+        finally:
+            sys.setswitchinterval(interval)
+        self.assertEqual(overlaps, [])
+        # no posted write is left in the queue
+        self.assertEqual(len(writes), 3 * 1000)
+        self.assertEqual(self.arbiter.waiting, 0)
+        self.assertTrue(self.colour.try_lock())
+        self.colour.unlock()
+        # every lock and every write sent without being queued took the bus once
+        stats = self.arbiter.stats().values()
+        posted = sum(client["posted"] for client in stats)
+        self.assertEqual(sum(client["waits"]["count"] for client in stats), 3 * 2000 - posted + 1)
+
+
+class TestI2CArbiterSimulation(unittest.TestCase):
+
+    def setUp(self):
+        self.simulation = Simulation.virtual().install()
+        self.bus = Hardware.busio.I2C(Hardware.board.SCL, Hardware.board.SDA)
+
+    def tearDown(self):
+        Hardware.useBackend(None)
+
+    def test_lambocar_shares_the_bus(self):
+        from LamboCar import LamboCar
+        lambo = LamboCar(self.bus)
+        arbiter = lambo.busArbiter
+        self.assertIs(arbiter.bus, self.bus)
+        lambo.motorManager.setSpeed(50)
+        lambo.sensorManager.readColourFrame()
+        lambo.sensorManager.getCurrent()
+        stats = arbiter.stats()
+        self.assertEqual(set(stats), {"PCA9685", "TCS34725", "INA219"})
+        self.assertEqual(stats["PCA9685"]["priority"], I2CArbiter.ACTUATOR)
+        # command byte and the 8 data bytes of the burst read
+        self.assertEqual(stats["TCS34725"]["bytes"], 9)
+        # bus voltage, shunt voltage and current
+        self.assertEqual(stats["INA219"]["transactions"], 3)
+        self.assertEqual(
+            sum(client["transactions"] for client in stats.values()),
+            self.bus.stats()["transactions"]
+        )
+        lambo.stopCar()
+
+
+if __name__ == '__main__':
+    unittest.main()
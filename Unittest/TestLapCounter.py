@@ -0,0 +1,95 @@
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'source')))
+from LapCounter import LapCounter
+from FakeGPIO import FakeGPIO
+from VirtualClock import VirtualClock
+
+
+class TestLapCounter(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = VirtualClock()
+        self.gpio = FakeGPIO(clock=self.clock, threadedEcho=False)
+        self.gpio.setup(20, self.gpio.IN)
+        self.gpio.setInput(20, self.gpio.HIGH)
+        self.laps = []
+        self.counter = LapCounter(
+            MagicMock(pinGPIO=20),
+            listener=lambda crossings, timestampNs: self.laps.append((crossings, timestampNs)),
+            gpio=self.gpio,
+            clock=self.clock
+        )
+
+    def tearDown(self):
+        self.counter.close()
+
+    def cross(self, seconds, duration=0.01):
+        """
+        Drives the car over the line at a time in seconds: the pin is LOW while the sensor sees the line.
+        """
+        self.clock.advanceTo(int(seconds * 1e9))
+        self.gpio.setInput(20, self.gpio.LOW)
+        self.clock.advance(duration)
+        self.gpio.setInput(20, self.gpio.HIGH)
+
+    def test_crossing_is_timestamped_on_the_edge(self):
+        self.assertTrue(self.counter.interrupts)
+        self.cross(2.5)
+        self.assertEqual(self.counter.crossings, 1)
+        self.assertEqual(self.counter.crossingTimes, [2_500_000_000])
+        self.assertEqual(self.laps, [(1, 2_500_000_000)])
+
+    def test_lap_times_and_splits(self):
+        for seconds in [1.0, 9.25, 17.125]:
+            self.cross(seconds)
+        self.assertEqual(self.counter.laps, 2)
+        self.assertEqual(self.counter.lapTimes, [8_250_000_000, 7_875_000_000])
+        self.assertEqual(self.counter.splits, [8_250_000_000, 16_125_000_000])
+        self.assertEqual(self.counter.lastLapTime, 7_875_000_000)
+
+    def test_short_crossing_between_two_ticks(self):
+        """
+        A crossing of 1 ms is counted even if no control tick reads the sensor meanwhile.
+        """
+        self.cross(1.0, duration=0.001)
+        self.assertEqual(self.counter.crossings, 1)
+
+    def test_bounces_are_ignored(self):
+        self.clock.advanceTo(1_000_000_000)
+        for _ in range(3):
+            self.gpio.setInput(20, self.gpio.LOW)
+            self.clock.advance(0.002)
+            self.gpio.setInput(20, self.gpio.HIGH)
+            self.clock.advance(0.002)
+        self.assertEqual(self.counter.crossings, 1)
+        self.assertEqual(self.counter.bounces, 2)
+
+    def test_crossing_too_soon_is_ignored(self):
+        self.cross(1.0)
+        self.cross(1.5)
+        self.assertEqual(self.counter.crossings, 1)
+        self.cross(3.0)
+        self.assertEqual(self.counter.crossings, 2)
+
+    def test_polling_without_edge_detection(self):
+        counter = LapCounter(None, clock=self.clock)
+        self.assertFalse(counter.interrupts)
+        for seconds, onLine in [(0.1, False), (0.2, True), (0.3, True), (0.4, False), (5.0, True)]:
+            counter.update(onLine, int(seconds * 1e9))
+        self.assertEqual(counter.crossingTimes, [200_000_000, 5_000_000_000])
+
+    def test_polling_fallback_when_edge_detection_fails(self):
+        counter = LapCounter(MagicMock(pinGPIO=20), gpio=self.gpio, clock=self.clock)
+        self.assertFalse(counter.interrupts)
+        self.assertTrue(counter.update(True, 1))
+
+    def test_update_ignored_with_interrupts(self):
+        self.assertFalse(self.counter.update(True, 1))
+        self.assertEqual(self.counter.crossings, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'source')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'source', 'sim')))
+import Hardware
+from Maneuver import Maneuver
+from ManeuverRegistry import ManeuverRegistry
+from ManeuverRunner import ManeuverRunner
+from ReplayMotorManager import ReplayMotorManager
+from VirtualClock import VirtualClock
+from data.Keyframe import Keyframe
+
+
+class TestManeuver(unittest.TestCase):
+
+    def test_keyframes_are_sorted(self):
+        maneuver = Maneuver("test", [(2, 0, 0), (0, 50, None), Keyframe(1, None, 30)])
+        self.assertEqual([frame.at for frame in maneuver.keyframes], [0, 1, 2])
+        self.assertEqual(maneuver.duration, 2)
+
+    def test_from_steps(self):
+        maneuver = Maneuver.fromSteps("test", [(1, 25, None), (0.5, 50, 10, "faster"), (0, 0, 0)])
+        self.assertEqual([frame.at for frame in maneuver.keyframes], [0, 1, 1.5])
+        self.assertEqual(maneuver.keyframes[1].label, "faster")
+        self.assertEqual(maneuver.duration, 1.5)
+
+    def test_invalid_maneuvers(self):
+        with self.assertRaises(ValueError):
+            Maneuver("empty", [])
+        with self.assertRaises(ValueError):
+            Maneuver("short", [(0, 10, 0), (2, 0, 0)], duration=1)
+        with self.assertRaises(ValueError):
+            Keyframe(-1, 10, 0)
+
+
+class TestManeuverRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = VirtualClock()
+        self.motors = ReplayMotorManager()
+        self.front = 100
+        self.sensorManager = MagicMock()
+        self.sensorManager.getDistance.side_effect = lambda: MagicMock(front=self.front)
+        self.runner = ManeuverRunner(self.motors, self.sensorManager, self.clock)
+
+    def test_keyframes_applied_on_time(self):
+        commands = []
+        maneuver = Maneuver.fromSteps("test", [(1, 30, -50), (1, 60, None), (0, 0, 0)])
+        state = self.runner.run(maneuver, 50, onTick=lambda: commands.append(
+            (self.clock.nowNs(), self.motors.speed, self.motors.angle)))
+        self.assertEqual(state, "completed")
+        self.assertEqual((self.motors.speed, self.motors.angle), (0, 0))
+        firstFast = next(timeNs for timeNs, speed, angle in commands if speed == 60)
+        self.assertEqual(firstFast, 1_000_000_000)
+        self.assertTrue(all(angle == -50 for timeNs, speed, angle in commands if speed == 60))
+        self.assertGreaterEqual(self.clock.nowNs(), 2_000_000_000)
+        self.assertLess(self.clock.nowNs(), 2_100_000_000)
+
+    def test_obstacle_preempts_maneuver(self):
+        def obstacle():
+            if self.clock.nowNs() >= 500_000_000:
+                self.front = 10
+        maneuver = ManeuverRegistry.create("circle", direction="right", duration=10)
+        state = self.runner.run(maneuver, 50, onTick=obstacle)
+        self.assertEqual(state, "preempted")
+        self.assertEqual((self.motors.speed, self.motors.angle), (0, 0))
+        self.assertLess(self.clock.nowNs(), 600_000_000)
+
+    def test_obstacle_does_not_preempt_reversing(self):
+        self.front = 5
+        maneuver = Maneuver.fromSteps("back", [(1, -30, 0), (0, 0, 0)])
+        self.assertEqual(self.runner.run(maneuver, 50), "completed")
+
+    def test_zigzag_keeps_driving_past_a_close_obstacle(self):
+        self.front = 10
+        self.motors.setSpeed(30)
+        state = self.runner.run(ManeuverRegistry.create("zigzag"), 50)
+        self.assertEqual(state, "completed")
+        self.assertEqual((self.motors.speed, self.motors.angle), (30, 0))
+
+    def test_stop_command(self):
+        def stop():
+            if self.runner.elapsed >= 0.3:
+                self.runner.stop()
+        state = self.runner.run(ManeuverRegistry.create("uTurn"), 50, onTick=stop)
+        self.assertEqual(state, "stopped")
+        self.assertEqual(self.motors.speed, 0)
+        self.assertLess(self.clock.nowNs(), 400_000_000)
+
+    def test_tick_without_maneuver(self):
+        self.assertFalse(self.runner.tick())
+        self.assertIsNone(self.runner.state)
+
+
+class TestManeuverRegistry(unittest.TestCase):
+
+    def tearDown(self):
+        ManeuverRegistry.unregister("slalom")
+
+    def test_builtins(self):
+        for name in ["startCar", "reverseGear", "uTurn", "circle", "eightTurn", "zigzag"]:
+            self.assertIn(name, ManeuverRegistry.names())
+        self.assertEqual(ManeuverRegistry.create("eightTurn", turns=2).duration, 28)
+        with self.assertRaises(ValueError):
+            ManeuverRegistry.create("circle", direction="up")
+
+    def test_register_custom_maneuver(self):
+        ManeuverRegistry.register("slalom", lambda gates=3: Maneuver.fromSteps(
+            "slalom", [(0.5, 30, 60 * (-1) ** gate) for gate in range(gates)] + [(0, 0, 0)]))
+        self.assertEqual(ManeuverRegistry.create("slalom", gates=4).duration, 2)
+        with self.assertRaises(KeyError):
+            ManeuverRegistry.create("unknown")
+
+    def test_lambocar_runs_registered_maneuver(self):
+        from Simulation import Simulation
+        from LamboCar import LamboCar
+        simulation = Simulation.virtual().install()
+        try:
+            bus = Hardware.busio.I2C(Hardware.board.SCL, Hardware.board.SDA)
+            lambo = LamboCar(bus)
+            ManeuverRegistry.register("slalom", Maneuver.fromSteps("slalom", [(0.5, 30, 60), (0.5, 30, -60), (0, 0, 0)]))
+            self.assertEqual(lambo.runManeuver("slalom"), "completed")
+            self.assertFalse(lambo.sensorManager.sampling)
+            self.assertGreaterEqual(simulation.clock.nowNs(), 1_000_000_000)
+            self.assertGreater(simulation.world.distance, 0)
+        finally:
+            Hardware.useBackend(None)
+
+
+if __name__ == '__main__':
+    unittest.main()
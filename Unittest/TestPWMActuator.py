@@ -0,0 +1,71 @@
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'source')))
+from PWMActuator import PWMActuator
+
+
+class TestPWMActuator(unittest.TestCase):
+
+    def setUp(self):
+        self.driver = MagicMock()
+        self.device = self.driver.i2c_device
+        self.actuator = PWMActuator(self.driver)
+
+    def writes(self):
+        return [bytes(call.args[0]) for call in self.device.write.call_args_list]
+
+    def test_toRegisters(self):
+        self.assertEqual(PWMActuator.toRegisters(0xFFFF), (0x1000, 0))
+        self.assertEqual(PWMActuator.toRegisters(0x7FFF), (0, 0x800))
+        with self.assertRaises(ValueError):
+            PWMActuator.toRegisters(0x10000)
+
+    def test_single_channel_write(self):
+        self.actuator.setDutyCycle(0, 0x7FFF)
+        self.assertEqual(self.writes(), [bytes([0x06, 0x00, 0x00, 0x00, 0x08])])
+
+    def test_unchanged_value_is_skipped(self):
+        self.actuator.setDutyCycle(0, 60000)
+        self.actuator.setDutyCycle(0, 60000)
+        self.actuator.setDutyCycle(0, 60001)  # same 12-bit register value
+
+        self.assertEqual(len(self.writes()), 1)
+        self.assertEqual(self.actuator.stats()["skippedWrites"], 2)
+
+    def test_consecutive_channels_in_one_block(self):
+        """
+        Channels 4 and 5 (the two DC motors) are written in one auto-increment transaction.
+        """
+        self.actuator.setDutyCycles({5: 0x7FFF, 4: 0x7FFF})
+
+        self.assertEqual(self.writes(), [bytes([0x16, 0, 0, 0x00, 0x08, 0, 0, 0x00, 0x08])])
+        stats = self.actuator.stats()
+        self.assertEqual(stats["transactions"], 1)
+        self.assertEqual(stats["coalescedWrites"], 1)
+
+    def test_non_consecutive_channels(self):
+        self.actuator.setDutyCycles({0: 1000, 4: 2000, 5: 2000})
+
+        writes = self.writes()
+        self.assertEqual(len(writes), 2)
+        self.assertEqual(writes[0][0], 0x06)
+        self.assertEqual(writes[1][0], 0x16)
+
+    def test_only_changed_channels_are_written(self):
+        self.actuator.setDutyCycles({4: 2000, 5: 2000})
+        self.actuator.setDutyCycles({4: 2000, 5: 3000})
+
+        self.assertEqual(self.writes()[-1][0], 0x1A)
+        self.assertEqual(self.actuator.stats()["savedTransactions"], 2)
+
+    def test_invalidate(self):
+        self.actuator.setDutyCycle(0, 1000)
+        self.actuator.invalidate()
+        self.actuator.setDutyCycle(0, 1000)
+        self.assertEqual(len(self.writes()), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
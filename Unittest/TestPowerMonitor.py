@@ -0,0 +1,121 @@
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'source')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'source', 'sim')))
+import Hardware
+from Simulation import Simulation
+from VirtualClock import VirtualClock
+from PowerMonitor import PowerMonitor
+from INASensor import INASensor
+from SensorManager import SensorManager
+
+# linear curve of the simulated battery: 6.4 V empty, 8.4 V full for 2 cells
+LINEAR_CURVE = [(3.2, 0.0), (4.2, 1.0)]
+
+
+class TestPowerMonitor(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = VirtualClock()
+        self.ina = MagicMock()
+        self.ina.readPower.return_value = (8.0, 1000.0)
+        self.monitor = PowerMonitor(self.ina, capacityMah=2000, internalResistance=0.0,
+                                    voltageCurve=LINEAR_CURVE, clock=self.clock)
+
+    def test_configures_averaging_once(self):
+        self.monitor.sampleOnce()
+        self.monitor.sampleOnce()
+        self.ina.configure.assert_called_once_with(32)
+
+    def test_configuration_error_is_retried(self):
+        self.ina.configure.side_effect = [OSError("I2C error"), None]
+        self.assertIsNone(self.monitor.sampleOnce())
+        self.assertEqual(self.monitor.errors, 1)
+        self.assertIsNotNone(self.monitor.sampleOnce())
+        self.assertEqual(self.ina.configure.call_count, 2)
+        self.monitor.sampleOnce()
+        self.assertEqual(self.ina.configure.call_count, 2)
+
+    def test_integrates_charge_and_energy(self):
+        self.monitor.sampleOnce()
+        self.clock.advance(1800)
+        self.ina.readPower.return_value = (8.0, 3000.0)
+        snapshot = self.monitor.sampleOnce()
+        # trapezoid: (1000 + 3000) / 2 mA during half an hour
+        self.assertAlmostEqual(snapshot.chargeMah, 1000.0)
+        self.assertAlmostEqual(snapshot.energyWh, 8.0)
+        self.assertAlmostEqual(snapshot.power, 24.0)
+        self.assertEqual(snapshot.samples, 2)
+        self.assertIs(self.monitor.snapshot, snapshot)
+
+    def test_state_of_charge_from_voltage_then_coulomb_counting(self):
+        snapshot = self.monitor.sampleOnce()
+        self.assertAlmostEqual(snapshot.stateOfCharge, 0.8)
+        self.clock.advance(360)
+        snapshot = self.monitor.sampleOnce()
+        # 100 mAh of 2000 mAh used
+        self.assertAlmostEqual(snapshot.stateOfCharge, 0.75)
+        self.clock.advance(36000)
+        self.assertEqual(self.monitor.sampleOnce().stateOfCharge, 0.0)
+
+    def test_rest_voltage_includes_internal_resistance(self):
+        monitor = PowerMonitor(self.ina, internalResistance=0.2, voltageCurve=LINEAR_CURVE, clock=self.clock)
+        self.assertAlmostEqual(monitor.stateOfChargeFromVoltage(7.8, 1000.0), 0.8)
+        self.assertEqual(monitor.stateOfChargeFromVoltage(5.0), 0.0)
+        self.assertEqual(monitor.stateOfChargeFromVoltage(9.0), 1.0)
+
+    def test_read_error_keeps_last_snapshot(self):
+        first = self.monitor.sampleOnce()
+        self.ina.readPower.side_effect = OSError("I2C error")
+        self.assertIsNone(self.monitor.sampleOnce())
+        self.assertIs(self.monitor.snapshot, first)
+        self.assertEqual(self.monitor.errors, 1)
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            PowerMonitor(self.ina, rateHz=0)
+        with self.assertRaises(ValueError):
+            PowerMonitor(self.ina, capacityMah=0)
+
+
+class TestPowerMonitorSimulation(unittest.TestCase):
+
+    def setUp(self):
+        self.sim = Simulation.virtual()
+        self.sim.install()
+        self.bus = Hardware.busio.I2C(Hardware.board.SCL, Hardware.board.SDA)
+
+    def tearDown(self):
+        Hardware.useBackend(None)
+
+    def test_estimates_charge_of_simulated_battery(self):
+        ina = INASensor(self.bus)
+        ina.configure(64)
+        with self.assertRaises(ValueError):
+            ina.configure(3)
+        monitor = PowerMonitor(ina, voltageCurve=LINEAR_CURVE, clock=self.sim.clock)
+        snapshot = monitor.sampleOnce()
+        self.assertAlmostEqual(snapshot.stateOfCharge, 1.0, places=3)
+        self.assertGreater(snapshot.current, 0)
+
+    def test_sensor_manager_reads_snapshot_without_bus(self):
+        sensorManager = SensorManager(self.bus, clock=self.sim.clock)
+        monitor = sensorManager.startPowerMonitor(rateHz=0.001)
+        try:
+            self.assertIs(sensorManager.powerMonitor, monitor)
+            transactions = self.bus.stats()["transactions"]
+            current = sensorManager.getCurrent()
+            self.assertEqual(current, monitor.snapshot.current)
+            self.assertEqual(sensorManager.lastCurrent, current)
+            self.assertIs(sensorManager.getPower(), monitor.snapshot)
+            self.assertEqual(self.bus.stats()["transactions"], transactions)
+        finally:
+            snapshot = sensorManager.stopPowerMonitor()
+        self.assertIsNotNone(snapshot)
+        self.assertIsNone(sensorManager.getPower())
+
+
+if __name__ == '__main__':
+    unittest.main()
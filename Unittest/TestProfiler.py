@@ -0,0 +1,152 @@
+import unittest
+import json
+import os
+import signal
+import sys
+import tempfile
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'source')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'source', 'sim')))
+import Hardware
+from Simulation import Simulation
+from VirtualClock import VirtualClock
+from HdrHistogram import HdrHistogram
+from Profiler import Profiler
+
+
+class Target:
+    def __init__(self, clock):
+        self.clock = clock
+
+    def work(self, seconds):
+        self.clock.advance(seconds)
+        return seconds
+
+    def fail(self):
+        raise OSError("bus error")
+
+
+class TestHdrHistogram(unittest.TestCase):
+
+    def test_percentiles_within_precision(self):
+        histogram = HdrHistogram()
+        for value in range(1, 10001):
+            histogram.record(value * 1000)
+        self.assertEqual(histogram.count, 10000)
+        self.assertEqual(histogram.min, 1000)
+        self.assertEqual(histogram.max, 10_000_000)
+        for percent in (50, 90, 99):
+            expected = percent * 100_000
+            self.assertAlmostEqual(histogram.percentile(percent), expected, delta=expected * 0.04)
+        self.assertEqual(histogram.summary()["max"], 10000.0)
+
+    def test_record_count(self):
+        histogram = HdrHistogram()
+        histogram.record(0, 99)
+        histogram.record(2000)
+        self.assertEqual(histogram.count, 100)
+        self.assertEqual(histogram.percentile(50), 0)
+        self.assertEqual(histogram.percentile(100), 2000)
+        self.assertEqual(histogram.mean, 20)
+
+    def test_overflow_and_reset(self):
+        histogram = HdrHistogram(precisionBits=3, maxBits=10)
+        histogram.record(5000)
+        self.assertEqual(histogram.percentile(100), 5000)
+        histogram.reset()
+        self.assertIsNone(histogram.percentile(50))
+        with self.assertRaises(ValueError):
+            HdrHistogram(precisionBits=8, maxBits=8)
+
+
+class TestProfiler(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = VirtualClock()
+        self.directory = tempfile.TemporaryDirectory()
+        self.profiler = Profiler(
+            [(Target, "work"), (Target, "fail")],
+            self.clock,
+            os.path.join(self.directory.name, "profile.json")
+        )
+        self.original = Target.__dict__["work"]
+
+    def tearDown(self):
+        self.profiler.disable()
+        self.directory.cleanup()
+
+    def test_disabled_profiler_leaves_methods_untouched(self):
+        self.assertFalse(self.profiler.enabled)
+        self.assertIs(Target.__dict__["work"], self.original)
+        Target(self.clock).work(0.001)
+        self.assertEqual(self.profiler.stats(), {})
+
+    def test_enabled_profiler_counts_calls_and_errors(self):
+        self.profiler.enable()
+        target = Target(self.clock)
+        self.assertEqual(target.work(0.002), 0.002)
+        target.work(0.004)
+        with self.assertRaises(OSError):
+            target.fail()
+        stats = self.profiler.stats()
+        self.assertEqual(stats["Target.work"]["calls"], 2)
+        self.assertEqual(stats["Target.work"]["errors"], 0)
+        self.assertEqual(stats["Target.work"]["latency"]["max"], 4000.0)
+        self.assertEqual(stats["Target.fail"]["errors"], 1)
+
+        self.profiler.disable()
+        self.assertIs(Target.__dict__["work"], self.original)
+        target.work(0.001)
+        self.assertEqual(self.profiler.stats()["Target.work"]["calls"], 2)
+
+    def test_signals_toggle_and_dump(self):
+        self.profiler.installSignalHandlers()
+        try:
+            os.kill(os.getpid(), signal.SIGUSR2)
+            self.assertTrue(self.profiler.enabled)
+            Target(self.clock).work(0.001)
+            os.kill(os.getpid(), signal.SIGUSR1)
+            with open(self.profiler.dumpPath) as file:
+                dump = json.load(file)
+            self.assertTrue(dump["enabled"])
+            self.assertEqual(dump["methods"]["Target.work"]["calls"], 1)
+        finally:
+            signal.signal(signal.SIGUSR1, signal.SIG_DFL)
+            signal.signal(signal.SIGUSR2, signal.SIG_DFL)
+
+    def test_default_targets_cover_sensors_and_control(self):
+        names = {Profiler.nameOf(cls, name) for cls, name in Profiler.defaultTargets()}
+        for name in (
+            "DistanceSensor.readValue", "LineSensor.readValue", "RGBSensor.readValue", "INASensor.readValue",
+            "MotorManager.setSpeed", "MotorManager.setAngle", "SensorManager.getDistance", "LamboCar.stayMid"
+        ):
+            self.assertIn(name, names)
+        self.assertNotIn("I2CSensor.readValue", names)
+
+
+class TestProfilerSimulation(unittest.TestCase):
+
+    def setUp(self):
+        self.sim = Simulation.virtual()
+        self.sim.install()
+
+    def tearDown(self):
+        Hardware.useBackend(None)
+
+    def test_profiles_car_in_simulation(self):
+        from LamboCar import LamboCar
+        bus = Hardware.busio.I2C(Hardware.board.SCL, Hardware.board.SDA)
+        lambo = LamboCar(bus, clock=self.sim.clock)
+        profiler = Profiler(clock=self.sim.clock, dumpPath=os.devnull)
+        profiler.enable()
+        try:
+            self.sim.drive(lambo, 0.5)
+        finally:
+            profiler.disable()
+        stats = profiler.stats()
+        self.assertGreater(stats["LamboCar.stayMid"]["calls"], 0)
+        self.assertGreater(stats["MotorManager.setSpeed"]["calls"], 0)
+        self.assertGreater(stats["DistanceSensor.readValue"]["calls"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
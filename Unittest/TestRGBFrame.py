@@ -0,0 +1,110 @@
+import unittest
+import struct
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'source')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'source', 'sim')))
+import Hardware
+from Simulation import Simulation
+from RGBSensor import RGBSensor
+from I2CArbiter import I2CArbiter
+from SensorManager import SensorManager
+from data.RGBFrame import RGBFrame
+
+
+class FakeI2CDevice:
+    """
+    I2C device of the adafruit driver, answers the burst read with fixed channel values.
+    """
+    def __init__(self, clear, red, green, blue):
+        self.data = struct.pack("<4H", clear, red, green, blue)
+        self.commands = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def write_then_readinto(self, bufferOut, bufferIn):
+        self.commands.append(bytes(bufferOut))
+        bufferIn[:] = self.data
+
+
+class TestRGBFrame(unittest.TestCase):
+
+    def setUp(self):
+        self.simulation = Simulation.virtual().install()
+        self.bus = Hardware.busio.I2C(Hardware.board.SCL, Hardware.board.SDA)
+
+    def tearDown(self):
+        Hardware.useBackend(None)
+
+    def test_rgb_bytes_like_adafruit_driver(self):
+        frame = RGBFrame(1000, 1000, 500, 0)
+        self.assertEqual((frame.rgb.red, frame.rgb.green, frame.rgb.blue), (255, 45, 0))
+        self.assertEqual(RGBFrame(0, 10, 10, 10).rgb.red, 0)
+
+    def test_burst_read(self):
+        """
+        The four channels come from a single 8 byte read starting at the clear data register.
+        """
+        sensor = RGBSensor(self.bus)
+        device = FakeI2CDevice(1000, 800, 100, 50)
+        sensor._RGBSensor__device = device
+        frame = sensor.readFrame()
+        self.assertEqual((frame.clear, frame.red, frame.green, frame.blue), (1000, 800, 100, 50))
+        self.assertEqual(device.commands, [bytes([0xB4])])
+        self.assertEqual(frame.timestampNs, self.simulation.clock.nowNs())
+
+    def test_burst_read_through_the_arbiter(self):
+        arbiter = I2CArbiter(self.bus, self.simulation.clock)
+        sensor = RGBSensor(arbiter)
+        self.simulation.world.setLight("green")
+        frame = sensor.readFrame()
+        red, green, blue, clear = self.simulation.world.colourRaw()
+        self.assertEqual((frame.clear, frame.red, frame.green, frame.blue), (clear, red, green, blue))
+        self.assertEqual(arbiter.stats()["TCS34725"]["transactions"], 1)
+
+    def test_sensor_is_enabled_before_the_first_frame(self):
+        """
+        The TCS34725 starts powered off and reads zeros: the sensor enables it and waits one integration.
+        """
+        device = self.simulation.module("adafruit_tcs34725").TCS34725(self.bus)
+        buffer = bytearray(8)
+        device.readRegisters(bytes([0xB4]), buffer)
+        self.assertEqual(buffer, bytearray(8))
+
+        self.simulation.world.setLight("green")
+        sensor = RGBSensor(self.bus)
+        startNs = self.simulation.clock.nowNs()
+        frame = sensor.readFrame()
+        self.assertEqual(frame.timestampNs - startNs, 2_400_000)
+        red, green, blue, clear = self.simulation.world.colourRaw()
+        self.assertEqual((frame.clear, frame.green), (clear, green))
+        self.assertGreater(frame.green, 0)
+        # the next frames are not delayed
+        self.assertEqual(sensor.readFrame().timestampNs, frame.timestampNs)
+
+    def test_read_value_is_one_transaction(self):
+        sensor = RGBSensor(self.bus)
+        before = self.bus.stats()["transactions"]
+        sensor.readValue()
+        self.assertEqual(self.bus.stats()["transactions"] - before, 1)
+
+    def test_predicates_of_a_tick_share_one_transaction(self):
+        sensorManager = SensorManager(self.bus)
+        self.simulation.world.setLight("green")
+        before = self.bus.stats()["transactions"]
+        self.assertTrue(sensorManager.isGreen())
+        self.assertFalse(sensorManager.isRed())
+        self.assertEqual(self.bus.stats()["transactions"] - before, 1)
+
+        self.simulation.clock.sleep(0.02)
+        self.simulation.world.setLight("red")
+        self.assertTrue(sensorManager.isRed())
+        self.assertEqual(self.bus.stats()["transactions"] - before, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+import tempfile
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'source')))
+import Hardware
+from ReplayEngine import ReplayEngine
+from TelemetryRecorder import TelemetryRecorder
+from data.TelemetryData import TelemetryData
+from sim.Simulation import Simulation
+from LamboCar import LamboCar
+
+
+class GentleLamboCar(LamboCar):
+    """Controller variant steering half as much."""
+    def stayMid(self):
+        speed, angle = super().stayMid()
+        self.motorManager.setAngle(angle / 2)
+        return speed, angle / 2
+
+
+class TestReplayEngine(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        simulation = Simulation.virtual().install()
+        cls.directory = tempfile.TemporaryDirectory()
+        path = os.path.join(cls.directory.name, "run.bin")
+        try:
+            with TelemetryRecorder(path) as recorder:
+                lambo = LamboCar(Hardware.busio.I2C(Hardware.board.SCL, Hardware.board.SDA), telemetry=recorder)
+                simulation.drive(lambo, 10)
+        finally:
+            Hardware.useBackend(None)
+        cls.samples = TelemetryRecorder.read(path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def test_replay_reproduces_the_recorded_commands(self):
+        commands = ReplayEngine(self.samples).run()
+        self.assertEqual(len(commands), len(self.samples))
+        recorded = [(s.timestampNs, s.speed, s.angle, tour) for s, (_, _, _, tour) in zip(self.samples, commands)]
+        result = ReplayEngine.compare(commands, recorded)
+        self.assertEqual(result["differingTicks"], 0)
+
+    def test_replay_is_deterministic(self):
+        first = ReplayEngine(self.samples).run()
+        second = ReplayEngine(self.samples).run()
+        self.assertEqual(first, second)
+
+    def test_controller_versions_differ(self):
+        reference = ReplayEngine(self.samples).run()
+        gentle = ReplayEngine(self.samples, GentleLamboCar).run()
+        result = ReplayEngine.compare(reference, gentle)
+        self.assertGreater(result["differingTicks"], 0)
+        self.assertGreater(result["maxAngleDifference"], 0)
+
+    def test_lap_logic_is_replayed(self):
+        samples = [TelemetryData(i * 20_000_000, 100.0, 30.0, 30.0, i in (10, 11), None, None, 0, 0) for i in range(20)]
+        commands = ReplayEngine(samples).run()
+        tours = [tour for _, _, _, tour in commands]
+        self.assertEqual(tours[-1] - tours[0], 1)
+
+    def test_save_and_load(self):
+        engine = ReplayEngine(self.samples[:50])
+        commands = engine.run()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "commands.csv")
+            engine.save(path)
+            loaded = ReplayEngine.load(path)
+        self.assertEqual(ReplayEngine.compare(commands, loaded)["differingTicks"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
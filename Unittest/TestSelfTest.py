@@ -0,0 +1,115 @@
+import unittest
+from unittest.mock import MagicMock
+import threading
+import time
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'source')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'source', 'sim')))
+import Hardware
+from Simulation import Simulation
+from World import World
+from VirtualClock import VirtualClock
+from SystemClock import SystemClock
+from SelfTest import SelfTest
+from data.DistanceData import DistanceData
+from data.RGBData import RGBData
+
+
+class TestSelfTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = VirtualClock()
+        self.motorManager = MagicMock()
+        self.sensorManager = MagicMock()
+        self.sensorManager.readColourFrame.return_value.rgb = RGBData(10, 200, 12)
+        self.sensorManager.getCurrent.return_value = 420.0
+        self.sensorManager.getDistance.return_value = DistanceData(120.0, 30.0, 31.0)
+        self.sensorManager.lineSensor.readValue.return_value = False
+        self.release = threading.Event()
+
+    def tearDown(self):
+        self.release.set()
+
+    def test_all_components_pass(self):
+        report = SelfTest(self.motorManager, self.sensorManager, self.clock).run()
+        self.assertTrue(report.ok)
+        self.assertEqual([check.name for check in report.checks], list(SelfTest.COMPONENTS))
+        self.assertEqual(report.check("Distance").value, {"front": 120.0, "left": 30.0, "right": 31.0})
+        self.assertEqual(report.check("Actuators").value["loadCurrent"], 420.0)
+        self.assertEqual(report.toDict()["checks"][2]["status"], "ok")
+        self.motorManager.setSpeed.assert_called_with(0)
+        self.motorManager.setAngle.assert_called_with(0)
+
+    def test_failures_and_errors_are_reported(self):
+        self.sensorManager.readColourFrame.return_value.rgb = None
+        self.sensorManager.getDistance.return_value = DistanceData(None, 30.0, None)
+        self.sensorManager.lineSensor.readValue.side_effect = OSError("GPIO busy")
+        report = SelfTest(self.motorManager, self.sensorManager, self.clock).run()
+        self.assertFalse(report.ok)
+        self.assertEqual(report.failed, ["RGB", "Distance", "Line"])
+        self.assertEqual(report.check("RGB").status, "failed")
+        self.assertEqual(report.check("Distance").message, "no echo on front, right")
+        self.assertEqual(report.check("Line").status, "error")
+        self.assertIn("GPIO busy", report.check("Line").message)
+
+    def test_dead_line_sensor_is_an_error(self):
+        self.sensorManager.lineSensor.readValue.side_effect = TimeoutError("Timeout waiting for a valid GPIO value")
+        # detectLine hides the error behind False
+        self.sensorManager.detectLine.return_value = False
+        report = SelfTest(self.motorManager, self.sensorManager, self.clock).run()
+        self.assertEqual(report.failed, ["Line"])
+        self.assertEqual(report.check("Line").status, "error")
+        self.assertIn("TimeoutError", report.check("Line").message)
+
+    def test_component_timeout_does_not_block_the_test(self):
+        self.sensorManager.getDistance.side_effect = lambda: self.release.wait(5)
+        start = time.monotonic()
+        report = SelfTest(self.motorManager, self.sensorManager, self.clock, timeouts={"Distance": 0.1}).run()
+        self.assertLess(time.monotonic() - start, 1.0)
+        self.assertEqual(report.failed, ["Distance"])
+        self.assertEqual(report.check("Distance").status, "timeout")
+        self.assertEqual(report.check("Distance").durationMs, 100.0)
+
+    def test_sweep_timeout_leaves_the_motors_stopped(self):
+        sweep = ((30, 50, 0.3), (60, -50, 2.0))
+        start = time.monotonic()
+        report = SelfTest(
+            self.motorManager, self.sensorManager, SystemClock(), timeouts={"Actuators": 0.2}, sweep=sweep
+        ).run()
+        self.assertLess(time.monotonic() - start, 1.0)
+        self.assertEqual(report.check("Actuators").status, "timeout")
+        calls = len(self.motorManager.setSpeed.call_args_list)
+        time.sleep(0.3)
+        # the sweep did not go on after the motors were stopped
+        self.assertEqual(len(self.motorManager.setSpeed.call_args_list), calls)
+        self.motorManager.setSpeed.assert_called_with(0)
+        self.motorManager.setAngle.assert_called_with(0)
+
+    def test_unknown_component_timeout(self):
+        with self.assertRaises(ValueError):
+            SelfTest(self.motorManager, self.sensorManager, self.clock, timeouts={"Lidar": 1.0})
+
+
+class TestSelfTestSimulation(unittest.TestCase):
+
+    def setUp(self):
+        self.sim = Simulation.scaled(1).install()
+
+    def tearDown(self):
+        Hardware.useBackend(None)
+
+    def test_car_self_test_takes_under_a_second(self):
+        from LamboCar import LamboCar
+        bus = Hardware.busio.I2C(Hardware.board.SCL, Hardware.board.SDA)
+        lambo = LamboCar(bus, clock=self.sim.clock)
+        report = lambo.selfTest()
+        self.assertTrue(report.ok, str(report))
+        self.assertLess(report.durationMs, 1000)
+        # the motors draw more current than the idle car during the sweep
+        self.assertGreater(report.check("Actuators").value["loadCurrent"], World.IDLE_CURRENT)
+        self.assertEqual(lambo.motorManager.speed, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
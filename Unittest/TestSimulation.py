@@ -0,0 +1,167 @@
+import unittest
+import math
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'source')))
+import Hardware
+from VirtualClock import VirtualClock
+from PWMActuator import PWMActuator
+from sim.Track import Track
+from sim.CarModel import CarModel
+from sim.World import World
+from sim.Simulation import Simulation
+
+
+class TestTrack(unittest.TestCase):
+
+    def setUp(self):
+        self.track = Track.stadium(straight=300, radius=90, width=70)
+
+    def test_side_walls_are_half_width_away(self):
+        x, y, heading = self.track.startPose()
+        self.assertAlmostEqual(self.track.raycast(x, y, heading + math.pi / 2), 35.0)
+        self.assertAlmostEqual(self.track.raycast(x, y, heading - math.pi / 2), 35.0)
+
+    def test_raycast_out_of_range(self):
+        x, y, heading = self.track.startPose()
+        self.assertIsNone(self.track.raycast(x, y, heading, maxRange=100))
+
+    def test_start_line(self):
+        self.assertTrue(self.track.onStartLine(0, -90))
+        self.assertTrue(self.track.onStartLine(0, -60))
+        self.assertFalse(self.track.onStartLine(5, -90))
+
+    def test_locate(self):
+        _, along, lateral = self.track.locate(100, -80)
+        self.assertAlmostEqual(along, 100)
+        self.assertAlmostEqual(lateral, 10)
+
+
+class TestCarModel(unittest.TestCase):
+
+    def test_straight_line(self):
+        car = CarModel(maxSpeed=200, timeConstant=0.3)
+        for _ in range(1000):
+            car.step(0.002, throttle=0.5)
+        self.assertAlmostEqual(car.speed, 100, delta=1)
+        self.assertAlmostEqual(car.y, 0)
+        self.assertGreater(car.x, 150)
+
+    def test_steering_left_turns_counter_clockwise(self):
+        car = CarModel()
+        for _ in range(100):
+            car.step(0.01, throttle=0.5, steer=car.maxSteer)
+        self.assertGreater(car.heading, 0)
+
+    def test_brake(self):
+        car = CarModel()
+        for _ in range(500):
+            car.step(0.002, throttle=1.0)
+        for _ in range(500):
+            car.step(0.002, brake=True)
+        self.assertLess(car.speed, 1)
+
+
+class TestWorld(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = VirtualClock()
+        self.world = World(Track.stadium(), self.clock)
+
+    def test_motor_pins_drive_the_car(self):
+        for motor in (0, 1):
+            self.world.setMotorDuty(motor, 0.5)
+            self.world.setMotorPins(motor, 0, 1)
+        self.clock.advance(1.0)
+        self.world.sync()
+        self.assertGreater(self.world.car.speed, 80)
+        self.assertGreater(self.world.distance, 50)
+
+    def test_coasting_car_does_not_move(self):
+        self.world.setMotorDuty(0, 1.0)
+        self.clock.advance(1.0)
+        self.world.sync()
+        self.assertEqual(self.world.distance, 0)
+
+    def test_servo_center(self):
+        self.world.setServoPulse(1.0 + 80 / 180)
+        self.assertAlmostEqual(self.world.wheelAngle(), 0)
+
+    def test_no_echo(self):
+        world = World(Track([(0, 0), (2000, 0), (2000, 2000), (0, 2000)], 1000), self.clock,
+                      CarModel(1000, 1000, 0))
+        self.assertEqual(world.ultrasonicDistance("Front"), World.NO_ECHO_DISTANCE)
+
+    def test_light_schedule(self):
+        self.world.setLight("red")
+        self.world.setLight("green", 1.0)
+        self.assertEqual(self.world.light(), "red")
+        self.clock.advance(1.0)
+        self.assertEqual(self.world.light(), "green")
+
+
+class TestSimulation(unittest.TestCase):
+
+    def setUp(self):
+        self.simulation = Simulation.virtual().install()
+
+    def tearDown(self):
+        Hardware.useBackend(None)
+
+    def test_pca9685_block_write(self):
+        """
+        The coalesced write of both motor channels reaches the world like two duty_cycle writes.
+        """
+        bus = Hardware.busio.I2C(Hardware.board.SCL, Hardware.board.SDA)
+        pca = Hardware.adafruit_pca9685.PCA9685(bus, address=0x40)
+        pca.frequency = 50
+        PWMActuator(pca).setDutyCycles({4: 0x7FFF, 5: 0x7FFF})
+        self.assertEqual(pca.channels[4].duty_cycle, 0x8000)
+        self.assertEqual(pca.channels[5].duty_cycle, 0x8000)
+
+    def test_colour_sensor(self):
+        from SensorManager import SensorManager
+        bus = Hardware.busio.I2C(Hardware.board.SCL, Hardware.board.SDA)
+        sensorManager = SensorManager(bus)
+        self.simulation.world.setLight("red")
+        self.assertTrue(sensorManager.isRed())
+        self.assertFalse(sensorManager.isGreen())
+        self.simulation.world.setLight("green")
+        self.simulation.clock.sleep(0.02)
+        self.assertTrue(sensorManager.isGreen())
+        self.assertFalse(sensorManager.isRed())
+
+    def test_lambocar_drives_in_virtual_time(self):
+        """
+        LamboCar keeps the middle of the track for 20 simulated seconds and counts the laps.
+        """
+        from LamboCar import LamboCar
+        bus = Hardware.busio.I2C(Hardware.board.SCL, Hardware.board.SDA)
+        lambo = LamboCar(bus)
+        stats = self.simulation.drive(lambo, 20)
+        world = self.simulation.world
+        self.assertEqual(world.collisions, 0)
+        self.assertGreater(world.laps, 0)
+        self.assertGreater(world.distance, 1000)
+        # the first crossing of the start line starts the race (tour 0)
+        self.assertEqual(lambo.lapCounter.crossings, world.laps)
+        self.assertEqual(lambo.tour, world.laps - 1)
+        self.assertGreater(stats["ticks"], 900)
+
+    def test_lambocar_drives_with_adaptive_sampling(self):
+        """
+        With the adaptive sampling policy, the echoes stay within the budget and the car still keeps the track.
+        """
+        from LamboCar import LamboCar
+        bus = Hardware.busio.I2C(Hardware.board.SCL, Hardware.board.SDA)
+        lambo = LamboCar(bus, adaptiveSampling=True)
+        self.simulation.drive(lambo, 20)
+        self.assertEqual(self.simulation.world.collisions, 0)
+        self.assertGreater(self.simulation.world.laps, 0)
+        stats = lambo.samplingPolicy.stats()
+        self.assertGreater(stats["replans"], 0)
+        self.assertLessEqual(stats["totalHz"], stats["budgetHz"] * 1.05)
+
+
+if __name__ == '__main__':
+    unittest.main()
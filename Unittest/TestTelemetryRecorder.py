@@ -0,0 +1,84 @@
+import unittest
+import tempfile
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'source')))
+import Hardware
+from TelemetryRecorder import TelemetryRecorder
+from data.DistanceData import DistanceData
+from data.RGBData import RGBData
+from sim.Simulation import Simulation
+
+
+class TestTelemetryRecorder(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "telemetry.bin")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        with TelemetryRecorder(self.path, capacity=16, flushEvery=4) as recorder:
+            recorder.record(1000, DistanceData(120.5, 30.25, None), True, RGBData(3, 92, 4), 850.0, 40.0, -12.5)
+            recorder.record(2000, (None, None, None), None, None, None, 0, 0)
+        samples = TelemetryRecorder.read(self.path)
+        self.assertEqual(len(samples), 2)
+        first, second = samples
+        self.assertEqual(first.timestampNs, 1000)
+        self.assertEqual((first.front, first.left, first.right), (120.5, 30.25, None))
+        self.assertTrue(first.line)
+        self.assertEqual(first.rgb, (3, 92, 4))
+        self.assertEqual((first.current, first.speed, first.angle), (850.0, 40.0, -12.5))
+        self.assertIsNone(second.line)
+        self.assertIsNone(second.rgb)
+        self.assertIsNone(second.current)
+
+    def test_ring_keeps_the_latest_samples(self):
+        with TelemetryRecorder(self.path, capacity=8, flushEvery=3) as recorder:
+            for i in range(20):
+                recorder.record(i, speed=i)
+            self.assertEqual(recorder.count, 20)
+        samples = TelemetryRecorder.read(self.path)
+        self.assertEqual([sample.timestampNs for sample in samples], list(range(12, 20)))
+
+    def test_flushed_samples_survive_without_close(self):
+        """
+        The samples copied into the mapped file are readable even if the recorder is never closed.
+        """
+        recorder = TelemetryRecorder(self.path, capacity=64, flushEvery=5)
+        for i in range(12):
+            recorder.record(i, speed=i)
+        self.assertEqual(len(TelemetryRecorder.read(self.path)), 10)
+        recorder.flush()
+        self.assertEqual(len(TelemetryRecorder.read(self.path)), 12)
+        recorder.close()
+
+    def test_invalid_file(self):
+        with open(self.path, "wb") as file:
+            file.write(b"not a telemetry file at all, just text....")
+        with self.assertRaises(ValueError):
+            TelemetryRecorder.read(self.path)
+
+    def test_lambocar_records_each_control_tick(self):
+        from LamboCar import LamboCar
+        simulation = Simulation.virtual().install()
+        try:
+            with TelemetryRecorder(self.path, capacity=1024) as recorder:
+                bus = Hardware.busio.I2C(Hardware.board.SCL, Hardware.board.SDA)
+                lambo = LamboCar(bus, telemetry=recorder)
+                stats = simulation.drive(lambo, 2)
+        finally:
+            Hardware.useBackend(None)
+        samples = TelemetryRecorder.read(self.path)
+        # The last tick only ends the drive
+        self.assertEqual(len(samples), stats["ticks"] - 1)
+        self.assertTrue(all(sample.front is not None for sample in samples))
+        self.assertGreater(samples[-1].speed, 0)
+        # the colour and the current are read at a low rate, every sample holds the last values
+        self.assertTrue(all(sample.rgb is not None and sample.current is not None for sample in samples))
+
+
+if __name__ == '__main__':
+    unittest.main()
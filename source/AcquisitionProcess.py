@@ -0,0 +1,219 @@
+import os
+import logging
+import traceback
+import multiprocessing
+import Hardware
+from DistanceSampler import DistanceSampler
+from FiringScheduler import FiringScheduler
+from SharedSampleBuffer import SharedSampleBuffer
+from logs_config import restart_logging, shutdown_logging
+
+"""
+Module for the AcquisitionProcess class.
+This class runs the ultrasonic and line sensors in a separate process, so their echo waits
+and polling loops do not compete with the control loop for the GIL.
+"""
+
+class AcquisitionProcess:
+    """
+    Sensor acquisition in a child process.
+
+    The child process fires the ultrasonic sensors with a FiringScheduler, polls the line sensor
+    and publishes a SensorSample every publishPeriod seconds in a SharedSampleBuffer.
+    The control process reads the latest sample without locks (read()).
+    With a sampling policy, the speed and steering of the control process are published
+    in the other direction at each read, and drive a copy of the policy in the child.
+
+    The child is forked, so it uses copies of the sensor objects; the edge detection of the
+    distance sensors is registered again in the child, and so is the logging thread (see
+    logs_config.restart_logging). It stops with stop(), or by itself when
+    the control process is gone. If it crashes, its traceback is sent back and the next read()
+    or check() of the control process raises a RuntimeError.
+
+    Attributes:
+        distanceSensors (tuple): Front, left and right sensors with a readValue() method.
+        lineSensor: Sensor with a readValue() method returning True on the line.
+        filterFactory: Function returning a new filter for each DistanceSampler (see SensorManager.createFilter).
+        rateHz (float): Readings per second of each sampler, used to pace the filters.
+        windowSize (int): Number of readings in the window of each sampler.
+        slots: Slots of the FiringScheduler.
+        guardTime (float): Silence in seconds between two staggered pulses.
+        maxAge (float): Readings older than this (in seconds) are published as None.
+        policy: Sampling policy (e.g. AdaptiveSamplingPolicy) with motorManager and rebind().
+        publishPeriod (float): Time in seconds between two published samples.
+        clock: Clock of the samples, the clock of the hardware backend by default.
+    """
+    def __init__(
+        self,
+        distanceSensors,
+        lineSensor,
+        filterFactory=None,
+        rateHz: float = 20,
+        windowSize: int = 5,
+        slots="roundRobin",
+        guardTime: float = 0.01,
+        maxAge: float = 0.5,
+        policy=None,
+        publishPeriod: float = 0.002,
+        clock=None
+    ):
+        if "fork" not in multiprocessing.get_all_start_methods():
+            raise RuntimeError("The acquisition process needs the fork start method.")
+        if publishPeriod <= 0:
+            raise ValueError("Publish period must be positive.")
+        self.__distanceSensors = tuple(distanceSensors)
+        self.__lineSensor = lineSensor
+        self.__filterFactory = filterFactory
+        self.__rateHz = rateHz
+        self.__windowSize = windowSize
+        self.__slots = slots
+        self.__guardTime = guardTime
+        self.__maxAge = maxAge
+        self.__policy = policy
+        self.__publishPeriod = publishPeriod
+        self.__clock = clock if clock else Hardware.clock()
+        self.__context = multiprocessing.get_context("fork")
+        self.__process = None
+        self.__buffer = None
+        self.__stopEvent = None
+        self.__errors = None
+        self.__stopping = False
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def running(self) -> bool:
+        return self.__process is not None and self.__process.is_alive()
+
+    @property
+    def pid(self):
+        return None if self.__process is None else self.__process.pid
+
+    @property
+    def exitcode(self):
+        return None if self.__process is None else self.__process.exitcode
+
+    @property
+    def buffer(self):
+        return self.__buffer
+
+    def start(self, readyTimeout: float = 1.0) -> None:
+        """
+        Starts the child process and waits up to readyTimeout seconds for its first sample.
+        Raises:
+            RuntimeError: If the child process crashes before its first sample.
+        """
+        if self.__process is not None:
+            return
+        self.__buffer = SharedSampleBuffer()
+        self.__stopEvent = self.__context.Event()
+        self.__errors = self.__context.SimpleQueue()
+        self.__stopping = False
+        self.__process = self.__context.Process(target=self.__run, name="acquisition", daemon=True)
+        self.__process.start()
+        self.logger.info(f"Acquisition process started (pid {self.__process.pid})")
+
+        deadline = self.__clock.nowNs() + int(readyTimeout * 1e9)
+        while self.__buffer.readSample() is None and self.__clock.nowNs() < deadline:
+            self.check()
+            self.__stopEvent.wait(0.001)
+        self.check()
+
+    def check(self) -> None:
+        """
+        Raises a RuntimeError with the traceback of the child process if it has ended without being stopped.
+        """
+        process = self.__process
+        if process is None or self.__stopping or process.exitcode is None:
+            return
+        error = self.__errors.get() if not self.__errors.empty() else "no traceback"
+        raise RuntimeError(f"Acquisition process ended with exit code {process.exitcode}:\n{error}")
+
+    def read(self):
+        """
+        Returns the latest SensorSample (None before the first one), after publishing the commands
+        of the policy and checking that the child process is alive.
+        """
+        self.check()
+        if self.__policy is not None:
+            motorManager = self.__policy.motorManager
+            self.__buffer.writeCommands(motorManager.speed, motorManager.angle)
+        return self.__buffer.readSample()
+
+    def stop(self, timeout: float = 1.0) -> None:
+        """
+        Stops the child process, kills it if it does not end within timeout seconds, and frees the shared memory.
+        """
+        process, self.__process = self.__process, None
+        if process is None:
+            return
+        self.__stopping = True
+        self.__stopEvent.set()
+        process.join(timeout)
+        if process.is_alive():
+            self.logger.warning("Acquisition process did not stop, terminating it")
+            process.terminate()
+            process.join(timeout)
+        self.logger.info(f"Acquisition process stopped (exit code {process.exitcode})")
+        self.__buffer.close()
+        self.__buffer.unlink()
+
+    def __run(self) -> None:
+        """
+        Main function of the child process.
+        """
+        restart_logging()
+        try:
+            self.__acquire()
+        except BaseException:
+            self.__errors.put(traceback.format_exc())
+            raise
+        finally:
+            shutdown_logging()
+
+    def __acquire(self) -> None:
+        parentPid = os.getppid()
+        clock = self.__clock
+        buffer = self.__buffer
+        for sensor in self.__distanceSensors:
+            if hasattr(sensor, "reopen"):
+                sensor.reopen()
+
+        samplers = tuple(
+            DistanceSampler(
+                sensor, self.__rateHz, self.__windowSize, clock,
+                filter=self.__filterFactory() if self.__filterFactory else None
+            )
+            for sensor in self.__distanceSensors
+        )
+        policy = self.__policy.rebind(buffer) if self.__policy is not None else None
+        scheduler = FiringScheduler(
+            {"Front": samplers[0], "Left": samplers[1], "Right": samplers[2]},
+            self.__slots,
+            self.__guardTime,
+            clock,
+            policy=policy
+        )
+        period = self.__publishPeriod / getattr(clock, "scale", 1.0)
+        lineEdges = 0
+        lastEdgeNs = None
+        lastState = False
+        scheduler.start()
+        try:
+            while not self.__stopEvent.is_set() and os.getppid() == parentPid:
+                onLine = self.__lineSensor.readValue()
+                now = clock.nowNs()
+                if onLine and not lastState:
+                    lineEdges += 1
+                    lastEdgeNs = now
+                lastState = onLine
+                buffer.writeSample(
+                    now,
+                    [sampler.estimate(self.__maxAge) for sampler in samplers],
+                    onLine,
+                    lastEdgeNs,
+                    lineEdges,
+                    scheduler.effectiveRates()
+                )
+                self.__stopEvent.wait(period)
+        finally:
+            scheduler.stop()
@@ -0,0 +1,151 @@
+import logging
+
+"""
+Module for the AdaptiveSamplingPolicy class.
+This class shares the echoes of the ultrasonic sensors according to what the car is doing:
+the faster the car, the more often the front sensor is fired, and the side sensors
+are fired more often in the curves than on the straights.
+"""
+
+class AdaptiveSamplingPolicy:
+    """
+    Sampling policy of a FiringScheduler driven by the last commands of a MotorManager.
+
+    Before each round of slots, the policy reads the last speed and steering commanded,
+    computes a target rate for each sensor and turns them into a round of planLength slots
+    (e.g. Front, Left, Front, Right, Front...). The total rate is bounded by the echo budget:
+    when the targets exceed it they are scaled down, and the slot period of the scheduler
+    is set so that no more than budgetHz echoes are sent per second.
+
+    Attributes:
+        motorManager: Object with speed and angle properties (the last commands).
+        budgetHz (float): Largest number of echoes per second for all the sensors.
+        frontRange (tuple): Rate of the front sensor in Hz when stopped and at full speed.
+        sideRange (tuple): Rate of each side sensor in Hz when going straight and at full steering.
+        planLength (int): Number of slots in a round.
+    """
+    def __init__(
+        self,
+        motorManager,
+        budgetHz: float = 75,
+        frontRange: tuple = (15, 40),
+        sideRange: tuple = (10, 25),
+        planLength: int = 8
+    ):
+        if budgetHz <= 0:
+            raise ValueError("Echo budget must be positive.")
+        if planLength < 3:
+            raise ValueError("A round needs at least 3 slots.")
+        self.__motorManager = motorManager
+        self.__budgetHz = budgetHz
+        self.__frontRange = frontRange
+        self.__sideRange = sideRange
+        self.__planLength = planLength
+        self.__targets = {}
+        self.__plan = []
+        self.__scheduler = None
+        self.__replans = 0
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def motorManager(self):
+        return self.__motorManager
+
+    @property
+    def budgetHz(self):
+        return self.__budgetHz
+
+    @property
+    def plan(self):
+        return list(self.__plan)
+
+    @property
+    def replans(self):
+        """Number of times the slots of the scheduler were changed."""
+        return self.__replans
+
+    def rebind(self, motorManager):
+        """
+        Returns a new policy with the same settings, driven by the commands of another motorManager
+        (e.g. the commands shared with an acquisition process).
+        """
+        return AdaptiveSamplingPolicy(
+            motorManager, self.__budgetHz, self.__frontRange, self.__sideRange, self.__planLength
+        )
+
+    def targetRates(self, speed: float, angle: float) -> dict:
+        """
+        Returns the rate in Hz of each sensor for a speed and a steering (-100 to 100),
+        scaled down to fit in the echo budget.
+        """
+        speedRatio = min(abs(speed), 100) / 100
+        angleRatio = min(abs(angle), 100) / 100
+        front = self.__frontRange[0] + (self.__frontRange[1] - self.__frontRange[0]) * speedRatio
+        side = self.__sideRange[0] + (self.__sideRange[1] - self.__sideRange[0]) * angleRatio
+        rates = {"Front": front, "Left": side, "Right": side}
+        total = front + 2 * side
+        if total > self.__budgetHz:
+            rates = {name: rate * self.__budgetHz / total for name, rate in rates.items()}
+        return rates
+
+    def buildPlan(self, rates: dict) -> list:
+        """
+        Spreads the sensors over a round of planLength slots in proportion to their rates,
+        each sensor getting at least one slot, with a smooth weighted round-robin
+        so that the slots of one sensor are evenly spaced.
+        """
+        names = [name for name in rates if rates[name] > 0]
+        total = sum(rates[name] for name in names)
+        counts = {name: 1 for name in names}
+        spare = self.__planLength - len(names)
+        shares = {name: rates[name] / total * self.__planLength - 1 for name in names}
+        for name in sorted(names, key=lambda n: shares[n], reverse=True):
+            extra = min(spare, max(0, int(round(shares[name]))))
+            counts[name] += extra
+            spare -= extra
+
+        plan = []
+        current = {name: 0 for name in names}
+        length = sum(counts.values())
+        for _ in range(length):
+            for name in names:
+                current[name] += counts[name]
+            chosen = max(names, key=lambda n: current[n])
+            current[chosen] -= length
+            plan.append(chosen)
+        return plan
+
+    def apply(self, scheduler) -> None:
+        """
+        Called by the FiringScheduler before each round: updates its slots and slot period.
+        """
+        motorManager = self.__motorManager
+        rates = self.targetRates(motorManager.speed, motorManager.angle)
+        available = [name for name in rates if name in scheduler.samplers]
+        rates = {name: rates[name] for name in available}
+        self.__targets = rates
+        self.__scheduler = scheduler
+
+        total = sum(rates.values())
+        scheduler.slotPeriod = 1.0 / min(total, self.__budgetHz)
+        plan = self.buildPlan(rates)
+        if plan != self.__plan:
+            self.__plan = plan
+            self.__replans += 1
+            scheduler.slots = plan
+            scheduler.resetStats()
+
+    def stats(self) -> dict:
+        """
+        Returns the target rates, the rates measured since the last change of the slots
+        and the total echo rate compared with the budget.
+        """
+        achieved = self.__scheduler.effectiveRates() if self.__scheduler is not None else {}
+        return {
+            "budgetHz": self.__budgetHz,
+            "plan": list(self.__plan),
+            "replans": self.__replans,
+            "target": {name: round(rate, 1) for name, rate in self.__targets.items()},
+            "achieved": achieved,
+            "totalHz": round(sum(achieved.values()), 1)
+        }
@@ -0,0 +1,110 @@
+"""
+Module for the AlphaBetaFilter class.
+This class tracks the distance of an obstacle and its speed from the readings of one sensor,
+which gives a smooth estimate that does not lag behind a moving obstacle like an average.
+"""
+
+class AlphaBetaFilter:
+    """
+    Alpha-beta tracker (a steady-state Kalman filter with a constant velocity model).
+
+    Each update predicts the distance from the last estimate and speed, then corrects
+    the prediction by alpha times the residual and the speed by beta times the residual.
+    A reading with a residual larger than the gate is rejected, and the estimate
+    follows the prediction. After maxRejections rejected readings in a row, the track
+    restarts from the new reading, or is lost if the sensor got no echo.
+
+    The confidence moves halfway towards 1 - |residual| / gate on each accepted reading,
+    and is halved on each rejected or missing one.
+
+    Attributes:
+        alpha (float): Gain of the position correction (0..1).
+        beta (float): Gain of the speed correction (0..2).
+        gate (float): Largest accepted residual in cm.
+        period (float): Time between two readings in seconds, used when no timestamp is given.
+        maxRejections (int): Rejected readings in a row after which the track restarts.
+    """
+    def __init__(self, alpha: float = 0.5, beta: float = 0.1, gate: float = 30.0, period: float = 0.05, maxRejections: int = 3):
+        if not 0 < alpha <= 1:
+            raise ValueError("Alpha must be in ]0, 1].")
+        if not 0 <= beta < 2:
+            raise ValueError("Beta must be in [0, 2[.")
+        if gate <= 0 or period <= 0:
+            raise ValueError("Gate and period must be positive.")
+        if maxRejections < 1:
+            raise ValueError("maxRejections must be at least 1.")
+        self.__alpha = alpha
+        self.__beta = beta
+        self.__gate = gate
+        self.__period = period
+        self.__maxRejections = maxRejections
+        self.__rejected = 0
+        self.reset()
+
+    @property
+    def estimate(self):
+        """Tracked distance in cm, None while no obstacle is tracked."""
+        return None if self.__position is None else round(self.__position, 1)
+
+    @property
+    def velocity(self):
+        """Tracked speed of the obstacle in cm/s, negative when it gets closer."""
+        return self.__velocity
+
+    @property
+    def confidence(self) -> float:
+        return self.__confidence
+
+    @property
+    def rejected(self):
+        """Number of readings rejected by the gate since the creation of the filter."""
+        return self.__rejected
+
+    def reset(self) -> None:
+        """
+        Drops the track.
+        """
+        self.__position = None
+        self.__velocity = 0.0
+        self.__lastNs = None
+        self.__streak = 0
+        self.__confidence = 0.0
+
+    def update(self, value, timestampNs: int = None):
+        """
+        Adds a reading (None when the sensor got no echo) and returns the new (estimate, confidence).
+        """
+        dt = self.__period
+        if timestampNs is not None:
+            if self.__lastNs is not None and timestampNs > self.__lastNs:
+                dt = (timestampNs - self.__lastNs) / 1e9
+            self.__lastNs = timestampNs
+
+        if self.__position is None:
+            if value is not None:
+                self.__position = float(value)
+                self.__confidence = 0.5
+            return self.estimate, self.__confidence
+
+        predicted = self.__position + self.__velocity * dt
+        residual = None if value is None else value - predicted
+        if residual is None or abs(residual) > self.__gate:
+            if residual is not None:
+                self.__rejected += 1
+            self.__streak += 1
+            if self.__streak >= self.__maxRejections:
+                self.reset()
+                self.__lastNs = timestampNs
+                if value is not None:
+                    self.__position = float(value)
+                    self.__confidence = 0.5
+                return self.estimate, self.__confidence
+            self.__position = predicted
+            self.__confidence *= 0.5
+            return self.estimate, self.__confidence
+
+        self.__streak = 0
+        self.__position = predicted + self.__alpha * residual
+        self.__velocity += self.__beta * residual / dt
+        self.__confidence = 0.5 * self.__confidence + 0.5 * (1 - abs(residual) / self.__gate)
+        return self.estimate, self.__confidence
@@ -0,0 +1,67 @@
+import logging
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler
+
+"""
+Module for the AsyncLogHandler class.
+This handler puts the log records in a bounded queue, they are written
+by a background thread so that logging never waits for the disk.
+"""
+
+class AsyncLogHandler(QueueHandler):
+    """
+    QueueHandler that never blocks the logging thread.
+
+    When the queue is full, the record is dropped and counted instead of waiting.
+    After drops, a warning with their number is queued as soon as there is room again.
+    The records are written by a logging.handlers.QueueListener reading the same queue.
+
+    Attributes:
+        maxSize (int): Capacity of the queue in records.
+    """
+    def __init__(self, maxSize: int = 10000):
+        super().__init__(queue.Queue(maxSize))
+        self.__dropped = 0
+        self.__pendingDrops = 0
+        self.__lock = threading.Lock()
+
+    @property
+    def dropped(self):
+        """Total number of records dropped because the queue was full."""
+        return self.__dropped
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        with self.__lock:
+            pending = self.__pendingDrops
+        try:
+            if pending:
+                self.queue.put_nowait(self.__dropRecord(pending))
+                with self.__lock:
+                    self.__pendingDrops -= pending
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self.__lock:
+                self.__dropped += 1
+                self.__pendingDrops += 1
+
+    def __dropRecord(self, count: int) -> logging.LogRecord:
+        return logging.LogRecord(
+            __name__, logging.WARNING, __file__, 0,
+            f"{count} log records dropped, the log queue was full", None, None
+        )
+
+    def drain(self, timeout: float = 1.0) -> bool:
+        """
+        Waits until the background thread has handled every queued record.
+        Returns False if records are still queued after timeout seconds.
+        """
+        deadline = time.monotonic() + timeout
+        with self.queue.all_tasks_done:
+            while self.queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self.queue.all_tasks_done.wait(remaining)
+        return True
@@ -0,0 +1,271 @@
+import asyncio
+import logging
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from LatencyStats import LatencyStats
+from ManeuverRegistry import ManeuverRegistry
+
+"""
+Module for the AsyncRuntime class.
+This class runs a LamboCar as asyncio tasks (sensing, control, telemetry and commands)
+that can all be cancelled, instead of threads and loops stopped by KeyboardInterrupt.
+"""
+
+class AsyncRuntime:
+    """
+    asyncio runtime of a LamboCar.
+
+    run() starts cooperating tasks on the event loop:
+    - sensing: fires the ultrasonic sensors slot after slot through the FiringScheduler of the SensorManager.
+      The wait for an echo blocks, so each slot is fired in a single worker thread while the loop runs the other tasks.
+    - control: calls controlTick() at controlFrequency against absolute deadlines, like a ControlLoop,
+      or the tick of the maneuver started by a "maneuver" command.
+    - telemetry: flushes the TelemetryRecorder of the car every telemetryPeriod seconds.
+    - commands: reads text commands ("stop", "pause", "resume", "maneuver <name>") from an async iterable,
+      e.g. stdinCommands(), and from submit(). The run does not end with the command input.
+
+    stop() cancels every task: the sleeping tasks wake up at once, so a stop takes effect before the next tick,
+    then the motors are stopped and the sampling is ended. Idle tasks wait on the event loop and use no CPU.
+    The clock of the car must run by itself (SystemClock or ScaledClock); in virtual time, use Simulation.drive.
+
+    Attributes:
+        lambo: LamboCar to run.
+        commands: Async iterable of command lines, None for no command input.
+        telemetryPeriod (float): Time in seconds between two flushes of the telemetry.
+    """
+    def __init__(self, lambo, commands=None, telemetryPeriod: float = 1.0):
+        self.__scale = getattr(lambo.clock, "scale", None)
+        if self.__scale is None:
+            raise ValueError("The asyncio runtime needs a clock running in real time.")
+        if telemetryPeriod <= 0:
+            raise ValueError("Telemetry period must be positive.")
+        self.__lambo = lambo
+        self.__commands = commands
+        self.__telemetryPeriod = telemetryPeriod
+        self.__loop = None
+        self.__stopEvent = None
+        self.__ready = None
+        self.__paused = False
+        self.__ticks = 0
+        self.__overruns = 0
+        self.__jitter = LatencyStats()
+        self.__latency = LatencyStats()
+        self.__handled = []
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def running(self) -> bool:
+        return self.__stopEvent is not None and not self.__stopEvent.is_set()
+
+    @property
+    def paused(self) -> bool:
+        return self.__paused
+
+    @property
+    def ticks(self):
+        return self.__ticks
+
+    @property
+    def handledCommands(self) -> list:
+        """Commands handled by the last run, in order."""
+        return list(self.__handled)
+
+    def stop(self) -> None:
+        """
+        Ends the run, can be called from another thread.
+        """
+        self.submit("stop")
+
+    def submit(self, command: str) -> None:
+        """
+        Handles a command on the event loop of the run, can be called from another thread.
+        """
+        loop = self.__loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self.__handle(command)
+        else:
+            loop.call_soon_threadsafe(self.__handle, command)
+
+    async def run(self, tours: int = None, duration: float = None) -> dict:
+        """
+        Runs the car until tours laps are counted, duration clock seconds have passed,
+        stop() is called or a "stop" command is received.
+        Returns the statistics of the control task.
+        """
+        lambo = self.__lambo
+        sensorManager = lambo.sensorManager
+        self.__loop = asyncio.get_running_loop()
+        self.__stopEvent = asyncio.Event()
+        self.__ready = asyncio.Event()
+        self.__paused = False
+        self.__handled = []
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sensing")
+        sensorManager.startSampling(background=False, policy=lambo.samplingPolicy)
+        if lambo.powerMonitor:
+            sensorManager.startPowerMonitor()
+
+        tasks = [
+            asyncio.create_task(self.__sensing(executor), name="sensing"),
+            asyncio.create_task(self.__control(tours, duration), name="control")
+        ]
+        if lambo.telemetry is not None:
+            tasks.append(asyncio.create_task(self.__telemetry(), name="telemetry"))
+        if self.__commands is not None:
+            tasks.append(asyncio.create_task(self.__readCommands(), name="commands"))
+        stopping = asyncio.create_task(self.__stopEvent.wait())
+        try:
+            done, _ = await asyncio.wait(tasks + [stopping], return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task is not stopping and not task.cancelled() and task.exception() is not None:
+                    raise task.exception()
+        finally:
+            self.__stopEvent.set()
+            for task in tasks + [stopping]:
+                task.cancel()
+            await asyncio.gather(*tasks, stopping, return_exceptions=True)
+            executor.shutdown(wait=True)
+            lambo.stopCar()
+            sensorManager.stopSampling()
+            if lambo.powerMonitor:
+                sensorManager.stopPowerMonitor()
+            if lambo.telemetry is not None:
+                lambo.telemetry.flush()
+            self.__loop = None
+        stats = self.stats()
+        self.logger.info(f"Async runtime stats: {stats}")
+        return stats
+
+    def stats(self) -> dict:
+        """
+        Returns the tick count, the overruns and the jitter/latency statistics of the control task in microseconds.
+        """
+        return {
+            "frequency": self.__lambo.controlFrequency,
+            "ticks": self.__ticks,
+            "overruns": self.__overruns,
+            "jitter": self.__jitter.summary(),
+            "latency": self.__latency.summary()
+        }
+
+    async def __sleep(self, seconds: float) -> None:
+        """
+        Waits a number of clock seconds without blocking the event loop.
+        """
+        await asyncio.sleep(max(0.0, seconds / self.__scale))
+
+    async def __sensing(self, executor) -> None:
+        """
+        Fires the slots of the FiringScheduler; the control task starts after a first round, so the
+        first tick does not see an empty track.
+        """
+        scheduler = self.__lambo.sensorManager.firingScheduler
+        loop = asyncio.get_running_loop()
+        fired = 0
+        while True:
+            start = loop.time()
+            await loop.run_in_executor(executor, scheduler.step)
+            fired += 1
+            if fired == len(scheduler.slots):
+                self.__ready.set()
+            elapsed = (loop.time() - start) * self.__scale
+            await self.__sleep(max(scheduler.guardTime, scheduler.slotPeriod - elapsed))
+
+    async def __control(self, tours, duration) -> None:
+        lambo = self.__lambo
+        clock = lambo.clock
+        runner = lambo.maneuverRunner
+        periodNs = int(1e9 / lambo.controlFrequency)
+        await self.__ready.wait()
+        deadline = clock.nowNs()
+        endNs = None if duration is None else deadline + int(duration * 1e9)
+        while True:
+            now = clock.nowNs()
+            if now < deadline:
+                await self.__sleep((deadline - now) / 1e9)
+                now = clock.nowNs()
+            if (endNs is not None and now >= endNs) or (tours is not None and lambo.tour >= tours):
+                self.__stopEvent.set()
+                return
+            self.__jitter.record(now - deadline)
+
+            if runner.running:
+                runner.tick()
+                lambo.LineCount()
+            elif not self.__paused:
+                lambo.controlTick()
+
+            end = clock.nowNs()
+            self.__latency.record(end - now)
+            self.__ticks += 1
+            deadline += periodNs
+            if end > deadline:
+                self.__overruns += 1
+                deadline += ((end - deadline) // periodNs + 1) * periodNs
+
+    async def __telemetry(self) -> None:
+        telemetry = self.__lambo.telemetry
+        while True:
+            await self.__sleep(self.__telemetryPeriod)
+            await asyncio.to_thread(telemetry.flush)
+
+    async def __readCommands(self) -> None:
+        """
+        Handles the command lines; the end of the input (e.g. end of file on stdin) only ends the reading,
+        the task then waits for the end of the run so that the car keeps going.
+        """
+        async for line in self.__commands:
+            self.__handle(line)
+            if self.__stopEvent.is_set():
+                return
+        self.logger.info("End of the command input, the run goes on without commands")
+        await self.__stopEvent.wait()
+
+    def __handle(self, line: str) -> None:
+        words = line.strip().split()
+        if not words or self.__stopEvent is None:
+            return
+        command = words[0].lower()
+        lambo = self.__lambo
+        if command == "stop":
+            self.__stopEvent.set()
+        elif command == "pause":
+            self.__paused = True
+            lambo.stopCar()
+        elif command == "resume":
+            self.__paused = False
+        elif command == "maneuver" and len(words) == 2:
+            try:
+                lambo.maneuverRunner.start(ManeuverRegistry.create(words[1]))
+            except KeyError as e:
+                self.logger.warning(e)
+                return
+        else:
+            self.logger.warning(f"Unknown command: {line.strip()}")
+            return
+        self.__handled.append(" ".join(words))
+        self.logger.info(f"Command: {' '.join(words)}")
+
+    @staticmethod
+    async def stdinCommands():
+        """
+        Async iterator over the lines typed on the standard input.
+        The event loop is woken up when a line is ready, nothing is read in a thread.
+        """
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        stdin = sys.stdin
+        loop.add_reader(stdin.fileno(), lambda: queue.put_nowait(stdin.readline()))
+        try:
+            while True:
+                line = await queue.get()
+                if not line:
+                    return
+                yield line
+        finally:
+            loop.remove_reader(stdin.fileno())
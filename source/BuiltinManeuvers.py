@@ -0,0 +1,71 @@
+from Maneuver import Maneuver
+
+"""
+Maneuvers of the LamboCar, registered in the ManeuverRegistry under the name of their function.
+Each function returns a new Maneuver built from (seconds, speed, angle[, label]) steps,
+None keeping the current speed or steering.
+"""
+
+def startCar() -> Maneuver:
+    """Gradual acceleration up to 75 %."""
+    return Maneuver.fromSteps("startCar", [
+        (1, 25, None),
+        (1, 50, None),
+        (0, 75, None)
+    ])
+
+def reverseGear() -> Maneuver:
+    """Gradual acceleration forward, stop, then the same backward."""
+    return Maneuver.fromSteps("reverseGear", [
+        (2, 25, None, "The car is going forward"),
+        (2, 50, None),
+        (1, 75, None),
+        (2, 0, None, "The car is stopping"),
+        (2, -25, None, "The car is going backward"),
+        (2, -50, None),
+        (1, -75, None),
+        (0, 0, None, "The car is stopping")
+    ])
+
+def uTurn() -> Maneuver:
+    """U-turn in four back and forth moves."""
+    steps = [(1, -25, -100), (1, 10, 20)] * 4
+    return Maneuver.fromSteps("uTurn", steps + [(1, 40, 0), (0, 0, None)])
+
+def circle(direction: str = "left", duration: float = 10) -> Maneuver:
+    """Full steering circle to the left or to the right."""
+    if direction.lower() == "left":
+        angle = -100
+    elif direction.lower() == "right":
+        angle = 100
+    else:
+        raise ValueError("Direction must be 'left' or 'right'")
+    return Maneuver.fromSteps("circle", [(duration, 50, angle), (0, 0, 0)])
+
+def eightTurn(turns: int = 1) -> Maneuver:
+    """Figure of eight, one left and one right circle per turn."""
+    steps = [
+        (8, 40, -100, "eightTurn: Turning left"),
+        (6, 40, 90, "eightTurn: Turning right")
+    ] * turns
+    return Maneuver.fromSteps("eightTurn", steps + [(0, 0, 0)])
+
+def zigzag() -> Maneuver:
+    """
+    Avoidance of an obstacle, to the right then to the left, at the current speed.
+    It is not preempted by the obstacle it goes around: a preempted zigzag would leave the car stopped.
+    """
+    return Maneuver.fromSteps("zigzag", [
+        (1.2, None, 80),
+        (1.5, None, -90),
+        (0, None, 0)
+    ], obstacleDistance=None)
+
+BUILTINS = {
+    "startCar": startCar,
+    "reverseGear": reverseGear,
+    "uTurn": uTurn,
+    "circle": circle,
+    "eightTurn": eightTurn,
+    "zigzag": zigzag
+}
@@ -0,0 +1,178 @@
+import json
+import bisect
+
+"""
+Module for the Calibration class.
+This class holds the steering and throttle calibration of a car
+and compiles it into lookup tables, so that converting a command into
+a PCA9685 duty cycle is a single table index.
+"""
+
+class Calibration:
+    """
+    Servo and motor calibration of one car.
+
+    The steering points map a steering percentage (-100 to 100) to a servo pulse width in ms.
+    The throttle points map a speed percentage (0 to 100) to the percentage of PWM really applied
+    to the motors (e.g. to skip the dead band of the motors).
+    Between two points the values are linearly interpolated.
+
+    Calibration file (JSON):
+        {
+            "name": "LamboCar",
+            "frequency": 50,
+            "steering": [[-100, 1.1667], [0, 1.4444], [100, 1.7222]],
+            "throttle": [[0, 0], [100, 100]]
+        }
+
+    Attributes:
+        steeringPoints (list): (steering %, pulse ms) pairs.
+        throttlePoints (list): (speed %, output %) pairs.
+        frequency (float): PWM frequency of the PCA9685 in Hz.
+        resolution (float): Step in percent between two entries of the lookup tables.
+        name (str): Name of the calibrated car.
+    """
+    def __init__(self, steeringPoints, throttlePoints=None, frequency: float = 50, resolution: float = 0.1, name: str = ""):
+        if resolution <= 0:
+            raise ValueError("Resolution must be positive.")
+        self.__steeringPoints = self.__checkPoints(steeringPoints, "steering")
+        self.__throttlePoints = self.__checkPoints(throttlePoints if throttlePoints else [[0, 0], [100, 100]], "throttle")
+        self.__frequency = frequency
+        self.__resolution = resolution
+        self.__name = name
+
+        periodMs = 1000.0 / frequency
+        self.__steeringTable = [
+            int(pulse / periodMs * 65535)
+            for pulse in self.__sample(self.__steeringPoints, -100, 100)
+        ]
+        self.__throttleTable = [
+            int(min(100.0, max(0.0, output)) / 100.0 * 65535)
+            for output in self.__sample(self.__throttlePoints, 0, 100)
+        ]
+
+    @classmethod
+    def fromServo(cls, servo, resolution: float = 0.1):
+        """
+        Builds the calibration from the geometry of a ServoMotor (center angle, range and pulse widths).
+        """
+        points = []
+        for steering in (-100, 0, 100):
+            angle = servo.centerAngle + (steering / 100.0) * servo.rangeDegrees
+            pulse = servo.minPulse + (servo.maxPulse - servo.minPulse) * (angle / 180.0)
+            points.append([steering, pulse])
+        return cls(points, frequency=servo.frequency, resolution=resolution, name="default")
+
+    @classmethod
+    def load(cls, path: str, resolution: float = 0.1):
+        """
+        Reads a calibration file.
+        Raises:
+            ValueError: If the file content is not a valid calibration.
+        """
+        with open(path, "r") as file:
+            data = json.load(file)
+        try:
+            return cls(
+                data["steering"],
+                data.get("throttle"),
+                data.get("frequency", 50),
+                resolution,
+                data.get("name", "")
+            )
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"Invalid calibration file {path}: {e}")
+
+    def save(self, path: str) -> None:
+        """
+        Writes the calibration points in a file readable by load().
+        """
+        with open(path, "w") as file:
+            json.dump({
+                "name": self.__name,
+                "frequency": self.__frequency,
+                "steering": self.__steeringPoints,
+                "throttle": self.__throttlePoints
+            }, file, indent=4)
+
+    @property
+    def name(self):
+        return self.__name
+
+    @property
+    def frequency(self):
+        return self.__frequency
+
+    @property
+    def resolution(self):
+        return self.__resolution
+
+    @property
+    def steeringPoints(self):
+        return [list(point) for point in self.__steeringPoints]
+
+    @property
+    def throttlePoints(self):
+        return [list(point) for point in self.__throttlePoints]
+
+    def steeringToDuty(self, steering: float) -> int:
+        """
+        Returns the 16-bit duty cycle of the servo for a steering percentage (clamped to -100..100).
+        """
+        if steering <= -100:
+            return self.__steeringTable[0]
+        if steering >= 100:
+            return self.__steeringTable[-1]
+        return self.__steeringTable[int((steering + 100) / self.__resolution + 0.5)]
+
+    def speedToDuty(self, speed: float) -> int:
+        """
+        Returns the 16-bit duty cycle of the motors for a speed percentage (absolute value, clamped to 0..100).
+        """
+        speed = abs(speed)
+        if speed >= 100:
+            return self.__throttleTable[-1]
+        return self.__throttleTable[int(speed / self.__resolution + 0.5)]
+
+    def steeringToDuties(self, steerings) -> list:
+        """
+        Batch version of steeringToDuty.
+        """
+        steeringToDuty = self.steeringToDuty
+        return [steeringToDuty(steering) for steering in steerings]
+
+    def speedsToDuties(self, speeds) -> list:
+        """
+        Batch version of speedToDuty.
+        """
+        speedToDuty = self.speedToDuty
+        return [speedToDuty(speed) for speed in speeds]
+
+    @staticmethod
+    def __checkPoints(points, label) -> list:
+        points = sorted([float(x), float(y)] for x, y in points)
+        if len(points) < 2:
+            raise ValueError(f"At least two {label} points are required.")
+        for (x0, _), (x1, _) in zip(points, points[1:]):
+            if x0 == x1:
+                raise ValueError(f"Duplicate {label} point at {x0}.")
+        return points
+
+    def __sample(self, points, start, end) -> list:
+        """
+        Interpolates the points on every step of the table, values outside the points are clamped.
+        """
+        xs = [x for x, _ in points]
+        size = int(round((end - start) / self.__resolution)) + 1
+        values = []
+        for i in range(size):
+            x = start + i * self.__resolution
+            if x <= xs[0]:
+                values.append(points[0][1])
+            elif x >= xs[-1]:
+                values.append(points[-1][1])
+            else:
+                j = bisect.bisect_right(xs, x)
+                (x0, y0), (x1, y1) = points[j - 1], points[j]
+                values.append(y0 + (y1 - y0) * (x - x0) / (x1 - x0))
+        return values
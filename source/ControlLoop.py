@@ -0,0 +1,126 @@
+import logging
+import Hardware
+from LatencyStats import LatencyStats
+
+"""
+Module for the ControlLoop class.
+This class calls a control function at a fixed rate against absolute deadlines,
+and measures how well the rate is kept.
+"""
+
+class ControlLoop:
+    """
+    Fixed-rate loop runner.
+
+    Tick k is due at start + k * period. The loop sleeps until the next deadline instead
+    of sleeping a fixed delay after each tick, so the time spent in the tick does not slow the rate down.
+    When a tick ends after the next deadline, the loop counts an overrun and skips the deadlines
+    already missed to stay on the same time grid.
+
+    Attributes:
+        frequency (float): Target number of ticks per second.
+        clock: Object with nowNs() and sleep() methods, the clock of the hardware backend by default.
+    """
+    def __init__(self, frequency: float, clock=None):
+        if frequency <= 0:
+            raise ValueError("Frequency must be positive.")
+        self.__frequency = frequency
+        self.__periodNs = int(1e9 / frequency)
+        self.__clock = clock if clock else Hardware.clock()
+        self.__running = False
+        self.__ticks = 0
+        self.__overruns = 0
+        self.__missedTicks = 0
+        self.__jitter = LatencyStats()
+        self.__latency = LatencyStats()
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def frequency(self):
+        return self.__frequency
+
+    @property
+    def clock(self):
+        return self.__clock
+
+    @property
+    def running(self):
+        return self.__running
+
+    @property
+    def ticks(self):
+        return self.__ticks
+
+    @property
+    def overruns(self):
+        return self.__overruns
+
+    @property
+    def missedTicks(self):
+        return self.__missedTicks
+
+    @property
+    def jitter(self) -> LatencyStats:
+        return self.__jitter
+
+    @property
+    def latency(self) -> LatencyStats:
+        return self.__latency
+
+    def stop(self) -> None:
+        """
+        Asks the loop to end after the current tick.
+        """
+        self.__running = False
+
+    def run(self, tick, maxTicks: int = None) -> None:
+        """
+        Calls tick() at the target frequency until it returns False,
+        stop() is called or maxTicks ticks have been run.
+        """
+        clock = self.__clock
+        period = self.__periodNs
+        self.__running = True
+        deadline = clock.nowNs()
+        count = 0
+        try:
+            while self.__running and (maxTicks is None or count < maxTicks):
+                now = clock.nowNs()
+                if now < deadline:
+                    clock.sleep((deadline - now) / 1e9)
+                    now = clock.nowNs()
+                self.__jitter.record(now - deadline)
+
+                result = tick()
+
+                end = clock.nowNs()
+                self.__latency.record(end - now)
+                self.__ticks += 1
+                count += 1
+
+                deadline += period
+                if end > deadline:
+                    missed = (end - deadline) // period + 1
+                    self.__overruns += 1
+                    self.__missedTicks += missed
+                    deadline += missed * period
+
+                if result is False:
+                    break
+        finally:
+            self.__running = False
+
+    def stats(self) -> dict:
+        """
+        Returns the tick count, the overruns and the jitter/latency statistics in microseconds.
+        Jitter is the delay between the deadline and the actual start of a tick,
+        latency is the time spent in the tick function.
+        """
+        return {
+            "frequency": self.__frequency,
+            "ticks": self.__ticks,
+            "overruns": self.__overruns,
+            "missedTicks": self.__missedTicks,
+            "jitter": self.__jitter.summary(),
+            "latency": self.__latency.summary()
+        }
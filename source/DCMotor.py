@@ -1,4 +1,4 @@
-import RPi.GPIO as GPIO
+from Hardware import GPIO
 """
 DCMotor class for controlling a DC motor using GPIO pins on a Raspberry Pi.
 This class allows you to set the direction of the motor and stop it.
@@ -0,0 +1,184 @@
+import threading
+import time
+import logging
+import Hardware
+
+"""
+Module for the DistanceSampler class.
+This class samples one ultrasonic sensor in a background thread
+so that the latest distance can be read without waiting for an echo.
+"""
+
+class DistanceSampler:
+    """
+    Long-lived sampler for a DistanceSensor.
+
+    Without a filter, the readings are stored in a ring buffer allocated once, and the average of
+    the valid readings of the window is updated in O(1) after each sample.
+    With a filter (MedianFilter, AlphaBetaFilter...), each reading updates the filter
+    and the latest distance is its estimate.
+
+    Attributes:
+        sensor: Sensor with a readValue() method returning a distance or None.
+        rateHz (float): Number of readings per second.
+        windowSize (int): Number of readings kept in the ring buffer.
+        clock: Clock timestamping and pacing the samples, the clock of the hardware backend by default.
+        filter: Object with an update(value, timestampNs) method returning (estimate, confidence), or None.
+    """
+    def __init__(self, sensor, rateHz: float = 20, windowSize: int = 5, clock=None, filter=None):
+        if rateHz <= 0:
+            raise ValueError("Sampling rate must be positive.")
+        if windowSize < 1:
+            raise ValueError("Window size must be at least 1.")
+        self.__sensor = sensor
+        self.__rateHz = rateHz
+        self.__ring = [None] * windowSize
+        self.__index = 0
+        self.__sum = 0.0
+        self.__count = 0
+        self.__filter = filter
+        self.__latest = (None, None, 0.0)
+        self.__samples = 0
+        self.__ready = threading.Event()
+        self.__stop = threading.Event()
+        self.__thread = None
+        self.__clock = clock if clock else Hardware.clock()
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def sensor(self):
+        return self.__sensor
+
+    @property
+    def rateHz(self):
+        return self.__rateHz
+
+    @rateHz.setter
+    def rateHz(self, rateHz):
+        if rateHz <= 0:
+            raise ValueError("Sampling rate must be positive.")
+        self.__rateHz = rateHz
+
+    @property
+    def windowSize(self):
+        return len(self.__ring)
+
+    @property
+    def samples(self):
+        return self.__samples
+
+    @property
+    def running(self):
+        return self.__thread is not None and self.__thread.is_alive()
+
+    @property
+    def filter(self):
+        return self.__filter
+
+    @property
+    def latest(self):
+        """Filtered distance of the last sample, or None if no valid reading is in the window."""
+        return self.__latest[0]
+
+    @property
+    def confidence(self) -> float:
+        """Confidence (0 to 1) of the latest distance."""
+        return self.__latest[2]
+
+    def snapshot(self, maxAge: float = None):
+        """
+        Returns the filtered distance and the time of the sample that produced it (clock time in ns).
+        The distance is None if it is older than maxAge seconds.
+        """
+        value, timestamp, _ = self.__latest
+        if maxAge is not None and timestamp is not None:
+            if self.__clock.nowNs() - timestamp > maxAge * 1e9:
+                value = None
+        return value, timestamp
+
+    def estimate(self, maxAge: float = None):
+        """
+        Same as snapshot, with the confidence of the distance as third value (0 when it is too old).
+        """
+        value, timestamp, confidence = self.__latest
+        if maxAge is not None and timestamp is not None:
+            if self.__clock.nowNs() - timestamp > maxAge * 1e9:
+                value, confidence = None, 0.0
+        return value, timestamp, confidence
+
+    def addSample(self, value) -> None:
+        """
+        Stores a reading in the ring buffer and updates the average of the valid readings,
+        or updates the filter.
+        """
+        if self.__filter is not None:
+            now = self.__clock.nowNs()
+            estimate, confidence = self.__filter.update(value, now)
+            self.__samples += 1
+            self.__latest = (estimate, now, confidence)
+            self.__ready.set()
+            return
+
+        evicted = self.__ring[self.__index]
+        if evicted is not None:
+            self.__sum -= evicted
+            self.__count -= 1
+        self.__ring[self.__index] = value
+        if value is not None:
+            self.__sum += value
+            self.__count += 1
+        self.__index = (self.__index + 1) % len(self.__ring)
+        self.__samples += 1
+
+        average = round(self.__sum / self.__count, 1) if self.__count else None
+        self.__latest = (average, self.__clock.nowNs(), self.__count / len(self.__ring))
+        self.__ready.set()
+
+    def sampleOnce(self):
+        """
+        Reads the sensor once and stores the reading.
+        """
+        try:
+            value = self.__sensor.readValue()
+        except Exception as e:
+            self.logger.error(f"Error while sampling distance sensor: {e}")
+            value = None
+        self.addSample(value)
+        return value
+
+    def waitReady(self, timeout: float = None) -> bool:
+        """
+        Waits until the first sample is stored.
+        """
+        return self.__ready.wait(timeout)
+
+    def start(self) -> None:
+        """
+        Starts the sampling thread.
+        """
+        if self.running:
+            return
+        self.__stop.clear()
+        self.__thread = threading.Thread(target=self.__run, daemon=True)
+        self.__thread.start()
+
+    def stop(self, timeout: float = 1.0) -> None:
+        """
+        Stops the sampling thread and waits for it to end.
+        """
+        self.__stop.set()
+        if self.__thread is not None:
+            self.__thread.join(timeout)
+            self.__thread = None
+
+    def __run(self):
+        scale = getattr(self.__clock, "scale", 1.0)
+        next_time = time.perf_counter()
+        while not self.__stop.is_set():
+            self.sampleOnce()
+            next_time += 1.0 / (self.__rateHz * scale)
+            delay = next_time - time.perf_counter()
+            if delay < 0:
+                next_time = time.perf_counter()
+                delay = 0
+            self.__stop.wait(delay)
@@ -1,5 +1,7 @@
-import RPi.GPIO as GPIO
+from Hardware import GPIO
+import Hardware
 import time
+import threading
 from Sensor import Sensor
 import logging
 
@@ -13,51 +15,147 @@ class DistanceSensor(Sensor):
         pinTrig (int): GPIO pin number for the trigger.
         pinEcho (int): GPIO pin number for the echo.
         side (str): Side of the robot (e.g., "front", "left", "right").
+        edgeCapture (bool): Timestamp the echo edges from GPIO callbacks instead of polling the echo pin.
+        gpio: GPIO backend to use instead of the hardware one (e.g. a FakeGPIO).
+        clock: Clock timestamping the echo edges, the clock of the hardware backend by default.
     """
-    def __init__(self, pinTrig: int, pinEcho: int, side: str):
+    def __init__(self, pinTrig: int, pinEcho: int, side: str, edgeCapture: bool = False, gpio=None, clock=None):
         self.__pinTrig = pinTrig
         self.__pinEcho = pinEcho
         self.__side = side.capitalize()
+        self.__gpio = gpio
+        self.__edgeCapture = edgeCapture
+        self.__riseNs = None
+        self.__fallNs = None
+        self.__echoDone = threading.Event()
+        self.__clock = clock if clock else Hardware.clock()
         self.logger = logging.getLogger(__name__)
 
-        GPIO.setup(self.__pinTrig, GPIO.OUT)
-        GPIO.setup(self.__pinEcho, GPIO.IN)
+        gpio = self.__backend()
+        gpio.setup(self.__pinTrig, gpio.OUT)
+        gpio.setup(self.__pinEcho, gpio.IN)
+        if self.__edgeCapture:
+            try:
+                gpio.add_event_detect(self.__pinEcho, gpio.BOTH, callback=self.__onEchoEdge)
+            except RuntimeError as e:
+                self.logger.warning(f"[{self.__side}] Edge detection unavailable, polling the echo pin: {e}")
+                self.__edgeCapture = False
     
     @property
     def side(self):
         return self.__side
 
+    @property
+    def edgeCapture(self):
+        return self.__edgeCapture
+
+    def __backend(self):
+        """Return the injected GPIO backend, or the hardware GPIO module by default."""
+        return self.__gpio if self.__gpio is not None else GPIO
+
+    def reopen(self):
+        """
+        Register the edge detection of the echo pin again, in a process forked after the sensor was created
+        (the GPIO callbacks of the parent process are not running in the child).
+        """
+        if self.__edgeCapture:
+            gpio = self.__backend()
+            gpio.remove_event_detect(self.__pinEcho)
+            self.__echoDone = threading.Event()
+            gpio.add_event_detect(self.__pinEcho, gpio.BOTH, callback=self.__onEchoEdge)
+
+    def close(self):
+        """
+        Stop the edge detection on the echo pin.
+        """
+        if self.__edgeCapture:
+            self.__backend().remove_event_detect(self.__pinEcho)
+
+    def __onEchoEdge(self, channel):
+        """
+        GPIO edge callback, timestamps the echo edges as soon as they are reported.
+        The first edge after a trigger is the rising one, the second one is the falling one.
+        """
+        now = self.__clock.nowNs()
+        if self.__riseNs is None:
+            self.__riseNs = now
+        elif self.__fallNs is None:
+            self.__fallNs = now
+            self.__echoDone.set()
+
+    def __captureEcho(self, gpio) -> float:
+        """
+        Send a trigger pulse and wait for the echo edges reported by the GPIO callbacks.
+        Returns:
+            float: Duration of the echo in seconds.
+        """
+        if gpio.input(self.__pinEcho) == 1:
+            self.logger.error("Echo line is still busy.")
+            raise TimeoutError("Echo line is still busy.")
+
+        self.__riseNs = None
+        self.__fallNs = None
+        self.__echoDone.clear()
+
+        gpio.output(self.__pinTrig, True)
+        time.sleep(0.00001)
+        gpio.output(self.__pinTrig, False)
+
+        if not self.__echoDone.wait(0.1):
+            if self.__riseNs is None:
+                self.logger.error("Start signal is too long.")
+                raise TimeoutError("Start signal is too long.")
+            self.logger.error("End of the signal is too long.")
+            raise TimeoutError("End of the signal is too long.")
+
+        return (self.__fallNs - self.__riseNs) / 1e9
+
+    def __pollEcho(self, gpio) -> float:
+        """
+        Send a trigger pulse and busy-wait on the echo pin.
+        Returns:
+            float: Duration of the echo in seconds.
+        """
+        gpio.output(self.__pinTrig, True)
+        time.sleep(0.00001)
+        gpio.output(self.__pinTrig, False)
+
+        start_time = time.time()
+        timeout = start_time + 0.05
+        while gpio.input(self.__pinEcho) == 0:
+            start_time = time.time()
+            if start_time > timeout:
+                self.logger.error("Start signal is too long.")
+                raise TimeoutError("Start signal is too long.")
+
+        stop_time = time.time()
+        timeout = stop_time + 0.05
+        while gpio.input(self.__pinEcho) == 1:
+            stop_time = time.time()
+            if stop_time > timeout:
+                self.logger.error("End of the signal is too long.")
+                raise TimeoutError("End of the signal is too long.")
+
+        return stop_time - start_time
+
     def readValue(self) -> float:
         """
         Measure the distance using the ultrasonic sensor.  
         Sends a trigger signal and waits for the echo signal to calculate the distance.
+        In edge capture mode the echo is timestamped by GPIO callbacks,
+        otherwise the echo pin is polled.
         Returns:
             float: Distance in centimeters.
             Raises:
                 TimeoutError: If the signal duration is too long.
                 ValueError: If the distance is out of range or invalid."""
         try:
-            GPIO.output(self.__pinTrig, True)
-            time.sleep(0.00001)
-            GPIO.output(self.__pinTrig, False)
-
-            start_time = time.time()
-            timeout = start_time + 0.05
-            while GPIO.input(self.__pinEcho) == 0:
-                start_time = time.time()
-                if start_time > timeout:
-                    self.logger.error("Start signal is too long.")
-                    raise TimeoutError("Start signal is too long.")
+            gpio = self.__backend()
+            if self.__edgeCapture:
+                duration = self.__captureEcho(gpio)
+            else:
+                duration = self.__pollEcho(gpio)
 
-            stop_time = time.time()
-            timeout = stop_time + 0.05
-            while GPIO.input(self.__pinEcho) == 1:
-                stop_time = time.time()
-                if stop_time > timeout:
-                    self.logger.error("End of the signal is too long.")
-                    raise TimeoutError("End of the signal is too long.")
-
-            duration = stop_time - start_time
             if duration <= 0:
                 self.logger.error("Invalid duration.")
                 raise ValueError("Invalid duration.")
@@ -71,7 +169,5 @@ class DistanceSensor(Sensor):
             return distance
 
         except Exception as e:
-            print(f"[{self.__side}] Error : {e}")
             self.logger.error(f"[{self.__side}] Error : {e}")
             return None
-        
\ No newline at end of file
@@ -0,0 +1,174 @@
+import threading
+from SystemClock import SystemClock
+
+"""
+Module for the FakeGPIO class.
+This class mimics the subset of the RPi.GPIO module used by the LamboCar
+so that the sensors and motors can be tested and benchmarked without a Raspberry Pi.
+It can also simulate the echo of an HC-SR04 ultrasonic sensor.
+"""
+
+class FakeGPIO:
+    """
+    In-memory replacement for the RPi.GPIO module.
+
+    Output levels are stored per pin, input levels are set with setInput()
+    and edge callbacks registered with add_event_detect() are fired from the
+    thread that changes the level, like the RPi.GPIO callback thread.
+
+    Attributes:
+        echoDelay (float): Delay in seconds between the end of the trigger pulse
+            and the rising edge of a simulated echo.
+        clock: Clock used to time the simulated echoes, SystemClock by default.
+        threadedEcho (bool): Emit the echoes from a background thread like the real sensor.
+            When False, the echo is emitted during the output() call that ends the trigger pulse,
+            which is deterministic with a VirtualClock.
+    """
+    BCM = 11
+    BOARD = 10
+    OUT = 0
+    IN = 1
+    LOW = 0
+    HIGH = 1
+    PUD_OFF = 20
+    PUD_DOWN = 21
+    PUD_UP = 22
+    RISING = 31
+    FALLING = 32
+    BOTH = 33
+
+    def __init__(self, echoDelay: float = 0.0005, clock=None, threadedEcho: bool = True):
+        self.__mode = None
+        self.__directions = {}
+        self.__levels = {}
+        self.__events = {}
+        self.__echoes = {}
+        self.__lock = threading.RLock()
+        self.echoDelay = echoDelay
+        self.__clock = clock if clock else SystemClock()
+        self.__threadedEcho = threadedEcho
+
+    @property
+    def clock(self):
+        return self.__clock
+
+    @property
+    def mode(self):
+        return self.__mode
+
+    def setmode(self, mode):
+        self.__mode = mode
+
+    def getmode(self):
+        return self.__mode
+
+    def setwarnings(self, flag):
+        pass
+
+    def setup(self, pin, direction, pull_up_down=None, initial=None):
+        with self.__lock:
+            self.__directions[pin] = direction
+            if initial is not None:
+                self.__levels[pin] = int(bool(initial))
+            else:
+                self.__levels.setdefault(pin, self.LOW)
+
+    def output(self, pin, value):
+        """
+        Set the level of an output pin.
+        A falling edge on a trigger pin registered with attachEcho() starts a simulated echo.
+        """
+        value = int(bool(value))
+        with self.__lock:
+            previous = self.__levels.get(pin, self.LOW)
+            self.__levels[pin] = value
+            echo = self.__echoes.get(pin)
+        if echo is not None and previous == self.HIGH and value == self.LOW:
+            if self.__threadedEcho:
+                threading.Thread(target=self.__emitEcho, args=echo, daemon=True).start()
+            else:
+                self.__emitEcho(*echo)
+
+    def input(self, pin):
+        with self.__lock:
+            return self.__levels.get(pin, self.LOW)
+
+    def add_event_detect(self, pin, edge, callback=None, bouncetime=None):
+        with self.__lock:
+            if pin in self.__events:
+                raise RuntimeError("Conflicting edge detection already enabled for this GPIO channel")
+            self.__events[pin] = [edge, [callback] if callback else []]
+
+    def add_event_callback(self, pin, callback):
+        with self.__lock:
+            if pin not in self.__events:
+                raise RuntimeError("Add event detection using add_event_detect first before adding a callback")
+            self.__events[pin][1].append(callback)
+
+    def remove_event_detect(self, pin):
+        with self.__lock:
+            self.__events.pop(pin, None)
+
+    def cleanup(self, pin=None):
+        with self.__lock:
+            pins = [pin] if pin is not None else list(self.__directions)
+            for p in pins:
+                self.__directions.pop(p, None)
+                self.__levels.pop(p, None)
+                self.__events.pop(p, None)
+                self.__echoes.pop(p, None)
+
+    def setInput(self, pin, value):
+        """
+        Drive the level of an input pin as the hardware would.
+        Fires the edge callbacks registered on the pin when the level changes.
+        """
+        value = int(bool(value))
+        with self.__lock:
+            previous = self.__levels.get(pin, self.LOW)
+            self.__levels[pin] = value
+            event = self.__events.get(pin)
+            callbacks = list(event[1]) if event else []
+        if previous == value or not callbacks:
+            return
+        edge = event[0]
+        if edge == self.BOTH or (edge == self.RISING) == (value == self.HIGH):
+            for callback in callbacks:
+                callback(pin)
+
+    def attachEcho(self, pinTrig, pinEcho, distance):
+        """
+        Simulate an HC-SR04 wired on pinTrig/pinEcho.
+
+        Args:
+            distance (float | callable): Distance of the obstacle in centimeters,
+                or a function returning it. None means no echo is returned.
+        """
+        with self.__lock:
+            self.__echoes[pinTrig] = (pinEcho, distance)
+
+    def __emitEcho(self, pinEcho, distance):
+        if callable(distance):
+            distance = distance()
+        if distance is None:
+            return
+        self.__wait(self.echoDelay)
+        self.setInput(pinEcho, self.HIGH)
+        self.__wait(distance / 17150)
+        self.setInput(pinEcho, self.LOW)
+
+    def __wait(self, seconds):
+        """
+        Waits on the clock. With a clock running in real time, sleep until shortly
+        before the deadline, then spin to hit it precisely: an overshoot of the sleep
+        would be measured as distance. A VirtualClock is only advanced.
+        """
+        if not self.__threadedEcho and not hasattr(self.__clock, "scale"):
+            self.__clock.sleep(seconds)
+            return
+        deadlineNs = self.__clock.nowNs() + int(seconds * 1e9)
+        remaining = deadlineNs - self.__clock.nowNs()
+        if remaining > 300_000:
+            self.__clock.sleep((remaining - 300_000) / 1e9)
+        while self.__clock.nowNs() < deadlineNs:
+            pass
@@ -0,0 +1,175 @@
+import threading
+import time
+import logging
+import Hardware
+
+"""
+Module for the FiringScheduler class.
+This class fires the ultrasonic sensors one after the other so that
+the echo of one sensor is never received by another one.
+"""
+
+class FiringScheduler:
+    """
+    Orders the trigger pulses of several DistanceSamplers in time slots.
+
+    A slot fires one sensor and lasts until its echo is received (or timed out),
+    followed by a guard time letting the residual echoes fade out.
+    Only one sensor is in flight at a time, and the next one fires as soon as
+    the guard time is over, which gives the highest rate without cross-talk.
+    A slot period can bound the rate: a slot then starts at least slotPeriod after the previous one.
+    A policy (e.g. AdaptiveSamplingPolicy) can change the slots and the slot period
+    before each round of slots.
+
+    Attributes:
+        samplers (dict): DistanceSamplers by name (e.g. "Front", "Left", "Right").
+        slots (str | list): "roundRobin", "frontPriority" or an explicit list of sampler names.
+        guardTime (float): Silence in seconds between two slots.
+        clock: Clock used to measure the rates and to time the guard of the thread,
+            the clock of the hardware backend by default.
+        slotPeriod (float): Minimum time in seconds between the start of two slots, 0 for no limit.
+        policy: Object with an apply(scheduler) method called at the start of each round of slots, or None.
+    """
+    def __init__(self, samplers: dict, slots="roundRobin", guardTime: float = 0.01, clock=None, slotPeriod: float = 0.0, policy=None):
+        if not samplers:
+            raise ValueError("At least one sampler is required.")
+        if guardTime < 0:
+            raise ValueError("Guard time must not be negative.")
+        self.__samplers = dict(samplers)
+        self.__slots = self.__buildSlots(slots)
+        self.__guardTime = guardTime
+        self.__slotPeriod = slotPeriod
+        self.__policy = policy
+        self.__slotIndex = 0
+        self.__counts = {name: 0 for name in self.__samplers}
+        self.__firstNs = {name: None for name in self.__samplers}
+        self.__lastNs = {name: None for name in self.__samplers}
+        self.__stop = threading.Event()
+        self.__thread = None
+        self.__clock = clock if clock else Hardware.clock()
+        self.logger = logging.getLogger(__name__)
+
+    def __buildSlots(self, slots) -> list:
+        names = list(self.__samplers)
+        if slots == "roundRobin":
+            return names
+        if slots == "frontPriority":
+            if "Front" not in self.__samplers:
+                raise ValueError("frontPriority needs a 'Front' sampler.")
+            others = [name for name in names if name != "Front"]
+            plan = []
+            for name in others:
+                plan += ["Front", name]
+            return plan if plan else ["Front"]
+        slots = list(slots)
+        unknown = [name for name in slots if name not in self.__samplers]
+        if unknown or not slots:
+            raise ValueError(f"Invalid slots: {slots}")
+        return slots
+
+    @property
+    def samplers(self):
+        return self.__samplers
+
+    @property
+    def slots(self):
+        return list(self.__slots)
+
+    @slots.setter
+    def slots(self, slots):
+        self.__slots = self.__buildSlots(slots)
+        self.__slotIndex = 0
+
+    @property
+    def guardTime(self):
+        return self.__guardTime
+
+    @property
+    def slotPeriod(self):
+        return self.__slotPeriod
+
+    @slotPeriod.setter
+    def slotPeriod(self, slotPeriod):
+        if slotPeriod < 0:
+            raise ValueError("Slot period must not be negative.")
+        self.__slotPeriod = slotPeriod
+
+    @property
+    def policy(self):
+        return self.__policy
+
+    @property
+    def running(self):
+        return self.__thread is not None and self.__thread.is_alive()
+
+    def step(self) -> str:
+        """
+        Fires the sensor of the next slot and stores its reading.
+        Returns the name of the sampler that was fired.
+        """
+        if self.__slotIndex == 0 and self.__policy is not None:
+            self.__policy.apply(self)
+        slots = self.__slots
+        index = self.__slotIndex % len(slots)
+        name = slots[index]
+        self.__slotIndex = (index + 1) % len(slots)
+        self.__samplers[name].sampleOnce()
+
+        now = self.__clock.nowNs()
+        if self.__firstNs[name] is None:
+            self.__firstNs[name] = now
+        self.__lastNs[name] = now
+        self.__counts[name] += 1
+        return name
+
+    def effectiveRates(self) -> dict:
+        """
+        Returns the measured number of readings per second of each sampler.
+        """
+        rates = {}
+        for name, count in self.__counts.items():
+            first, last = self.__firstNs[name], self.__lastNs[name]
+            if count < 2 or last == first:
+                rates[name] = 0.0
+            else:
+                rates[name] = round((count - 1) / ((last - first) / 1e9), 1)
+        return rates
+
+    def counts(self) -> dict:
+        """
+        Returns the number of readings of each sampler since the last resetStats.
+        """
+        return dict(self.__counts)
+
+    def resetStats(self) -> None:
+        for name in self.__counts:
+            self.__counts[name] = 0
+            self.__firstNs[name] = None
+            self.__lastNs[name] = None
+
+    def start(self) -> None:
+        """
+        Starts the firing thread.
+        """
+        if self.running:
+            return
+        self.__stop.clear()
+        self.__thread = threading.Thread(target=self.__run, daemon=True)
+        self.__thread.start()
+
+    def stop(self, timeout: float = 1.0) -> None:
+        """
+        Stops the firing thread and waits for it to end.
+        """
+        self.__stop.set()
+        if self.__thread is not None:
+            self.__thread.join(timeout)
+            self.__thread = None
+
+    def __run(self):
+        scale = getattr(self.__clock, "scale", 1.0)
+        while not self.__stop.is_set():
+            start = time.perf_counter()
+            self.step()
+            elapsed = time.perf_counter() - start
+            self.__stop.wait(max(self.__guardTime / scale, self.__slotPeriod / scale - elapsed))
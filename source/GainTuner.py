@@ -0,0 +1,240 @@
+import argparse
+import csv
+import itertools
+import logging
+import math
+import os
+import sys
+from data.ControllerGains import ControllerGains
+
+"""
+Module for the GainTuner class.
+This class searches the gains and thresholds of stayMid: every combination of a grid is driven
+on simulated tracks by a pool of processes, scored, and the ranked results are written in a CSV table.
+
+Usage (from the source directory):
+    python GainTuner.py --kp 6,8,10,12 --minSpeed 35,40,45 --maxSpeed 41,50,60 -o gains.csv
+    python GainTuner.py --kp 8,10 --track mytrack.json --laps 3 --workers 4
+"""
+
+def evaluate(gains: dict, tracks, laps: int, seconds: float) -> dict:
+    """
+    Drives a car with the gains on each track in a virtual simulation.
+    Returns the metrics averaged over the tracks: lap time (s), completed laps, smallest distance
+    from the centre of the car to a wall (cm), steering oscillation (steering change per second)
+    and collisions.
+    """
+    import Hardware
+    from LamboCar import LamboCar
+    from sim.Simulation import Simulation
+
+    runs = []
+    for track in tracks:
+        simulation = Simulation.virtual(track).install()
+        world = simulation.world
+        bus = Hardware.busio.I2C(Hardware.board.SCL, Hardware.board.SDA)
+        lambo = LamboCar(bus, clock=simulation.clock, gains=ControllerGains.fromDict(gains))
+        motorManager = lambo.motorManager
+        state = {"segment": None, "clearance": math.inf, "angle": None, "steering": 0.0}
+
+        def onTick():
+            car = world.car
+            segment, _, lateral = track.locate(car.x, car.y, state["segment"])
+            state["segment"] = segment
+            state["clearance"] = min(state["clearance"], track.width / 2.0 - abs(lateral))
+            angle = motorManager.angle
+            if state["angle"] is not None:
+                state["steering"] += abs(angle - state["angle"])
+            state["angle"] = angle
+
+        simulation.drive(lambo, seconds, maxTours=laps, onTick=onTick)
+        lapTimes = lambo.lapCounter.lapTimes
+        runs.append({
+            "lapTime": sum(lapTimes) / len(lapTimes) / 1e9 if lapTimes else None,
+            "laps": len(lapTimes),
+            "clearance": state["clearance"],
+            "oscillation": state["steering"] / max(world.elapsed, 1e-9),
+            "collisions": world.collisions
+        })
+        Hardware.useBackend(None)
+
+    lapTimes = [run["lapTime"] for run in runs if run["lapTime"] is not None]
+    return {
+        "lapTime": round(sum(lapTimes) / len(lapTimes), 3) if lapTimes else None,
+        "laps": sum(run["laps"] for run in runs),
+        "clearance": round(min(run["clearance"] for run in runs), 1),
+        "oscillation": round(sum(run["oscillation"] for run in runs) / len(runs), 1),
+        "collisions": sum(run["collisions"] for run in runs)
+    }
+
+def _evaluateTask(task) -> dict:
+    """
+    Entry point of the worker processes.
+    """
+    gains, tracks, laps, seconds = task
+    return evaluate(gains, tracks, laps, seconds)
+
+
+class GainTuner:
+    """
+    Parallel grid search of the ControllerGains of stayMid.
+
+    Each combination of the grid is driven for laps laps (at most seconds simulated seconds) on every
+    track, in virtual time, by a pool of processes (one per core by default). Each run is scored,
+    lower being better:
+        lapTime * lapTime weight
+        + missing laps * missingLap weight (laps not completed within seconds)
+        + max(0, targetClearance - clearance) * clearance weight
+        + oscillation * oscillation weight
+        + collisions * collision weight
+    Combinations that are not valid ControllerGains (e.g. maxSpeed < minSpeed) are skipped.
+
+    Attributes:
+        grid (dict): Values of ControllerGains fields to combine, e.g. {"kp": [6, 8, 10]};
+            the other fields keep the defaults of ControllerGains.
+        tracks (list): Simulated tracks (sim.Track), a stadium track by default.
+        laps (int): Laps driven on each track.
+        seconds (float): Simulated time limit of each drive.
+        workers (int): Processes of the pool, the number of cores by default.
+        weights (dict): Weights of the score terms, see WEIGHTS.
+        targetClearance (float): Distance in cm from the centre of the car to the walls under which the run is penalised.
+    """
+    WEIGHTS = {"lapTime": 1.0, "missingLap": 60.0, "clearance": 0.5, "oscillation": 0.05, "collision": 20.0}
+    METRICS = ("lapTime", "laps", "clearance", "oscillation", "collisions")
+
+    def __init__(
+        self,
+        grid: dict,
+        tracks=None,
+        laps: int = 2,
+        seconds: float = 60,
+        workers: int = None,
+        weights: dict = None,
+        targetClearance: float = 15.0
+    ):
+        unknown = set(grid) - set(ControllerGains.FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown gains: {sorted(unknown)}")
+        if laps < 1 or seconds <= 0:
+            raise ValueError("Each run needs at least one lap and a positive time limit.")
+        if tracks is None:
+            from sim.Track import Track
+            tracks = [Track.stadium()]
+        self.__grid = {name: list(values) for name, values in grid.items()}
+        self.__tracks = list(tracks)
+        self.__laps = laps
+        self.__seconds = seconds
+        self.__workers = workers if workers else os.cpu_count() or 1
+        self.__weights = dict(self.WEIGHTS)
+        self.__weights.update(weights or {})
+        self.__targetClearance = targetClearance
+        self.__results = []
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def results(self) -> list:
+        """Ranked results of the last run: dicts with the rank, the score, the gains and the metrics."""
+        return list(self.__results)
+
+    def combinations(self) -> list:
+        """
+        Returns the valid ControllerGains of the grid.
+        """
+        names = list(self.__grid)
+        combinations = []
+        for values in itertools.product(*(self.__grid[name] for name in names)):
+            try:
+                combinations.append(ControllerGains(**dict(zip(names, values))))
+            except ValueError:
+                continue
+        return combinations
+
+    def score(self, metrics: dict) -> float:
+        """
+        Returns the score of the metrics of a combination, lower is better.
+        """
+        weights = self.__weights
+        laps = self.__laps * len(self.__tracks)
+        lapTime = metrics["lapTime"] if metrics["lapTime"] is not None else self.__seconds
+        return round(
+            lapTime * weights["lapTime"]
+            + max(0, laps - metrics["laps"]) * weights["missingLap"]
+            + max(0.0, self.__targetClearance - metrics["clearance"]) * weights["clearance"]
+            + metrics["oscillation"] * weights["oscillation"]
+            + metrics["collisions"] * weights["collision"],
+            3
+        )
+
+    def run(self) -> list:
+        """
+        Evaluates every combination in the process pool and returns the ranked results.
+        """
+        from concurrent.futures import ProcessPoolExecutor
+        combinations = self.combinations()
+        tasks = [(gains.toDict(), self.__tracks, self.__laps, self.__seconds) for gains in combinations]
+        self.logger.info(f"Evaluating {len(tasks)} combinations with {self.__workers} processes")
+        chunksize = max(1, len(tasks) // (self.__workers * 4))
+        with ProcessPoolExecutor(max_workers=self.__workers) as pool:
+            metrics = list(pool.map(_evaluateTask, tasks, chunksize=chunksize))
+
+        results = []
+        for gains, values in zip(combinations, metrics):
+            result = {"score": self.score(values)}
+            result.update(gains.toDict())
+            result.update(values)
+            results.append(result)
+        results.sort(key=lambda result: result["score"])
+        for rank, result in enumerate(results, 1):
+            result["rank"] = rank
+        self.__results = results
+        return self.results
+
+    def save(self, path: str) -> None:
+        """
+        Writes the ranked results of the last run in a CSV file.
+        """
+        fields = ("rank", "score") + ControllerGains.FIELDS + self.METRICS
+        with open(path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(fields)
+            for result in self.__results:
+                writer.writerow([result[field] for field in fields])
+
+
+def parseValues(text: str) -> list:
+    """
+    Returns the values of a comma separated list, e.g. "6,8,10".
+    """
+    return [float(value) for value in text.split(",") if value.strip()]
+
+def main(argv=None):
+    """
+    Runs a grid search of the stayMid gains and writes the ranked table.
+    """
+    parser = argparse.ArgumentParser(description="Grid search of the stayMid gains on simulated tracks.")
+    for field in ControllerGains.FIELDS:
+        parser.add_argument(f"--{field}", type=parseValues, help=f"Comma separated values of {field}.")
+    parser.add_argument("--track", action="append", help="JSON track file (see sim.Track.load), the stadium track by default.")
+    parser.add_argument("--laps", type=int, default=2, help="Laps driven on each track.")
+    parser.add_argument("--seconds", type=float, default=60, help="Simulated time limit of each drive.")
+    parser.add_argument("--workers", type=int, default=None, help="Processes of the pool, one per core by default.")
+    parser.add_argument("-o", "--output", default="gains.csv", help="CSV file receiving the ranked results.")
+    parser.add_argument("--top", type=int, default=10, help="Results printed.")
+    args = parser.parse_args(argv)
+
+    grid = {field: getattr(args, field) for field in ControllerGains.FIELDS if getattr(args, field)}
+    tracks = None
+    if args.track:
+        from sim.Track import Track
+        tracks = [Track.load(path) for path in args.track]
+    logging.disable(logging.WARNING)
+    tuner = GainTuner(grid, tracks, args.laps, args.seconds, args.workers)
+    results = tuner.run()
+    tuner.save(args.output)
+    for result in results[:args.top]:
+        print(result)
+    print(f"{len(results)} combinations ranked in {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
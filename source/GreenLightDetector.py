@@ -0,0 +1,132 @@
+import logging
+import Hardware
+from LatencyStats import LatencyStats
+
+"""
+Module for the GreenLightDetector class.
+This class waits for the start light to turn green with the lowest possible delay,
+and measures the reaction time of the car.
+"""
+
+class GreenLightDetector:
+    """
+    Fast poller of the colour sensor for the race start.
+
+    The colour sensor is set to its fastest integration time and a new frame is read after each
+    integration. The wait until the end of an integration sleeps, except for the last spinBudget
+    seconds which are busy-waited so the frame is read as soon as it is ready.
+    The light is considered green after confirmFrames green frames in a row, so a single
+    flickering frame does not start the car; any other frame resets the count.
+
+    The reaction time is the time between the first frame of the confirmed green streak and the
+    end of the first setSpeed of the car, in microseconds.
+
+    Attributes:
+        sensorManager: SensorManager giving the colour frames and the green predicate.
+        confirmFrames (int): Green frames in a row needed to start.
+        spinBudget (float): Time in seconds busy-waited before each frame instead of sleeping.
+        clock: Clock of the polling loop, the clock of the hardware backend by default.
+    """
+    def __init__(self, sensorManager, confirmFrames: int = 2, spinBudget: float = 0.0005, clock=None):
+        if confirmFrames < 1:
+            raise ValueError("At least one frame is needed to confirm the green light.")
+        if spinBudget < 0:
+            raise ValueError("Spin budget must not be negative.")
+        self.__sensorManager = sensorManager
+        self.__confirmFrames = confirmFrames
+        self.__spinBudget = spinBudget
+        self.__clock = clock if clock else Hardware.clock()
+        self.__reactionTimes = LatencyStats()
+        self.__lastReactionUs = None
+        self.__frames = 0
+        self.__flickers = 0
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def frames(self):
+        """Number of frames read by the last wait."""
+        return self.__frames
+
+    @property
+    def flickers(self):
+        """Number of green streaks shorter than confirmFrames seen by the last wait."""
+        return self.__flickers
+
+    @property
+    def lastReactionUs(self):
+        return self.__lastReactionUs
+
+    @property
+    def reactionTimes(self) -> LatencyStats:
+        """Reaction times of every start, in nanoseconds."""
+        return self.__reactionTimes
+
+    def waitForGreen(self, timeout: float = None):
+        """
+        Polls the colour sensor until the light is green.
+        Returns the clock time (ns) of the first frame of the confirmed green streak,
+        or None if the timeout (in seconds) expires.
+        """
+        clock = self.__clock
+        sensorManager = self.__sensorManager
+        rgbSensor = sensorManager.rgbSensor
+        if hasattr(rgbSensor, "configure"):
+            rgbSensor.configure()
+        periodNs = int(getattr(rgbSensor, "integrationTime", 2.4) * 1e6)
+
+        self.__frames = 0
+        self.__flickers = 0
+        streak = 0
+        firstGreenNs = None
+        endNs = None if timeout is None else clock.nowNs() + int(timeout * 1e9)
+        nextNs = clock.nowNs()
+        while endNs is None or nextNs < endNs:
+            self.__waitUntil(nextNs)
+            frame = sensorManager.readColourFrame(maxAge=0)
+            frameNs = clock.nowNs()
+            self.__frames += 1
+            if sensorManager.isGreen(frame=frame):
+                if streak == 0:
+                    firstGreenNs = frameNs
+                streak += 1
+                if streak >= self.__confirmFrames:
+                    self.logger.info(f"Green light after {self.__frames} frames ({self.__flickers} flickers)")
+                    return firstGreenNs
+            elif streak:
+                self.__flickers += 1
+                streak = 0
+            nextNs = max(nextNs + periodNs, frameNs)
+        self.logger.warning(f"No green light after {timeout} s")
+        return None
+
+    def recordReaction(self, greenNs: int) -> float:
+        """
+        Records the reaction time of a start from the time of the green light until now.
+        Returns it in microseconds.
+        """
+        reactionNs = self.__clock.nowNs() - greenNs
+        self.__reactionTimes.record(reactionNs)
+        self.__lastReactionUs = round(reactionNs / 1000, 1)
+        self.logger.info(f"Reaction time: {self.__lastReactionUs} us")
+        return self.__lastReactionUs
+
+    def __waitUntil(self, deadlineNs: int) -> None:
+        """
+        Sleeps until spinBudget before the deadline, then busy-waits.
+        A clock that does not move by itself (virtual time) sleeps the rest of the time instead.
+        """
+        clock = self.__clock
+        now = clock.nowNs()
+        remaining = (deadlineNs - now) / 1e9
+        if remaining <= 0:
+            return
+        if remaining > self.__spinBudget:
+            clock.sleep(remaining - self.__spinBudget)
+        previous = None
+        now = clock.nowNs()
+        while now < deadlineNs:
+            if now == previous:
+                clock.sleep((deadlineNs - now) / 1e9)
+                return
+            previous = now
+            now = clock.nowNs()
@@ -0,0 +1,97 @@
+import os
+import importlib
+from SystemClock import SystemClock
+
+"""
+Module giving access to the hardware drivers of the LamboCar.
+
+The other modules import GPIO, board, busio and the adafruit drivers from here
+instead of importing them directly. Each name is a proxy that forwards to the
+driver module of the active backend:
+- "pi" (default): RPi.GPIO, board, busio and the adafruit libraries of the Raspberry Pi.
+- "sim": the simulated devices of sim/Simulation.py, driven by a car-and-track model.
+
+The backend is chosen with the LAMBOCAR_HARDWARE environment variable
+or with useBackend() before the first driver is used.
+The backend also gives the clock used by the control loops and the sensors.
+"""
+
+PI_MODULES = {
+    "GPIO": "RPi.GPIO",
+    "board": "board",
+    "busio": "busio",
+    "adafruit_pca9685": "adafruit_pca9685",
+    "adafruit_tcs34725": "adafruit_tcs34725",
+    "adafruit_ina219": "adafruit_ina219",
+    "adafruit_bus_device": "adafruit_bus_device.i2c_device"
+}
+
+class PiBackend:
+    """
+    Backend of the real car, the drivers are the installed Raspberry Pi libraries.
+    """
+    def __init__(self):
+        self.__clock = SystemClock()
+
+    @property
+    def clock(self):
+        return self.__clock
+
+    def module(self, name: str):
+        return importlib.import_module(PI_MODULES[name])
+
+
+class DriverModule:
+    """
+    Proxy of a driver module, attributes are read from the module of the active backend.
+    """
+    def __init__(self, name: str):
+        self.__name = name
+
+    def __getattr__(self, attribute):
+        return getattr(backend().module(self.__name), attribute)
+
+    def __repr__(self):
+        return f"<driver module {self.__name}>"
+
+
+_backend = None
+
+def backend():
+    """
+    Returns the active backend, created from LAMBOCAR_HARDWARE on first use.
+    """
+    global _backend
+    if _backend is None:
+        name = os.environ.get("LAMBOCAR_HARDWARE", "pi").lower()
+        if name == "sim":
+            from sim.Simulation import Simulation
+            _backend = Simulation.fromEnvironment()
+        elif name == "pi":
+            _backend = PiBackend()
+        else:
+            raise ValueError(f"Unknown hardware backend: {name}")
+    return _backend
+
+def useBackend(newBackend) -> None:
+    """
+    Replaces the active backend (e.g. with a Simulation), None goes back to the one of LAMBOCAR_HARDWARE.
+    Drivers already created keep the devices of the previous backend.
+    """
+    global _backend
+    _backend = newBackend
+
+def clock():
+    """
+    Returns the clock of the active backend.
+    """
+    return backend().clock
+
+
+GPIO = DriverModule("GPIO")
+board = DriverModule("board")
+busio = DriverModule("busio")
+adafruit_pca9685 = DriverModule("adafruit_pca9685")
+adafruit_tcs34725 = DriverModule("adafruit_tcs34725")
+adafruit_ina219 = DriverModule("adafruit_ina219")
+adafruit_bus_device = DriverModule("adafruit_bus_device")
@@ -0,0 +1,113 @@
+"""
+Module for the HdrHistogram class.
+This class records durations with a fixed relative precision over a wide range (HDR histogram),
+so the percentiles of a call can be read without keeping every duration.
+"""
+
+class HdrHistogram:
+    """
+    Histogram of durations in nanoseconds with log-linear buckets.
+
+    Each power of two is split into 2^(precisionBits - 1) linear buckets, so a duration is known
+    within 2^(1 - precisionBits) of its value (about 3 % with 5 bits), from 1 ns up to 2^maxBits ns.
+    Longer durations are counted in the last bucket. The memory used does not depend on the number of durations.
+
+    Attributes:
+        precisionBits (int): Bits of the linear part of each bucket.
+        maxBits (int): The largest tracked duration is 2^maxBits - 1 ns (2^36 ns is about 69 s).
+    """
+    def __init__(self, precisionBits: int = 5, maxBits: int = 36):
+        if precisionBits < 1 or maxBits <= precisionBits:
+            raise ValueError("The histogram needs 1 <= precisionBits < maxBits.")
+        self.__precisionBits = precisionBits
+        self.__subCount = 1 << precisionBits
+        self.__halfCount = self.__subCount >> 1
+        self.__maxValue = (1 << maxBits) - 1
+        self.__counts = [0] * self.__index(self.__maxValue) + [0]
+        self.__count = 0
+        self.__total = 0
+        self.__min = None
+        self.__max = None
+
+    @property
+    def count(self):
+        return self.__count
+
+    @property
+    def mean(self):
+        return self.__total / self.__count if self.__count else None
+
+    @property
+    def min(self):
+        return self.__min
+
+    @property
+    def max(self):
+        return self.__max
+
+    def __index(self, value: int) -> int:
+        if value < self.__subCount:
+            return value
+        shift = value.bit_length() - self.__precisionBits
+        return self.__subCount + (shift - 1) * self.__halfCount + (value >> shift) - self.__halfCount
+
+    def __lowest(self, index: int) -> int:
+        """
+        Returns the smallest duration counted in a bucket.
+        """
+        if index < self.__subCount:
+            return index
+        shift, offset = divmod(index - self.__subCount, self.__halfCount)
+        return (offset + self.__halfCount) << (shift + 1)
+
+    def record(self, valueNs: int, count: int = 1) -> None:
+        """
+        Adds count durations of valueNs nanoseconds.
+        """
+        valueNs = max(0, int(valueNs))
+        self.__counts[self.__index(min(valueNs, self.__maxValue))] += count
+        self.__count += count
+        self.__total += valueNs * count
+        if self.__min is None or valueNs < self.__min:
+            self.__min = valueNs
+        if self.__max is None or valueNs > self.__max:
+            self.__max = valueNs
+
+    def percentile(self, percent: float):
+        """
+        Returns the duration in nanoseconds below which percent % of the durations are, None when empty.
+        The value is the middle of its bucket, bounded by the smallest and largest durations.
+        """
+        if not self.__count:
+            return None
+        rank = max(1, -(-self.__count * percent // 100))
+        seen = 0
+        for index, count in enumerate(self.__counts):
+            seen += count
+            if seen >= rank:
+                middle = (self.__lowest(index) + self.__lowest(index + 1) - 1) // 2
+                return min(self.__max, max(self.__min, middle))
+        return self.__max
+
+    def reset(self) -> None:
+        self.__counts = [0] * len(self.__counts)
+        self.__count = 0
+        self.__total = 0
+        self.__min = None
+        self.__max = None
+
+    def summary(self) -> dict:
+        """
+        Returns the count, the mean, the 50th, 90th and 99th percentiles and the maximum in microseconds.
+        """
+        def micros(valueNs):
+            return round(valueNs / 1000.0, 1) if valueNs is not None else None
+
+        return {
+            "count": self.__count,
+            "mean": micros(self.mean),
+            "p50": micros(self.percentile(50)),
+            "p90": micros(self.percentile(90)),
+            "p99": micros(self.percentile(99)),
+            "max": micros(self.__max)
+        }
@@ -0,0 +1,317 @@
+import heapq
+import itertools
+import threading
+import logging
+import Hardware
+from collections import OrderedDict
+from HdrHistogram import HdrHistogram
+
+"""
+Module for the I2CArbiter class.
+This class shares one I2C bus between the PCA9685, the TCS34725 and the INA219:
+transactions are serialised, the actuator writes go first, and the waits are measured per device.
+"""
+
+class I2CArbiter:
+    """
+    Priority arbiter of an I2C bus (busio.I2C or SimI2C).
+
+    Each device gets its own client (client()), which has the interface of busio.I2C and is given
+    to the driver instead of the bus. A client locking the bus (try_lock, as done by the adafruit drivers
+    around each transaction) waits until the bus is free; when several clients wait, the one with
+    the lowest priority number gets the bus first, then the oldest request. When the bus is free
+    and nobody waits, it is taken with a plain non-blocking lock, without the priority queue.
+    The lock is reentrant for the thread holding the bus.
+
+    A write can also be posted (post()): if the bus is busy, the write is queued instead of waiting,
+    and a newer write with the same key replaces the queued one. The queued writes are sent in one
+    go by the thread releasing the bus, before any waiting client gets it.
+
+    Attributes:
+        bus: Bus shared by the devices.
+        clock: Clock measuring the waits, the clock of the hardware backend by default.
+    """
+    ACTUATOR = 0
+    COLOUR = 1
+    POWER = 2
+
+    def __init__(self, bus, clock=None):
+        self.__bus = bus
+        self.__clock = clock if clock else Hardware.clock()
+        self.__busy = threading.Lock()
+        self.__condition = threading.Condition(threading.Lock())
+        self.__owner = None
+        self.__depth = 0
+        self.__waiters = []
+        self.__sequence = itertools.count()
+        self.__posted = OrderedDict()
+        self.__clients = {}
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def bus(self):
+        return self.__bus
+
+    @property
+    def clients(self) -> dict:
+        return dict(self.__clients)
+
+    @property
+    def waiting(self):
+        """Number of clients waiting for the bus."""
+        with self.__condition:
+            return len(self.__waiters)
+
+    @staticmethod
+    def clientOf(bus, name: str, priority: int):
+        """
+        Returns the client of a device when bus is an I2CArbiter, or the bus itself otherwise.
+        """
+        if isinstance(bus, I2CArbiter):
+            return bus.client(name, priority)
+        return bus
+
+    def client(self, name: str, priority: int):
+        """
+        Returns the client of the device name, created with priority on the first call.
+        """
+        with self.__condition:
+            client = self.__clients.get(name)
+            if client is None:
+                client = I2CArbiterClient(self, name, priority)
+                self.__clients[name] = client
+            return client
+
+    def acquire(self, client) -> None:
+        """
+        Waits until client can use the bus and takes it.
+        """
+        me = threading.get_ident()
+        if self.__owner == me:
+            # only the owner changes the depth while it holds the bus
+            self.__depth += 1
+            return
+        if not self.__waiters and self.__busy.acquire(False):
+            self.__owner = me
+            self.__depth = 1
+            client.recordFree()
+            return
+        with self.__condition:
+            startNs = self.__clock.nowNs()
+            entry = (client.priority, next(self.__sequence))
+            heapq.heappush(self.__waiters, entry)
+            # the bus may have been released before the entry was queued: try it once queued
+            while self.__waiters[0] != entry or not self.__busy.acquire(False):
+                self.__condition.wait()
+            heapq.heappop(self.__waiters)
+            self.__owner = me
+            self.__depth = 1
+            client.recordWait(self.__clock.nowNs() - startNs)
+
+    def release(self) -> None:
+        """
+        Releases the bus, after sending the posted writes.
+        """
+        me = threading.get_ident()
+        if self.__owner != me:
+            raise RuntimeError("The I2C bus is not held by this thread.")
+        if self.__depth > 1:
+            self.__depth -= 1
+            return
+        while True:
+            if self.__posted:
+                self.__flush()
+            self.__owner = None
+            self.__depth = 0
+            self.__busy.release()
+            # a write posted while the bus was being released is sent by whoever takes the bus first
+            if not self.__posted or not self.__busy.acquire(False):
+                break
+            self.__owner = me
+            self.__depth = 1
+        if self.__waiters:
+            with self.__condition:
+                self.__condition.notify_all()
+
+    def post(self, client, key, write) -> bool:
+        """
+        Sends a write of client now if the bus is free, otherwise queues it.
+        write() does the transaction; key identifies what it writes (e.g. the first register),
+        a queued write with the same key is replaced.
+        Returns True if the write was sent now.
+        """
+        me = threading.get_ident()
+        if self.__owner == me:
+            self.__depth += 1
+        elif not self.__waiters and self.__busy.acquire(False):
+            self.__owner = me
+            self.__depth = 1
+            client.recordFree()
+        else:
+            with self.__condition:
+                if (client.name, key) in self.__posted:
+                    client.recordCoalesced()
+                self.__posted[(client.name, key)] = write
+                client.recordPosted()
+            if not self.__busy.acquire(False):
+                return False
+            # the bus was released meanwhile: send the queued writes
+            self.__owner = me
+            self.__depth = 1
+            self.release()
+            return True
+        try:
+            write()
+        finally:
+            self.release()
+        return True
+
+    def __flush(self) -> None:
+        """
+        Sends the queued writes as the owner of the bus.
+        """
+        while True:
+            with self.__condition:
+                if not self.__posted:
+                    return
+                _, write = self.__posted.popitem(last=False)
+            self.__depth = 1
+            try:
+                write()
+            except Exception as e:
+                self.logger.error(f"Posted I2C write failed: {e}")
+
+    def stats(self) -> dict:
+        """
+        Returns the statistics of each client: transactions, bytes, posted and coalesced writes, waits.
+        """
+        return {name: client.stats() for name, client in self.__clients.items()}
+
+
+class I2CArbiterClient:
+    """
+    View of an I2CArbiter for one device, with the interface of busio.I2C.
+    try_lock waits for the turn of the device instead of failing, and every transaction is counted.
+
+    Attributes:
+        arbiter (I2CArbiter): Arbiter of the bus.
+        name (str): Name of the device.
+        priority (int): Priority of the device, lower numbers first.
+    """
+    def __init__(self, arbiter, name: str, priority: int):
+        self.__arbiter = arbiter
+        self.__name = name
+        self.__priority = priority
+        self.__transactions = 0
+        self.__bytes = 0
+        self.__posted = 0
+        self.__coalesced = 0
+        self.__waits = HdrHistogram()
+        self.__free = 0
+
+    @property
+    def arbiter(self):
+        return self.__arbiter
+
+    @property
+    def name(self):
+        return self.__name
+
+    @property
+    def priority(self):
+        return self.__priority
+
+    @property
+    def transactions(self):
+        return self.__transactions
+
+    @property
+    def bytes(self):
+        return self.__bytes
+
+    @property
+    def waits(self) -> HdrHistogram:
+        """Waits for the bus, including the ones of the bus taken free."""
+        free, self.__free = self.__free, 0
+        if free:
+            self.__waits.record(0, free)
+        return self.__waits
+
+    def recordWait(self, waitNs: int) -> None:
+        self.__waits.record(waitNs)
+
+    def recordFree(self) -> None:
+        """
+        Counts the bus taken without waiting; only counted to keep the fast path of the arbiter cheap.
+        """
+        self.__free += 1
+
+    def recordPosted(self) -> None:
+        self.__posted += 1
+
+    def recordCoalesced(self) -> None:
+        self.__coalesced += 1
+
+    def __count(self, size: int) -> None:
+        self.__transactions += 1
+        self.__bytes += size
+
+    def try_lock(self) -> bool:
+        self.__arbiter.acquire(self)
+        return True
+
+    def unlock(self) -> None:
+        self.__arbiter.release()
+
+    def post(self, key, write) -> bool:
+        """
+        Posts a write of the device, see I2CArbiter.post.
+        """
+        return self.__arbiter.post(self, key, write)
+
+    def writeto(self, address: int, buffer, *, start: int = 0, end: int = None) -> None:
+        self.__count(len(buffer[start:end]))
+        self.__arbiter.bus.writeto(address, buffer, start=start, end=end)
+
+    def readfrom_into(self, address: int, buffer, *, start: int = 0, end: int = None) -> None:
+        self.__count(len(buffer[start:end]))
+        self.__arbiter.bus.readfrom_into(address, buffer, start=start, end=end)
+
+    def writeto_then_readfrom(self, address: int, bufferOut, bufferIn, *, out_start=0, out_end=None, in_start=0, in_end=None) -> None:
+        self.__count(len(bufferOut[out_start:out_end]) + len(bufferIn[in_start:in_end]))
+        self.__arbiter.bus.writeto_then_readfrom(
+            address, bufferOut, bufferIn,
+            out_start=out_start, out_end=out_end, in_start=in_start, in_end=in_end
+        )
+
+    def record(self, address: int, size: int) -> None:
+        """
+        Transaction reported by a simulated device: it is arbitrated and counted like a real one.
+        """
+        arbiter = self.__arbiter
+        arbiter.acquire(self)
+        try:
+            self.__count(size)
+            record = getattr(arbiter.bus, "record", None)
+            if record is not None:
+                record(address, size)
+        finally:
+            arbiter.release()
+
+    def stats(self) -> dict:
+        return {
+            "priority": self.__priority,
+            "transactions": self.__transactions,
+            "bytes": self.__bytes,
+            "posted": self.__posted,
+            "coalesced": self.__coalesced,
+            "waits": self.waits.summary()
+        }
+
+    def __getattr__(self, name):
+        """
+        Other attributes of the bus (scan, frequency, attach...) are the ones of the shared bus.
+        """
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.__arbiter.bus, name)
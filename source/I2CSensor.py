@@ -1,15 +1,16 @@
 from Sensor import Sensor
 from abc import abstractmethod
-import busio
-import board
+from Hardware import busio, board
+from I2CArbiter import I2CArbiter
 
 """
 Abstract class for I2C sensors.
 This class defines the basic structure for I2C sensors.
+When the bus is an I2CArbiter, the sensor uses its own client of the arbiter with the given priority.
 """
 class I2CSensor(Sensor):
-    def __init__(self, i2c_bus:busio.I2C):
-        self._i2c_bus = i2c_bus
+    def __init__(self, i2c_bus: "busio.I2C", device: str = None, priority: int = I2CArbiter.COLOUR):
+        self._i2c_bus = I2CArbiter.clientOf(i2c_bus, device or type(self).__name__, priority)
 
     @abstractmethod
     def readValue(self):
@@ -1,7 +1,6 @@
 from I2CSensor import I2CSensor
-import busio
-import board
-import adafruit_ina219
+from I2CArbiter import I2CArbiter
+from Hardware import busio, board, adafruit_ina219
 """
 Class for INA219 sensor.
 This class inherits from I2CSensor and implements the readValue method.
@@ -9,10 +8,33 @@ This class is used to read the values from the INA219 sensor.
 It uses the adafruit_ina219 library to communicate with the sensor over I2C.
 """
 class INASensor(I2CSensor):
-    def __init__(self, i2c_bus:busio.I2C):
-        super().__init__(i2c_bus)
+    AVERAGING = (1, 2, 4, 8, 16, 32, 64, 128)
+
+    def __init__(self, i2c_bus: "busio.I2C"):
+        super().__init__(i2c_bus, "INA219", I2CArbiter.POWER)
         self.__sensor = adafruit_ina219.INA219(self._i2c_bus)
 
+    def configure(self, averaging: int = 32) -> None:
+        """
+        Sets the number of samples averaged by the INA219 for each bus and shunt conversion (1 to 128),
+        which filters the PWM ripple of the motors out of the readings.
+        Drivers without the ADC settings (e.g. the simulation) are left as they are.
+        """
+        if averaging not in self.AVERAGING:
+            raise ValueError(f"Averaging must be one of {self.AVERAGING}")
+        resolutions = getattr(adafruit_ina219, "ADCResolution", None)
+        if resolutions is None or not hasattr(self.__sensor, "bus_adc_resolution"):
+            return
+        resolution = getattr(resolutions, f"ADCRES_12BIT_{averaging}S")
+        self.__sensor.bus_adc_resolution = resolution
+        self.__sensor.shunt_adc_resolution = resolution
+
+    def readPower(self) -> tuple:
+        """
+        Returns the (bus voltage in V, current in mA) of the battery, two register reads.
+        """
+        return self.__sensor.bus_voltage, self.__sensor.current
+
     def readValue(self) -> dict:
         """
         Return a dictionary with the values of the sensor.
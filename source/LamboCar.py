@@ -1,13 +1,19 @@
 import time
 import logging
-import threading
-import busio
-import board
+from Hardware import busio, board
 from MotorManager import MotorManager
 from SensorManager import SensorManager
-from logs_config import setup_logging
-
-setup_logging()
+from ControlLoop import ControlLoop
+from AdaptiveSamplingPolicy import AdaptiveSamplingPolicy
+from GreenLightDetector import GreenLightDetector
+from LapCounter import LapCounter
+from ManeuverRunner import ManeuverRunner
+from ManeuverRegistry import ManeuverRegistry
+from I2CArbiter import I2CArbiter
+from SelfTest import SelfTest
+from data.SelfTestReport import SelfTestReport
+from data.ControllerGains import ControllerGains
+import Hardware
 
 """
 LamboCar class for controlling a car with motors and sensors.
@@ -15,10 +21,28 @@ This class provides methods to control the car's movement, manage sensors, and p
 It also includes methods for lap counting and obstacle avoidance.
 """
 class LamboCar:
-    def __init__(self, i2c_bus: busio.I2C):
+    # Time in seconds between two readings of the colour sensor and the INA219 recorded in the telemetry
+    TELEMETRY_SENSOR_PERIOD = 0.1
+
+    def __init__(
+        self,
+        i2c_bus: "busio.I2C",
+        controlFrequency: float = 50,
+        clock=None,
+        telemetry=None,
+        sensorManager: SensorManager = None,
+        motorManager: MotorManager = None,
+        adaptiveSampling: bool = False,
+        acquisitionProcess: bool = False,
+        powerMonitor: bool = False,
+        gains: ControllerGains = None
+    ):
         self.__carName = "LamboCar"
-        self.__sensorManager = SensorManager(i2c_bus)
-        self.__motorManager = MotorManager(i2c_bus)
+        if i2c_bus is not None and not isinstance(i2c_bus, I2CArbiter):
+            i2c_bus = I2CArbiter(i2c_bus, clock)
+        self.__busArbiter = i2c_bus
+        self.__sensorManager = sensorManager if sensorManager else SensorManager(i2c_bus)
+        self.__motorManager = motorManager if motorManager else MotorManager(i2c_bus)
         self.__totalLaps = 0
         self.__lastLapDuration = 0
         self.__currentState = ""
@@ -26,8 +50,33 @@ class LamboCar:
         self.__mode = None
         self.__tour = -1
         self.__last_line_state = False
-        self.__lock = threading.RLock()
+        self.__controlFrequency = controlFrequency
+        self.__clock = clock if clock else Hardware.clock()
+        self.__reverseUntil = None
+        self.__telemetry = telemetry
+        self.__telemetrySensorsNs = None
+        self.__samplingPolicy = AdaptiveSamplingPolicy(self.__motorManager) if adaptiveSampling else None
+        self.__acquisitionProcess = acquisitionProcess
+        self.__powerMonitor = powerMonitor
+        self.__gains = gains if gains else ControllerGains()
+        self.__greenLightDetector = GreenLightDetector(self.__sensorManager, clock=self.__clock)
+        # the LapCounter registers the edge callback at once, and __onCrossing logs
         self.logger = logging.getLogger(__name__)
+        self.__lapCounter = LapCounter(
+            getattr(self.__sensorManager, "lineSensor", None),
+            listener=self.__onCrossing,
+            clock=self.__clock
+        )
+        self.__maneuverRunner = ManeuverRunner(self.__motorManager, self.__sensorManager, self.__clock)
+
+    @property
+    def maneuverRunner(self):
+        return self.__maneuverRunner
+
+    @property
+    def busArbiter(self):
+        """I2CArbiter sharing the I2C bus between the motors and the sensors."""
+        return self.__busArbiter
 
     @property
     def motorManager(self):
@@ -41,6 +90,49 @@ class LamboCar:
     def carName(self):
         return self.__carName
 
+    @property
+    def controlFrequency(self):
+        return self.__controlFrequency
+
+    @property
+    def clock(self):
+        return self.__clock
+
+    @property
+    def telemetry(self):
+        return self.__telemetry
+
+    @property
+    def samplingPolicy(self):
+        return self.__samplingPolicy
+
+    @property
+    def acquisitionProcess(self) -> bool:
+        """True when the sensors are sampled in an AcquisitionProcess while the car drives."""
+        return self.__acquisitionProcess
+
+    @property
+    def gains(self) -> ControllerGains:
+        """Gains and thresholds of stayMid."""
+        return self.__gains
+
+    @gains.setter
+    def gains(self, gains: ControllerGains):
+        self.__gains = gains
+
+    @property
+    def powerMonitor(self) -> bool:
+        """True when the battery is watched by a PowerMonitor while the car drives."""
+        return self.__powerMonitor
+
+    @property
+    def greenLightDetector(self):
+        return self.__greenLightDetector
+
+    @property
+    def lapCounter(self):
+        return self.__lapCounter
+
     @property
     def mode(self):
         return self.__mode
@@ -67,33 +159,44 @@ class LamboCar:
 
     def LineCount(self):
         """
-        Counts laps based on line detection.
-        Increments the lap count when a line is detected.
+        Reads the line sensor for the current tick.
+        The laps are counted by the LapCounter from the edges of the line sensor, so none is missed
+        between two ticks; without edge detection, the line state of the tick is given to the LapCounter.
         """
         try:
             on_line = self.sensorManager.detectLine()
-            if on_line and not self.__last_line_state:
-                self.__tour += 1
-                self.logger.info(f"Lap counted! Total laps: {self.__tour}")
+            self.__lapCounter.update(on_line, self.__clock.nowNs())
             self.__last_line_state = on_line
         except Exception as e:
             self.logger.error(f"Error in LineCount: {e}")
 
+    def __onCrossing(self, crossings, timestampNs):
+        """
+        Called by the LapCounter at each crossing of the start line; the crossings are debounced
+        by the LapCounter, so two calls never overlap.
+        """
+        self.__tour += 1
+        self.__totalLaps = self.__lapCounter.laps
+        lapTime = self.__lapCounter.lastLapTime
+        if lapTime is not None:
+            self.__lastLapDuration = lapTime / 1e9
+            self.logger.info(f"Lap counted! Total laps: {self.__tour}, lap time: {lapTime / 1e9:.3f} s")
+        else:
+            self.logger.info(f"Lap counted! Total laps: {self.__tour}")
+
     def startCar(self):
         """
         Starts the car by setting the speed and angle of the motors.
         Gradually increases the speed to avoid sudden acceleration.
         """
-        self.__motorManager.setSpeed(25)
-        time.sleep(1)
-        self.__motorManager.setSpeed(50)
-        time.sleep(1)
-        self.__motorManager.setSpeed(75)
+        return self.runManeuver("startCar")
 
     def stopCar(self):
         """
         Stops the car by setting the speed and angle of the motors to zero.
         """
+        self.__reverseUntil = None
+        self.__maneuverRunner.stop()
         self.__motorManager.setSpeed(0)
         self.__motorManager.setAngle(0)
 
@@ -102,75 +205,59 @@ class LamboCar:
         Reverses the car by setting the speed to negative values.
         Gradually decreases the speed to avoid sudden deceleration.
         """
-        self.logger.info("The car is going forward")
-        self.__motorManager.setSpeed(25)
-        time.sleep(2)
-        self.__motorManager.setSpeed(50)
-        time.sleep(2)
-        self.__motorManager.setSpeed(75)
-        time.sleep(1)
-        self.__motorManager.setSpeed(0)
-        self.logger.info("The car is stopping")
-        time.sleep(2)
-        self.logger.info("The car is going backward")
-        self.__motorManager.setSpeed(-25)
-        time.sleep(2)
-        self.__motorManager.setSpeed(-50)
-        time.sleep(2)
-        self.__motorManager.setSpeed(-75)
-        time.sleep(1)
-        self.__motorManager.setSpeed(0)
-        self.logger.info("The car is stopping")
+        return self.runManeuver("reverseGear")
 
     def uTurn(self):
         """
         Performs a U-turn by setting the speed and angle of the motors.
         The car turns in place for a specified duration before stopping.
         """
-        for _ in range(4):
-            self.__motorManager.setAngle(-100)
-            self.__motorManager.setSpeed(-25)
-            time.sleep(1)
-            self.__motorManager.setAngle(20)
-            self.__motorManager.setSpeed(10)
-            time.sleep(1)
-        self.__motorManager.setAngle(0)
-        self.__motorManager.setSpeed(40)
-        time.sleep(1)
-        self.__motorManager.setSpeed(0)
+        return self.runManeuver("uTurn")
 
-    def circle(self, direction: str):
+    def circle(self, direction: str, duration: float = 10):
         """
         Performs a circular motion by setting the speed and angle of the motors.
         The direction can be either 'left' or 'right'.
         """
-        self.__motorManager.setSpeed(50)
-        if direction.lower() == "left":
-            self.__motorManager.setAngle(-100)
-        elif direction.lower() == "right":
-            self.__motorManager.setAngle(100)
-        else:
+        if direction.lower() not in ("left", "right"):
             self.logger.error("Circle: Invalid direction, it must be 'left' or 'right'")
             raise ValueError("Direction must be 'left' or 'right'")
-        time.sleep(10)
-        self.__motorManager.setAngle(0)
-        self.__motorManager.setSpeed(0)
+        return self.runManeuver("circle", direction=direction, duration=duration)
 
-    def eightTurn(self, duration: int):
+    def eightTurn(self, turns: int = 1):
         """
         Performs an eight-turn maneuver by alternating between left and right turns.
-        The duration specifies how many times the turn is performed.
-        """
-        self.__motorManager.setSpeed(40)
-        for _ in range(duration):
-            self.__motorManager.setAngle(-100)
-            self.logger.info("eightTurn: Turning left")
-            time.sleep(8)
-            self.__motorManager.setAngle(90)
-            self.logger.info("eightTurn: Turning right")
-            time.sleep(6)
-        self.__motorManager.setAngle(0)
-        self.__motorManager.setSpeed(0)
+        turns specifies how many times the turn is performed.
+        """
+        return self.runManeuver("eightTurn", turns=turns)
+
+    def runManeuver(self, maneuver, **params):
+        """
+        Runs a maneuver tick by tick at controlFrequency, with the sensors sampled and the laps counted
+        during the maneuver. The maneuver is a Maneuver or the name of a maneuver of the ManeuverRegistry,
+        created with params. It ends early when an obstacle is in front of the car or stopManeuver() is called.
+        Returns the final state of the maneuver: "completed", "preempted" or "stopped".
+        """
+        if isinstance(maneuver, str):
+            maneuver = ManeuverRegistry.create(maneuver, **params)
+        sampling = self.__sensorManager.sampling
+        if not sampling:
+            self.__startSampling()
+        try:
+            return self.__maneuverRunner.run(maneuver, self.__controlFrequency, onTick=self.LineCount)
+        except KeyboardInterrupt:
+            print("Stop the car.")
+            self.stopCar()
+            return self.__maneuverRunner.state
+        finally:
+            if not sampling:
+                self.__stopSampling()
+
+    def stopManeuver(self):
+        """
+        Stops the running maneuver at its next tick, can be called from another thread.
+        """
+        self.__maneuverRunner.stop()
 
     def turnLeft(self):
         self.__motorManager.setSpeed(30)
@@ -221,7 +308,7 @@ class LamboCar:
         print("Preparing sensors...")
         all_ready = True
 
-        data_rgb = self.__sensorManager.rgbSensor.readValue()
+        data_rgb = self.__sensorManager.readColourFrame().rgb
         if data_rgb is not None:
             red, green, blue = data_rgb.red, data_rgb.green, data_rgb.blue
             print(f"RGB Sensor: Red: {red}, Green: {green}, Blue: {blue}")
@@ -270,35 +357,62 @@ class LamboCar:
             self.logger.error("Some sensors are not responding!")
         return all_ready
 
-    def start_on_green(self, tours):
+    def start_on_green(self, tours, startSpeed: float = 40, timeout: float = None):
         """
         Starts the car when the green light is detected.
-        Continuously checks the sensor for the green light and starts the car when detected."""
-        while True:
-            if self.__sensorManager.isGreen():
-                self.logger.info("GREEN LIGHT! THE RACE IS ON!")
-                self.start(tours)
-            else:
-                self.logger.info("NOT GREEN YET!")
-                time.sleep(0.5)
+        The motors are armed before the light turns green, the colour sensor is polled at its fastest
+        rate by the GreenLightDetector, and the reaction time from the green light to the first
+        setSpeed is logged in microseconds.
+        Returns the reaction time, or None if the light did not turn green before the timeout.
+        """
+        self.__motorManager.setAngle(0)
+        self.__motorManager.arm()
+        greenNs = self.__greenLightDetector.waitForGreen(timeout)
+        if greenNs is None:
+            self.stopCar()
+            return None
+        self.__motorManager.setSpeed(startSpeed)
+        reaction = self.__greenLightDetector.recordReaction(greenNs)
+        self.logger.info("GREEN LIGHT! THE RACE IS ON!")
+        self.start(tours)
+        return reaction
+
+    def __startSampling(self):
+        self.__sensorManager.startSampling(policy=self.__samplingPolicy, process=self.__acquisitionProcess)
+        if self.__powerMonitor:
+            self.__sensorManager.startPowerMonitor()
+
+    def __stopSampling(self):
+        self.__sensorManager.stopSampling()
+        if self.__powerMonitor:
+            snapshot = self.__sensorManager.stopPowerMonitor()
+            if snapshot is not None:
+                self.logger.info(f"Energy used: {snapshot.toDict()}")
 
     def stayMid(self):
         """
         Keeps the car in the middle of the track by adjusting the speed and angle based on sensor readings.
+        When the front is blocked, the car reverses for one second without blocking the control loop.
         """
+        if self.__reverseUntil is not None:
+            if self.__clock.nowNs() < self.__reverseUntil:
+                return (-30, 0)
+            self.__reverseUntil = None
+            self.__motorManager.setAngle(0)
+
         distance = self.__sensorManager.getDistance()
         frontDist = distance.front
         leftDist = distance.left
         rightDist = distance.right
 
-        min_front = 20
-        max_front = 100
-        Kp = 10
+        gains = self.__gains
+        min_front = gains.minFront
+        max_front = gains.maxFront
+        Kp = gains.kp
 
         if frontDist is None or frontDist < min_front:
             self.__motorManager.setSpeed(-30)
-            time.sleep(1)  
-            self.__motorManager.setAngle(0)
+            self.__reverseUntil = self.__clock.nowNs() + 1_000_000_000
             return (-30, 0)
 
         if leftDist is None and rightDist is None:
@@ -315,13 +429,11 @@ class LamboCar:
 
         newAngle = max(-100, min(100, Kp * error))
 
-        try:
-            rawSpeed = (frontDist - min_front) / (max_front - min_front) * 100
-        except ZeroDivisionError:
-            rawSpeed = 40
+        # ControllerGains guarantees max_front > min_front
+        rawSpeed = (frontDist - min_front) / (max_front - min_front) * 100
 
-        newSpeed = max(40, min(41, rawSpeed))
-        correctionFactor = 1 - (abs(newAngle) / 100) * 0.5
+        newSpeed = max(gains.minSpeed, min(gains.maxSpeed, rawSpeed))
+        correctionFactor = 1 - (abs(newAngle) / 100) * gains.turnSlowdown
         newSpeed *= correctionFactor
 
         self.__motorManager.setAngle(newAngle)
@@ -329,84 +441,166 @@ class LamboCar:
 
         return (newSpeed, newAngle)
 
-    def test(self):
+    def controlTick(self):
         """
-        Test function to prepare the car for operation.
+        One period of the control loop: steering, lap count and, with a TelemetryRecorder,
+        one telemetry sample with the last sensor values and the commands of the tick.
+        The colour and the current of the samples are read every TELEMETRY_SENSOR_PERIOD seconds,
+        they are not needed by the control.
         """
-        self.prepareMotors()
-        time.sleep(1)
-        self.prepareSensors()
-        time.sleep(1)
-        self.start()
+        speed, angle = self.stayMid()
+        self.LineCount()
+        if self.__telemetry is not None:
+            sensorManager = self.__sensorManager
+            nowNs = self.__clock.nowNs()
+            if self.__telemetrySensorsNs is None or nowNs - self.__telemetrySensorsNs >= self.TELEMETRY_SENSOR_PERIOD * 1e9:
+                self.__telemetrySensorsNs = nowNs
+                self.__refreshTelemetrySensors()
+            self.__telemetry.record(
+                nowNs,
+                sensorManager.lastDistance,
+                sensorManager.isOnLine,
+                sensorManager.lastRGB,
+                sensorManager.lastCurrent,
+                speed,
+                angle
+            )
+        return speed, angle
+
+    def __refreshTelemetrySensors(self):
+        try:
+            self.__sensorManager.readColourFrame()
+        except Exception as e:
+            self.logger.error(f"Error while reading the colour sensor for the telemetry: {e}")
+        self.__sensorManager.getCurrent()
+
+    def selfTest(self, timeout: float = 1.0, timeouts: dict = None) -> SelfTestReport:
+        """
+        Checks the motors, the servo and the sensors at the same time, each within timeout seconds
+        (or its entry of timeouts), and returns the SelfTestReport with the values and timings of each check.
+        Takes about half a second when every component answers, instead of the fixed sleeps of
+        prepareMotors and prepareSensors.
+        """
+        report = SelfTest(self.__motorManager, self.__sensorManager, self.__clock, timeout, timeouts).run()
+        print(report)
+        return report
+
+    def test(self, max_tours: int = 1):
+        """
+        Test function to prepare the car for operation: runs the self-test and starts the car if it passed.
+        """
+        report = self.selfTest()
+        if not report.ok:
+            print(f"Not starting, failed components: {', '.join(report.failed)}")
+            return report
+        self.start(max_tours)
+        return report
 
     def start(self, max_tours):
         """
         Starts the car and counts laps based on line detection.
+        The steering and the lap count run at controlFrequency.
         """
-        line_detected = False
+        def tick():
+            if self.tour >= max_tours:
+                return False
+            self.controlTick()
+            return True
+
+        loop = ControlLoop(self.__controlFrequency, self.__clock)
+        self.__startSampling()
         try:
-            while self.tour < max_tours:
-                self.stayMid()
-
-                if self.sensorManager.detectLine() and not line_detected:
-                    self.tour+=1
-                    self.logger.info(self.tour)
-                    line_detected = True
-                    time.sleep(0.5)
-                elif self.sensorManager.detectLine():
-                    line_detected = False
-                time.sleep(0.5)
+            loop.run(tick)
             self.stopCar()
         except KeyboardInterrupt:
             print("Stop the car.")
             self.stopCar()
+        except Exception:
+            self.stopCar()
+            raise
+        finally:
+            self.logger.info(f"Ultrasonic firing rates (Hz): {self.__sensorManager.firingRates()}")
+            if self.__samplingPolicy is not None:
+                self.logger.info(f"Adaptive sampling: {self.__samplingPolicy.stats()}")
+            self.__stopSampling()
+            if self.__telemetry is not None:
+                self.__telemetry.flush()
+            self.logger.info(f"Control loop stats: {loop.stats()}")
+
+    def startAsync(self, max_tours, commands=None):
+        """
+        Starts the car and counts laps like start(), with the sensing, the control, the telemetry
+        and the command input run as asyncio tasks by an AsyncRuntime.
+        commands is an async iterable of command lines, e.g. AsyncRuntime.stdinCommands().
+        Returns the statistics of the control task.
+        """
+        import asyncio
+        from AsyncRuntime import AsyncRuntime
+        runtime = AsyncRuntime(self, commands)
+        try:
+            return asyncio.run(runtime.run(max_tours))
+        except KeyboardInterrupt:
+            print("Stop the car.")
+            self.stopCar()
+            return runtime.stats()
 
     def zigzagAvoidance(self):
         """
         Zigzag avoidance maneuver to navigate around obstacles.
         The car turns right and left alternately when an obstacle is detected within a certain distance.
+        The zigzag is run tick by tick, so the obstacle is still watched while the car avoids it.
         """
-        try :
-            self.__motorManager.setSpeed(45)
-            self.__motorManager.setAngle(0)
-
-            while True:
-                distance = self.__sensorManager.getDistance().front
+        runner = self.__maneuverRunner
 
-                if distance is not None and distance < 50:
-                    self.logger.info(f"Obstacle detected at {distance} cm → initiating zigzag")
+        def tick():
+            if runner.running:
+                runner.tick()
+                return True
 
-                    self.__motorManager.setAngle(80)
-                    time.sleep(1.2)
+            distance = self.__sensorManager.getDistance().front
 
-                    self.__motorManager.setAngle(-90)
-                    time.sleep(1.5)
+            if distance is not None and distance < 50:
+                self.logger.info(f"Obstacle detected at {distance} cm → initiating zigzag")
+                runner.start(ManeuverRegistry.create("zigzag"))
+                runner.tick()
 
-                    self.__motorManager.setAngle(0)
-
-                else:
-                    self.__motorManager.setSpeed(30)
-                    self.__motorManager.setAngle(0)
+            else:
+                self.__motorManager.setSpeed(30)
+                self.__motorManager.setAngle(0)
+            return True
 
-                time.sleep(0.1)
+        loop = ControlLoop(10, self.__clock)
+        self.__startSampling()
+        try :
+            self.__motorManager.setSpeed(45)
+            self.__motorManager.setAngle(0)
+            loop.run(tick)
         except KeyboardInterrupt:
             print("Stop the car.")
             self.stopCar()
+        finally:
+            self.__stopSampling()
+            self.logger.info(f"Control loop stats: {loop.stats()}")
 
 def main():
     """
     Main function to initialize the LamboCar and start the car.
     """
+    from logs_config import setup_logging
+    setup_logging()
     i2c_bus = busio.I2C(board.SCL, board.SDA)
     lambo = LamboCar(i2c_bus)
+    loop = ControlLoop(lambo.controlFrequency, lambo.clock)
+    lambo.sensorManager.startSampling()
 
     try:
-        while True:
-            lambo.stayMid()
-            time.sleep(0.05)
+        loop.run(lambo.stayMid)
     except KeyboardInterrupt:
         print("Stop the car.")
         lambo.stopCar()
+    finally:
+        lambo.sensorManager.stopSampling()
+        print(f"Control loop stats: {loop.stats()}")
 
 if __name__ == "__main__":
     main()
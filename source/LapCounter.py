@@ -0,0 +1,149 @@
+from Hardware import GPIO
+import Hardware
+import threading
+import logging
+
+"""
+Module for the LapCounter class.
+This class counts the crossings of the start line from the edges of the line sensor,
+so a lap is never missed between two control ticks, and times the laps in nanoseconds.
+"""
+
+class LapCounter:
+    """
+    Interrupt-driven lap counter on a LineSensor.
+
+    The falling edge of the line sensor (the car enters the black line) is timestamped by a GPIO callback.
+    Edges closer than debounceTime to the previous one are bounces of the sensor and are ignored,
+    crossings closer than minLapTime to the previous crossing (e.g. the car wiggling on the line) too.
+    When the GPIO backend has no edge detection, update() is called with the line state of each tick instead.
+
+    The first crossing starts the race, each following crossing ends a lap.
+
+    Attributes:
+        lineSensor: LineSensor whose pin is watched, or None to only use update().
+        debounceTime (float): Minimum time in seconds between two edges.
+        minLapTime (float): Minimum time in seconds between two crossings.
+        listener: Function called with (crossings, timestampNs) after each counted crossing.
+        gpio: GPIO backend to use instead of the hardware one.
+        clock: Clock timestamping the crossings, the clock of the hardware backend by default.
+    """
+    def __init__(self, lineSensor=None, debounceTime: float = 0.05, minLapTime: float = 1.0, listener=None, gpio=None, clock=None):
+        self.__debounceNs = int(debounceTime * 1e9)
+        self.__minLapNs = int(minLapTime * 1e9)
+        self.__listener = listener
+        self.__gpio = gpio
+        self.__clock = clock if clock else Hardware.clock()
+        self.__lock = threading.Lock()
+        self.__crossingsNs = []
+        self.__lastEdgeNs = None
+        self.__lastState = False
+        self.__bounces = 0
+        self.__pin = getattr(lineSensor, "pinGPIO", None)
+        self.__interrupts = False
+        self.logger = logging.getLogger(__name__)
+
+        if self.__pin is not None:
+            gpio = self.__backend()
+            try:
+                gpio.add_event_detect(self.__pin, gpio.FALLING, callback=self.__onEdge,
+                                      bouncetime=max(1, self.__debounceNs // 1_000_000))
+                self.__interrupts = True
+            except (RuntimeError, AttributeError) as e:
+                self.logger.warning(f"Edge detection unavailable on the line sensor, polling it: {e}")
+
+    @property
+    def interrupts(self) -> bool:
+        """True when the crossings come from GPIO edges, False when they come from update()."""
+        return self.__interrupts
+
+    @property
+    def crossings(self):
+        return len(self.__crossingsNs)
+
+    @property
+    def laps(self):
+        """Number of completed laps."""
+        return max(0, len(self.__crossingsNs) - 1)
+
+    @property
+    def bounces(self):
+        """Number of edges ignored by the debouncing."""
+        return self.__bounces
+
+    @property
+    def crossingTimes(self) -> list:
+        """Clock times (ns) of the crossings."""
+        with self.__lock:
+            return list(self.__crossingsNs)
+
+    @property
+    def lapTimes(self) -> list:
+        """Duration (ns) of each completed lap."""
+        times = self.crossingTimes
+        return [end - start for start, end in zip(times, times[1:])]
+
+    @property
+    def splits(self) -> list:
+        """Time (ns) since the first crossing at the end of each completed lap."""
+        times = self.crossingTimes
+        return [time - times[0] for time in times[1:]]
+
+    @property
+    def lastLapTime(self):
+        """Duration (ns) of the last completed lap, None before the first one."""
+        with self.__lock:
+            if len(self.__crossingsNs) < 2:
+                return None
+            return self.__crossingsNs[-1] - self.__crossingsNs[-2]
+
+    def __backend(self):
+        return self.__gpio if self.__gpio is not None else GPIO
+
+    def close(self) -> None:
+        """
+        Stops the edge detection on the line sensor pin.
+        """
+        if self.__interrupts:
+            self.__backend().remove_event_detect(self.__pin)
+            self.__interrupts = False
+
+    def reset(self) -> None:
+        with self.__lock:
+            self.__crossingsNs = []
+            self.__lastEdgeNs = None
+            self.__bounces = 0
+
+    def update(self, onLine: bool, timestampNs: int = None) -> bool:
+        """
+        Polling mode: gives the line state read by a control tick, a crossing is counted when the car enters the line.
+        Ignored while the edges are captured by interrupts.
+        Returns True if a crossing was counted.
+        """
+        entered = onLine and not self.__lastState
+        self.__lastState = onLine
+        if self.__interrupts or not entered:
+            return False
+        return self.__crossing(timestampNs if timestampNs is not None else self.__clock.nowNs())
+
+    def __onEdge(self, channel):
+        """
+        GPIO callback of the falling edge, timestamps the crossing as soon as it is reported.
+        """
+        self.__crossing(self.__clock.nowNs())
+
+    def __crossing(self, timestampNs: int) -> bool:
+        with self.__lock:
+            last = self.__lastEdgeNs
+            self.__lastEdgeNs = timestampNs
+            if last is not None and timestampNs - last < self.__debounceNs:
+                self.__bounces += 1
+                return False
+            if self.__crossingsNs and timestampNs - self.__crossingsNs[-1] < self.__minLapNs:
+                self.__bounces += 1
+                return False
+            self.__crossingsNs.append(timestampNs)
+            crossings = len(self.__crossingsNs)
+        if self.__listener is not None:
+            self.__listener(crossings, timestampNs)
+        return True
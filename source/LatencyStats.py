@@ -0,0 +1,77 @@
+"""
+Module for the LatencyStats class.
+This class aggregates durations (latency, jitter...) with a fixed amount of memory.
+"""
+
+class LatencyStats:
+    """
+    Running statistics of durations in nanoseconds.
+    Count, mean, min and max cover every recorded value, the percentiles
+    are computed on the last windowSize values kept in a ring buffer.
+
+    Attributes:
+        windowSize (int): Number of recent values kept for the percentiles.
+    """
+    def __init__(self, windowSize: int = 1024):
+        self.__window = [0] * windowSize
+        self.__index = 0
+        self.__count = 0
+        self.__total = 0
+        self.__min = None
+        self.__max = None
+
+    @property
+    def count(self):
+        return self.__count
+
+    @property
+    def min(self):
+        return self.__min
+
+    @property
+    def max(self):
+        return self.__max
+
+    @property
+    def mean(self):
+        return self.__total / self.__count if self.__count else None
+
+    def record(self, valueNs: int) -> None:
+        """
+        Adds a duration in nanoseconds.
+        """
+        self.__window[self.__index] = valueNs
+        self.__index = (self.__index + 1) % len(self.__window)
+        self.__count += 1
+        self.__total += valueNs
+        if self.__min is None or valueNs < self.__min:
+            self.__min = valueNs
+        if self.__max is None or valueNs > self.__max:
+            self.__max = valueNs
+
+    def percentile(self, percent: float):
+        """
+        Returns the given percentile (0-100) of the recent values in nanoseconds, or None without values.
+        """
+        size = min(self.__count, len(self.__window))
+        if size == 0:
+            return None
+        values = sorted(self.__window[:size])
+        rank = min(size - 1, int(round(percent / 100.0 * (size - 1))))
+        return values[rank]
+
+    def summary(self) -> dict:
+        """
+        Returns the statistics in microseconds.
+        """
+        def toUs(value):
+            return round(value / 1000.0, 1) if value is not None else None
+
+        return {
+            "count": self.__count,
+            "mean": toUs(self.mean),
+            "min": toUs(self.__min),
+            "p50": toUs(self.percentile(50)),
+            "p99": toUs(self.percentile(99)),
+            "max": toUs(self.__max)
+        }
@@ -1,5 +1,5 @@
 from Sensor import Sensor
-import RPi.GPIO as GPIO
+from Hardware import GPIO
 import time
 
 """
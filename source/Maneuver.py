@@ -0,0 +1,62 @@
+from data.Keyframe import Keyframe
+
+"""
+Module for the Maneuver class.
+This class describes a maneuver of the car as a timeline of speed and steering commands,
+played tick by tick by a ManeuverRunner instead of a sequence of blocking sleeps.
+"""
+
+class Maneuver:
+    """
+    Timeline of keyframes.
+
+    Each keyframe is applied when the time since the start of the maneuver reaches its time,
+    and its commands are held until the next keyframe. The maneuver ends at duration.
+
+    Attributes:
+        name (str): Name of the maneuver.
+        keyframes (list): Keyframe objects, or (at, speed, angle) tuples.
+        duration (float): Length of the maneuver in seconds, the time of the last keyframe by default.
+        obstacleDistance (float): The maneuver is preempted when the car goes forward and the front
+            distance is below this value in cm, None to never preempt it on an obstacle.
+    """
+    def __init__(self, name: str, keyframes, duration: float = None, obstacleDistance: float = 20):
+        frames = [frame if isinstance(frame, Keyframe) else Keyframe(*frame) for frame in keyframes]
+        if not frames:
+            raise ValueError("A maneuver needs at least one keyframe.")
+        self.__name = name
+        self.__keyframes = sorted(frames, key=lambda frame: frame.at)
+        last = self.__keyframes[-1].at
+        self.__duration = last if duration is None else duration
+        if self.__duration < last:
+            raise ValueError("The duration of a maneuver can not end before its last keyframe.")
+        self.__obstacleDistance = obstacleDistance
+
+    @classmethod
+    def fromSteps(cls, name: str, steps, obstacleDistance: float = 20):
+        """
+        Builds a maneuver from consecutive (seconds, speed, angle) or (seconds, speed, angle, label) steps:
+        each step is held for its number of seconds before the next one.
+        """
+        keyframes = []
+        at = 0.0
+        for seconds, speed, angle, *label in steps:
+            keyframes.append(Keyframe(at, speed, angle, label[0] if label else None))
+            at += seconds
+        return cls(name, keyframes, at, obstacleDistance)
+
+    @property
+    def name(self):
+        return self.__name
+
+    @property
+    def keyframes(self):
+        return list(self.__keyframes)
+
+    @property
+    def duration(self):
+        return self.__duration
+
+    @property
+    def obstacleDistance(self):
+        return self.__obstacleDistance
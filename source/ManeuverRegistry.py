@@ -0,0 +1,56 @@
+from Maneuver import Maneuver
+from BuiltinManeuvers import BUILTINS
+
+"""
+Module for the ManeuverRegistry class.
+This class keeps the maneuvers the car can run by name, so new maneuvers
+can be added without changing LamboCar.
+"""
+
+class ManeuverRegistry:
+    """
+    Registry of maneuver factories shared by the whole program.
+
+    A factory is a function returning a new Maneuver, called with the parameters given to create:
+
+        ManeuverRegistry.register("slalom", lambda gates=3: Maneuver.fromSteps("slalom", ...))
+        lambo.runManeuver("slalom", gates=5)
+    """
+    __factories = {}
+
+    @classmethod
+    def register(cls, name: str, factory) -> None:
+        """
+        Adds a maneuver, or replaces the one with the same name.
+        The factory can also be a Maneuver, which is then run as it is.
+        """
+        if isinstance(factory, Maneuver):
+            maneuver = factory
+            factory = lambda: maneuver
+        if not callable(factory):
+            raise TypeError("A maneuver factory must be callable.")
+        cls.__factories[name] = factory
+
+    @classmethod
+    def unregister(cls, name: str) -> None:
+        cls.__factories.pop(name, None)
+
+    @classmethod
+    def names(cls) -> list:
+        return sorted(cls.__factories)
+
+    @classmethod
+    def create(cls, name: str, **params) -> Maneuver:
+        """
+        Returns a new maneuver built by the factory registered under name.
+        Raises:
+            KeyError: If no maneuver has this name.
+        """
+        try:
+            factory = cls.__factories[name]
+        except KeyError:
+            raise KeyError(f"Unknown maneuver: {name}")
+        return factory(**params)
+
+for _name, _factory in BUILTINS.items():
+    ManeuverRegistry.register(_name, _factory)
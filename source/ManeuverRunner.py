@@ -0,0 +1,147 @@
+import logging
+import threading
+import Hardware
+from ControlLoop import ControlLoop
+
+"""
+Module for the ManeuverRunner class.
+This class plays a Maneuver one control tick at a time, so the sensors keep being read
+during the maneuver and the maneuver can be interrupted at any tick.
+"""
+
+class ManeuverRunner:
+    """
+    Tick by tick player of maneuvers.
+
+    Each tick applies the keyframes whose time has come (steering first, then speed) and ends the maneuver:
+    - "completed" when its duration has elapsed,
+    - "preempted" when the car goes forward and the front distance is below the obstacleDistance of the maneuver,
+    - "stopped" when stop() was called, from the control loop or from another thread.
+    The motors are stopped when the maneuver is preempted or stopped; a completed maneuver
+    leaves the commands of its last keyframe.
+
+    Attributes:
+        motorManager: MotorManager receiving the commands, its speed property gives the last speed commanded.
+        sensorManager: SensorManager giving the front distance, None to never preempt on an obstacle.
+        clock: Clock of the maneuvers, the clock of the hardware backend by default.
+    """
+    def __init__(self, motorManager, sensorManager=None, clock=None):
+        self.__motorManager = motorManager
+        self.__sensorManager = sensorManager
+        self.__clock = clock if clock else Hardware.clock()
+        self.__maneuver = None
+        self.__startNs = None
+        self.__next = 0
+        self.__state = None
+        self.__stopEvent = threading.Event()
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def maneuver(self):
+        """Maneuver being run, or the last one run."""
+        return self.__maneuver
+
+    @property
+    def state(self):
+        """None before the first maneuver, then "running", "completed", "preempted" or "stopped"."""
+        return self.__state
+
+    @property
+    def running(self) -> bool:
+        return self.__state == "running"
+
+    @property
+    def elapsed(self) -> float:
+        """Time in seconds since the start of the current maneuver."""
+        if self.__startNs is None:
+            return 0.0
+        return (self.__clock.nowNs() - self.__startNs) / 1e9
+
+    def start(self, maneuver) -> None:
+        """
+        Starts a maneuver, replacing the one being run.
+        """
+        self.__maneuver = maneuver
+        self.__startNs = self.__clock.nowNs()
+        self.__next = 0
+        self.__stopEvent.clear()
+        self.__state = "running"
+        self.logger.info(f"Maneuver {maneuver.name} started ({maneuver.duration} s)")
+
+    def stop(self) -> None:
+        """
+        Asks the running maneuver to stop at the next tick.
+        """
+        self.__stopEvent.set()
+
+    def tick(self) -> bool:
+        """
+        Runs one tick of the current maneuver.
+        Returns True while the maneuver is running.
+        """
+        if self.__state != "running":
+            return False
+        if self.__stopEvent.is_set():
+            return self.__end("stopped")
+
+        maneuver = self.__maneuver
+        elapsedNs = self.__clock.nowNs() - self.__startNs
+        keyframes = maneuver.keyframes
+        while self.__next < len(keyframes) and keyframes[self.__next].at * 1e9 <= elapsedNs:
+            self.__apply(keyframes[self.__next])
+            self.__next += 1
+
+        if self.__obstacle(maneuver.obstacleDistance):
+            return self.__end("preempted")
+        if elapsedNs >= maneuver.duration * 1e9:
+            self.__state = "completed"
+            self.logger.info(f"Maneuver {maneuver.name} completed")
+            return False
+        return True
+
+    def run(self, maneuver, frequency: float = 50, onTick=None) -> str:
+        """
+        Runs a maneuver until its end in a ControlLoop at frequency,
+        calling onTick() after each tick (e.g. for the lap count).
+        Returns the final state of the maneuver.
+        """
+        def tick():
+            running = self.tick()
+            if onTick is not None:
+                onTick()
+            return running
+
+        self.start(maneuver)
+        loop = ControlLoop(frequency, self.__clock)
+        try:
+            loop.run(tick)
+        except KeyboardInterrupt:
+            self.__end("stopped")
+            raise
+        return self.__state
+
+    def __apply(self, keyframe) -> None:
+        if keyframe.label:
+            self.logger.info(keyframe.label)
+        if keyframe.angle is not None:
+            self.__motorManager.setAngle(keyframe.angle)
+        if keyframe.speed is not None:
+            self.__motorManager.setSpeed(keyframe.speed)
+
+    def __obstacle(self, obstacleDistance) -> bool:
+        """
+        True when the car goes forward towards an obstacle closer than obstacleDistance.
+        """
+        if obstacleDistance is None or self.__sensorManager is None:
+            return False
+        if self.__motorManager.speed <= 0:
+            return False
+        front = self.__sensorManager.getDistance().front
+        return front is not None and front < obstacleDistance
+
+    def __end(self, state: str) -> bool:
+        self.__motorManager.setSpeed(0)
+        self.__motorManager.setAngle(0)
+        self.__state = state
+        self.logger.warning(f"Maneuver {self.__maneuver.name} {state} after {self.elapsed:.2f} s")
+        return False
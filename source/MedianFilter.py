@@ -0,0 +1,106 @@
+import bisect
+
+"""
+Module for the MedianFilter class.
+This class smooths the readings of one distance sensor sample by sample,
+with a rolling median that rejects the isolated bad echoes.
+"""
+
+class MedianFilter:
+    """
+    Rolling median of the last valid readings, updated after each sample.
+
+    The readings are kept in a ring buffer and in a sorted list of the same size,
+    so each update costs one bisect insertion and one removal in a list of windowSize values.
+    A reading farther from the median than the tolerance is rejected like a missing reading,
+    unless maxRejections readings in a row are rejected: the obstacle really moved
+    and the window restarts from the new reading.
+
+    The confidence of the estimate is the fraction of the window holding accepted readings.
+
+    Attributes:
+        windowSize (int): Number of readings in the window.
+        tolerance (float): Minimum deviation from the median (in cm) to reject a reading.
+        relativeTolerance (float): Deviation relative to the median to reject a reading,
+            the larger of the two tolerances is used.
+        maxRejections (int): Rejected readings in a row after which the window restarts.
+    """
+    def __init__(self, windowSize: int = 5, tolerance: float = 15.0, relativeTolerance: float = 0.3, maxRejections: int = 3):
+        if windowSize < 1:
+            raise ValueError("Window size must be at least 1.")
+        if maxRejections < 1:
+            raise ValueError("maxRejections must be at least 1.")
+        self.__windowSize = windowSize
+        self.__tolerance = tolerance
+        self.__relativeTolerance = relativeTolerance
+        self.__maxRejections = maxRejections
+        self.__rejected = 0
+        self.reset()
+
+    @property
+    def windowSize(self):
+        return self.__windowSize
+
+    @property
+    def estimate(self):
+        """Median of the accepted readings of the window, None if there is none."""
+        return self.__estimate
+
+    @property
+    def confidence(self) -> float:
+        return self.__confidence
+
+    @property
+    def rejected(self):
+        """Number of readings rejected as outliers since the creation of the filter."""
+        return self.__rejected
+
+    def reset(self) -> None:
+        """
+        Empties the window.
+        """
+        self.__ring = [None] * self.__windowSize
+        self.__index = 0
+        self.__sorted = []
+        self.__streak = 0
+        self.__estimate = None
+        self.__confidence = 0.0
+
+    def update(self, value, timestampNs: int = None):
+        """
+        Adds a reading (None when the sensor got no echo) and returns the new (estimate, confidence).
+        timestampNs is not used by the median, it keeps the interface of the other filters.
+        """
+        if value is not None and self.__isOutlier(value):
+            self.__rejected += 1
+            self.__streak += 1
+            if self.__streak >= self.__maxRejections:
+                self.reset()
+            else:
+                value = None
+        else:
+            self.__streak = 0
+
+        evicted = self.__ring[self.__index]
+        if evicted is not None:
+            del self.__sorted[bisect.bisect_left(self.__sorted, evicted)]
+        self.__ring[self.__index] = value
+        if value is not None:
+            bisect.insort(self.__sorted, value)
+        self.__index = (self.__index + 1) % self.__windowSize
+
+        count = len(self.__sorted)
+        if count == 0:
+            self.__estimate = None
+        elif count % 2:
+            self.__estimate = round(self.__sorted[count // 2], 1)
+        else:
+            self.__estimate = round((self.__sorted[count // 2 - 1] + self.__sorted[count // 2]) / 2, 1)
+        self.__confidence = count / self.__windowSize
+        return self.__estimate, self.__confidence
+
+    def __isOutlier(self, value) -> bool:
+        median = self.__estimate
+        if median is None or len(self.__sorted) < 2:
+            return False
+        return abs(value - median) > max(self.__tolerance, self.__relativeTolerance * median)
@@ -1,23 +1,43 @@
 from DCMotor import DCMotor
 from ServoMotor import ServoMotor
-import adafruit_pca9685
-import busio
-import board
+from PWMActuator import PWMActuator
+from I2CArbiter import I2CArbiter
+from Calibration import Calibration
+from Hardware import busio, board, adafruit_pca9685
 import time
+import logging
+import os
 
 """
 Module for the MotorManager class.
 This class is used to manage the motors of the LamboCar.
 It initializes the DC motors and the servo motor using the PCA9685 driver.
 It also provides methods to set the speed and angle of the motors.
+The PWM duty cycles go through a PWMActuator, so unchanged values are not written again on the I2C bus.
+On a bus shared through an I2CArbiter, the PCA9685 has the highest priority.
+The conversion of the commands into duty cycles uses the lookup tables of the car Calibration,
+read from config/calibration.json when the file exists.
 """
+DEFAULT_CALIBRATION_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config", "calibration.json")
+
 class MotorManager():
-    def __init__(self, i2c_bus:busio.I2C):
+    def __init__(self, i2c_bus: "busio.I2C", calibrationFile: str = None):
         self.__dcMotorsPropulsion = [DCMotor(5, 17, 18), DCMotor(4, 27, 22)]
         self.__servoDirection = ServoMotor(0, 50)
-        self.__i2c_bus = i2c_bus
+        if calibrationFile is None and os.path.exists(DEFAULT_CALIBRATION_FILE):
+            calibrationFile = DEFAULT_CALIBRATION_FILE
+        if calibrationFile:
+            self.__calibration = Calibration.load(calibrationFile)
+        else:
+            self.__calibration = Calibration.fromServo(self.__servoDirection)
+        self.__i2c_bus = I2CArbiter.clientOf(i2c_bus, "PCA9685", I2CArbiter.ACTUATOR)
         self.__pwmDriver = adafruit_pca9685.PCA9685(self.__i2c_bus, address=0x40)
-        self.__pwmDriver.frequency = 50
+        self.__pwmDriver.frequency = self.__calibration.frequency
+        self.__actuator = PWMActuator(self.__pwmDriver)
+        self.__direction = None
+        self.__speed = 0
+        self.__angle = 0
+        self.logger = logging.getLogger(__name__)
 
     @property
     def dcMotorsPropulsion(self):
@@ -28,6 +48,20 @@ class MotorManager():
     @property
     def pwmDriver(self):
         return self.__pwmDriver
+    @property
+    def actuator(self):
+        return self.__actuator
+    @property
+    def calibration(self):
+        return self.__calibration
+    @property
+    def speed(self):
+        """Last speed given to setSpeed."""
+        return self.__speed
+    @property
+    def angle(self):
+        """Last steering given to setAngle."""
+        return self.__angle
     
     def setSpeed(self, speed:float) -> None:
         try:
@@ -41,28 +75,46 @@ class MotorManager():
             """
             if isinstance(speed, int) or isinstance(speed, float):
 
+                self.__speed = speed
                 front = (speed >= 0)
                 speed_value = abs(speed)
 
-                dc_duty = int((speed_value / 100.0) * 65535)
+                dc_duty = self.__calibration.speedToDuty(speed_value)
+                if speed_value == 0:
+                    direction = "stopped"
+                else:
+                    direction = "forward" if front else "backward"
 
-                for motor in self.__dcMotorsPropulsion:
-                    if speed_value == 0:
-                        motor.stop()
-                        print("Speed is 0, motors stopped.")
-                    else:
-                        motor.setDirection(front)
-                        self.__pwmDriver.channels[motor.pinEnable].duty_cycle =((2**16)-1)-dc_duty
-                        if front:
-                            print(f"Motors are moving forward at {speed_value}%.")
+                if direction != self.__direction:
+                    for motor in self.__dcMotorsPropulsion:
+                        if speed_value == 0:
+                            motor.stop()
                         else:
-                            print(f"Motors are moving backward at {speed_value}%.")
+                            motor.setDirection(front)
+                    self.__direction = direction
+
+                if speed_value != 0:
+                    self.__actuator.setDutyCycles(
+                        {motor.pinEnable: ((2**16)-1)-dc_duty for motor in self.__dcMotorsPropulsion}
+                    )
 
             else:
                 raise ValueError("Speed must be an integer or float.")
         except ValueError as e:
-            print(e)
+            self.logger.error(e)
         
+    def arm(self, forward: bool = True) -> None:
+        """
+        Prepares the motors for a start: the direction pins are set and the duty cycles
+        of the motors are written for a speed of 0, so the next setSpeed only writes the new duty cycles.
+        """
+        for motor in self.__dcMotorsPropulsion:
+            motor.setDirection(forward)
+        self.__direction = "forward" if forward else "backward"
+        idle = ((2**16)-1)-self.__calibration.speedToDuty(0)
+        self.__actuator.setDutyCycles({motor.pinEnable: idle for motor in self.__dcMotorsPropulsion})
+        self.__speed = 0
+
     def setAngle(self, steering:float) -> None:
         try:
             """
@@ -71,46 +123,30 @@ class MotorManager():
             :param steering: Steering percentage from -100 (full left) to 100 (full right), 0 for straight ahead.
             """
             if isinstance(steering, int) or isinstance(steering, float):
+                self.__angle = steering
                 servo_duty = self.convert_steering_to_duty(steering)
-                self.__pwmDriver.channels[self.__servoDirection.boardChannel].duty_cycle = ((2**16)-1)-servo_duty
+                self.__actuator.setDutyCycle(self.__servoDirection.boardChannel, ((2**16)-1)-servo_duty)
             else:
                 raise ValueError("Steering must be an integer or float.")
         except ValueError as e:
-            print(e)
+            self.logger.error(e)
         
     def convert_steering_to_duty(self, steering: float) -> int:
         """
-        Converts a steering percentage (-100 to 100) into a duty_cycle value (0 to 65535)
-        for a servo with a limited mechanical range around the center.
-
-        Parameters:
-        - steering: Steering percentage (-100 to 100)
-        - center_angle: The center angle of the servo (in degrees), typically 90°.
-        - range_deg: Maximum deviation from the center, e.g., 45°.
-                    This means -100% corresponds to center_angle - range_deg (90-45 = 45°)
-                    and 100% to center_angle + range_deg (90+45 = 135°).
-        - freq: PWM signal frequency (e.g., 60 Hz)
-        - min_pulse_ms: Minimum pulse width in ms (for 0° in the full mapping, e.g., 1.0 ms)
-        - max_pulse_ms: Maximum pulse width in ms (for 180° in the full mapping, e.g., 2.0 ms)
+        Converts a steering percentage (-100 to 100) into a duty_cycle value (0 to 65535).
 
-        The function first calculates the signal period, determines the full duty cycle range
-        for the servo, then extracts the value corresponding to the effective angle.
+        The value is read from the steering lookup table of the calibration, which is
+        compiled once from the calibration points (pulse width in ms for a steering percentage).
+        Without calibration file the points come from the ServoMotor geometry:
+        -100% corresponds to centerAngle - rangeDegrees and 100% to centerAngle + rangeDegrees,
+        with a pulse going from minPulse (0°) to maxPulse (180°) at the servo frequency.
 
         :return: 16-bit duty_cycle value (0 to 65535)
         """
-        center_angle = self.__servoDirection.centerAngle
-        range_deg = self.__servoDirection.rangeDegrees
-        min_pulse_ms = self.__servoDirection.minPulse
-        max_pulse_ms = self.__servoDirection.maxPulse
-        freq = self.__servoDirection.frequency
+        return self.__calibration.steeringToDuty(steering)
 
-        periode_ms = 1000.0 / freq  # ex: 1000/60 ≈ 16.67 ms
-        
-        t_min_duty = min_pulse_ms / periode_ms   # ex: ≈ 1.0/16.67 ≈ 0.06
-        t_max_duty = max_pulse_ms / periode_ms   # ex: ≈ 2.0/16.67 ≈ 0.12
-        
-        normalized_angle = center_angle + (steering / 100.0) * range_deg
-        
-        duty_fraction = t_min_duty + (t_max_duty - t_min_duty) * (normalized_angle / 180.0)
-        
-        return int(duty_fraction * 65535)
\ No newline at end of file
+    def convert_steerings_to_duty(self, steerings) -> list:
+        """
+        Batch version of convert_steering_to_duty.
+        """
+        return self.__calibration.steeringToDuties(steerings)
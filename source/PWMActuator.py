@@ -0,0 +1,119 @@
+import threading
+from I2CArbiter import I2CArbiterClient
+
+"""
+Module for the PWMActuator class.
+This class writes the duty cycles of the PCA9685 channels while avoiding useless I2C transactions.
+"""
+
+class PWMActuator:
+    """
+    Write-coalescing layer on top of an adafruit PCA9685 driver.
+
+    A shadow copy of the ON/OFF registers of the 16 channels is kept,
+    so a duty cycle that does not change the registers is not written again.
+    Channels updated together with consecutive numbers are written in one
+    auto-increment block write starting at their first LEDn_ON_L register.
+    On a bus shared through an I2CArbiter, the block writes are posted: when the bus is busy
+    they are queued (a newer write of the same block replacing the queued one) instead of waiting.
+
+    Attributes:
+        pwmDriver: adafruit_pca9685.PCA9685 instance (auto-increment is enabled by its frequency setter).
+    """
+    LED0_ON_L = 0x06
+    CHANNELS = 16
+
+    def __init__(self, pwmDriver):
+        self.__pwmDriver = pwmDriver
+        self.__shadow = [None] * self.CHANNELS
+        self.__lock = threading.Lock()
+        self.__transactions = 0
+        self.__skippedWrites = 0
+        self.__coalescedWrites = 0
+
+    @property
+    def pwmDriver(self):
+        return self.__pwmDriver
+
+    @staticmethod
+    def toRegisters(value: int) -> tuple:
+        """
+        Converts a 16-bit duty cycle into the (ON, OFF) 12-bit register values,
+        the same way as the adafruit PWMChannel.duty_cycle setter.
+        """
+        if not 0 <= value <= 0xFFFF:
+            raise ValueError(f"Duty cycle out of range: {value}")
+        if value == 0xFFFF:
+            return (0x1000, 0)
+        return (0, (value + 1) >> 4)
+
+    def setDutyCycle(self, channel: int, value: int) -> None:
+        """
+        Sets the 16-bit duty cycle of one channel, nothing is written if it does not change.
+        """
+        self.setDutyCycles({channel: value})
+
+    def setDutyCycles(self, duties: dict) -> None:
+        """
+        Sets the 16-bit duty cycle of several channels.
+        Unchanged channels are skipped and consecutive channels are written in a single transaction.
+        """
+        with self.__lock:
+            changed = {}
+            for channel, value in duties.items():
+                registers = self.toRegisters(int(value))
+                if self.__shadow[channel] == registers:
+                    self.__skippedWrites += 1
+                else:
+                    changed[channel] = registers
+
+            for block in self.__consecutiveBlocks(sorted(changed)):
+                self.__writeBlock(block[0], [changed[channel] for channel in block])
+                for channel in block:
+                    self.__shadow[channel] = changed[channel]
+                self.__transactions += 1
+                self.__coalescedWrites += len(block) - 1
+
+    def invalidate(self) -> None:
+        """
+        Forgets the shadow registers, the next write of every channel goes to the device.
+        """
+        with self.__lock:
+            self.__shadow = [None] * self.CHANNELS
+
+    def stats(self) -> dict:
+        """
+        Returns the number of I2C transactions done and saved.
+        """
+        return {
+            "transactions": self.__transactions,
+            "skippedWrites": self.__skippedWrites,
+            "coalescedWrites": self.__coalescedWrites,
+            "savedTransactions": self.__skippedWrites + self.__coalescedWrites
+        }
+
+    @staticmethod
+    def __consecutiveBlocks(channels: list) -> list:
+        blocks = []
+        for channel in channels:
+            if blocks and blocks[-1][-1] == channel - 1:
+                blocks[-1].append(channel)
+            else:
+                blocks.append([channel])
+        return blocks
+
+    def __writeBlock(self, firstChannel: int, registers: list) -> None:
+        buffer = bytearray([self.LED0_ON_L + 4 * firstChannel])
+        for on, off in registers:
+            buffer += bytes([on & 0xFF, on >> 8, off & 0xFF, off >> 8])
+        device = self.__pwmDriver.i2c_device
+
+        def write():
+            with device:
+                device.write(buffer)
+
+        bus = getattr(device, "i2c", None)
+        if isinstance(bus, I2CArbiterClient):
+            bus.post((buffer[0], len(buffer)), write)
+        else:
+            write()
@@ -0,0 +1,182 @@
+import bisect
+import logging
+import threading
+import time
+import Hardware
+from data.PowerSnapshot import PowerSnapshot
+
+"""
+Module for the PowerMonitor class.
+This class polls the INA219 in the background at a low rate, integrates the charge and the energy
+used during the run and estimates the charge left in the battery.
+"""
+
+class PowerMonitor:
+    """
+    Background power monitor on an INASensor.
+
+    The INA219 is set to average averaging samples per conversion, then read rateHz times per second
+    (bus voltage and current). The charge (mAh) and the energy (Wh) are integrated with the trapezoidal rule.
+    The state of charge starts from the rest voltage of the first reading (the voltage plus the drop in the
+    internal resistance of the battery) on the voltageCurve of one cell, then follows the charge used
+    (coulomb counting).
+
+    The latest measure is kept as an immutable PowerSnapshot, so the control loop reads it without
+    touching the bus.
+
+    Attributes:
+        inaSensor: INASensor with configure() and readPower() methods.
+        rateHz (float): Readings per second.
+        capacityMah (float): Capacity of the battery in mAh.
+        cells (int): Number of cells in series.
+        internalResistance (float): Internal resistance of the battery in ohms.
+        averaging (int): Samples averaged by the INA219 for each conversion.
+        voltageCurve (list): (cell rest voltage, state of charge) points, in increasing voltage.
+        clock: Clock timestamping the readings, the clock of the hardware backend by default.
+    """
+    LI_ION_CURVE = [
+        (3.00, 0.00), (3.30, 0.02), (3.50, 0.08), (3.60, 0.15), (3.70, 0.30),
+        (3.80, 0.50), (3.90, 0.65), (4.00, 0.78), (4.10, 0.90), (4.20, 1.00)
+    ]
+
+    def __init__(
+        self,
+        inaSensor,
+        rateHz: float = 10,
+        capacityMah: float = 2600,
+        cells: int = 2,
+        internalResistance: float = 0.15,
+        averaging: int = 32,
+        voltageCurve: list = None,
+        clock=None
+    ):
+        if rateHz <= 0:
+            raise ValueError("Rate must be positive.")
+        if capacityMah <= 0 or cells < 1:
+            raise ValueError("The battery needs a positive capacity and at least one cell.")
+        self.__inaSensor = inaSensor
+        self.__rateHz = rateHz
+        self.__capacityMah = capacityMah
+        self.__cells = cells
+        self.__internalResistance = internalResistance
+        self.__averaging = averaging
+        self.__curve = voltageCurve if voltageCurve else self.LI_ION_CURVE
+        self.__clock = clock if clock else Hardware.clock()
+        self.__snapshot = None
+        self.__initialCharge = None
+        self.__errors = 0
+        self.__configured = False
+        self.__stop = threading.Event()
+        self.__thread = None
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def snapshot(self) -> PowerSnapshot:
+        """Latest measure, None before the first one."""
+        return self.__snapshot
+
+    @property
+    def rateHz(self):
+        return self.__rateHz
+
+    @property
+    def errors(self):
+        """Number of failed readings."""
+        return self.__errors
+
+    @property
+    def running(self):
+        return self.__thread is not None and self.__thread.is_alive()
+
+    def stateOfChargeFromVoltage(self, busVoltage: float, current: float = 0.0) -> float:
+        """
+        Returns the state of charge (0 to 1) of a battery at rest with the voltage of the battery under load
+        busVoltage (V) and its current (mA).
+        """
+        cellVoltage = (busVoltage + current / 1000.0 * self.__internalResistance) / self.__cells
+        curve = self.__curve
+        voltages = [voltage for voltage, _ in curve]
+        index = bisect.bisect_left(voltages, cellVoltage)
+        if index == 0:
+            return curve[0][1]
+        if index == len(curve):
+            return curve[-1][1]
+        (v0, s0), (v1, s1) = curve[index - 1], curve[index]
+        return s0 + (s1 - s0) * (cellVoltage - v0) / (v1 - v0)
+
+    def sampleOnce(self):
+        """
+        Reads the INA219 once and updates the snapshot.
+        Returns the new snapshot, or None if the reading failed.
+        """
+        try:
+            if not self.__configured:
+                self.__inaSensor.configure(self.__averaging)
+                self.__configured = True
+            busVoltage, current = self.__inaSensor.readPower()
+        except Exception as e:
+            self.__errors += 1
+            self.logger.error(f"Error while reading the power sensor: {e}")
+            return None
+        now = self.__clock.nowNs()
+        power = busVoltage * current / 1000.0
+
+        previous = self.__snapshot
+        if previous is None:
+            chargeMah = energyWh = 0.0
+            self.__initialCharge = self.stateOfChargeFromVoltage(busVoltage, current)
+            samples = 1
+        else:
+            hours = (now - previous.timestampNs) / 3.6e12
+            chargeMah = previous.chargeMah + (previous.current + current) / 2 * hours
+            energyWh = previous.energyWh + (previous.power + power) / 2 * hours
+            samples = previous.samples + 1
+        stateOfCharge = min(1.0, max(0.0, self.__initialCharge - chargeMah / self.__capacityMah))
+
+        self.__snapshot = PowerSnapshot(now, busVoltage, current, power, chargeMah, energyWh, stateOfCharge, samples)
+        return self.__snapshot
+
+    def reset(self) -> None:
+        """
+        Starts the integration again from the next reading.
+        """
+        self.__snapshot = None
+        self.__initialCharge = None
+
+    def start(self) -> None:
+        """
+        Starts the polling thread.
+        """
+        if self.running:
+            return
+        self.__stop.clear()
+        self.__thread = threading.Thread(target=self.__run, daemon=True)
+        self.__thread.start()
+
+    def stop(self, timeout: float = 1.0) -> None:
+        """
+        Stops the polling thread and waits for it to end.
+        """
+        self.__stop.set()
+        if self.__thread is not None:
+            self.__thread.join(timeout)
+            self.__thread = None
+        if self.__snapshot is not None:
+            self.logger.info(f"Power: {self.__snapshot.toDict()}")
+
+    def __run(self):
+        scale = getattr(self.__clock, "scale", 1.0)
+        period = 1.0 / (self.__rateHz * scale)
+        next_time = time.perf_counter()
+        if self.__snapshot is not None:
+            # already sampled by the caller, wait for the next period
+            next_time += period
+            self.__stop.wait(period)
+        while not self.__stop.is_set():
+            self.sampleOnce()
+            next_time += period
+            delay = next_time - time.perf_counter()
+            if delay < 0:
+                next_time = time.perf_counter()
+                delay = 0
+            self.__stop.wait(delay)
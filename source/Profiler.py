@@ -0,0 +1,213 @@
+import functools
+import json
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+import Hardware
+from HdrHistogram import HdrHistogram
+
+"""
+Module for the Profiler class.
+This class measures the calls of the sensing and control methods of the LamboCar (sensor reads,
+motor writes, distance reads, steering) while the car runs, to see where the time of a stutter went.
+
+Usage, to dump the statistics of a running car started with main.py:
+    python Profiler.py <pid>            dumps the statistics and prints them
+    python Profiler.py <pid> toggle     enables or disables the profiling
+"""
+
+class Profiler:
+    """
+    Call profiler of a set of methods.
+
+    enable() replaces each target method on its class by a wrapper counting the calls, the exceptions
+    and the duration of each call in an HdrHistogram; disable() puts the original methods back.
+    While the profiler is disabled, the classes are left untouched, so the calls cost nothing more.
+    The counts are not locked: two threads calling the same method at once may lose a count.
+
+    With installSignalHandlers(), SIGUSR1 writes the statistics to dumpPath (and the log)
+    and SIGUSR2 enables or disables the profiling of the running process.
+
+    Attributes:
+        targets (list): (class, method name) pairs to profile, defaultTargets() by default.
+        clock: Clock measuring the calls, the clock of the hardware backend by default.
+        dumpPath (str): File written by dump(), logs/profile_<pid>.json by default.
+    """
+    DUMP_SIGNAL = signal.SIGUSR1
+    TOGGLE_SIGNAL = signal.SIGUSR2
+
+    def __init__(self, targets=None, clock=None, dumpPath: str = None):
+        self.__targets = list(targets) if targets is not None else self.defaultTargets()
+        self.__clock = clock if clock else Hardware.clock()
+        self.__dumpPath = dumpPath if dumpPath else self.dumpPathOf(os.getpid())
+        self.__histograms = {self.nameOf(cls, name): HdrHistogram() for cls, name in self.__targets}
+        self.__errors = dict.fromkeys(self.__histograms, 0)
+        self.__originals = {}
+        self.__lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.__originals)
+
+    @property
+    def targets(self) -> list:
+        return list(self.__targets)
+
+    @property
+    def dumpPath(self):
+        return self.__dumpPath
+
+    @staticmethod
+    def nameOf(cls, name: str) -> str:
+        return f"{cls.__name__}.{name}"
+
+    @staticmethod
+    def dumpPathOf(pid: int) -> str:
+        return os.path.join("logs", f"profile_{pid}.json")
+
+    @staticmethod
+    def defaultTargets() -> list:
+        """
+        Returns the readValue method of every Sensor class, MotorManager.setSpeed and setAngle,
+        SensorManager.getDistance and LamboCar.stayMid.
+        """
+        from Sensor import Sensor
+        from LamboCar import LamboCar
+        from MotorManager import MotorManager
+        from SensorManager import SensorManager
+
+        targets = []
+        pending = list(Sensor.__subclasses__())
+        while pending:
+            cls = pending.pop(0)
+            pending.extend(cls.__subclasses__())
+            method = cls.__dict__.get("readValue")
+            if method is not None and not getattr(method, "__isabstractmethod__", False):
+                targets.append((cls, "readValue"))
+        targets += [
+            (MotorManager, "setSpeed"),
+            (MotorManager, "setAngle"),
+            (SensorManager, "getDistance"),
+            (LamboCar, "stayMid")
+        ]
+        return targets
+
+    def enable(self) -> None:
+        """
+        Starts profiling the targets.
+        """
+        with self.__lock:
+            if self.__originals:
+                return
+            for cls, name in self.__targets:
+                original = cls.__dict__[name]
+                key = self.nameOf(cls, name)
+                self.__originals[(cls, name)] = original
+                setattr(cls, name, self.__wrap(original, self.__histograms[key], key))
+        self.logger.info(f"Profiling enabled on {len(self.__targets)} methods")
+
+    def disable(self) -> None:
+        """
+        Stops profiling, the targets are the original methods again. The statistics are kept.
+        """
+        with self.__lock:
+            originals, self.__originals = self.__originals, {}
+            for (cls, name), original in originals.items():
+                setattr(cls, name, original)
+        if originals:
+            self.logger.info("Profiling disabled")
+
+    def toggle(self) -> None:
+        if self.enabled:
+            self.disable()
+        else:
+            self.enable()
+
+    def __wrap(self, original, histogram: HdrHistogram, key: str):
+        clock = self.__clock
+        errors = self.__errors
+
+        @functools.wraps(original)
+        def profiled(*args, **kwargs):
+            start = clock.nowNs()
+            try:
+                return original(*args, **kwargs)
+            except BaseException:
+                errors[key] += 1
+                raise
+            finally:
+                histogram.record(clock.nowNs() - start)
+        return profiled
+
+    def stats(self) -> dict:
+        """
+        Returns the calls, the exceptions and the duration summary (microseconds) of each called target.
+        """
+        return {
+            key: {"calls": histogram.count, "errors": self.__errors[key], "latency": histogram.summary()}
+            for key, histogram in self.__histograms.items()
+            if histogram.count
+        }
+
+    def reset(self) -> None:
+        for key, histogram in self.__histograms.items():
+            histogram.reset()
+            self.__errors[key] = 0
+
+    def dump(self) -> dict:
+        """
+        Writes the statistics to dumpPath as JSON and to the log, and returns them.
+        """
+        stats = {"enabled": self.enabled, "time": time.time(), "methods": self.stats()}
+        directory = os.path.dirname(self.__dumpPath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary = f"{self.__dumpPath}.tmp"
+        with open(temporary, "w") as file:
+            json.dump(stats, file, indent=2)
+        os.replace(temporary, self.__dumpPath)
+        self.logger.info(f"Profile: {stats['methods']}")
+        return stats
+
+    def installSignalHandlers(self) -> None:
+        """
+        Dumps the statistics on SIGUSR1 and enables or disables the profiling on SIGUSR2.
+        Must be called from the main thread.
+        """
+        signal.signal(self.DUMP_SIGNAL, lambda signum, frame: self.dump())
+        signal.signal(self.TOGGLE_SIGNAL, lambda signum, frame: self.toggle())
+
+
+def main(argv=None):
+    """
+    Asks a running car to dump its profile (or to toggle the profiling) and prints the dump.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or len(argv) > 2 or (len(argv) == 2 and argv[1] not in ("dump", "toggle")):
+        print("Usage: python Profiler.py <pid> [dump|toggle]")
+        return 2
+    pid = int(argv[0])
+    if len(argv) == 2 and argv[1] == "toggle":
+        os.kill(pid, Profiler.TOGGLE_SIGNAL)
+        # pending signals are delivered by number, SIGUSR1 would come first
+        time.sleep(0.1)
+    path = Profiler.dumpPathOf(pid)
+    before = os.stat(path).st_mtime_ns if os.path.exists(path) else None
+    os.kill(pid, Profiler.DUMP_SIGNAL)
+    deadline = time.monotonic() + 2.0
+    while time.monotonic() < deadline:
+        if os.path.exists(path) and os.stat(path).st_mtime_ns != before:
+            with open(path) as file:
+                print(file.read())
+            return 0
+        time.sleep(0.05)
+    print(f"No profile written to {path}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,69 @@
+import struct
 from I2CSensor import I2CSensor
-import adafruit_tcs34725
-import busio
-import board
+from I2CArbiter import I2CArbiter
+from Hardware import busio, board, adafruit_tcs34725, adafruit_bus_device
 from data.RGBData import RGBData
+from data.RGBFrame import RGBFrame
+import Hardware
+
+ADDRESS = 0x29
+# Integration time in ms set by the adafruit driver when it is created
+DEFAULT_INTEGRATION_TIME = 2.4
+# Command byte of the TCS34725: command bit, auto-increment, first data register (CDATAL)
+BURST_COMMAND = bytes([0x80 | 0x20 | 0x14])
 
 class RGBSensor(I2CSensor):
-    def __init__(self, i2c_bus:busio.I2C):
-        super().__init__(i2c_bus)
-        self.__sensor = adafruit_tcs34725.TCS34725(self._i2c_bus)
-    
+    def __init__(self, i2c_bus: "busio.I2C", clock=None):
+        super().__init__(i2c_bus, "TCS34725", I2CArbiter.COLOUR)
+        self.__sensor = adafruit_tcs34725.TCS34725(self._i2c_bus, ADDRESS)
+        # device of the burst reads, on the same (arbitrated) bus as the driver
+        self.__device = adafruit_bus_device.I2CDevice(self._i2c_bus, ADDRESS)
+        self.__clock = clock if clock else Hardware.clock()
+        self.__buffer = bytearray(8)
+        self.__readyNs = None
+        self.__enable(DEFAULT_INTEGRATION_TIME)
+
+    @property
+    def integrationTime(self) -> float:
+        """Integration time of the sensor in ms, a new frame is available after each integration."""
+        return self.__sensor.integration_time
+
+    @property
+    def gain(self):
+        return self.__sensor.gain
+
+    def configure(self, integrationTime: float = 2.4, gain: int = 60) -> None:
+        """
+        Sets the integration time (2.4 to 614.4 ms) and the gain (1, 4, 16 or 60) of the TCS34725.
+        The defaults are the fastest setting: the shortest integration, compensated by the highest gain.
+        """
+        self.__sensor.integration_time = integrationTime
+        self.__sensor.gain = gain
+        self.__enable(integrationTime)
+
+    def __enable(self, integrationTime: float) -> None:
+        """
+        Powers the sensor on with the colour conversions enabled (PON | AEN): the driver starts it
+        inactive and the burst reads do not enable it. The first frame is read after a full integration.
+        """
+        self.__sensor.active = True
+        self.__readyNs = self.__clock.nowNs() + int(integrationTime * 1e6)
+
+    def readFrame(self) -> RGBFrame:
+        """
+        Reads the clear, red, green and blue channels in one burst of 8 bytes (a single I2C transaction)
+        and returns them as a timestamped RGBFrame.
+        """
+        if self.__readyNs is not None:
+            remaining = self.__readyNs - self.__clock.nowNs()
+            if remaining > 0:
+                self.__clock.sleep(remaining / 1e9)
+            self.__readyNs = None
+        with self.__device as device:
+            device.write_then_readinto(BURST_COMMAND, self.__buffer)
+        clear, red, green, blue = struct.unpack("<4H", self.__buffer)
+        return RGBFrame(clear, red, green, blue, self.__clock.nowNs())
+
     def readValue(self):
         """ return a tuple with the values of the sensor Red Green Blue"""
-        return RGBData(self.__sensor.color_rgb_bytes[0],self.__sensor.color_rgb_bytes[1],self.__sensor.color_rgb_bytes[2])
-        
\ No newline at end of file
+        return self.readFrame().rgb
@@ -0,0 +1,83 @@
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+
+"""
+Module for the RateLimitFilter class.
+This filter limits the number of log records repeated with the same key,
+so that a sensor failing on every reading does not flood the logs.
+"""
+
+class RateLimitFilter(logging.Filter):
+    """
+    Logging filter letting at most burst records per key through in each interval.
+
+    The key of a record is its "rateKey" extra attribute if given, otherwise its logger,
+    its level and its message where the numbers are replaced by "#"
+    (so "Distance out of range: 651.0 cm" and "Distance out of range: 702.3 cm" share a key).
+    When a key is let through again, the number of records suppressed meanwhile
+    is appended to its message.
+    At most maxKeys keys are remembered, the least recently used ones are forgotten first.
+
+    Attributes:
+        burst (int): Records of a key let through in each interval.
+        interval (float): Length of an interval in seconds.
+        maxKeys (int): Number of keys remembered.
+    """
+    NUMBER = re.compile(r"\d+(\.\d+)?")
+
+    def __init__(self, burst: int = 5, interval: float = 1.0, maxKeys: int = 1024):
+        super().__init__()
+        if burst < 1:
+            raise ValueError("Burst must be at least 1.")
+        if interval <= 0:
+            raise ValueError("Interval must be positive.")
+        self.__burst = burst
+        self.__interval = interval
+        self.__maxKeys = maxKeys
+        self.__keys = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__suppressed = 0
+
+    @property
+    def burst(self):
+        return self.__burst
+
+    @property
+    def interval(self):
+        return self.__interval
+
+    @property
+    def suppressed(self):
+        """Total number of records suppressed."""
+        return self.__suppressed
+
+    def keyOf(self, record: logging.LogRecord):
+        key = getattr(record, "rateKey", None)
+        if key is not None:
+            return key
+        return (record.name, record.levelno, self.NUMBER.sub("#", str(record.msg)))
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = self.keyOf(record)
+        now = time.monotonic()
+        with self.__lock:
+            state = self.__keys.get(key)
+            if state is None or now - state[0] >= self.__interval:
+                suppressed = state[2] if state else 0
+                self.__keys[key] = [now, 1, 0]
+                self.__keys.move_to_end(key)
+                if len(self.__keys) > self.__maxKeys:
+                    self.__keys.popitem(last=False)
+            elif state[1] < self.__burst:
+                state[1] += 1
+                suppressed = 0
+            else:
+                state[2] += 1
+                self.__suppressed += 1
+                return False
+        if suppressed:
+            record.msg = f"{record.msg} ({suppressed} similar messages suppressed)"
+        return True
@@ -0,0 +1,168 @@
+import argparse
+import csv
+import sys
+from VirtualClock import VirtualClock
+from SensorManager import SensorManager
+from ReplaySensor import ReplaySensor
+from ReplayMotorManager import ReplayMotorManager
+from TelemetryRecorder import TelemetryRecorder
+
+"""
+Module for the ReplayEngine class.
+This class replays recorded sensor streams through the control code of the LamboCar
+(stayMid and the lap logic) and collects the actuator commands, without hardware and
+as fast as the CPU allows, so that two versions of the controller can be compared on real data.
+"""
+
+class ReplayEngine:
+    """
+    Deterministic replay of a telemetry recording.
+
+    For each recorded tick, the virtual clock is set to the recorded timestamp, the stub sensors
+    return the recorded distances, line state and current, and controlTick of the car is called.
+    The distances go through the same SensorManager sampling path as on the car, with a window of
+    one reading (the recorded distances are already averaged) and no age limit.
+    The colour is not replayed: the recording keeps the RGB bytes, not the raw channels of the frames
+    read by the colour path, and the control tick does not use it.
+
+    Attributes:
+        samples (list): TelemetryData samples, e.g. from TelemetryRecorder.read().
+        carClass: LamboCar class (or subclass) to replay, LamboCar by default.
+    """
+    FIELDS = ("timestampNs", "speed", "angle", "tour")
+
+    def __init__(self, samples, carClass=None):
+        self.__samples = list(samples)
+        if carClass is None:
+            from LamboCar import LamboCar
+            carClass = LamboCar
+        self.__carClass = carClass
+        self.__commands = []
+
+    @classmethod
+    def fromFile(cls, path: str, carClass=None):
+        return cls(TelemetryRecorder.read(path), carClass)
+
+    @property
+    def samples(self):
+        return self.__samples
+
+    @property
+    def commands(self):
+        """(timestampNs, speed, angle, tour) of each replayed tick."""
+        return list(self.__commands)
+
+    def run(self) -> list:
+        """
+        Replays every sample and returns the commands of each tick.
+        """
+        clock = VirtualClock(self.__samples[0].timestampNs if self.__samples else 0)
+        front, left, right = ReplaySensor("front"), ReplaySensor("left"), ReplaySensor("right")
+        # the rgb stub is never read, it only keeps SensorManager from opening a colour sensor
+        line, rgb, current = ReplaySensor("line"), ReplaySensor("rgb"), ReplaySensor("current")
+        sensorManager = SensorManager(
+            lineSensor=line,
+            distSensorFront=front,
+            distSensorLeft=left,
+            distSensorRight=right,
+            inaSensor=current,
+            rgbSensor=rgb
+        )
+        motorManager = ReplayMotorManager()
+        lambo = self.__carClass(
+            None,
+            clock=clock,
+            sensorManager=sensorManager,
+            motorManager=motorManager
+        )
+
+        sensorManager.startSampling(windowSize=1, maxAge=None, background=False, filter="mean")
+        scheduler = sensorManager.firingScheduler
+        commands = []
+        try:
+            for sample in self.__samples:
+                clock.advanceTo(sample.timestampNs)
+                front.value, left.value, right.value = sample.front, sample.left, sample.right
+                line.value = sample.line
+                current.value = {"Current": sample.current}
+                for _ in scheduler.slots:
+                    scheduler.step()
+                lambo.controlTick()
+                commands.append((sample.timestampNs, motorManager.speed, motorManager.angle, lambo.tour))
+        finally:
+            sensorManager.stopSampling()
+        self.__commands = commands
+        return list(commands)
+
+    def save(self, path: str) -> None:
+        """
+        Writes the commands of the last run in a CSV file.
+        """
+        with open(path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(self.FIELDS)
+            for timestamp, speed, angle, tour in self.__commands:
+                writer.writerow((timestamp, round(speed, 3), round(angle, 3), tour))
+
+    @staticmethod
+    def compare(commands, otherCommands, tolerance: float = 0.01) -> dict:
+        """
+        Compares the commands of two runs tick by tick.
+        Returns the number of ticks compared and differing, the first differing timestamp
+        and the largest speed and steering differences.
+        """
+        differing = 0
+        first = None
+        maxSpeed = 0.0
+        maxAngle = 0.0
+        for (timestamp, speed, angle, tour), (_, otherSpeed, otherAngle, otherTour) in zip(commands, otherCommands):
+            speedDiff = abs(speed - otherSpeed)
+            angleDiff = abs(angle - otherAngle)
+            maxSpeed = max(maxSpeed, speedDiff)
+            maxAngle = max(maxAngle, angleDiff)
+            if speedDiff > tolerance or angleDiff > tolerance or tour != otherTour:
+                differing += 1
+                if first is None:
+                    first = timestamp
+        return {
+            "ticks": min(len(commands), len(otherCommands)),
+            "lengthDifference": len(commands) - len(otherCommands),
+            "differingTicks": differing,
+            "firstDifference": first,
+            "maxSpeedDifference": round(maxSpeed, 3),
+            "maxAngleDifference": round(maxAngle, 3)
+        }
+
+    @staticmethod
+    def load(path: str) -> list:
+        """
+        Reads a CSV file written by save().
+        """
+        with open(path, "r", newline="") as file:
+            reader = csv.reader(file)
+            next(reader)
+            return [(int(t), float(speed), float(angle), int(tour)) for t, speed, angle, tour in reader]
+
+def main():
+    """
+    Replays a telemetry file, writes the commands and compares them with the recorded ones or a previous replay.
+    """
+    parser = argparse.ArgumentParser(description="Replay a LamboCar telemetry file through the controller.")
+    parser.add_argument("telemetry", help="Telemetry file written by TelemetryRecorder.")
+    parser.add_argument("-o", "--output", help="CSV file receiving the replayed commands.")
+    parser.add_argument("--compare", help="CSV file of another replay to compare with (default: the recorded commands).")
+    args = parser.parse_args()
+
+    engine = ReplayEngine.fromFile(args.telemetry)
+    commands = engine.run()
+    if args.output:
+        engine.save(args.output)
+    if args.compare:
+        reference = ReplayEngine.load(args.compare)
+    else:
+        # The recording has no lap count, only the speed and steering are compared
+        reference = [(s.timestampNs, s.speed or 0, s.angle or 0, t) for s, (_, _, _, t) in zip(engine.samples, commands)]
+    print(ReplayEngine.compare(commands, reference))
+
+if __name__ == "__main__":
+    sys.exit(main())
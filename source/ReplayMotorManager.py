@@ -0,0 +1,38 @@
+"""
+Module for the ReplayMotorManager class.
+This class stands in for the MotorManager during a replay and keeps the commands instead of driving motors.
+"""
+
+class ReplayMotorManager:
+    """
+    MotorManager stub recording the commanded speed and steering.
+
+    Attributes:
+        speed (float): Last speed given to setSpeed.
+        angle (float): Last steering given to setAngle.
+        calls (int): Number of setSpeed and setAngle calls.
+    """
+    def __init__(self):
+        self.__speed = 0
+        self.__angle = 0
+        self.__calls = 0
+
+    @property
+    def speed(self):
+        return self.__speed
+
+    @property
+    def angle(self):
+        return self.__angle
+
+    @property
+    def calls(self):
+        return self.__calls
+
+    def setSpeed(self, speed: float) -> None:
+        self.__speed = speed
+        self.__calls += 1
+
+    def setAngle(self, steering: float) -> None:
+        self.__angle = steering
+        self.__calls += 1
@@ -0,0 +1,31 @@
+from Sensor import Sensor
+
+"""
+Module for the ReplaySensor class.
+This class is a stub sensor returning recorded values, used to replay a run.
+"""
+
+class ReplaySensor(Sensor):
+    """
+    Sensor whose readValue returns the value set by the replay engine for the current tick.
+
+    Attributes:
+        name (str): Name of the replayed stream (e.g. "front", "line").
+        value: Value returned by readValue.
+    """
+    def __init__(self, name: str, value=None):
+        self.__name = name
+        self.value = value
+        self.__reads = 0
+
+    @property
+    def name(self):
+        return self.__name
+
+    @property
+    def reads(self):
+        return self.__reads
+
+    def readValue(self):
+        self.__reads += 1
+        return self.value
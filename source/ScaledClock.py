@@ -0,0 +1,33 @@
+import time
+
+"""
+Module for the ScaledClock class.
+This clock runs faster (or slower) than the wall clock,
+it is used to run the simulation faster than real time.
+"""
+
+class ScaledClock:
+    """
+    Clock with the same interface as SystemClock where time goes scale times faster than real time.
+
+    Attributes:
+        scale (float): Number of clock seconds per real second.
+    """
+    def __init__(self, scale: float):
+        if scale <= 0:
+            raise ValueError("Scale must be positive.")
+        self.__scale = scale
+        self.__originNs = time.perf_counter_ns()
+
+    @property
+    def scale(self):
+        return self.__scale
+
+    def nowNs(self) -> int:
+        """Returns the scaled time in nanoseconds."""
+        return int((time.perf_counter_ns() - self.__originNs) * self.__scale)
+
+    def sleep(self, seconds: float) -> None:
+        """Sleeps the given number of scaled seconds."""
+        if seconds > 0:
+            time.sleep(seconds / self.__scale)
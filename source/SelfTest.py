@@ -0,0 +1,177 @@
+import logging
+import threading
+import time
+import Hardware
+from data.ComponentCheck import ComponentCheck
+from data.SelfTestReport import SelfTestReport
+
+"""
+Module for the SelfTest class.
+This class checks the motors, the servo and the sensors of the car before a race,
+all at the same time, each with its own timeout.
+"""
+
+class SelfTest:
+    """
+    Pre-race self-test of a car.
+
+    The actuators run a short sweep (sweep: speed, steering and duration of each step, the current
+    being read while the motors turn) while the RGB, INA219, ultrasonic and line sensors are read,
+    each check in its own thread. A check that does not end within its timeout is reported as
+    "timeout" and the test goes on without it; its thread is left to end by itself, except the sweep
+    which is told to stop before the motors are stopped and the wheels set straight at the end of the test.
+
+    Attributes:
+        motorManager: MotorManager with setSpeed and setAngle methods.
+        sensorManager: SensorManager of the car.
+        clock: Clock of the sweep and of the timings, the clock of the hardware backend by default.
+        timeout (float): Time in seconds given to each check.
+        timeouts (dict): Timeouts of some components, e.g. {"Distance": 0.5}, instead of timeout.
+        sweep (tuple): (speed, angle, seconds) steps of the actuator check.
+    """
+    COMPONENTS = ("Actuators", "RGB", "INA219", "Distance", "Line")
+    SWEEP = ((30, 50, 0.2), (-30, -50, 0.2), (0, 0, 0.1))
+    STOP_TIMEOUT = 0.1
+
+    def __init__(self, motorManager, sensorManager, clock=None, timeout: float = 1.0, timeouts: dict = None, sweep=None):
+        if timeout <= 0:
+            raise ValueError("Timeout must be positive.")
+        unknown = set(timeouts or {}) - set(self.COMPONENTS)
+        if unknown:
+            raise ValueError(f"Unknown components: {sorted(unknown)}")
+        self.__motorManager = motorManager
+        self.__sensorManager = sensorManager
+        self.__clock = clock if clock else Hardware.clock()
+        self.__timeouts = {name: timeout for name in self.COMPONENTS}
+        self.__timeouts.update(timeouts or {})
+        self.__sweep = tuple(sweep) if sweep is not None else self.SWEEP
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def timeouts(self) -> dict:
+        return dict(self.__timeouts)
+
+    def run(self) -> SelfTestReport:
+        """
+        Runs every check at the same time and returns the SelfTestReport.
+        """
+        clock = self.__clock
+        scale = getattr(clock, "scale", 1.0)
+        stop = threading.Event()
+        checks = {
+            "Actuators": lambda: self.__checkActuators(stop),
+            "RGB": self.__checkRGB,
+            "INA219": self.__checkINA,
+            "Distance": self.__checkDistance,
+            "Line": self.__checkLine
+        }
+        startNs = clock.nowNs()
+        start = time.monotonic()
+        results = {}
+        threads = {}
+        try:
+            for name, check in checks.items():
+                thread = threading.Thread(
+                    target=self.__timed, args=(name, check, results), name=f"selftest-{name}", daemon=True
+                )
+                thread.start()
+                threads[name] = thread
+            for name, thread in threads.items():
+                thread.join(max(0.0, start + self.__timeouts[name] / scale - time.monotonic()))
+            # the checks that ended in time, a sweep stopped below stays a timeout
+            finished = dict(results)
+        finally:
+            # a sweep still running must not drive the motors after they are stopped
+            stop.set()
+            actuators = threads.get("Actuators")
+            if actuators is not None:
+                actuators.join(self.STOP_TIMEOUT)
+            self.__stopActuators()
+
+        checked = []
+        for name in checks:
+            if name in finished:
+                checked.append(finished[name])
+            else:
+                timeout = self.__timeouts[name]
+                checked.append(ComponentCheck(name, "timeout", timeout * 1000.0, message=f"no answer within {timeout} s"))
+        report = SelfTestReport(checked, (clock.nowNs() - startNs) / 1e6)
+        for check in report.checks:
+            if check.ok:
+                self.logger.info(f"Self-test {check}")
+            else:
+                self.logger.error(f"Self-test {check}")
+        self.logger.info(f"Self-test {'passed' if report.ok else 'failed'} in {report.durationMs:.1f} ms")
+        return report
+
+    def __timed(self, name: str, check, results: dict) -> None:
+        """
+        Runs a check returning (ok, value, message), times it and stores its ComponentCheck in results.
+        """
+        clock = self.__clock
+        startNs = clock.nowNs()
+        try:
+            ok, value, message = check()
+        except Exception as e:
+            results[name] = ComponentCheck(name, "error", (clock.nowNs() - startNs) / 1e6, message=f"{type(e).__name__}: {e}")
+            return
+        results[name] = ComponentCheck(name, "ok" if ok else "failed", (clock.nowNs() - startNs) / 1e6, value, message)
+
+    def __stopActuators(self) -> None:
+        try:
+            self.__motorManager.setSpeed(0)
+            self.__motorManager.setAngle(0)
+        except Exception as e:
+            self.logger.error(f"Could not stop the motors after the self-test: {e}")
+
+    def __checkActuators(self, stop: threading.Event):
+        """
+        Sweeps the speed and the steering, the motors have no feedback: the check fails on an I2C error only.
+        The current read during the first step shows whether the motors draw power.
+        The sweep ends at the next step once stop is set.
+        """
+        clock = self.__clock
+        scale = getattr(clock, "scale", None)
+        loadCurrent = None
+        for index, (speed, angle, seconds) in enumerate(self.__sweep):
+            if stop.is_set():
+                return False, {"steps": index, "loadCurrent": loadCurrent}, "sweep stopped"
+            self.__motorManager.setAngle(angle)
+            self.__motorManager.setSpeed(speed)
+            if scale is None:
+                # a VirtualClock does not run by itself
+                clock.sleep(seconds)
+            else:
+                stop.wait(seconds / scale)
+            if index == 0:
+                loadCurrent = self.__sensorManager.getCurrent()
+        return True, {"steps": len(self.__sweep), "loadCurrent": loadCurrent}, None
+
+    def __checkRGB(self):
+        rgb = self.__sensorManager.readColourFrame().rgb
+        if rgb is None:
+            return False, None, "no colour read"
+        return True, {"red": rgb.red, "green": rgb.green, "blue": rgb.blue}, None
+
+    def __checkINA(self):
+        current = self.__sensorManager.getCurrent()
+        if current is None:
+            return False, None, "no current read"
+        return True, {"current": current}, None
+
+    def __checkDistance(self):
+        distance = self.__sensorManager.getDistance()
+        values = {"front": distance.front, "left": distance.left, "right": distance.right}
+        silent = [side for side, value in values.items() if value is None]
+        if silent:
+            return False, values, f"no echo on {', '.join(silent)}"
+        return True, values, None
+
+    def __checkLine(self):
+        """
+        Reads the line sensor itself: detectLine logs its errors and gives False, which would pass.
+        """
+        onLine = self.__sensorManager.lineSensor.readValue()
+        if onLine is not True and onLine is not False:
+            return False, {"value": onLine}, "no line state read"
+        return True, {"onLine": onLine}, None
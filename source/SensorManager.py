@@ -2,135 +2,417 @@ from LineSensor import LineSensor
 from DistanceSensor import DistanceSensor
 from RGBSensor import RGBSensor
 from INASensor import INASensor
+from DistanceSampler import DistanceSampler
+from FiringScheduler import FiringScheduler
+from PowerMonitor import PowerMonitor
+from MedianFilter import MedianFilter
+from AlphaBetaFilter import AlphaBetaFilter
 from data.DistanceData import DistanceData
 import threading
-import busio
-import board
+from Hardware import busio, board
+import Hardware
 import time
+import logging
 
 
 class SensorManager:
     def __init__(
         self,
-        bus_i2C: busio.I2C = None,
+        bus_i2C: "busio.I2C" = None,
         lineSensor=None,
         distSensorFront=None,
         distSensorLeft=None,
         distSensorRight=None,
         inaSensor=None,
-        rgbSensor=None
+        rgbSensor=None,
+        distanceFilter="median",
+        colourMaxAge: float = 0.01,
+        clock=None
     ):
         self.__i2c_bus = bus_i2C
         self.__lineSensor = lineSensor if lineSensor else LineSensor(20)
-        self.__distSensorFront = distSensorFront if distSensorFront else DistanceSensor(16, 25, 'Front')
-        self.__distSensorLeft = distSensorLeft if distSensorLeft else DistanceSensor(11, 9, 'Left')
-        self.__distSensorRight = distSensorRight if distSensorRight else DistanceSensor(26, 19, 'Right')
+        self.__distSensorFront = distSensorFront if distSensorFront else DistanceSensor(16, 25, 'Front', edgeCapture=True)
+        self.__distSensorLeft = distSensorLeft if distSensorLeft else DistanceSensor(11, 9, 'Left', edgeCapture=True)
+        self.__distSensorRight = distSensorRight if distSensorRight else DistanceSensor(26, 19, 'Right', edgeCapture=True)
         self.__isOnLine = False
         self.__inaSensor = inaSensor if inaSensor else INASensor(bus_i2C)
         self.__rgbSensor = rgbSensor if rgbSensor else RGBSensor(bus_i2C)
+        self.__distanceFilter = distanceFilter
+        self.__readers = None
+        self.__samplers = None
+        self.__scheduler = None
+        self.__acquisition = None
+        self.__maxSampleAge = None
+        self.__lastDistance = None
+        self.__lastRGB = None
+        self.__lastCurrent = None
+        self.__powerMonitor = None
+        self.__colourFrame = None
+        self.__colourFrameNs = None
+        self.__colourMaxAge = colourMaxAge
+        self.__colourReads = 0
+        self.__clock = clock if clock else Hardware.clock()
+        self.logger = logging.getLogger(__name__)
 
     @property
     def rgbSensor(self):
         return self.__rgbSensor
 
+    @property
+    def lineSensor(self):
+        return self.__lineSensor
+
+    @property
+    def isOnLine(self) -> bool:
+        """Result of the last detectLine call."""
+        return self.__isOnLine
+
+    @property
+    def lastDistance(self) -> DistanceData:
+        """Result of the last getDistance call, None before the first one."""
+        return self.__lastDistance
+
+    @property
+    def lastRGB(self):
+        """Last RGBData read by isRed/isGreen, None before the first reading."""
+        return self.__lastRGB
+
+    @property
+    def lastColourFrame(self):
+        """Last RGBFrame read from the colour sensor, None before the first reading."""
+        return self.__colourFrame
+
+    @property
+    def colourReads(self):
+        """Number of frames read from the colour sensor."""
+        return self.__colourReads
+
+    @property
+    def lastCurrent(self):
+        """Last current read by getCurrent in mA, None before the first reading."""
+        monitor = self.__powerMonitor
+        if monitor is not None and monitor.snapshot is not None:
+            return monitor.snapshot.current
+        return self.__lastCurrent
+
+    @property
+    def powerMonitor(self):
+        """PowerMonitor started by startPowerMonitor, None otherwise."""
+        return self.__powerMonitor
+
+    @property
+    def distanceFilter(self):
+        return self.__distanceFilter
+
+    @property
+    def sampling(self) -> bool:
+        return self.__samplers is not None or self.__acquisition is not None
+
+    @property
+    def acquisition(self):
+        """AcquisitionProcess of the sampling started with process=True, None otherwise."""
+        return self.__acquisition
+
+    @property
+    def firingScheduler(self):
+        return self.__scheduler
+
+    def startSampling(
+        self,
+        rateHz: float = 20,
+        windowSize: int = 5,
+        maxAge: float = 0.5,
+        readyTimeout: float = 0.2,
+        slots="roundRobin",
+        guardTime: float = 0.01,
+        background: bool = True,
+        filter=None,
+        policy=None,
+        process: bool = False
+    ) -> None:
+        """
+        Starts the background sampling of the ultrasonic sensors.
+        While sampling, getDistance returns the latest filtered readings without blocking.
+
+        By default the sensors are fired one after the other by a FiringScheduler,
+        so that one sensor never receives the echo of another one.
+        With slots=None, each sensor is sampled by its own thread at rateHz.
+
+        :param rateHz: Readings per second for each sensor when slots is None.
+        :param windowSize: Number of readings in the window of each filter.
+        :param maxAge: Readings older than this (in seconds) are returned as None.
+        :param readyTimeout: Time to wait for the first readings before returning.
+        :param slots: "roundRobin", "frontPriority", a list of "Front"/"Left"/"Right", or None.
+        :param guardTime: Silence in seconds between two staggered pulses.
+        :param background: When False, no thread is started and the caller fires the sensors
+            with firingScheduler.step() (used by the simulation in virtual time).
+        :param filter: Filter of each sampler, see createFilter. The distanceFilter of the manager by default.
+        :param policy: Sampling policy changing the slots of the FiringScheduler (e.g. AdaptiveSamplingPolicy).
+        :param process: Run the ultrasonic and line sensors in an AcquisitionProcess, so they do not compete
+            with the control loop for the GIL; getDistance and detectLine then read its latest shared sample.
+        """
+        if self.sampling:
+            return
+        if policy is not None and slots is None:
+            raise ValueError("A sampling policy needs the FiringScheduler (slots must not be None).")
+        kind = filter if filter is not None else self.__distanceFilter
+        if process:
+            if slots is None:
+                raise ValueError("The acquisition process fires the sensors with a FiringScheduler (slots must not be None).")
+            # multiprocessing is only loaded by the runs using the acquisition process
+            from AcquisitionProcess import AcquisitionProcess
+            acquisition = AcquisitionProcess(
+                (self.__distSensorFront, self.__distSensorLeft, self.__distSensorRight),
+                self.__lineSensor,
+                lambda: self.createFilter(kind, windowSize, 1.0 / rateHz),
+                rateHz,
+                windowSize,
+                slots,
+                guardTime,
+                maxAge,
+                policy,
+                clock=self.__clock
+            )
+            acquisition.start(readyTimeout)
+            self.__maxSampleAge = maxAge
+            self.__acquisition = acquisition
+            return
+        samplers = tuple(
+            DistanceSampler(sensor, rateHz, windowSize, filter=self.createFilter(kind, windowSize, 1.0 / rateHz))
+            for sensor in (self.__distSensorFront, self.__distSensorLeft, self.__distSensorRight)
+        )
+        if slots is None:
+            if background:
+                for sampler in samplers:
+                    sampler.start()
+        else:
+            self.__scheduler = FiringScheduler(
+                {"Front": samplers[0], "Left": samplers[1], "Right": samplers[2]},
+                slots,
+                guardTime,
+                policy=policy
+            )
+            if background:
+                self.__scheduler.start()
+        if background:
+            for sampler in samplers:
+                sampler.waitReady(readyTimeout)
+        self.__maxSampleAge = maxAge
+        self.__samplers = samplers
+
+    @staticmethod
+    def createFilter(kind, windowSize: int = 5, period: float = 0.05):
+        """
+        Returns a new distance filter:
+        "median" for a MedianFilter, "alphaBeta" for an AlphaBetaFilter,
+        "mean" for none (plain average of the window), or the result of kind() if it is callable.
+        """
+        if callable(kind):
+            return kind()
+        if kind == "median":
+            return MedianFilter(windowSize)
+        if kind == "alphaBeta":
+            return AlphaBetaFilter(period=period)
+        if kind == "mean":
+            return None
+        raise ValueError(f"Unknown distance filter: {kind}")
+
+    def firingRates(self) -> dict:
+        """
+        Returns the measured readings per second of each ultrasonic sensor while staggered sampling runs.
+        """
+        if self.__acquisition is not None:
+            sample = self.__acquisition.read()
+            return sample.rates if sample is not None else {}
+        if self.__scheduler is None:
+            return {}
+        return self.__scheduler.effectiveRates()
+
+    def stopSampling(self) -> None:
+        """
+        Stops the background samplers or the acquisition process, getDistance reads the sensors again.
+        """
+        acquisition, self.__acquisition = self.__acquisition, None
+        if acquisition is not None:
+            acquisition.stop()
+        samplers, self.__samplers = self.__samplers, None
+        scheduler, self.__scheduler = self.__scheduler, None
+        if scheduler is not None:
+            scheduler.stop()
+        if samplers is None:
+            return
+        for sampler in samplers:
+            sampler.stop()
+
     def detectLine(self) -> bool:
         """
         Detect whether the car is currently over a line.
-        Returns True if the IR sensor reads 0 (line detected),
-        False if it reads 1 (no line),
-        Raises ValueError for any unexpected value.
+        Returns True if the IR sensor detects the line (LineSensor reads True when its pin is 0),
+        False otherwise.
+        Unexpected values are logged as errors and give False.
         """
+        if self.__acquisition is not None:
+            sample = self.__acquisition.read()
+            self.__isOnLine = sample.onLine if sample is not None else False
+            return self.__isOnLine
         try:
             value = self.__lineSensor.readValue()
 
-            if value == 0:
-                self.__isOnLine = True
-                return True
-            elif value == 1:
-                self.__isOnLine = False
-                return False
-            else:
-                raise ValueError(f"Unexpected value returned by IR sensor: {value}")
+            if value is True or value is False:
+                self.__isOnLine = value
+                return value
+            raise ValueError(f"Unexpected value returned by IR sensor: {value}")
 
         except Exception as e:
-            print("Error during the detection of the line:", e)
+            self.logger.error(f"Error during the detection of the line: {e}")
         return False
   
     def getDistance(self) -> DistanceData:
         """
-        Collects average distance measurements from three ultrasonic sensors
-        using threading to speed up parallel reads.
-        Returns a DistanceData object with front, left, and right distances.
+        Returns the filtered distances of the three ultrasonic sensors.
+        When the background samplers are running, the latest estimates are returned immediately,
+        otherwise each sensor is read once (the three in parallel threads) and the reading
+        updates the filter of the sensor, so every call gives a new estimate without waiting for a batch.
+        With an acquisition process, the distances of its latest sample are returned, or None if
+        the sample is older than the maxAge of the sampling.
+        Returns a DistanceData object with front, left, and right distances and their confidence.
         """
-        results = [None, None, None]
+        if self.__acquisition is not None:
+            sample = self.__acquisition.read()
+            if sample is None or self.__clock.nowNs() - sample.timestampNs > self.__maxSampleAge * 1e9:
+                self.__lastDistance = DistanceData(None, None, None, (0.0, 0.0, 0.0))
+            else:
+                self.__lastDistance = sample.distance
+            return self.__lastDistance
 
-        def wrapper(sensor, index):
-            readings = []
-            for _ in range(5):
-                value = sensor.readValue()
-                if value is not None:
-                    readings.append(value)
-                time.sleep(0.01)
-            avg = round(sum(readings) / len(readings), 1) if readings else None
-            results[index] = avg
+        samplers = self.__samplers
+        if samplers is not None:
+            maxAge = self.__maxSampleAge
+            front = samplers[0].estimate(maxAge)
+            left = samplers[1].estimate(maxAge)
+            right = samplers[2].estimate(maxAge)
+            self.__lastDistance = DistanceData(
+                front[0], left[0], right[0],
+                (front[2], left[2], right[2])
+            )
+            return self.__lastDistance
 
-        threads = [
-            threading.Thread(target=wrapper, args=(self.__distSensorFront, 0)),
-            threading.Thread(target=wrapper, args=(self.__distSensorLeft, 1)),
-            threading.Thread(target=wrapper, args=(self.__distSensorRight, 2))
-        ]
+        if self.__readers is None:
+            self.__readers = tuple(
+                DistanceSampler(sensor, filter=self.createFilter(self.__distanceFilter))
+                for sensor in (self.__distSensorFront, self.__distSensorLeft, self.__distSensorRight)
+            )
+        readers = self.__readers
 
+        threads = [threading.Thread(target=reader.sampleOnce) for reader in readers]
         for thread in threads:
             thread.start()
         for thread in threads:
             thread.join()
 
-        return DistanceData(results[0], results[1], results[2])
+        front, left, right = (reader.estimate() for reader in readers)
+        self.__lastDistance = DistanceData(
+            front[0], left[0], right[0],
+            (front[2], left[2], right[2])
+        )
+        return self.__lastDistance
+
+    def startPowerMonitor(self, rateHz: float = 10, **params) -> PowerMonitor:
+        """
+        Starts a PowerMonitor polling the INA219 at rateHz in the background (params are given to the PowerMonitor).
+        While it runs, getCurrent and getPower return its latest snapshot without touching the bus.
+        """
+        if self.__powerMonitor is not None:
+            return self.__powerMonitor
+        monitor = PowerMonitor(self.__inaSensor, rateHz, clock=self.__clock, **params)
+        monitor.sampleOnce()
+        monitor.start()
+        self.__powerMonitor = monitor
+        return monitor
+
+    def stopPowerMonitor(self):
+        """
+        Stops the PowerMonitor and returns its last snapshot (None if it was not running).
+        """
+        monitor, self.__powerMonitor = self.__powerMonitor, None
+        if monitor is None:
+            return None
+        monitor.stop()
+        return monitor.snapshot
+
+    def getPower(self):
+        """
+        Returns the latest PowerSnapshot of the PowerMonitor, None if it is not running or has no reading yet.
+        """
+        monitor = self.__powerMonitor
+        return monitor.snapshot if monitor is not None else None
 
     def getCurrent(self) -> float:
         """
         Retrieves the electrical current measured by the INA219 sensor.
         Returns the current in milliamps, or None if unavailable.
+        While the PowerMonitor runs, the current of its latest snapshot is returned.
         """
+        snapshot = self.getPower()
+        if snapshot is not None:
+            return snapshot.current
         try:
             sensorData = self.__inaSensor.readValue()
-            return sensorData.get('Current', None)
+            self.__lastCurrent = sensorData.get('Current', None)
+            return self.__lastCurrent
         except Exception as e:
-            print("Error while reading current sensor:", e)
+            self.logger.error(f"Error while reading current sensor: {e}")
             return None
 
-    def isRed(self, redMinimum: int = 150, G_R_DeltaMinimum: int = 30) -> bool:
+    def readColourFrame(self, maxAge: float = None):
+        """
+        Returns a colour frame (RGBFrame) of the RGB sensor.
+        The last frame is shared while it is younger than maxAge seconds (colourMaxAge by default),
+        so all the colour predicates of a control tick use the same single I2C read.
+        """
+        maxAge = self.__colourMaxAge if maxAge is None else maxAge
+        now = self.__clock.nowNs()
+        if self.__colourFrame is not None and now - self.__colourFrameNs <= maxAge * 1e9:
+            return self.__colourFrame
+        frame = self.__rgbSensor.readFrame()
+        self.__colourReads += 1
+        self.__colourFrame = frame
+        self.__colourFrameNs = now
+        self.__lastRGB = frame.rgb
+        return frame
+
+    def isRed(self, redMinimum: int = 150, G_R_DeltaMinimum: int = 30, frame=None) -> bool:
         """
         Detects red color from RGB sensor data.
         Returns True if red value is high and significantly greater than green.
+        The colour frame of the tick is used, unless a frame is given.
         """
         try:
-            data = self.__rgbSensor.readValue()
+            data = (frame if frame is not None else self.readColourFrame()).rgb
             r = data.red
             g = data.green
-            b = data.blue
             if r < redMinimum or (r - g) < G_R_DeltaMinimum:
                 return False
             return True
         except Exception as e:
-            print("Error while detecting red color:", e)
+            self.logger.error(f"Error while detecting red color: {e}")
             return False
 
-    def isGreen(self, greenMinimum: int = 25, G_R_DeltaMinimum: int = 5) -> bool:
+    def isGreen(self, greenMinimum: int = 25, G_R_DeltaMinimum: int = 5, frame=None) -> bool:
         """
         Detects green color from RGB sensor data.
         Returns True if green value is high and significantly greater than red.
+        The colour frame of the tick is used, unless a frame is given.
         """
         try:
-            data = self.__rgbSensor.readValue()
+            data = (frame if frame is not None else self.readColourFrame()).rgb
             r = data.red
             g = data.green
-            b = data.blue
             if g < greenMinimum or (g - r) < G_R_DeltaMinimum:
                 return False
             return True
         except Exception as e:
-            print("Error while detecting green color:", e)
+            self.logger.error(f"Error while detecting green color: {e}")
             return False
 
 if __name__ == "__main__":
@@ -140,7 +422,7 @@ if __name__ == "__main__":
     while True:
         print("Current:", sensor_manager.getCurrent())
         time.sleep(1)
-        print("RGB:", sensor_manager._SensorManager__rgbSensor.readValue())
+        print("RGB:", sensor_manager.readColourFrame().rgb)
         time.sleep(1)
         print("IS GREEN:", sensor_manager.isGreen())
         time.sleep(1)
@@ -0,0 +1,141 @@
+import math
+import struct
+from multiprocessing import shared_memory
+from data.DistanceData import DistanceData
+from data.SensorSample import SensorSample
+
+"""
+Module for the SharedSampleBuffer class.
+This class shares the latest sensor sample and the latest motor commands
+between the acquisition process and the control process, without locks.
+"""
+
+class SharedSampleBuffer:
+    """
+    Two seqlock records in a shared memory block.
+
+    The sample record is written by the acquisition process and read by the control process,
+    the command record the other way round. Each record starts with a sequence number:
+    the writer makes it odd, writes the values, then makes it even again. A reader copies the values
+    between two reads of the sequence number and retries if the number was odd or has changed,
+    so it never sees a half-written sample and never blocks the writer.
+
+    A distance that is None is stored as NaN, a missing line edge time as -1.
+
+    Attributes:
+        name (str): Name of an existing block to attach to, None to create a new one.
+    """
+    SEQUENCE = struct.Struct("<Q")
+    SAMPLE = struct.Struct("<q3d3d?qQ3dQ")
+    COMMANDS = struct.Struct("<2d")
+    SAMPLE_OFFSET = 0
+    COMMANDS_OFFSET = 128
+    SIZE = 256
+    RATE_NAMES = ("Front", "Left", "Right")
+
+    def __init__(self, name: str = None):
+        if name is None:
+            self.__memory = shared_memory.SharedMemory(create=True, size=self.SIZE)
+            self.__memory.buf[:self.SIZE] = bytes(self.SIZE)
+        else:
+            self.__memory = shared_memory.SharedMemory(name=name)
+        self.__buf = self.__memory.buf
+        self.__count = 0
+        self.__retries = 0
+
+    @property
+    def name(self):
+        return self.__memory.name
+
+    @property
+    def retries(self):
+        """Number of reads retried because a write was in progress."""
+        return self.__retries
+
+    @property
+    def speed(self):
+        """Last speed published by writeCommands, so the buffer can drive a sampling policy."""
+        return self.readCommands()[0]
+
+    @property
+    def angle(self):
+        """Last steering published by writeCommands."""
+        return self.readCommands()[1]
+
+    def __write(self, offset: int, layout: struct.Struct, values) -> None:
+        buf = self.__buf
+        sequence = self.SEQUENCE.unpack_from(buf, offset)[0]
+        self.SEQUENCE.pack_into(buf, offset, sequence + 1)
+        layout.pack_into(buf, offset + self.SEQUENCE.size, *values)
+        self.SEQUENCE.pack_into(buf, offset, sequence + 2)
+
+    def __read(self, offset: int, layout: struct.Struct, maxRetries: int):
+        """
+        Returns (values, sequence) of a consistent copy of a record, or (None, sequence) after maxRetries retries.
+        """
+        buf = self.__buf
+        for _ in range(maxRetries + 1):
+            before = self.SEQUENCE.unpack_from(buf, offset)[0]
+            if not before & 1:
+                values = layout.unpack_from(buf, offset + self.SEQUENCE.size)
+                if self.SEQUENCE.unpack_from(buf, offset)[0] == before:
+                    return values, before
+            self.__retries += 1
+        return None, before
+
+    def writeSample(self, timestampNs: int, estimates, onLine: bool, lastEdgeNs, lineEdges: int, rates: dict) -> None:
+        """
+        Publishes a sample: estimates are the (distance, timestamp, confidence) of the front, left and right samplers.
+        """
+        distances = [math.nan if value is None else value for value, _, _ in estimates]
+        confidences = [confidence for _, _, confidence in estimates]
+        self.__count += 1
+        self.__write(self.SAMPLE_OFFSET, self.SAMPLE, (
+            timestampNs, *distances, *confidences, onLine,
+            -1 if lastEdgeNs is None else lastEdgeNs, lineEdges,
+            *(rates.get(name, 0.0) for name in self.RATE_NAMES), self.__count
+        ))
+
+    def readSample(self, maxRetries: int = 1000):
+        """
+        Returns the latest SensorSample, or None before the first one or if the writer
+        kept the record busy for maxRetries retries.
+        """
+        values, _ = self.__read(self.SAMPLE_OFFSET, self.SAMPLE, maxRetries)
+        if values is None or values[-1] == 0:
+            return None
+        timestampNs = values[0]
+        distances = [None if math.isnan(value) else value for value in values[1:4]]
+        lastEdgeNs = None if values[8] < 0 else values[8]
+        return SensorSample(
+            timestampNs,
+            DistanceData(*distances, tuple(values[4:7])),
+            values[7],
+            values[9],
+            lastEdgeNs,
+            dict(zip(self.RATE_NAMES, values[10:13])),
+            values[13]
+        )
+
+    def writeCommands(self, speed: float, angle: float) -> None:
+        self.__write(self.COMMANDS_OFFSET, self.COMMANDS, (speed, angle))
+
+    def readCommands(self, maxRetries: int = 1000):
+        """
+        Returns the last (speed, angle) published by writeCommands, (0, 0) before the first one.
+        """
+        values, _ = self.__read(self.COMMANDS_OFFSET, self.COMMANDS, maxRetries)
+        return values if values is not None else (0.0, 0.0)
+
+    def close(self) -> None:
+        """
+        Detaches this process from the block.
+        """
+        self.__buf = None
+        self.__memory.close()
+
+    def unlink(self) -> None:
+        """
+        Frees the block, once every process has closed it.
+        """
+        self.__memory.unlink()
@@ -0,0 +1,24 @@
+import time
+
+"""
+Module for the SystemClock class.
+This class gives the time used by the control loops of the LamboCar.
+"""
+
+class SystemClock:
+    """
+    Monotonic clock based on time.perf_counter_ns.
+    """
+    @property
+    def scale(self):
+        """Number of clock seconds per real second."""
+        return 1.0
+
+    def nowNs(self) -> int:
+        """Returns the current time in nanoseconds."""
+        return time.perf_counter_ns()
+
+    def sleep(self, seconds: float) -> None:
+        """Suspends the calling thread for the given number of seconds."""
+        if seconds > 0:
+            time.sleep(seconds)
@@ -0,0 +1,210 @@
+import mmap
+import math
+import os
+import struct
+import threading
+from data.TelemetryData import TelemetryData
+
+"""
+Module for the TelemetryRecorder class.
+This class records one fixed-size binary sample per control tick
+in a ring of samples stored in a memory-mapped file.
+"""
+
+class TelemetryRecorder:
+    """
+    Telemetry ring file.
+
+    The samples are packed into a small array-backed staging buffer, copied into the
+    memory-mapped ring every flushEvery samples. Once copied, a sample is in the page cache
+    of the system and survives a crash of the program. When the ring is full, the oldest samples
+    are overwritten.
+
+    File layout (little endian):
+        header, 32 bytes: magic "LTLM", version (uint16), sample size (uint16),
+            capacity (uint32), number of samples written (uint64), padding
+        capacity samples of SAMPLE.size bytes: sequence number (uint32), timestamp ns (int64),
+            front, left, right (float32, NaN if unknown), flags (uint8), red, green, blue (uint8),
+            current, speed, angle (float32, NaN if unknown)
+        flags: bit 0 line detected, bit 1 line known, bit 2 RGB known
+
+    Attributes:
+        path (str): Telemetry file, created or overwritten.
+        capacity (int): Number of samples kept in the ring.
+        flushEvery (int): Samples staged before they are copied into the file.
+    """
+    MAGIC = b"LTLM"
+    VERSION = 1
+    HEADER = struct.Struct("<4sHHIQ12x")
+    SAMPLE = struct.Struct("<IqfffBBBBfff")
+    LINE = 1
+    LINE_KNOWN = 2
+    RGB_KNOWN = 4
+
+    def __init__(self, path: str, capacity: int = 65536, flushEvery: int = 10):
+        if capacity < 1:
+            raise ValueError("Capacity must be at least 1.")
+        if not 1 <= flushEvery <= capacity:
+            raise ValueError("flushEvery must be between 1 and the capacity.")
+        self.__path = path
+        self.__capacity = capacity
+        self.__flushEvery = flushEvery
+        self.__stage = bytearray(flushEvery * self.SAMPLE.size)
+        self.__staged = 0
+        self.__written = 0
+        self.__lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        size = self.HEADER.size + capacity * self.SAMPLE.size
+        self.__file = open(path, "w+b")
+        self.__file.truncate(size)
+        self.__map = mmap.mmap(self.__file.fileno(), size)
+        self.__writeHeader()
+
+    @property
+    def path(self):
+        return self.__path
+
+    @property
+    def capacity(self):
+        return self.__capacity
+
+    @property
+    def count(self):
+        """Number of samples recorded, including the ones overwritten and the staged ones."""
+        return self.__written + self.__staged
+
+    @property
+    def closed(self):
+        return self.__map is None
+
+    def record(self, timestampNs: int, distance=None, line=None, rgb=None, current=None, speed=None, angle=None) -> None:
+        """
+        Stages one sample.
+
+        :param distance: DistanceData of the tick or (front, left, right), or None.
+        :param line: Line sensor state, or None.
+        :param rgb: RGBData or (red, green, blue), or None.
+        """
+        if distance is None:
+            front = left = right = None
+        elif isinstance(distance, tuple):
+            front, left, right = distance
+        else:
+            front, left, right = distance.front, distance.left, distance.right
+        flags = 0
+        if line is not None:
+            flags |= self.LINE_KNOWN | (self.LINE if line else 0)
+        if rgb is None:
+            red = green = blue = 0
+        else:
+            flags |= self.RGB_KNOWN
+            if isinstance(rgb, tuple):
+                red, green, blue = rgb
+            else:
+                red, green, blue = rgb.red, rgb.green, rgb.blue
+        nan = math.nan
+        with self.__lock:
+            if self.__map is None:
+                raise ValueError("Telemetry recorder is closed.")
+            self.SAMPLE.pack_into(
+                self.__stage, self.__staged * self.SAMPLE.size,
+                (self.__written + self.__staged) & 0xFFFFFFFF, timestampNs,
+                nan if front is None else front,
+                nan if left is None else left,
+                nan if right is None else right,
+                flags, red & 0xFF, green & 0xFF, blue & 0xFF,
+                nan if current is None else current,
+                nan if speed is None else speed,
+                nan if angle is None else angle
+            )
+            self.__staged += 1
+            if self.__staged == self.__flushEvery:
+                self.__flushStage()
+
+    def flush(self) -> None:
+        """
+        Copies the staged samples into the file.
+        """
+        with self.__lock:
+            if self.__map is not None:
+                self.__flushStage()
+
+    def sync(self) -> None:
+        """
+        Flushes and asks the system to write the file to the disk (survives a power loss).
+        """
+        with self.__lock:
+            if self.__map is not None:
+                self.__flushStage()
+                self.__map.flush()
+
+    def close(self) -> None:
+        with self.__lock:
+            if self.__map is None:
+                return
+            self.__flushStage()
+            self.__map.flush()
+            self.__map.close()
+            self.__file.close()
+            self.__map = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __flushStage(self) -> None:
+        size = self.SAMPLE.size
+        done = 0
+        while done < self.__staged:
+            slot = self.__written % self.__capacity
+            chunk = min(self.__staged - done, self.__capacity - slot)
+            start = self.HEADER.size + slot * size
+            self.__map[start:start + chunk * size] = self.__stage[done * size:(done + chunk) * size]
+            self.__written += chunk
+            done += chunk
+        self.__staged = 0
+        self.__writeHeader()
+
+    def __writeHeader(self) -> None:
+        self.HEADER.pack_into(self.__map, 0, self.MAGIC, self.VERSION, self.SAMPLE.size, self.__capacity, self.__written)
+
+    @classmethod
+    def read(cls, path: str) -> list:
+        """
+        Reads a telemetry file and returns its TelemetryData samples, oldest first.
+        Raises:
+            ValueError: If the file is not a telemetry file.
+        """
+        with open(path, "rb") as file:
+            data = file.read()
+        if len(data) < cls.HEADER.size:
+            raise ValueError(f"Invalid telemetry file {path}")
+        magic, version, sampleSize, capacity, written = cls.HEADER.unpack_from(data, 0)
+        if magic != cls.MAGIC or version != cls.VERSION or sampleSize != cls.SAMPLE.size:
+            raise ValueError(f"Invalid telemetry file {path}")
+        if len(data) < cls.HEADER.size + capacity * sampleSize:
+            raise ValueError(f"Truncated telemetry file {path}")
+
+        count = min(written, capacity)
+        first = written - count
+        samples = []
+        for i in range(count):
+            offset = cls.HEADER.size + ((first + i) % capacity) * sampleSize
+            _, timestamp, front, left, right, flags, red, green, blue, current, speed, angle = cls.SAMPLE.unpack_from(data, offset)
+            samples.append(TelemetryData(
+                timestamp,
+                cls.__value(front), cls.__value(left), cls.__value(right),
+                bool(flags & cls.LINE) if flags & cls.LINE_KNOWN else None,
+                (red, green, blue) if flags & cls.RGB_KNOWN else None,
+                cls.__value(current), cls.__value(speed), cls.__value(angle)
+            ))
+        return samples
+
+    @staticmethod
+    def __value(value):
+        return None if math.isnan(value) else round(value, 3)
@@ -0,0 +1,37 @@
+import threading
+
+"""
+Module for the VirtualClock class.
+This clock only moves forward when it is told to,
+so that time-dependent code can be tested and simulated deterministically.
+"""
+
+class VirtualClock:
+    """
+    Clock with the same interface as SystemClock where sleeping advances the time instantly.
+
+    Attributes:
+        startNs (int): Initial time in nanoseconds.
+    """
+    def __init__(self, startNs: int = 0):
+        self.__nowNs = startNs
+        self.__lock = threading.Lock()
+
+    def nowNs(self) -> int:
+        """Returns the current virtual time in nanoseconds."""
+        return self.__nowNs
+
+    def sleep(self, seconds: float) -> None:
+        """Advances the virtual time by the given number of seconds."""
+        if seconds > 0:
+            self.advance(seconds)
+
+    def advanceTo(self, timeNs: int) -> None:
+        """Moves the virtual time forward to an absolute time, never backward."""
+        with self.__lock:
+            self.__nowNs = max(self.__nowNs, timeNs)
+
+    def advance(self, seconds: float) -> None:
+        """Moves the virtual time forward."""
+        with self.__lock:
+            self.__nowNs += int(seconds * 1e9)
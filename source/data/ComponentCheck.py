@@ -0,0 +1,61 @@
+class ComponentCheck:
+    """
+    Class to store the result of the self-test of one component of the car.
+    Attributes:
+        name (str): Name of the component (e.g. "RGB", "Distance").
+        status (str): "ok", "failed" (the component answered badly), "error" (exception) or "timeout".
+        durationMs (float): Time taken by the check in milliseconds (the timeout for "timeout").
+        value: Values read during the check, None if there are none.
+        message (str): Details of a failure, None when the check is ok.
+    """
+    STATUSES = ("ok", "failed", "error", "timeout")
+
+    def __init__(self, name, status, durationMs, value=None, message=None):
+        if status not in self.STATUSES:
+            raise ValueError(f"Unknown check status: {status}")
+        self.__name = name
+        self.__status = status
+        self.__durationMs = durationMs
+        self.__value = value
+        self.__message = message
+
+    @property
+    def name(self):
+        return self.__name
+
+    @property
+    def status(self):
+        return self.__status
+
+    @property
+    def ok(self) -> bool:
+        return self.__status == "ok"
+
+    @property
+    def durationMs(self):
+        return self.__durationMs
+
+    @property
+    def value(self):
+        return self.__value
+
+    @property
+    def message(self):
+        return self.__message
+
+    def toDict(self) -> dict:
+        return {
+            "name": self.__name,
+            "status": self.__status,
+            "durationMs": round(self.__durationMs, 1),
+            "value": self.__value,
+            "message": self.__message
+        }
+
+    def __str__(self):
+        text = f"{self.__name}: {self.__status} in {self.__durationMs:.1f} ms"
+        if self.__value is not None:
+            text += f", {self.__value}"
+        if self.__message:
+            text += f" ({self.__message})"
+        return text
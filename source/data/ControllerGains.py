@@ -0,0 +1,66 @@
+class ControllerGains:
+    """
+    Class to store the gains and thresholds of the stayMid controller.
+    Attributes:
+        kp (float): Steering per cm of difference between the right and left distances.
+        minFront (float): Front distance in cm under which the car backs up.
+        maxFront (float): Front distance in cm giving the full speed range.
+        minSpeed (float): Lowest speed commanded when the way is clear.
+        maxSpeed (float): Highest speed commanded.
+        turnSlowdown (float): Fraction of the speed removed at full steering (0 to 1).
+    """
+    FIELDS = ("kp", "minFront", "maxFront", "minSpeed", "maxSpeed", "turnSlowdown")
+
+    def __init__(self, kp=10, minFront=20, maxFront=100, minSpeed=40, maxSpeed=41, turnSlowdown=0.5):
+        if maxFront <= minFront:
+            raise ValueError("maxFront must be greater than minFront.")
+        if maxSpeed < minSpeed:
+            raise ValueError("maxSpeed must not be lower than minSpeed.")
+        if not 0 <= turnSlowdown <= 1:
+            raise ValueError("turnSlowdown must be between 0 and 1.")
+        self.__kp = kp
+        self.__minFront = minFront
+        self.__maxFront = maxFront
+        self.__minSpeed = minSpeed
+        self.__maxSpeed = maxSpeed
+        self.__turnSlowdown = turnSlowdown
+
+    @property
+    def kp(self):
+        return self.__kp
+
+    @property
+    def minFront(self):
+        return self.__minFront
+
+    @property
+    def maxFront(self):
+        return self.__maxFront
+
+    @property
+    def minSpeed(self):
+        return self.__minSpeed
+
+    @property
+    def maxSpeed(self):
+        return self.__maxSpeed
+
+    @property
+    def turnSlowdown(self):
+        return self.__turnSlowdown
+
+    def toDict(self) -> dict:
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    @classmethod
+    def fromDict(cls, values: dict):
+        return cls(**{field: values[field] for field in cls.FIELDS if field in values})
+
+    def __eq__(self, other):
+        return isinstance(other, ControllerGains) and self.toDict() == other.toDict()
+
+    def __hash__(self):
+        return hash(tuple(self.toDict().values()))
+
+    def __repr__(self):
+        return f"ControllerGains({', '.join(f'{key}={value}' for key, value in self.toDict().items())})"
@@ -1,11 +1,13 @@
 class DistanceData:
     """
     Class to store the distance data from ultrasonic sensors.
+    The confidence (0 to 1) of each distance is given by the filters of the SensorManager.
     """
-    def __init__(self, front, left, right):
+    def __init__(self, front, left, right, confidence=None):
         self.__front = front
         self.__left = left
         self.__right = right
+        self.__confidence = confidence
 
     @property
     def front(self):
@@ -17,4 +19,9 @@ class DistanceData:
 
     @property
     def right(self):
-        return self.__right
\ No newline at end of file
+        return self.__right
+
+    @property
+    def confidence(self):
+        """(front, left, right) confidences, None when unknown."""
+        return self.__confidence
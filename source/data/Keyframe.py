@@ -0,0 +1,32 @@
+class Keyframe:
+    """
+    Class to store one step of a maneuver timeline.
+    Attributes:
+        at (float): Time of the step in seconds since the start of the maneuver.
+        speed (float): Speed to command (-100 to 100), None to keep the current one.
+        angle (float): Steering to command (-100 to 100), None to keep the current one.
+        label (str): Message logged when the step is applied, None for no message.
+    """
+    def __init__(self, at, speed=None, angle=None, label=None):
+        if at < 0:
+            raise ValueError("A keyframe can not be before the start of the maneuver.")
+        self.__at = at
+        self.__speed = speed
+        self.__angle = angle
+        self.__label = label
+
+    @property
+    def at(self):
+        return self.__at
+
+    @property
+    def speed(self):
+        return self.__speed
+
+    @property
+    def angle(self):
+        return self.__angle
+
+    @property
+    def label(self):
+        return self.__label
@@ -0,0 +1,65 @@
+class PowerSnapshot:
+    """
+    Class to store the state of the battery measured by the PowerMonitor.
+    Attributes:
+        timestampNs (int): Clock time of the measure in nanoseconds.
+        busVoltage (float): Battery voltage in V.
+        current (float): Current in mA.
+        power (float): Power in W.
+        chargeMah (float): Charge used since the start of the monitor in mAh.
+        energyWh (float): Energy used since the start of the monitor in Wh.
+        stateOfCharge (float): Estimated charge left in the battery (0 to 1).
+        samples (int): Number of measures since the start of the monitor.
+    """
+    def __init__(self, timestampNs, busVoltage, current, power, chargeMah, energyWh, stateOfCharge, samples):
+        self.__timestampNs = timestampNs
+        self.__busVoltage = busVoltage
+        self.__current = current
+        self.__power = power
+        self.__chargeMah = chargeMah
+        self.__energyWh = energyWh
+        self.__stateOfCharge = stateOfCharge
+        self.__samples = samples
+
+    @property
+    def timestampNs(self):
+        return self.__timestampNs
+
+    @property
+    def busVoltage(self):
+        return self.__busVoltage
+
+    @property
+    def current(self):
+        return self.__current
+
+    @property
+    def power(self):
+        return self.__power
+
+    @property
+    def chargeMah(self):
+        return self.__chargeMah
+
+    @property
+    def energyWh(self):
+        return self.__energyWh
+
+    @property
+    def stateOfCharge(self):
+        return self.__stateOfCharge
+
+    @property
+    def samples(self):
+        return self.__samples
+
+    def toDict(self) -> dict:
+        return {
+            "busVoltage": round(self.__busVoltage, 3),
+            "current": round(self.__current, 1),
+            "power": round(self.__power, 3),
+            "chargeMah": round(self.__chargeMah, 3),
+            "energyWh": round(self.__energyWh, 5),
+            "stateOfCharge": round(self.__stateOfCharge, 3),
+            "samples": self.__samples
+        }
@@ -0,0 +1,55 @@
+from data.RGBData import RGBData
+
+class RGBFrame:
+    """
+    Class to store one raw reading of the colour sensor.
+    Attributes:
+        clear (int): Raw value of the clear channel.
+        red (int): Raw value of the red channel.
+        green (int): Raw value of the green channel.
+        blue (int): Raw value of the blue channel.
+        timestampNs (int): Clock time of the reading in nanoseconds.
+    """
+    def __init__(self, clear, red, green, blue, timestampNs=None):
+        self.__clear = clear
+        self.__red = red
+        self.__green = green
+        self.__blue = blue
+        self.__timestampNs = timestampNs
+        self.__rgb = None
+
+    @property
+    def clear(self):
+        return self.__clear
+
+    @property
+    def red(self):
+        return self.__red
+
+    @property
+    def green(self):
+        return self.__green
+
+    @property
+    def blue(self):
+        return self.__blue
+
+    @property
+    def timestampNs(self):
+        return self.__timestampNs
+
+    @property
+    def rgb(self) -> RGBData:
+        """
+        Colour as 0-255 bytes, computed like color_rgb_bytes of the adafruit driver.
+        """
+        if self.__rgb is None:
+            clear = self.__clear
+            if clear == 0:
+                self.__rgb = RGBData(0, 0, 0)
+            else:
+                self.__rgb = RGBData(*(
+                    min(int(pow((int((raw / clear) * 256) / 255), 2.5) * 255), 255)
+                    for raw in (self.__red, self.__green, self.__blue)
+                ))
+        return self.__rgb
@@ -0,0 +1,49 @@
+class SelfTestReport:
+    """
+    Class to store the report of a self-test of the car.
+    Attributes:
+        checks (list): ComponentCheck of each component, in the order of the test.
+        durationMs (float): Time taken by the whole self-test in milliseconds.
+    """
+    def __init__(self, checks, durationMs):
+        self.__checks = tuple(checks)
+        self.__durationMs = durationMs
+
+    @property
+    def checks(self) -> tuple:
+        return self.__checks
+
+    @property
+    def durationMs(self):
+        return self.__durationMs
+
+    @property
+    def ok(self) -> bool:
+        """True when every component passed its check."""
+        return all(check.ok for check in self.__checks)
+
+    @property
+    def failed(self) -> list:
+        """Names of the components that did not pass their check."""
+        return [check.name for check in self.__checks if not check.ok]
+
+    def check(self, name: str):
+        """
+        Returns the ComponentCheck of a component, None if it was not tested.
+        """
+        for check in self.__checks:
+            if check.name == name:
+                return check
+        return None
+
+    def toDict(self) -> dict:
+        return {
+            "ok": self.ok,
+            "durationMs": round(self.__durationMs, 1),
+            "checks": [check.toDict() for check in self.__checks]
+        }
+
+    def __str__(self):
+        lines = [str(check) for check in self.__checks]
+        lines.append(f"Self-test {'passed' if self.ok else 'FAILED'} in {self.__durationMs:.1f} ms")
+        return "\n".join(lines)
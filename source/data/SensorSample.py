@@ -0,0 +1,48 @@
+class SensorSample:
+    """
+    Class to store one sample published by the acquisition process.
+    Attributes:
+        timestampNs (int): Clock time of the sample in nanoseconds.
+        distance (DistanceData): Filtered distances and their confidence.
+        onLine (bool): State of the line sensor.
+        lineEdges (int): Number of times the car entered the line since the start of the acquisition.
+        lastEdgeNs (int): Clock time of the last entry on the line, None before the first one.
+        rates (dict): Measured readings per second of each ultrasonic sensor.
+        sequence (int): Number of samples published before this one.
+    """
+    def __init__(self, timestampNs, distance, onLine, lineEdges, lastEdgeNs, rates, sequence):
+        self.__timestampNs = timestampNs
+        self.__distance = distance
+        self.__onLine = onLine
+        self.__lineEdges = lineEdges
+        self.__lastEdgeNs = lastEdgeNs
+        self.__rates = rates
+        self.__sequence = sequence
+
+    @property
+    def timestampNs(self):
+        return self.__timestampNs
+
+    @property
+    def distance(self):
+        return self.__distance
+
+    @property
+    def onLine(self):
+        return self.__onLine
+
+    @property
+    def lineEdges(self):
+        return self.__lineEdges
+
+    @property
+    def lastEdgeNs(self):
+        return self.__lastEdgeNs
+
+    @property
+    def rates(self):
+        return dict(self.__rates)
+
+    @property
+    def sequence(self):
+        return self.__sequence
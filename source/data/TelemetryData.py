@@ -0,0 +1,64 @@
+class TelemetryData:
+    """
+    Class to store one telemetry sample of a control tick.
+    Attributes:
+        timestampNs (int): Clock time of the tick in nanoseconds.
+        front, left, right (float): Distances in cm, None if unknown.
+        line (bool): True over the line, None if unknown.
+        rgb (tuple): (red, green, blue) of the colour sensor, None if unknown.
+        current (float): Current in mA, None if unknown.
+        speed (float): Speed commanded by the tick.
+        angle (float): Steering commanded by the tick.
+    """
+    def __init__(self, timestampNs, front, left, right, line, rgb, current, speed, angle):
+        self.__timestampNs = timestampNs
+        self.__front = front
+        self.__left = left
+        self.__right = right
+        self.__line = line
+        self.__rgb = rgb
+        self.__current = current
+        self.__speed = speed
+        self.__angle = angle
+
+    @property
+    def timestampNs(self):
+        return self.__timestampNs
+
+    @property
+    def front(self):
+        return self.__front
+
+    @property
+    def left(self):
+        return self.__left
+
+    @property
+    def right(self):
+        return self.__right
+
+    @property
+    def line(self):
+        return self.__line
+
+    @property
+    def rgb(self):
+        return self.__rgb
+
+    @property
+    def current(self):
+        return self.__current
+
+    @property
+    def speed(self):
+        return self.__speed
+
+    @property
+    def angle(self):
+        return self.__angle
+
+    def __repr__(self):
+        return (
+            f"TelemetryData({self.__timestampNs}, {self.__front}, {self.__left}, {self.__right}, "
+            f"{self.__line}, {self.__rgb}, {self.__current}, {self.__speed}, {self.__angle})"
+        )
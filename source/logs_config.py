@@ -1,6 +1,10 @@
 import logging 
 import os 
 import datetime
+import atexit
+from logging.handlers import QueueListener
+from AsyncLogHandler import AsyncLogHandler
+from RateLimitFilter import RateLimitFilter
 
 """
 Create a log file in the logs directory with the current date.
@@ -9,9 +13,31 @@ Each day a new log file is created and the logs are appended to it.
 It is used to log the information and the errors of the car and the sensors.
 The format of the message is : 
     Date and time - Level - Message
+
+The records are not written by the thread that logs them: they go through a bounded queue
+to a background thread writing the file, so the control loop never waits for the disk.
+Repeated messages (e.g. the errors of a failing sensor) are rate limited per message key,
+and the records that do not fit in the queue are dropped and counted (see logging_stats).
 """
 
-def setup_logging():
+_handler = None
+_listener = None
+_rateLimit = None
+
+def setup_logging(queueSize: int = 10000, burst: int = 5, interval: float = 1.0):
+    """
+    Installs the asynchronous file logging on the root logger.
+    Like logging.basicConfig, nothing is done if the root logger already has handlers.
+
+    :param queueSize: Records waiting to be written before new ones are dropped.
+    :param burst: Records with the same key written in each interval.
+    :param interval: Rate limiting interval in seconds.
+    """
+    global _handler, _listener, _rateLimit
+    root = logging.getLogger()
+    if root.handlers:
+        return
+
     log_dir = "logs"
     os.makedirs(log_dir, exist_ok=True)
     
@@ -19,10 +45,64 @@ def setup_logging():
         log_dir,
         f"LamboCar_{datetime.datetime.now().date()}.log"
     )
-    
-    logging.basicConfig(
-        filename=log_path,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        level=logging.INFO,
-        filemode='a'
-    )
+
+    fileHandler = logging.FileHandler(log_path, mode='a')
+    fileHandler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+
+    _rateLimit = RateLimitFilter(burst, interval)
+    _handler = AsyncLogHandler(queueSize)
+    _handler.addFilter(_rateLimit)
+    _listener = QueueListener(_handler.queue, fileHandler, respect_handler_level=True)
+    _listener.start()
+
+    root.addHandler(_handler)
+    root.setLevel(logging.INFO)
+    atexit.register(shutdown_logging)
+
+def restart_logging():
+    """
+    Restarts the asynchronous logging in a process forked after setup_logging.
+    The background thread of the parent is not in the child: the records would stay in the
+    inherited queue. The child gets its own queue and thread, writing to the same file.
+    """
+    global _handler, _listener
+    if _listener is None:
+        return
+    root = logging.getLogger()
+    root.removeHandler(_handler)
+    _handler = AsyncLogHandler(_handler.queue.maxsize)
+    _handler.addFilter(_rateLimit)
+    _listener = QueueListener(_handler.queue, *_listener.handlers, respect_handler_level=True)
+    _listener.start()
+    root.addHandler(_handler)
+
+def flush_logging(timeout: float = 1.0) -> bool:
+    """
+    Waits until the queued records are written.
+    """
+    if _handler is None:
+        return True
+    return _handler.drain(timeout)
+
+def shutdown_logging():
+    """
+    Writes the queued records and stops the background thread.
+    """
+    global _handler, _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    logging.getLogger().removeHandler(_handler)
+    _handler, _listener = None, None
+
+def logging_stats() -> dict:
+    """
+    Returns the number of records waiting in the queue, dropped and suppressed by the rate limiting.
+    """
+    return {
+        "queued": _handler.queue.qsize() if _handler else 0,
+        "dropped": _handler.dropped if _handler else 0,
+        "suppressed": _rateLimit.suppressed if _rateLimit else 0
+    }
@@ -1,41 +1,66 @@
-import LamboCar
-import busio
-import board
+import os
+import datetime
+from Hardware import busio, board
+
+MODES = ("selftest", "test", "start", "async", "green", "avoid", "reversegear", "uturn", "eightturn")
 
 def main():
     """
     Main function to control the LamboCar.
-    It initializes the I2C bus and creates an instance of the LamboCar class.
+    It asks for the mode, then initializes the I2C bus and creates an instance of the LamboCar class,
+    so the prompt does not wait for the hardware drivers.
+    Each control tick of the run is recorded in a telemetry file of the logs directory,
+    and the ultrasonic sensors are fired according to the speed and steering of the car.
+    The Profiler is enabled by the LAMBO_PROFILE environment variable or by SIGUSR2, and dumped on SIGUSR1.
     """
+    command = None
+    while command not in MODES:
+        command = input("Enter mode here [selfTest,test,start,async,green,avoid,reverseGear,uTurn,eightTurn]").lower()
+    tours = int(input("How many turns?")) if command in ("test", "start", "async", "green") else None
+
+    # the car modules and the drivers are loaded and the devices set up once the mode is chosen
+    import LamboCar
+    from TelemetryRecorder import TelemetryRecorder
+    from Profiler import Profiler
+    from logs_config import setup_logging
+    setup_logging()
     i2c_bus = busio.I2C(board.SCL, board.SDA)
-    lambo = LamboCar.LamboCar(i2c_bus)
+    telemetry = TelemetryRecorder(
+        os.path.join("logs", f"telemetry_{datetime.datetime.now():%Y-%m-%d_%H-%M-%S}.bin")
+    )
+    lambo = LamboCar.LamboCar(i2c_bus, telemetry=telemetry, adaptiveSampling=True)
+    profiler = Profiler(clock=lambo.clock)
+    profiler.installSignalHandlers()
+    if os.environ.get("LAMBO_PROFILE"):
+        profiler.enable()
+    print(f"Profile with: python Profiler.py {os.getpid()} [dump|toggle]")
 
-    ack=True
-    while ack:
-        command = input("Enter mode here [test,start,green,avoid,reverseGear,uTurn,eightTurn]")
-        if command.lower() == "test":
-            lambo.test()
-            ack = False
-        elif command.lower() == "start":
-            tours = int(input("How many turns?"))
+    # the telemetry is flushed and the profile dumped even when a mode ends with an exception (e.g. Ctrl+C)
+    try:
+        if command == "selftest":
+            lambo.selfTest()
+        elif command == "test":
+            lambo.test(tours)
+        elif command == "start":
             lambo.start(tours)
-            ack = False
-        elif command.lower() == "green":
-            tours = int(input("How many turns?"))
+        elif command == "async":
+            from AsyncRuntime import AsyncRuntime
+            print("Commands: stop, pause, resume, maneuver <name>")
+            lambo.startAsync(tours, AsyncRuntime.stdinCommands())
+        elif command == "green":
             lambo.start_on_green(tours)
-            ack = False
-        elif command.lower() == "avoid":
+        elif command == "avoid":
             lambo.zigzagAvoidance()
-            ack = False
-        elif command.lower() == "reversegear":
+        elif command == "reversegear":
             lambo.reverseGear()
-            ack = False
-        elif command.lower() == "uturn":
+        elif command == "uturn":
             lambo.uTurn()
-            ack = False
-        elif command.lower() == "eightturn":
+        elif command == "eightturn":
             lambo.eightTurn()
-            ack = False
+    finally:
+        telemetry.close()
+        if profiler.enabled:
+            profiler.dump()
 
 
 if __name__ == "__main__":
@@ -1,41 +1,45 @@
 import sys
-import time
-import logging
-import busio
-import board
-from LamboCar import LamboCar
+from Hardware import busio, board
+from MotorManager import MotorManager
+from logs_config import setup_logging
 
+"""
+Stops the motors of the car from the command line.
+Only the PCA9685 of the motors is set up, so the car stops without waiting for the sensors.
+"""
 
 def main():
-    # Initialiser la voiture
-    i2c_bus = busio.I2C(board.SCL, board.SDA)
-    lambo = LamboCar(i2c_bus)
-
     # On regarde s'il y a un argument en ligne de commande
-    if len(sys.argv) > 1:
-        command = sys.argv[1].lower()
-        
-        if command == "stop":
-            # Appel immédiat de la méthode stopCar
-            lambo.stopCar()
-            print(">>> Car stopped !")
-            
-        elif command == "reset":
-            # S’il y a une logique de reset à ajouter, tu la mets ici
-            print(">>> Resetting car...")
-            # Par exemple :
-            lambo.stopCar()
-            # lambo.prepareMotors() ou autre...
-            
-        else:
-            print(f"unknown command : {command}")
-            print("Possible usage: python my_script.py stop | reset")
-    else:
+    if len(sys.argv) <= 1:
         print("No command specified.")
         print("Usage:")
-        print("  python my_script.py stop")
-        print("  python my_script.py reset")
+        print("  python reset.py stop")
+        print("  python reset.py reset")
+        return
+
+    command = sys.argv[1].lower()
+    if command not in ("stop", "reset"):
+        print(f"unknown command : {command}")
+        print("Possible usage: python reset.py stop | reset")
+        return
+
+    setup_logging()
+    # Seul le driver des moteurs est initialisé
+    i2c_bus = busio.I2C(board.SCL, board.SDA)
+    motorManager = MotorManager(i2c_bus)
+
+    if command == "stop":
+        # Arrêt immédiat des moteurs, comme LamboCar.stopCar
+        motorManager.setSpeed(0)
+        motorManager.setAngle(0)
+        print(">>> Car stopped !")
+
+    elif command == "reset":
+        # S’il y a une logique de reset à ajouter, tu la mets ici
+        print(">>> Resetting car...")
+        motorManager.setSpeed(0)
+        motorManager.setAngle(0)
 
 # Point d'entrée
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
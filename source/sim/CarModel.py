@@ -0,0 +1,137 @@
+import math
+
+"""
+Module for the CarModel class.
+This class integrates the motion of the car with a kinematic bicycle model.
+Distances are in centimeters, angles in radians and times in seconds.
+"""
+
+class CarModel:
+    """
+    Kinematic bicycle model of the LamboCar.
+
+    The speed follows the motor command with a first order lag (slower when coasting,
+    faster when braking) and the front wheels turn toward the steering command at a limited rate.
+    A positive wheel angle turns left, like the heading (counter-clockwise).
+
+    Attributes:
+        x, y (float): Position of the center of the rear axle.
+        heading (float): Direction of the car.
+        length, width (float): Size of the body.
+        wheelBase (float): Distance between the axles.
+        maxSteer (float): Largest wheel angle.
+        maxSpeed (float): Speed at full throttle.
+        timeConstant (float): Time constant of the speed response to the throttle.
+        steerRate (float): Angular speed of the steering in radians per second.
+    """
+    def __init__(
+        self,
+        x: float = 0.0,
+        y: float = 0.0,
+        heading: float = 0.0,
+        length: float = 25.0,
+        width: float = 15.0,
+        wheelBase: float = 15.0,
+        maxSteer: float = math.radians(30),
+        maxSpeed: float = 200.0,
+        timeConstant: float = 0.3,
+        steerRate: float = math.radians(300)
+    ):
+        self.__x = x
+        self.__y = y
+        self.__heading = heading
+        self.__speed = 0.0
+        self.__steer = 0.0
+        self.__length = length
+        self.__width = width
+        self.__wheelBase = wheelBase
+        self.__maxSteer = maxSteer
+        self.__maxSpeed = maxSpeed
+        self.__timeConstant = timeConstant
+        self.__steerRate = steerRate
+
+    @property
+    def x(self):
+        return self.__x
+
+    @property
+    def y(self):
+        return self.__y
+
+    @property
+    def heading(self):
+        return self.__heading
+
+    @property
+    def speed(self):
+        return self.__speed
+
+    @property
+    def steer(self):
+        return self.__steer
+
+    @property
+    def length(self):
+        return self.__length
+
+    @property
+    def width(self):
+        return self.__width
+
+    @property
+    def wheelBase(self):
+        return self.__wheelBase
+
+    @property
+    def maxSteer(self):
+        return self.__maxSteer
+
+    @property
+    def maxSpeed(self):
+        return self.__maxSpeed
+
+    def pose(self) -> tuple:
+        return (self.__x, self.__y, self.__heading)
+
+    def setPose(self, x: float, y: float, heading: float) -> None:
+        self.__x, self.__y, self.__heading = x, y, heading
+
+    def halt(self) -> None:
+        """
+        Stops the car at once (e.g. against a wall).
+        """
+        self.__speed = 0.0
+
+    def toWorld(self, forward: float, left: float) -> tuple:
+        """
+        Converts a point of the car frame (forward/left of the rear axle) into track coordinates.
+        """
+        cos, sin = math.cos(self.__heading), math.sin(self.__heading)
+        return (self.__x + forward * cos - left * sin, self.__y + forward * sin + left * cos)
+
+    def step(self, dt: float, throttle: float = None, steer: float = 0.0, brake: bool = False) -> None:
+        """
+        Moves the car forward by dt seconds.
+
+        :param throttle: Motor command from -1 (full reverse) to 1 (full forward), None when the motors coast.
+        :param steer: Wheel angle command, clamped to maxSteer.
+        :param brake: Short-circuit braking of the motors.
+        """
+        if brake:
+            target, timeConstant = 0.0, self.__timeConstant / 3
+        elif throttle is None:
+            target, timeConstant = 0.0, self.__timeConstant * 3
+        else:
+            target = max(-1.0, min(1.0, throttle)) * self.__maxSpeed
+            timeConstant = self.__timeConstant
+        self.__speed += (target - self.__speed) * (1 - math.exp(-dt / timeConstant))
+
+        steer = max(-self.__maxSteer, min(self.__maxSteer, steer))
+        change = self.__steerRate * dt
+        self.__steer += max(-change, min(change, steer - self.__steer))
+
+        distance = self.__speed * dt
+        self.__x += distance * math.cos(self.__heading)
+        self.__y += distance * math.sin(self.__heading)
+        self.__heading += distance / self.__wheelBase * math.tan(self.__steer)
+        self.__heading = math.atan2(math.sin(self.__heading), math.cos(self.__heading))
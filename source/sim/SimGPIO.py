@@ -0,0 +1,61 @@
+from FakeGPIO import FakeGPIO
+
+"""
+Module for the SimGPIO class.
+This class is the GPIO module of the simulation: the ultrasonic echoes, the line sensor
+and the motor direction pins are connected to the World.
+"""
+
+class SimGPIO(FakeGPIO):
+    """
+    FakeGPIO wired to a World.
+
+    Wiring (BCM pins):
+        ultrasonic (dict): side -> (trigger pin, echo pin), the echo lasts the time of flight to the closest wall.
+        linePin (int): Input of the line sensor, LOW over the black line.
+        motorPins (dict): motor index -> (input1 pin, input2 pin) of the L298N.
+
+    Attributes:
+        world (World): Model answering the sensors and receiving the motor commands.
+        wiring (dict): Pins of the car, see above.
+        clock: Clock of the simulation.
+        threadedEcho (bool): See FakeGPIO.
+    """
+    def __init__(self, world, wiring: dict, clock, threadedEcho: bool = True):
+        super().__init__(clock=clock, threadedEcho=threadedEcho)
+        self.__world = world
+        self.__linePin = wiring["linePin"]
+        self.__motorPins = {}
+        for motor, pins in wiring["motorPins"].items():
+            for pin in pins:
+                self.__motorPins[pin] = (motor, pins)
+        for side, (pinTrig, pinEcho) in wiring["ultrasonic"].items():
+            self.attachEcho(pinTrig, pinEcho, self.__distanceFunction(side))
+        world.lineCallback = self.__onLineChange
+
+    @property
+    def world(self):
+        return self.__world
+
+    def __distanceFunction(self, side):
+        return lambda: self.__world.ultrasonicDistance(side)
+
+    def __onLineChange(self, onLine):
+        self.setInput(self.__linePin, self.LOW if onLine else self.HIGH)
+
+    def setup(self, pin, direction, pull_up_down=None, initial=None):
+        super().setup(pin, direction, pull_up_down, initial)
+        if pin == self.__linePin:
+            self.__onLineChange(self.__world.lineDetected())
+
+    def input(self, pin):
+        if pin == self.__linePin:
+            self.__world.sync()
+        return super().input(pin)
+
+    def output(self, pin, value):
+        super().output(pin, value)
+        motor = self.__motorPins.get(pin)
+        if motor is not None:
+            index, (input1, input2) = motor
+            self.__world.setMotorPins(index, super().input(input1), super().input(input2))
@@ -0,0 +1,85 @@
+import threading
+
+"""
+Module for the SimI2C class.
+This class replaces busio.I2C in the simulation and counts the traffic of the simulated devices.
+"""
+
+class SimI2C:
+    """
+    Simulated I2C bus with the interface of busio.I2C.
+
+    The simulated devices attach themselves to the bus with their address,
+    and report their transactions so that the bus load can be measured.
+
+    Attributes:
+        scl, sda: Pins of the bus (unused).
+        frequency (int): Clock of the bus in Hz.
+    """
+    def __init__(self, scl=None, sda=None, *, frequency: int = 100000, timeout: int = 255):
+        self.__frequency = frequency
+        self.__devices = {}
+        self.__lock = threading.Lock()
+        self.__transactions = 0
+        self.__bytes = 0
+        self.__locked = False
+
+    @property
+    def frequency(self):
+        return self.__frequency
+
+    @property
+    def devices(self):
+        return dict(self.__devices)
+
+    def attach(self, address: int, device) -> None:
+        self.__devices[address] = device
+
+    def record(self, address: int, size: int) -> None:
+        """
+        Counts one transaction of size bytes with the device at address.
+        """
+        with self.__lock:
+            self.__transactions += 1
+            self.__bytes += size
+
+    def stats(self) -> dict:
+        """
+        Returns the number of transactions and bytes and the time they take on the bus.
+        Each byte takes 9 clock cycles (8 bits and the acknowledge), plus the address byte of each transaction.
+        """
+        with self.__lock:
+            busyTime = (self.__bytes + self.__transactions) * 9 / self.__frequency
+            return {"transactions": self.__transactions, "bytes": self.__bytes, "busyTime": round(busyTime, 6)}
+
+    def try_lock(self) -> bool:
+        with self.__lock:
+            if self.__locked:
+                return False
+            self.__locked = True
+            return True
+
+    def unlock(self) -> None:
+        with self.__lock:
+            self.__locked = False
+
+    def scan(self) -> list:
+        return sorted(self.__devices)
+
+    def writeto(self, address: int, buffer, *, start: int = 0, end: int = None) -> None:
+        self.record(address, len(buffer[start:end]))
+
+    def readfrom_into(self, address: int, buffer, *, start: int = 0, end: int = None) -> None:
+        self.record(address, len(buffer[start:end]))
+
+    def writeto_then_readfrom(self, address: int, bufferOut, bufferIn, *, out_start=0, out_end=None, in_start=0, in_end=None) -> None:
+        self.record(address, len(bufferOut[out_start:out_end]) + len(bufferIn[in_start:in_end]))
+
+    def deinit(self) -> None:
+        self.__devices.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.deinit()
@@ -0,0 +1,45 @@
+"""
+Module for the SimI2CDevice class.
+This class replaces adafruit_bus_device.i2c_device.I2CDevice in the simulation.
+"""
+
+class SimI2CDevice:
+    """
+    Simulated I2C device handle with the interface of adafruit_bus_device.I2CDevice.
+
+    The bus is locked while the device is used (with statement) and each transaction goes through
+    the bus, so it is arbitrated and counted like a real one. The data read comes from the simulated
+    device attached to the bus at the address, through its readRegisters(command, buffer) method.
+
+    Attributes:
+        i2c: Bus of the device (SimI2C or a client of an I2CArbiter).
+        device_address (int): I2C address.
+    """
+    def __init__(self, i2c, device_address: int, probe: bool = True):
+        self.i2c = i2c
+        self.device_address = device_address
+
+    def __enter__(self):
+        while not self.i2c.try_lock():
+            pass
+        return self
+
+    def __exit__(self, *exc):
+        self.i2c.unlock()
+        return False
+
+    def write(self, buffer, *, start: int = 0, end: int = None) -> None:
+        self.i2c.writeto(self.device_address, buffer, start=start, end=end)
+
+    def readinto(self, buffer, *, start: int = 0, end: int = None) -> None:
+        self.i2c.readfrom_into(self.device_address, buffer, start=start, end=end)
+
+    def write_then_readinto(self, out_buffer, in_buffer, *, out_start=0, out_end=None, in_start=0, in_end=None) -> None:
+        self.i2c.writeto_then_readfrom(
+            self.device_address, out_buffer, in_buffer,
+            out_start=out_start, out_end=out_end, in_start=in_start, in_end=in_end
+        )
+        device = self.i2c.devices.get(self.device_address)
+        if device is not None and hasattr(device, "readRegisters"):
+            view = memoryview(in_buffer)[in_start:in_end]
+            device.readRegisters(bytes(out_buffer[out_start:out_end]), view)
@@ -0,0 +1,46 @@
+"""
+Module for the SimINA219 class.
+This class replaces adafruit_ina219.INA219 in the simulation.
+"""
+
+class SimINA219:
+    """
+    Simulated current sensor measuring the battery of the World.
+
+    Attributes:
+        i2c_bus (SimI2C): Bus of the device.
+        world (World): Model giving the battery voltage and current.
+        address (int): I2C address.
+    """
+    def __init__(self, i2c_bus, world, address: int = 0x40):
+        self.__i2c_bus = i2c_bus
+        self.__world = world
+        self.__address = address
+        if hasattr(i2c_bus, "attach"):
+            i2c_bus.attach(address, self)
+
+    def __read(self, index: int) -> float:
+        if hasattr(self.__i2c_bus, "record"):
+            self.__i2c_bus.record(self.__address, 3)
+        return self.__world.power()[index]
+
+    @property
+    def bus_voltage(self) -> float:
+        """Bus voltage in V."""
+        return self.__read(0)
+
+    @property
+    def shunt_voltage(self) -> float:
+        """Shunt voltage in V."""
+        return self.__read(1)
+
+    @property
+    def current(self) -> float:
+        """Current in mA."""
+        return self.__read(2)
+
+    @property
+    def power(self) -> float:
+        """Power in W."""
+        busVoltage, _, current = self.__world.power()
+        return busVoltage * current / 1000.0
@@ -0,0 +1,135 @@
+import threading
+
+"""
+Module for the SimPCA9685 class.
+This class replaces adafruit_pca9685.PCA9685 in the simulation.
+"""
+
+class SimPWMChannel:
+    """
+    One output of a SimPCA9685, with the duty_cycle property of adafruit PWMChannel.
+    """
+    def __init__(self, pca, index: int):
+        self.__pca = pca
+        self.__index = index
+
+    @property
+    def duty_cycle(self) -> int:
+        return self.__pca.dutyCycle(self.__index)
+
+    @duty_cycle.setter
+    def duty_cycle(self, value: int):
+        if not 0 <= value <= 0xFFFF:
+            raise ValueError(f"Out of range: value {value} not 0 <= value <= 65,535")
+        if value == 0xFFFF:
+            registers = (0x1000, 0)
+        else:
+            registers = (0, (value + 1) >> 4)
+        self.__pca.writeRegisters(self.__index, [registers])
+
+
+class SimPCA9685:
+    """
+    Simulated PCA9685 with the interface of the adafruit driver used by the LamboCar:
+    frequency, channels[i].duty_cycle and the i2c_device used for block writes.
+
+    The device is its own i2c_device: a write starting at a LEDn_ON_L register
+    updates the ON/OFF registers of the following channels (auto-increment).
+    Every register change is reported to a listener, the wiring of the simulation.
+
+    Attributes:
+        i2c_bus (SimI2C): Bus of the device.
+        address (int): I2C address.
+        listener: Function called with (pca, channel, duty cycle) when a channel changes.
+    """
+    LED0_ON_L = 0x06
+    CHANNELS = 16
+
+    def __init__(self, i2c_bus, address: int = 0x40, reference_clock_speed: int = 25000000, listener=None):
+        self.__i2c_bus = i2c_bus
+        self.__address = address
+        self.__referenceClockSpeed = reference_clock_speed
+        self.__frequency = 200.0
+        self.__registers = [(0, 0)] * self.CHANNELS
+        self.__listener = listener
+        self.__lock = threading.Lock()
+        self.channels = [SimPWMChannel(self, index) for index in range(self.CHANNELS)]
+        if hasattr(i2c_bus, "attach"):
+            i2c_bus.attach(address, self)
+
+    @property
+    def address(self):
+        return self.__address
+
+    @property
+    def i2c_device(self):
+        return self
+
+    @property
+    def i2c(self):
+        """Bus of the device, like the i2c attribute of an adafruit I2CDevice."""
+        return self.__i2c_bus
+
+    @property
+    def frequency(self) -> float:
+        return self.__frequency
+
+    @frequency.setter
+    def frequency(self, freq: float):
+        prescale = int(self.__referenceClockSpeed / 4096.0 / freq + 0.5)
+        if prescale < 3:
+            raise ValueError("PCA9685 cannot output at the given frequency")
+        self.__frequency = self.__referenceClockSpeed / 4096.0 / prescale
+        self.__record(2)
+
+    def dutyCycle(self, channel: int) -> int:
+        on, off = self.__registers[channel]
+        if on == 0x1000:
+            return 0xFFFF
+        return off << 4
+
+    def writeRegisters(self, firstChannel: int, registers: list) -> None:
+        """
+        Writes the (ON, OFF) registers of consecutive channels in one transaction.
+        """
+        changed = []
+        with self.__lock:
+            for offset, value in enumerate(registers):
+                channel = firstChannel + offset
+                if self.__registers[channel] != value:
+                    self.__registers[channel] = value
+                    changed.append(channel)
+        self.__record(1 + 4 * len(registers))
+        if self.__listener is not None:
+            for channel in changed:
+                self.__listener(self, channel, self.dutyCycle(channel))
+
+    def write(self, buffer, *, start: int = 0, end: int = None) -> None:
+        """
+        I2CDevice.write: the first byte is the register address, the next ones the register values.
+        """
+        data = bytes(buffer[start:end])
+        register = data[0]
+        if register < self.LED0_ON_L or (register - self.LED0_ON_L) % 4 or (len(data) - 1) % 4:
+            self.__record(len(data))
+            return
+        registers = []
+        for i in range(1, len(data), 4):
+            registers.append((data[i] | data[i + 1] << 8, data[i + 2] | data[i + 3] << 8))
+        self.writeRegisters((register - self.LED0_ON_L) // 4, registers)
+
+    def reset(self) -> None:
+        self.writeRegisters(0, [(0, 0)] * self.CHANNELS)
+
+    def deinit(self) -> None:
+        self.reset()
+
+    def __record(self, size: int) -> None:
+        if hasattr(self.__i2c_bus, "record"):
+            self.__i2c_bus.record(self.__address, size)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
@@ -0,0 +1,65 @@
+import struct
+
+"""
+Module for the SimTCS34725 class.
+This class replaces adafruit_tcs34725.TCS34725 in the simulation.
+"""
+
+class SimTCS34725:
+    """
+    Simulated colour sensor looking at the start light of the World.
+
+    The raw values come from the world, the other properties are computed
+    with the same formulas as the adafruit driver. Like the real sensor, it starts
+    powered off: the data registers read zeros until active is set.
+
+    Attributes:
+        i2c_bus (SimI2C): Bus of the device.
+        world (World): Model giving the colour of the start light.
+        address (int): I2C address.
+    """
+    DATA_REGISTER = 0x14
+
+    def __init__(self, i2c_bus, world, address: int = 0x29):
+        self.__i2c_bus = i2c_bus
+        self.__world = world
+        self.__address = address
+        self.integration_time = 2.4
+        self.gain = 1
+        self.active = False
+        if hasattr(i2c_bus, "attach"):
+            i2c_bus.attach(address, self)
+
+    @property
+    def color_raw(self) -> tuple:
+        """Raw (red, green, blue, clear) values, one 8 byte read on the bus; the driver powers the sensor on for it."""
+        if hasattr(self.__i2c_bus, "record"):
+            self.__i2c_bus.record(self.__address, 8)
+        return self.__world.colourRaw()
+
+    def readRegisters(self, command: bytes, buffer) -> None:
+        """
+        Answers a read of the registers through an I2C device (SimI2CDevice): only the data registers,
+        from CDATAL (0x14), are simulated, each channel being a little-endian 16 bit word.
+        """
+        offset = (command[0] & 0x1F) - self.DATA_REGISTER
+        if offset < 0:
+            return
+        red, green, blue, clear = self.__world.colourRaw() if self.active else (0, 0, 0, 0)
+        data = struct.pack("<4H", clear, red, green, blue)[offset:offset + len(buffer)]
+        buffer[:len(data)] = data
+
+    @property
+    def color_rgb_bytes(self) -> tuple:
+        r, g, b, clear = self.color_raw
+        if clear == 0:
+            return (0, 0, 0)
+        red = int(pow((int((r / clear) * 256) / 255), 2.5) * 255)
+        green = int(pow((int((g / clear) * 256) / 255), 2.5) * 255)
+        blue = int(pow((int((b / clear) * 256) / 255), 2.5) * 255)
+        return (min(red, 255), min(green, 255), min(blue, 255))
+
+    @property
+    def color(self) -> int:
+        r, g, b = self.color_rgb_bytes
+        return (r << 16) | (g << 8) | b
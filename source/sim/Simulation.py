@@ -0,0 +1,179 @@
+import os
+import logging
+from types import SimpleNamespace
+import Hardware
+from VirtualClock import VirtualClock
+from ScaledClock import ScaledClock
+from ControlLoop import ControlLoop
+from sim.Track import Track
+from sim.World import World
+from sim.SimGPIO import SimGPIO
+from sim.SimI2C import SimI2C
+from sim.SimI2CDevice import SimI2CDevice
+from sim.SimPCA9685 import SimPCA9685
+from sim.SimTCS34725 import SimTCS34725
+from sim.SimINA219 import SimINA219
+
+"""
+Module for the Simulation class.
+This class is the "sim" hardware backend: it builds the simulated devices
+around a World and gives them to the Hardware module in place of the Raspberry Pi drivers.
+"""
+
+class Simulation:
+    """
+    Simulated hardware of the LamboCar.
+
+    The devices are wired like the car: ultrasonic sensors and line sensor on the GPIO,
+    servo on channel 0 and motors on channels 5/4 of the PCA9685, colour and current sensors on the I2C bus.
+    As on the car, the PCA9685 outputs are inverted (MotorManager writes 65535 - duty).
+
+    Two kinds of time are supported:
+    - virtual(): a VirtualClock, time only moves when the code sleeps or an echo is waited for.
+      Everything runs in the calling thread, use drive() to run the control loop of a LamboCar.
+    - scaled(scale): a ScaledClock, the car runs in real threads scale times faster than real time.
+      The sleep overshoots of the OS are scaled too, so the higher the scale, the less precise the echoes.
+
+    Attributes:
+        clock: Clock of the simulation.
+        track (Track): Track, Track.stadium() by default.
+        threadedEcho (bool): Emit the echoes from a thread like the real sensor (see FakeGPIO).
+            By default the echo is timed by the thread that fires the sensor, which is not
+            preempted by the other threads while it waits for the falling edge.
+    """
+    WIRING = {
+        "ultrasonic": {"Front": (16, 25), "Left": (11, 9), "Right": (26, 19)},
+        "linePin": 20,
+        "motorPins": {0: (17, 18), 1: (27, 22)}
+    }
+    SERVO_CHANNEL = 0
+    MOTOR_CHANNELS = {5: 0, 4: 1}
+
+    def __init__(self, clock, track: Track = None, threadedEcho: bool = False):
+        self.__clock = clock
+        self.__world = World(track if track else Track.stadium(), clock)
+        self.__gpio = SimGPIO(self.__world, self.WIRING, clock, threadedEcho)
+        self.__buses = []
+        self.__modules = {
+            "GPIO": self.__gpio,
+            "board": SimpleNamespace(SCL="SCL", SDA="SDA"),
+            "busio": SimpleNamespace(I2C=self.__createBus),
+            "adafruit_pca9685": SimpleNamespace(PCA9685=self.__createPCA9685),
+            "adafruit_tcs34725": SimpleNamespace(TCS34725=self.__createTCS34725),
+            "adafruit_ina219": SimpleNamespace(INA219=self.__createINA219),
+            "adafruit_bus_device": SimpleNamespace(I2CDevice=SimI2CDevice)
+        }
+        self.logger = logging.getLogger(__name__)
+
+    @classmethod
+    def virtual(cls, track: Track = None):
+        """
+        Simulation in virtual time, deterministic and as fast as the CPU allows.
+        """
+        return cls(VirtualClock(), track)
+
+    @classmethod
+    def scaled(cls, scale: float = 1.0, track: Track = None):
+        """
+        Simulation in real threads, scale times faster than real time.
+        """
+        return cls(ScaledClock(scale), track)
+
+    @classmethod
+    def fromEnvironment(cls):
+        """
+        Simulation used by LAMBOCAR_HARDWARE=sim, running LAMBOCAR_SIM_SPEED times faster than real time (1 by default).
+        The start light is red and turns green after one second.
+        """
+        simulation = cls.scaled(float(os.environ.get("LAMBOCAR_SIM_SPEED", "1")))
+        simulation.world.setLight("red")
+        simulation.world.setLight("green", 1.0)
+        return simulation
+
+    @property
+    def clock(self):
+        return self.__clock
+
+    @property
+    def world(self):
+        return self.__world
+
+    @property
+    def gpio(self):
+        return self.__gpio
+
+    @property
+    def buses(self):
+        return list(self.__buses)
+
+    def module(self, name: str):
+        return self.__modules[name]
+
+    def install(self):
+        """
+        Makes this simulation the active hardware backend.
+        """
+        Hardware.useBackend(self)
+        return self
+
+    def drive(self, lambo, seconds: float, maxTours: int = None, onTick=None) -> dict:
+        """
+        Runs the control loop of a LamboCar (controlTick) for a number of simulated seconds
+        or until maxTours laps are counted. onTick, if given, is called after each controlTick.
+        The ultrasonic sensors are fired from the loop, one full round of slots per tick,
+        so that the run is deterministic with a VirtualClock.
+        With the sampling policy of the car, the slots are fired at the slot period set by the policy instead.
+        Returns the statistics of the control loop.
+        """
+        sensorManager = lambo.sensorManager
+        policy = getattr(lambo, "samplingPolicy", None)
+        sensorManager.startSampling(background=False, policy=policy)
+        scheduler = sensorManager.firingScheduler
+        endNs = self.__clock.nowNs() + int(seconds * 1e9)
+        nextSlotNs = [self.__clock.nowNs()]
+
+        def tick():
+            now = self.__clock.nowNs()
+            if now >= endNs or (maxTours is not None and lambo.tour >= maxTours):
+                return False
+            if policy is None:
+                for _ in scheduler.slots:
+                    scheduler.step()
+            else:
+                while nextSlotNs[0] <= now:
+                    scheduler.step()
+                    nextSlotNs[0] += int(scheduler.slotPeriod * 1e9)
+            lambo.controlTick()
+            if onTick is not None:
+                onTick()
+            return True
+
+        loop = ControlLoop(lambo.controlFrequency, self.__clock)
+        try:
+            loop.run(tick)
+        finally:
+            lambo.stopCar()
+            sensorManager.stopSampling()
+        self.logger.info(f"Simulated drive: {self.__world.stats()}")
+        return loop.stats()
+
+    def __createBus(self, scl=None, sda=None, **kwargs):
+        bus = SimI2C(scl, sda, **kwargs)
+        self.__buses.append(bus)
+        return bus
+
+    def __createPCA9685(self, i2c_bus, *, address: int = 0x40, reference_clock_speed: int = 25000000):
+        return SimPCA9685(i2c_bus, address, reference_clock_speed, listener=self.__onPwm)
+
+    def __createTCS34725(self, i2c_bus, address: int = 0x29):
+        return SimTCS34725(i2c_bus, self.__world, address)
+
+    def __createINA219(self, i2c_bus, addr: int = 0x40):
+        return SimINA219(i2c_bus, self.__world, addr)
+
+    def __onPwm(self, pca, channel: int, duty: int) -> None:
+        fraction = 1.0 - duty / 65535.0
+        if channel == self.SERVO_CHANNEL:
+            self.__world.setServoPulse(fraction * 1000.0 / pca.frequency)
+        elif channel in self.MOTOR_CHANNELS:
+            self.__world.setMotorDuty(self.MOTOR_CHANNELS[channel], fraction)
@@ -0,0 +1,185 @@
+import json
+import math
+import bisect
+
+"""
+Module for the Track class.
+This class describes a closed 2D track for the simulation: its centerline,
+its walls and the start line. Distances are in centimeters.
+"""
+
+class Track:
+    """
+    Closed track of constant width around a centerline polyline.
+
+    The walls are the centerline offset by half the width on each side.
+    The start line crosses the track at the first point of the centerline,
+    and the race direction goes from the first point to the second one.
+
+    Attributes:
+        centerline (list): (x, y) points of the closed centerline, without repeating the first point.
+        width (float): Distance between the two walls.
+        lineWidth (float): Width of the black start line.
+        name (str): Name of the track.
+    """
+    def __init__(self, centerline, width: float, lineWidth: float = 2.5, name: str = ""):
+        if len(centerline) < 3:
+            raise ValueError("A track needs at least 3 centerline points.")
+        if width <= 0:
+            raise ValueError("Track width must be positive.")
+        self.__points = [(float(x), float(y)) for x, y in centerline]
+        self.__width = width
+        self.__lineWidth = lineWidth
+        self.__name = name
+
+        count = len(self.__points)
+        self.__segments = []
+        self.__cumulative = [0.0]
+        for i in range(count):
+            x1, y1 = self.__points[i]
+            x2, y2 = self.__points[(i + 1) % count]
+            length = math.hypot(x2 - x1, y2 - y1)
+            if length == 0:
+                raise ValueError("Two consecutive centerline points are equal.")
+            self.__segments.append((x1, y1, (x2 - x1) / length, (y2 - y1) / length, length))
+            self.__cumulative.append(self.__cumulative[-1] + length)
+        self.__length = self.__cumulative[-1]
+
+        left, right = [], []
+        half = width / 2.0
+        for i in range(count):
+            _, _, ux0, uy0, _ = self.__segments[i - 1]
+            _, _, ux1, uy1, _ = self.__segments[i]
+            nx, ny = -(uy0 + uy1), ux0 + ux1
+            norm = math.hypot(nx, ny)
+            nx, ny = nx / norm, ny / norm
+            miter = half / max(0.2, nx * -uy1 + ny * ux1)
+            x, y = self.__points[i]
+            left.append((x + nx * miter, y + ny * miter))
+            right.append((x - nx * miter, y - ny * miter))
+        self.__walls = []
+        for wall in (left, right):
+            for i in range(count):
+                (x1, y1), (x2, y2) = wall[i], wall[(i + 1) % count]
+                self.__walls.append((x1, y1, x2, y2, min(x1, x2), max(x1, x2), min(y1, y2), max(y1, y2)))
+
+    @classmethod
+    def stadium(cls, straight: float = 300, radius: float = 90, width: float = 70, arcSegments: int = 24):
+        """
+        Builds an oval track: two straights joined by two half circles, driven counter-clockwise.
+        The start line is in the middle of the bottom straight.
+        """
+        half = straight / 2.0
+        points = [(0.0, -radius), (half, -radius)]
+        for i in range(1, arcSegments):
+            angle = -math.pi / 2 + math.pi * i / arcSegments
+            points.append((half + radius * math.cos(angle), radius * math.sin(angle)))
+        points += [(half, radius), (-half, radius)]
+        for i in range(1, arcSegments):
+            angle = math.pi / 2 + math.pi * i / arcSegments
+            points.append((-half + radius * math.cos(angle), radius * math.sin(angle)))
+        points.append((-half, -radius))
+        return cls(points, width, name=f"stadium {straight}x{radius}")
+
+    @classmethod
+    def load(cls, path: str):
+        """
+        Reads a track measured on the floor from a JSON file:
+        {"centerline": [[x, y], ...], "width": 70, "lineWidth": 2.5, "name": "..."} in cm.
+        """
+        with open(path, "r") as file:
+            values = json.load(file)
+        return cls(values["centerline"], values["width"], values.get("lineWidth", 2.5), values.get("name", path))
+
+    @property
+    def name(self):
+        return self.__name
+
+    @property
+    def width(self):
+        return self.__width
+
+    @property
+    def lineWidth(self):
+        return self.__lineWidth
+
+    @property
+    def length(self):
+        return self.__length
+
+    @property
+    def centerline(self):
+        return list(self.__points)
+
+    def startPose(self, backOff: float = 30.0) -> tuple:
+        """
+        Returns (x, y, heading) on the centerline, backOff cm before the start line, facing the race direction.
+        """
+        x, y, ux, uy, _ = self.__segments[-1]
+        length = self.__segments[-1][4]
+        backOff = min(backOff, length)
+        return (x + ux * (length - backOff), y + uy * (length - backOff), math.atan2(uy, ux))
+
+    def locate(self, x: float, y: float, hint: int = None) -> tuple:
+        """
+        Projects a point on the centerline.
+        Returns (segment index, distance along the track from the start line, lateral offset to the left).
+        With a hint (segment index of a previous call), only the neighbouring segments are searched.
+        """
+        count = len(self.__segments)
+        if hint is None:
+            candidates = range(count)
+        else:
+            candidates = [(hint + offset) % count for offset in (-2, -1, 0, 1, 2)]
+        best = None
+        for i in candidates:
+            x1, y1, ux, uy, length = self.__segments[i]
+            dx, dy = x - x1, y - y1
+            along = min(max(dx * ux + dy * uy, 0.0), length)
+            px, py = dx - along * ux, dy - along * uy
+            distance = px * px + py * py
+            if best is None or distance < best[0]:
+                lateral = ux * dy - uy * dx
+                best = (distance, i, self.__cumulative[i] + along, lateral)
+        return best[1], best[2], best[3]
+
+    def distanceAlong(self, segment: int, s: float) -> float:
+        return self.__cumulative[segment] + s
+
+    def segmentAt(self, s: float) -> int:
+        s %= self.__length
+        return min(bisect.bisect_right(self.__cumulative, s) - 1, len(self.__segments) - 1)
+
+    def raycast(self, x: float, y: float, angle: float, maxRange: float = 400.0):
+        """
+        Returns the distance from (x, y) to the first wall in the given direction, or None beyond maxRange.
+        """
+        dx, dy = math.cos(angle), math.sin(angle)
+        bx0, bx1 = min(x, x + dx * maxRange), max(x, x + dx * maxRange)
+        by0, by1 = min(y, y + dy * maxRange), max(y, y + dy * maxRange)
+        best = None
+        for x1, y1, x2, y2, minX, maxX, minY, maxY in self.__walls:
+            if maxX < bx0 or minX > bx1 or maxY < by0 or minY > by1:
+                continue
+            ex, ey = x2 - x1, y2 - y1
+            denominator = dx * ey - dy * ex
+            if abs(denominator) < 1e-12:
+                continue
+            wx, wy = x1 - x, y1 - y
+            t = (wx * ey - wy * ex) / denominator
+            u = (wx * dy - wy * dx) / denominator
+            if t >= 0 and 0 <= u <= 1 and (best is None or t < best):
+                best = t
+        if best is None or best > maxRange:
+            return None
+        return best
+
+    def onStartLine(self, x: float, y: float) -> bool:
+        """
+        Returns True if the point is on the black start line.
+        """
+        x1, y1, ux, uy, _ = self.__segments[0]
+        dx, dy = x - x1, y - y1
+        along = dx * ux + dy * uy
+        lateral = ux * dy - uy * dx
+        return abs(along) <= self.__lineWidth / 2.0 and abs(lateral) <= self.__width / 2.0
@@ -0,0 +1,294 @@
+import math
+import threading
+import bisect
+from sim.CarModel import CarModel
+
+"""
+Module for the World class.
+This class holds the state of the simulation (car, track, start light, battery)
+and answers the simulated devices: echo distances, line sensor, colour and power readings.
+"""
+
+class World:
+    """
+    Car-and-track model advanced lazily to the time of the clock.
+
+    The physics is integrated in fixed substeps up to clock.nowNs() each time a device
+    reads or writes the world (sync), so the model follows virtual time as well as real time.
+    The actuator commands are the electrical ones: servo pulse width, motor PWM fraction
+    and the direction pins of each L298N channel.
+
+    Attributes:
+        track (Track): Track the car drives on.
+        clock: Clock of the simulation.
+        car (CarModel): Car model, placed before the start line of the track by default.
+        stepSize (float): Integration substep in seconds.
+    """
+    # Ultrasonic sensors: (forward, left) position on the car in cm and direction in radians
+    SENSORS = {
+        "Front": (25.0, 0.0, 0.0),
+        "Left": (12.0, 7.5, math.pi / 2),
+        "Right": (12.0, -7.5, -math.pi / 2)
+    }
+    SENSOR_RAYS = (-math.radians(7.5), 0.0, math.radians(7.5))
+    SENSOR_RANGE = 400.0
+    # An HC-SR04 without echo returns a pulse of about 38 ms
+    NO_ECHO_DISTANCE = 0.038 * 17150
+    LINE_SENSOR = (20.0, 0.0)
+
+    # Servo geometry of ServoMotor: 1 ms to 2 ms for 0° to 180°, wheels straight at 80°, ±50° on the stops
+    SERVO_CENTER = 80.0
+    SERVO_RANGE = 50.0
+
+    # TCS34725 raw (red, green, blue, clear) values seen in front of the start light
+    LIGHTS = {
+        "green": (800, 3000, 900, 4500),
+        "red": (3800, 400, 300, 4200),
+        "off": (500, 500, 450, 1500)
+    }
+
+    # 2S 18650 pack measured by the INA219 through a 0.1 ohm shunt
+    BATTERY_EMPTY = 6.4
+    BATTERY_FULL = 8.4
+    BATTERY_RESISTANCE = 0.15
+    SHUNT_RESISTANCE = 0.1
+    IDLE_CURRENT = 120.0
+    MOTOR_CURRENT = 1500.0
+    SERVO_CURRENT = 250.0
+
+    def __init__(self, track, clock, car: CarModel = None, stepSize: float = 0.002, batteryCapacity: float = 2600.0):
+        self.__track = track
+        self.__clock = clock
+        if car is None:
+            car = CarModel(*track.startPose())
+        self.__car = car
+        self.__stepNs = int(stepSize * 1e9)
+        self.__lock = threading.RLock()
+        self.__timeNs = clock.nowNs()
+        self.__startNs = self.__timeNs
+
+        self.__servoPulse = None
+        self.__motorDuties = {}
+        self.__motorPins = {}
+
+        self.__segment = track.locate(car.x, car.y)[0]
+        self.__onLine = track.onStartLine(*car.toWorld(*self.LINE_SENSOR))
+        self.__lineCallback = None
+        self.__laps = 0
+        self.__collisions = 0
+        self.__contact = False
+        self.__distance = 0.0
+
+        self.__lightTimes = [self.__startNs]
+        self.__lightColours = ["off"]
+
+        self.__batteryCapacity = batteryCapacity
+        self.__consumed = 0.0
+        self.__current = self.IDLE_CURRENT
+
+    @property
+    def track(self):
+        return self.__track
+
+    @property
+    def clock(self):
+        return self.__clock
+
+    @property
+    def car(self):
+        return self.__car
+
+    @property
+    def lineCallback(self):
+        return self.__lineCallback
+
+    @lineCallback.setter
+    def lineCallback(self, callback):
+        """Function called with True/False when the line sensor enters/leaves the start line."""
+        self.__lineCallback = callback
+
+    @property
+    def elapsed(self) -> float:
+        """Simulated seconds since the creation of the world."""
+        return (self.__timeNs - self.__startNs) / 1e9
+
+    @property
+    def laps(self):
+        return self.__laps
+
+    @property
+    def collisions(self):
+        return self.__collisions
+
+    @property
+    def distance(self):
+        """Distance driven in centimeters."""
+        return self.__distance
+
+    def sync(self) -> None:
+        """
+        Integrates the physics up to the current time of the clock.
+        """
+        with self.__lock:
+            now = self.__clock.nowNs()
+            while self.__timeNs < now:
+                stepNs = min(self.__stepNs, now - self.__timeNs)
+                self.__step(stepNs / 1e9)
+                self.__timeNs += stepNs
+
+    def setServoPulse(self, pulseMs: float) -> None:
+        with self.__lock:
+            self.sync()
+            self.__servoPulse = pulseMs
+
+    def setMotorDuty(self, motor: int, fraction: float) -> None:
+        """
+        Sets the fraction of the battery voltage applied to one motor (PWM of its enable pin).
+        """
+        with self.__lock:
+            self.sync()
+            self.__motorDuties[motor] = max(0.0, min(1.0, fraction))
+
+    def setMotorPins(self, motor: int, input1: int, input2: int) -> None:
+        """
+        Sets the direction pins of one motor:
+        LOW/HIGH forward, HIGH/LOW backward, HIGH/HIGH brake, LOW/LOW coast.
+        """
+        with self.__lock:
+            self.sync()
+            self.__motorPins[motor] = (int(bool(input1)), int(bool(input2)))
+
+    def wheelAngle(self) -> float:
+        """
+        Returns the wheel angle commanded by the servo pulse (positive to the left).
+        """
+        if self.__servoPulse is None:
+            return 0.0
+        servoAngle = (self.__servoPulse - 1.0) * 180.0
+        ratio = (servoAngle - self.SERVO_CENTER) / self.SERVO_RANGE
+        return -max(-1.0, min(1.0, ratio)) * self.__car.maxSteer
+
+    def ultrasonicDistance(self, side: str) -> float:
+        """
+        Returns the distance measured by an ultrasonic sensor: the closest wall in its beam,
+        or NO_ECHO_DISTANCE when nothing is in range.
+        """
+        with self.__lock:
+            self.sync()
+            forward, left, angle = self.SENSORS[side]
+            x, y = self.__car.toWorld(forward, left)
+            heading = self.__car.heading + angle
+            best = None
+            for spread in self.SENSOR_RAYS:
+                distance = self.__track.raycast(x, y, heading + spread, self.SENSOR_RANGE)
+                if distance is not None and (best is None or distance < best):
+                    best = distance
+            return self.NO_ECHO_DISTANCE if best is None else best
+
+    def lineDetected(self) -> bool:
+        with self.__lock:
+            self.sync()
+            return self.__onLine
+
+    def setLight(self, colour: str, atSeconds: float = None) -> None:
+        """
+        Switches the start light to "red", "green" or "off", now or at a time in seconds since the creation of the world.
+        """
+        if colour not in self.LIGHTS:
+            raise ValueError(f"Unknown light colour: {colour}")
+        with self.__lock:
+            timeNs = self.__clock.nowNs() if atSeconds is None else self.__startNs + int(atSeconds * 1e9)
+            index = bisect.bisect_right(self.__lightTimes, timeNs)
+            del self.__lightTimes[index:], self.__lightColours[index:]
+            self.__lightTimes.append(timeNs)
+            self.__lightColours.append(colour)
+
+    def light(self) -> str:
+        index = bisect.bisect_right(self.__lightTimes, self.__clock.nowNs()) - 1
+        return self.__lightColours[max(0, index)]
+
+    def colourRaw(self) -> tuple:
+        """
+        Returns the raw (red, green, blue, clear) values of the colour sensor.
+        """
+        return self.LIGHTS[self.light()]
+
+    def power(self) -> tuple:
+        """
+        Returns the (bus voltage in V, shunt voltage in V, current in mA) of the battery.
+        """
+        with self.__lock:
+            self.sync()
+            charge = max(0.0, 1.0 - self.__consumed / self.__batteryCapacity)
+            openVoltage = self.BATTERY_EMPTY + (self.BATTERY_FULL - self.BATTERY_EMPTY) * charge
+            current = self.__current
+            return (
+                openVoltage - current / 1000.0 * self.BATTERY_RESISTANCE,
+                current / 1000.0 * self.SHUNT_RESISTANCE,
+                current
+            )
+
+    def stats(self) -> dict:
+        with self.__lock:
+            self.sync()
+            return {
+                "time": round(self.elapsed, 3),
+                "x": round(self.__car.x, 1),
+                "y": round(self.__car.y, 1),
+                "speed": round(self.__car.speed, 1),
+                "distance": round(self.__distance, 1),
+                "laps": self.__laps,
+                "collisions": self.__collisions
+            }
+
+    def __throttle(self) -> tuple:
+        """
+        Returns the (throttle, brake) command of the car from the state of the two motors.
+        """
+        drives = []
+        brake = False
+        for motor, pins in self.__motorPins.items():
+            fraction = self.__motorDuties.get(motor, 0.0)
+            if pins == (0, 1):
+                drives.append(fraction)
+            elif pins == (1, 0):
+                drives.append(-fraction)
+            elif pins == (1, 1):
+                brake = True
+        if brake or not drives:
+            return None, brake
+        return sum(drives) / len(drives), False
+
+    def __step(self, dt: float) -> None:
+        car = self.__car
+        throttle, brake = self.__throttle()
+        steer = self.wheelAngle()
+        previous = car.pose()
+        steerBefore = car.steer
+        car.step(dt, throttle, steer, brake)
+
+        segment, _, lateral = self.__track.locate(car.x, car.y, self.__segment)
+        if abs(lateral) > (self.__track.width - car.width) / 2:
+            car.setPose(*previous)
+            car.halt()
+            if not self.__contact:
+                self.__collisions += 1
+            self.__contact = True
+        else:
+            self.__contact = False
+            self.__segment = segment
+            self.__distance += math.hypot(car.x - previous[0], car.y - previous[1])
+
+        onLine = self.__track.onStartLine(*car.toWorld(*self.LINE_SENSOR))
+        if onLine != self.__onLine:
+            self.__onLine = onLine
+            if onLine and car.speed > 0:
+                self.__laps += 1
+            if self.__lineCallback is not None:
+                self.__lineCallback(onLine)
+
+        current = self.IDLE_CURRENT + self.MOTOR_CURRENT * abs(throttle or 0.0)
+        if car.steer != steerBefore:
+            current += self.SERVO_CURRENT
+        self.__current = current
+        self.__consumed += current * dt / 3600.0